@@ -28,6 +28,23 @@ resource "aws_dynamodb_table" "jobs" {
   }
 }
 
+# DynamoDB Table for Run History
+resource "aws_dynamodb_table" "runs" {
+  name         = var.dynamodb_runs_table_name
+  billing_mode = "PAY_PER_REQUEST"
+  hash_key     = "run_id"
+
+  attribute {
+    name = "run_id"
+    type = "S"
+  }
+
+  tags = {
+    Name        = "Job Tracker Run History Table"
+    Application = "job-tracker"
+  }
+}
+
 # ECR Repository for Docker Image
 resource "aws_ecr_repository" "job_tracker" {
   name                 = "job-tracker"
@@ -125,11 +142,16 @@ resource "aws_iam_role_policy" "dynamodb_access" {
         "dynamodb:PutItem",
         "dynamodb:GetItem",
         "dynamodb:UpdateItem",
+        "dynamodb:BatchGetItem",
+        "dynamodb:BatchWriteItem",
         "dynamodb:Query",
         "dynamodb:Scan",
         "dynamodb:DescribeTable"
       ]
-      Resource = aws_dynamodb_table.jobs.arn
+      Resource = [
+        aws_dynamodb_table.jobs.arn,
+        aws_dynamodb_table.runs.arn
+      ]
     }]
   })
 }
@@ -157,6 +179,10 @@ resource "aws_ecs_task_definition" "job_tracker" {
         name  = "DYNAMODB_TABLE_NAME"
         value = var.dynamodb_table_name
       },
+      {
+        name  = "DYNAMODB_RUNS_TABLE_NAME"
+        value = var.dynamodb_runs_table_name
+      },
       {
         name  = "AWS_REGION"
         value = var.aws_region
@@ -168,6 +194,20 @@ resource "aws_ecs_task_definition" "job_tracker" {
       {
         name  = "LOCATION"
         value = var.location
+      },
+      {
+        # Leave headroom below the 1 GB task limit for Python and the drivers
+        name  = "BROWSER_MEMORY_LIMIT_MB"
+        value = "900"
+      },
+      {
+        name  = "BROWSER_LOW_MEMORY"
+        value = "true"
+      },
+      {
+        # 0.5 vCPU: one parse worker overlaps parsing with navigation without starving Chromium
+        name  = "PARSE_WORKERS"
+        value = "1"
       }
     ]
 
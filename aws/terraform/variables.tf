@@ -10,6 +10,12 @@ variable "dynamodb_table_name" {
   default     = "job-tracker-jobs"
 }
 
+variable "dynamodb_runs_table_name" {
+  description = "Name of the DynamoDB table for run history"
+  type        = string
+  default     = "job-tracker-runs"
+}
+
 variable "search_query" {
   description = "Job search query"
   type        = string
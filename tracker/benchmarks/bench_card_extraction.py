@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+"""
+Compare per-element card extraction with single-round-trip script extraction
+on the recorded search page fixtures (tests/fixtures).
+
+Indeed is measured through Playwright (page.evaluate), LinkedIn through
+Selenium/ChromeDriver (execute_script), matching the production scrapers.
+
+Usage:
+    python benchmarks/bench_card_extraction.py --repeat 20
+    python benchmarks/bench_card_extraction.py --board indeed
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scrapers.indeed_scraper import IndeedScraper
+from src.scrapers.linkedin_scraper import LinkedInScraper
+
+FIXTURES = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests', 'fixtures')
+
+
+def time_extractor(extract, target, repeat):
+    """Run an extractor repeatedly; return (median ms, cards from the last run)."""
+    timings = []
+    cards = []
+    for _ in range(repeat):
+        # Extractors print progress; keep the benchmark output readable
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            cards = extract(target)
+            timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return timings[len(timings) // 2], cards
+
+
+def report(board, per_element, single):
+    (slow_ms, slow_cards), (fast_ms, fast_cards) = per_element, single
+    print(f"{board}:")
+    print(f"  per-element  {slow_ms:8.1f} ms  ({len(slow_cards)} cards)")
+    print(f"  single call  {fast_ms:8.1f} ms  ({len(fast_cards)} cards)")
+    print(f"  speedup      {slow_ms / fast_ms:8.1f}x" if fast_ms else "  speedup      n/a")
+    if slow_cards != fast_cards:
+        print("  WARNING: extractors returned different cards")
+
+
+def bench_indeed(repeat):
+    from playwright.sync_api import sync_playwright
+
+    scraper = IndeedScraper('software engineer', 'Remote')
+    with open(os.path.join(FIXTURES, 'indeed_search.html'), encoding='utf-8') as f:
+        html = f.read()
+
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=True)
+        page = browser.new_page()
+        page.set_content(html)
+        report('indeed (Playwright)',
+               time_extractor(scraper._extract_cards_per_element, page, repeat),
+               time_extractor(scraper._extract_cards_js, page, repeat))
+        browser.close()
+
+
+def bench_linkedin(repeat):
+    scraper = LinkedInScraper('software engineer', 'Remote')
+    driver = scraper._create_driver()
+    try:
+        driver.get('file://' + os.path.join(FIXTURES, 'linkedin_search.html'))
+        report('linkedin (Selenium)',
+               time_extractor(scraper._extract_cards_per_element, driver, repeat),
+               time_extractor(scraper._extract_cards_js, driver, repeat))
+    finally:
+        driver.quit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Card extraction benchmark')
+    parser.add_argument('--board', choices=['indeed', 'linkedin', 'all'], default='all')
+    parser.add_argument('--repeat', type=int, default=10, help='Extractions per method (median reported)')
+    args = parser.parse_args()
+
+    if args.board in ('indeed', 'all'):
+        bench_indeed(args.repeat)
+    if args.board in ('linkedin', 'all'):
+        bench_linkedin(args.repeat)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,273 @@
+#!/usr/bin/env python
+"""
+Database operation latency and memory at several table sizes.
+
+For each scale the jobs table is seeded with synthetic jobs
+(benchmarks/synthetic.py), then each operation runs --repeat times after
+one warm-up call. Latency percentiles come from the timed calls. Peak
+memory (tracemalloc, Python allocations) comes from one extra traced call,
+so tracing does not slow the timed ones. Expensive operations stop early
+once --max-seconds is spent (at least 3 samples).
+
+Operations:
+    process_jobs       JobMonitor.process_jobs on a --batch of scraped jobs, half already stored
+    get_job_by_url     Lookup of a stored URL
+    search_jobs        Keyword search (python, kubernetes, react, payments in turn)
+    get_recent_jobs    Last 7 and last 30 days
+    count_jobs         Active jobs posted in the last 7 days
+    get_job_count_by_source
+
+SQLite databases are seeded once per (scale, seed, day) into --data-dir and
+copied for each run, so repeated runs start from identical data (posted
+dates are relative to the seeding time, hence a new seed each day). DynamoDB
+runs against DynamoDB Local (a throwaway table per scale). Results are
+written to JSON; --compare prints the change between two result files.
+
+Usage:
+    python benchmarks/bench_database.py --scales 10000 100000
+    python benchmarks/bench_database.py --scales 1000000 --repeat 5 --max-seconds 60
+    python benchmarks/bench_database.py --backend dynamodb --endpoint http://localhost:8000 --scales 10000
+    python benchmarks/bench_database.py --compare benchmarks/results/old.json benchmarks/results/new.json
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import JobGenerator, seed_dynamodb, seed_sqlite
+from src.tracker.monitor import JobMonitor
+
+RESULTS_SCHEMA = 1
+KEYWORDS = ['python', 'kubernetes', 'react', 'payments']
+
+
+def percentile(ordered, fraction: float) -> float:
+    """Linearly interpolated percentile of an ascending list."""
+    position = (len(ordered) - 1) * fraction
+    low = int(position)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (position - low)
+
+
+def operations(db, scale: int, batch: int, generator: JobGenerator):
+    """(name, callable) pairs; each callable returns the number of rows it produced."""
+    monitor = JobMonitor(db)
+    state = {'next_new': scale, 'call': 0}
+    since = datetime.utcnow() - timedelta(days=7)
+
+    def process_jobs():
+        # Half the batch is already stored (spread over the table), half is new
+        stored = [generator.job(index * scale // (batch // 2 or 1)) for index in range(batch // 2)]
+        new = list(generator.jobs(batch - len(stored), start=state['next_new']))
+        state['next_new'] += len(new)
+        results = monitor.process_jobs(stored + new, 'bench')
+        return results['total_processed']
+
+    def get_job_by_url():
+        state['call'] += 1
+        index = (state['call'] * 7919) % scale
+        return int(db.get_job_by_url(generator.url(index, generator.board(index))) is not None)
+
+    def search_jobs():
+        state['call'] += 1
+        return len(db.search_jobs(KEYWORDS[state['call'] % len(KEYWORDS)]))
+
+    return [
+        ('process_jobs', process_jobs),
+        ('get_job_by_url', get_job_by_url),
+        ('search_jobs', search_jobs),
+        ('get_recent_jobs(7)', lambda: len(db.get_recent_jobs(days=7))),
+        ('get_recent_jobs(30)', lambda: len(db.get_recent_jobs(days=30))),
+        ('count_jobs', lambda: db.count_jobs('active', since=since)),
+        ('get_job_count_by_source', lambda: sum(sum(counts.values()) for counts in db.get_job_count_by_source().values())),
+    ]
+
+
+def measure(fn, repeat: int, max_seconds: float):
+    """Time fn; returns (latencies in seconds, peak traced MB, last result)."""
+    fn()  # Warm-up: connection setup, SQLite page cache
+    latencies = []
+    started = time.perf_counter()
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        latencies.append(time.perf_counter() - start)
+        if len(latencies) >= 3 and time.perf_counter() - started > max_seconds:
+            break
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return latencies, peak / 1024 / 1024, result
+
+
+def summarize(latencies, peak_mb: float, rows) -> dict:
+    ordered = sorted(latencies)
+    return {
+        'samples': len(ordered),
+        'mean_ms': round(sum(ordered) / len(ordered) * 1000, 3),
+        'p50_ms': round(percentile(ordered, 0.5) * 1000, 3),
+        'p90_ms': round(percentile(ordered, 0.9) * 1000, 3),
+        'p99_ms': round(percentile(ordered, 0.99) * 1000, 3),
+        'max_ms': round(ordered[-1] * 1000, 3),
+        'peak_mb': round(peak_mb, 2),
+        'rows': rows,
+    }
+
+
+def open_sqlite(scale: int, args, workdir: str):
+    """A working copy of the seeded database for this scale; returns (Database, info)."""
+    from src.database.db import Database
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    seeded_path = os.path.join(args.data_dir, f"jobs-{scale}-seed{args.seed}-{datetime.utcnow():%Y%m%d}.db")
+    seed_seconds = None
+    if not os.path.exists(seeded_path):
+        partial_path = f'{seeded_path}.partial'
+        seeded = Database(partial_path)
+        seeded.create_tables()
+        start = time.perf_counter()
+        seed_sqlite(seeded, scale, JobGenerator(seed=args.seed))
+        seed_seconds = round(time.perf_counter() - start, 2)
+        seeded.engine.dispose()
+        os.replace(partial_path, seeded_path)
+    work_path = os.path.join(workdir, f'jobs-{scale}.db')
+    shutil.copyfile(seeded_path, work_path)
+    db = Database(work_path)
+    db.create_tables()
+    return db, {'seed_seconds': seed_seconds, 'db_bytes': os.path.getsize(work_path)}
+
+
+def open_dynamodb(scale: int, args):
+    """A fresh table seeded with `scale` jobs; returns (DynamoDatabase, info)."""
+    from src.database.dynamodb import DynamoDatabase, JobModel
+
+    # DynamoDB Local accepts any credentials
+    os.environ.setdefault('AWS_ACCESS_KEY_ID', 'local')
+    os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'local')
+    table_name = f'bench-jobs-{uuid.uuid4().hex[:8]}'
+    db = DynamoDatabase(table_name=table_name, runs_table_name=f'{table_name}-runs', host=args.endpoint)
+    JobModel.create_table(read_capacity_units=1000, write_capacity_units=1000, wait=True)
+    start = time.perf_counter()
+    seed_dynamodb(scale, JobGenerator(seed=args.seed))
+    return db, {'seed_seconds': round(time.perf_counter() - start, 2), 'table': table_name}
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run(args):
+    report = {
+        'schema': RESULTS_SCHEMA,
+        'started_at': datetime.utcnow().isoformat(timespec='seconds') + 'Z',
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'backend': args.backend,
+        'seed': args.seed,
+        'batch': args.batch,
+        'scales': {},
+        'results': [],
+    }
+    print(f"{args.backend}: scales {', '.join(f'{scale:,}' for scale in args.scales)}, "
+          f"{args.repeat} calls per operation")
+    with tempfile.TemporaryDirectory() as workdir:
+        for scale in args.scales:
+            if args.backend == 'dynamodb':
+                db, info = open_dynamodb(scale, args)
+            else:
+                db, info = open_sqlite(scale, args, workdir)
+            report['scales'][str(scale)] = info
+            seeded = f", seeded in {info['seed_seconds']:.1f}s" if info['seed_seconds'] is not None else ""
+            print(f"\n{scale:,} jobs{seeded}")
+            print(f"  {'operation':<26}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'max ms':>10}"
+                  f"{'peak MB':>10}{'rows':>9}{'n':>5}")
+
+            generator = JobGenerator(seed=args.seed)
+            try:
+                for name, fn in operations(db, scale, args.batch, generator):
+                    if args.operations and name.split('(')[0] not in args.operations:
+                        continue
+                    result = summarize(*measure(fn, args.repeat, args.max_seconds))
+                    report['results'].append({'scale': scale, 'operation': name, **result})
+                    print(f"  {name:<26}{result['p50_ms']:>10.2f}{result['p90_ms']:>10.2f}{result['p99_ms']:>10.2f}"
+                          f"{result['max_ms']:>10.2f}{result['peak_mb']:>10.1f}{result['rows']:>9,}"
+                          f"{result['samples']:>5}")
+            finally:
+                if args.backend == 'dynamodb':
+                    from src.database.dynamodb import JobModel
+                    JobModel.delete_table()
+                else:
+                    db.engine.dispose()
+
+    output = args.output or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'results',
+        f"database-{args.backend}-{datetime.utcnow().strftime('%Y%m%dT%H%M%SZ')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+
+
+def compare(old_path: str, new_path: str):
+    """Print p50/p99 and peak memory changes between two result files."""
+    with open(old_path, encoding='utf-8') as f:
+        old = json.load(f)
+    with open(new_path, encoding='utf-8') as f:
+        new = json.load(f)
+    before = {(r['scale'], r['operation']): r for r in old['results']}
+    print(f"{old_path} ({old.get('git_commit')}) -> {new_path} ({new.get('git_commit')})")
+    print(f"  {'scale':>9}  {'operation':<26}{'p50 ms':>18}{'p99 ms':>18}{'peak MB':>16}")
+    for result in new['results']:
+        previous = before.get((result['scale'], result['operation']))
+        if previous is None:
+            continue
+
+        def change(key):
+            ratio = result[key] / previous[key] if previous[key] else float('inf')
+            return f"{result[key]:>9.2f} ({ratio:4.2f}x)"
+
+        print(f"  {result['scale']:>9,}  {result['operation']:<26}{change('p50_ms'):>18}{change('p99_ms'):>18}"
+              f"{change('peak_mb'):>16}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--backend', choices=['sqlite', 'dynamodb'], default='sqlite')
+    parser.add_argument('--scales', type=int, nargs='+', default=[10000, 100000], help='Jobs in the table')
+    parser.add_argument('--operations', nargs='+', help='Only these operations (e.g. search_jobs count_jobs)')
+    parser.add_argument('--repeat', type=int, default=20, help='Timed calls per operation')
+    parser.add_argument('--max-seconds', type=float, default=20, help='Stop an operation early after this long')
+    parser.add_argument('--batch', type=int, default=100, help='Scraped jobs per process_jobs call')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'job-tracker-bench'),
+                        help='Where seeded SQLite databases are kept between runs')
+    parser.add_argument('--endpoint', default='http://localhost:8000', help='DynamoDB Local endpoint')
+    parser.add_argument('--output', help='Results file (default: benchmarks/results/database-<backend>-<time>.json)')
+    parser.add_argument('--compare', nargs=2, metavar=('OLD', 'NEW'), help='Compare two results files and exit')
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+    else:
+        run(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+"""
+Query result cache: the reads behind `stats`, uncached vs cached in memory vs shared on disk.
+
+Each "stats" round issues the same queries as CLI.show_stats (four
+count_jobs, counts by source and by company). Rounds are repeated against
+the bare SQLite database, behind an in-process cache, and behind a fresh
+cache per round sharing one SQLite cache file (a new CLI process each
+time). Every --write-every rounds a job is added through the cache, which
+invalidates it, so the hit rate reflects a database that keeps changing.
+
+Usage:
+    python benchmarks/bench_db_cache.py --jobs 50000 --rounds 50 --write-every 10
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.cache import CachedDatabase, ResultCache
+from src.database.db import Database
+from src.database.models import Job
+
+
+def populate(db: Database, n: int, seed: int):
+    """Bulk-insert n jobs with ~2 KB descriptions posted over the past two months."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    description = "Build and operate services. " * 80
+    rows = []
+    for i in range(n):
+        posted = now - timedelta(seconds=rng.randint(0, 60 * 86400))
+        rows.append({
+            'title': f'Engineer {i}', 'company': f'Company {rng.randrange(500)}',
+            'url': f'https://www.indeed.com/viewjob?jk={i:012x}', 'board_source': rng.choice(['indeed', 'linkedin']),
+            'location': 'Remote', 'status': rng.choice(['active'] * 9 + ['expired']), 'posted_date': posted,
+            'description': description, 'created_at': posted, 'updated_at': posted,
+        })
+    with db.engine.begin() as conn:
+        conn.execute(Job.__table__.insert(), rows)
+
+
+def stats_round(db):
+    """The queries CLI.show_stats runs."""
+    now = datetime.utcnow()
+    db.count_jobs('active')
+    for days in (1, 7, 30):
+        db.count_jobs('active', since=now - timedelta(days=days))
+    db.get_job_count_by_source()
+    db.get_job_count_by_company('active')
+
+
+def run(label: str, rounds: int, write_every: int, make_db):
+    """Time `rounds` stats rounds, adding a job every `write_every` rounds."""
+    elapsed = 0.0
+    hits = lookups = 0
+    for i in range(rounds):
+        db = make_db()
+        cache = getattr(db, 'cache', None)
+        before = (cache.stats['hits'], cache.stats['hits'] + cache.stats['misses']) if cache else (0, 0)
+        start = time.perf_counter()
+        stats_round(db)
+        elapsed += time.perf_counter() - start
+        if cache:
+            hits += cache.stats['hits'] - before[0]
+            lookups += cache.stats['hits'] + cache.stats['misses'] - before[1]
+        if write_every and (i + 1) % write_every == 0:
+            db.add_job(title='New job', company='Acme', url=f'https://example.com/{label}/{i}', board_source='indeed')
+    hit_rate = f"{hits / lookups:6.1%} hits" if lookups else "      -     "
+    print(f"  {label:<32} {elapsed / rounds * 1000:9.2f} ms/round  {hit_rate}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=50000, help='Jobs in the database')
+    parser.add_argument('--rounds', type=int, default=50, help='stats rounds per configuration')
+    parser.add_argument('--write-every', type=int, default=10, help='Add a job every N rounds (0 = never)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        database = Database(os.path.join(tmpdir, 'jobs.db'))
+        database.create_tables()
+        populate(database, args.jobs, args.seed)
+        print(f"{args.jobs} jobs, {args.rounds} rounds, a write every {args.write_every} rounds")
+
+        run("uncached", args.rounds, args.write_every, lambda: database)
+        memory = ResultCache(ttl=300)
+        run("in-process cache", args.rounds, args.write_every, lambda: CachedDatabase(database, memory))
+        cache_path = os.path.join(tmpdir, 'db_cache.db')
+        caches = []
+
+        def new_process():
+            caches.append(ResultCache(ttl=300, cache_path=cache_path))
+            return CachedDatabase(database, caches[-1])
+
+        run("shared disk cache, new process", args.rounds, args.write_every, new_process)
+        for cache in caches:
+            cache.close()
+        database.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
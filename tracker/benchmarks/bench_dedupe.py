@@ -0,0 +1,99 @@
+#!/usr/bin/env python
+"""
+Benchmark per-insert latency of the near-duplicate index on synthetic jobs.
+
+Usage:
+    python benchmarks/bench_dedupe.py --jobs 100000 --dup-rate 0.2
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tracker.dedupe import NearDuplicateIndex
+
+WORDS = (
+    "python java go rust backend frontend platform data cloud aws docker kubernetes "
+    "api services design build scale team product mentor lead senior remote hybrid "
+    "postgres redis kafka spark ml pipelines testing ci cd security reliability "
+    "customers growth startup enterprise equity benefits salary health vacation"
+).split()
+TITLES = ["Software Engineer", "Backend Engineer", "Data Engineer", "Platform Engineer",
+          "Frontend Developer", "ML Engineer", "Site Reliability Engineer"]
+
+
+def synthetic_job(rng: random.Random, i: int) -> dict:
+    """Generate one synthetic job with a random description."""
+    return {
+        'url': f"https://www.indeed.com/viewjob?jk={i:012x}",
+        'title': rng.choice(TITLES),
+        'company': f"Company {rng.randint(1, 5000)}",
+        'description': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(80, 200))),
+    }
+
+
+def repost(rng: random.Random, job: dict, i: int) -> dict:
+    """Copy a job under a new URL with a few words changed."""
+    words = job['description'].split()
+    for _ in range(max(1, len(words) // 50)):
+        words[rng.randrange(len(words))] = rng.choice(WORDS)
+    return {**job, 'url': f"https://www.linkedin.com/jobs/view/{i}", 'description': ' '.join(words)}
+
+
+def percentile(sorted_values, pct):
+    """Return the pct-th percentile from an already sorted list."""
+    idx = min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))
+    return sorted_values[idx]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Near-duplicate index benchmark')
+    parser.add_argument('--jobs', type=int, default=20000, help='Number of jobs to insert')
+    parser.add_argument('--dup-rate', type=float, default=0.2, help='Fraction of inserts that are reposts')
+    parser.add_argument('--report-every', type=int, default=5000, help='Print latency every N inserts')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    inserted = []
+    latencies = []
+    flagged = 0
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        index = NearDuplicateIndex(os.path.join(tmpdir, 'dedupe.db'))
+        start = time.perf_counter()
+
+        for i in range(1, args.jobs + 1):
+            if inserted and rng.random() < args.dup_rate:
+                job = repost(rng, rng.choice(inserted), i)
+            else:
+                job = synthetic_job(rng, i)
+                inserted.append(job)
+
+            t0 = time.perf_counter()
+            result = index.add(job['url'], job['title'], job['company'], job['description'])
+            latencies.append((time.perf_counter() - t0) * 1000)
+            flagged += result.is_duplicate
+
+            if i % args.report_every == 0:
+                window = sorted(latencies[-args.report_every:])
+                print(f"{i:>8} jobs  p50={percentile(window, 50):.2f}ms  "
+                      f"p95={percentile(window, 95):.2f}ms  p99={percentile(window, 99):.2f}ms")
+
+        elapsed = time.perf_counter() - start
+        index.close()
+
+    ordered = sorted(latencies)
+    print("=" * 60)
+    print(f"Inserted {args.jobs} jobs in {elapsed:.1f}s ({args.jobs / elapsed:.0f} inserts/s)")
+    print(f"Overall p50={percentile(ordered, 50):.2f}ms  p95={percentile(ordered, 95):.2f}ms")
+    print(f"Flagged as duplicates: {flagged}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+"""
+Full-table DynamoDB scans: single full-item scan vs parallel, projected and COUNT scans.
+
+The baseline is what get_job_count_by_source used to do: one sequential
+scan of full items (descriptions included) collected into a list, then
+counted. The other rows run the current DynamoDatabase methods at several
+segment counts. Wall time and consumed read capacity are reported; expect
+capacity to stay about the same (DynamoDB charges scans by item size read,
+whatever is returned) while wall time and transfer drop.
+
+Runs against DynamoDB Local (docker run -p 8000:8000 amazon/dynamodb-local);
+a throwaway table is created and deleted.
+
+Usage:
+    python benchmarks/bench_dynamodb_scans.py --endpoint http://localhost:8000 --jobs 20000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# DynamoDB Local accepts any credentials
+os.environ.setdefault('AWS_ACCESS_KEY_ID', 'local')
+os.environ.setdefault('AWS_SECRET_ACCESS_KEY', 'local')
+
+from src.database.dynamodb import DynamoDatabase, JobModel
+from src.metrics import metrics
+
+CAPACITY = 'dynamodb_consumed_capacity_total'
+
+
+def populate(n: int, seed: int):
+    """Batch-write n jobs with ~2 KB descriptions."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    description = "Build and operate services. " * 80
+    with JobModel.batch_write() as batch:
+        for i in range(n):
+            batch.save(JobModel(
+                url=f'https://www.indeed.com/viewjob?jk={i:012x}', id=i, title=f'Engineer {i}',
+                company=f'Company {rng.randrange(500)}', board_source=rng.choice(['indeed', 'linkedin']),
+                status=rng.choice(['active'] * 9 + ['expired']), description=description,
+                posted_date=now - timedelta(days=rng.randint(0, 60))))
+
+
+def measure(fn):
+    """Return (seconds, consumed capacity units, result)."""
+    before = sum(metrics.counters.get(CAPACITY, {}).values())
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    return elapsed, sum(metrics.counters.get(CAPACITY, {}).values()) - before, result
+
+
+def report(label: str, elapsed: float, units: float):
+    print(f"  {label:<46} {elapsed:7.2f}s  {units:10,.1f} RCU")
+
+
+def baseline(db: DynamoDatabase):
+    """Sequential full-item scan into a list, counted afterwards (the old get_job_count_by_source)."""
+    jobs = [job for _, page, _, _ in db._scan_segments(segments=1, operation='baseline') for job in page]
+    stats = {}
+    for job in jobs:
+        by_status = stats.setdefault(job.board_source, {})
+        by_status[job.status] = by_status.get(job.status, 0) + 1
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--endpoint', default='http://localhost:8000', help='DynamoDB Local endpoint')
+    parser.add_argument('--jobs', type=int, default=20000, help='Jobs in the throwaway table')
+    parser.add_argument('--segments', type=int, nargs='+', default=[1, 4, 8], help='Segment counts to compare')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    table_name = f'bench-jobs-{uuid.uuid4().hex[:8]}'
+    db = DynamoDatabase(table_name=table_name, runs_table_name=f'{table_name}-runs', host=args.endpoint)
+    JobModel.create_table(read_capacity_units=1000, write_capacity_units=1000, wait=True)
+    try:
+        populate(args.jobs, args.seed)
+        print(f"{args.jobs} jobs in {table_name} at {args.endpoint}")
+
+        elapsed, units, expected = measure(lambda: baseline(db))
+        report("count by source: full items, 1 segment", elapsed, units)
+        for segments in args.segments:
+            db.scan_segments = segments
+            elapsed, units, stats = measure(db.get_job_count_by_source)
+            assert stats == expected
+            report(f"count by source: projected, {segments} segments", elapsed, units)
+
+        since = datetime.utcnow() - timedelta(days=7)
+        db.scan_segments = 1
+        elapsed, units, jobs = measure(lambda: db.get_jobs_since(since))
+        report("jobs this week: len(full items), 1 segment", elapsed, units)
+        for segments in args.segments:
+            db.scan_segments = segments
+            elapsed, units, count = measure(lambda: db.count_jobs('active', since=since))
+            assert count == len(jobs)
+            report(f"jobs this week: Select=COUNT, {segments} segments", elapsed, units)
+    finally:
+        JobModel.delete_table()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python
+"""
+End-to-end scraping throughput (jobs/minute) against the local mock job board.
+
+Starts benchmarks/mock_board.py in-process, then runs the full scraper
+(`python src/main.py`: browser, card extraction, detail pages, parsing,
+dedupe, database) pointed at it via INDEED_SITE_URL/LINKEDIN_SITE_URL,
+once per combination of the concurrency settings:
+
+    --parse-workers   PARSE_WORKERS of each scraper process
+    --processes       Scraper processes running at the same time, each with
+                      its own share of the searches and its own working
+                      directory (as separate scheduled tasks would)
+
+Each run starts from empty databases and caches. Throughput is jobs
+scraped (run report totals) per wall-clock minute across all processes;
+the mock board's counters give detail pages served and blocked. Human-like
+pauses are scaled by --delay-scale (0 by default, so the numbers measure
+the pipeline rather than the sleeps). Needs the Playwright Chromium and
+Chrome/chromedriver installs the scrapers use.
+
+Usage:
+    python benchmarks/bench_end_to_end.py --searches 4 --parse-workers 0 2 --processes 1 2
+    python benchmarks/bench_end_to_end.py --latency 0.3 --jitter 0.5 --block-rate 0.05 --boards indeed
+"""
+import argparse
+import itertools
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_board import MockJobBoard, start_server
+
+MAIN = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src', 'main.py')
+QUERIES = ['software engineer', 'python developer', 'data engineer', 'backend engineer', 'frontend developer',
+           'devops engineer', 'machine learning engineer', 'site reliability engineer']
+LOCATIONS = ['Remote', 'New York, NY', 'Austin, TX']
+
+
+def build_searches(count: int, boards):
+    """`count` distinct query|location|board entries for the SEARCHES setting."""
+    pairs = itertools.product(LOCATIONS, QUERIES)
+    return [f'{query}|{location}|{board}' for location, query in itertools.islice(pairs, count) for board in boards]
+
+
+def run_processes(origin: str, searches, processes: int, parse_workers: int, delay_scale: float, workdir: str):
+    """Run `processes` scrapers at once over the searches; returns (seconds, per-process reports)."""
+    running = []
+    for n in range(processes):
+        share = searches[n::processes]
+        if not share:
+            continue
+        cwd = os.path.join(workdir, f'process-{n}')
+        os.makedirs(cwd)
+        env = {
+            **os.environ,
+            'INDEED_SITE_URL': origin,
+            'LINKEDIN_SITE_URL': origin,
+            'SCRAPER_DELAY_SCALE': str(delay_scale),
+            'SEARCHES': ';'.join(share),
+            'PARSE_WORKERS': str(parse_workers),
+            'DATABASE_TYPE': 'sqlite',
+            'DATABASE_PATH': os.path.join(cwd, 'jobs.db'),
+            'METRICS_REPORT_PATH': os.path.join(cwd, 'run_report.json'),
+            'PAGE_CACHE_ENABLED': 'false',
+            'NOTIFY_ON_NEW_JOBS': 'false',
+            'SNAPSHOT_DIR': '',
+            'SNAPSHOT_S3_BUCKET': '',
+        }
+        log = open(os.path.join(cwd, 'output.log'), 'w')
+        running.append((cwd, log, subprocess.Popen([sys.executable, MAIN], cwd=cwd, env=env,
+                                                   stdout=log, stderr=subprocess.STDOUT)))
+
+    start = time.perf_counter()
+    for _, _, process in running:
+        process.wait()
+    seconds = time.perf_counter() - start
+
+    reports = []
+    for cwd, log, process in running:
+        log.close()
+        report_path = os.path.join(cwd, 'run_report.json')
+        if process.returncode != 0 or not os.path.exists(report_path):
+            with open(os.path.join(cwd, 'output.log')) as f:
+                tail = f.read()[-600:]
+            print(f"  scraper process failed (exit {process.returncode}):\n{tail}")
+            continue
+        with open(report_path) as f:
+            reports.append(json.load(f))
+    return seconds, reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--searches', type=int, default=4, help='Distinct query/location pairs (run on each board)')
+    parser.add_argument('--boards', nargs='+', default=['indeed', 'linkedin'], choices=['indeed', 'linkedin'])
+    parser.add_argument('--parse-workers', type=int, nargs='+', default=[0, 2])
+    parser.add_argument('--processes', type=int, nargs='+', default=[1, 2])
+    parser.add_argument('--delay-scale', type=float, default=0.0, help='SCRAPER_DELAY_SCALE for the scrapers')
+    parser.add_argument('--latency', type=float, default=0.1, help='Mock board seconds per response')
+    parser.add_argument('--jitter', type=float, default=0.1)
+    parser.add_argument('--pages', type=int, default=3, help='Mock board result pages per search')
+    parser.add_argument('--salary-fraction', type=float, default=0.55)
+    parser.add_argument('--block-rate', type=float, default=0.0)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    board = MockJobBoard(seed=args.seed, pages=args.pages, latency=args.latency, jitter=args.jitter,
+                         salary_fraction=args.salary_fraction, block_rate=args.block_rate)
+    server = start_server(board)
+    origin = f'http://127.0.0.1:{server.server_address[1]}'
+    searches = build_searches(args.searches, args.boards)
+    print(f"Mock board at {origin}: {args.latency:.2f}s + up to {args.jitter:.2f}s per response, "
+          f"block rate {args.block_rate:.0%}; {len(searches)} searches")
+    print(f"  {'parse workers':>13}{'processes':>11}{'jobs':>7}{'new':>7}{'details':>9}{'blocked':>9}"
+          f"{'seconds':>10}{'jobs/min':>10}")
+
+    try:
+        for parse_workers, processes in itertools.product(args.parse_workers, args.processes):
+            before = board.stats()
+            with tempfile.TemporaryDirectory() as workdir:
+                seconds, reports = run_processes(origin, searches, processes, parse_workers, args.delay_scale, workdir)
+            served = board.stats()
+
+            def served_since(suffix):
+                return sum(count - before.get(name, 0) for name, count in served.items() if name.endswith(suffix))
+
+            scraped = sum(report['totals']['scraped'] for report in reports)
+            new = sum(report['totals']['new'] for report in reports)
+            print(f"  {parse_workers:>13}{processes:>11}{scraped:>7}{new:>7}{served_since('_detail'):>9}"
+                  f"{served_since('_blocked'):>9}{seconds:>10.1f}{scraped / seconds * 60:>10.1f}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
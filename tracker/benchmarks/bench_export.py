@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+Export throughput and peak memory per format on a synthetic SQLite history.
+
+Each format is exported with chunked streaming; peak Python memory
+(tracemalloc) is compared with loading every job as an ORM object first,
+which is what an unchunked export would do. Peak memory should track the
+chunk / row-group size, not the table size.
+
+Usage:
+    python benchmarks/bench_export.py --jobs 200000 --chunk-size 1000
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.db import Database
+from src.database.models import Job
+from src.tracker.export import export_jobs
+
+
+def populate(db: Database, n: int, seed: int):
+    """Bulk-insert n jobs with ~2 KB descriptions."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    description = "Build and operate services. " * 80
+    batch = []
+    with db.engine.begin() as conn:
+        for i in range(n):
+            batch.append({
+                'title': f'Engineer {i}', 'company': f'Company {rng.randrange(5000)}',
+                'url': f'https://www.indeed.com/viewjob?jk={i:012x}', 'board_source': rng.choice(['indeed', 'linkedin']),
+                'location': 'Remote', 'status': 'active', 'posted_date': now - timedelta(days=rng.randint(0, 365)),
+                'description': description, 'salary_min': rng.randint(60, 220) * 1000, 'salary_period': 'yearly',
+                'created_at': now, 'updated_at': now, 'is_duplicate': False, 'applied': False,
+            })
+            if len(batch) == 10000:
+                conn.execute(Job.__table__.insert(), batch)
+                batch = []
+        if batch:
+            conn.execute(Job.__table__.insert(), batch)
+
+
+def measure(fn):
+    """Return (seconds, peak traced MB, result)."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = fn()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] / 1024 / 1024
+    tracemalloc.stop()
+    return elapsed, peak, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=200000, help='Jobs in the synthetic history')
+    parser.add_argument('--chunk-size', type=int, default=1000, help='Rows per database round trip')
+    parser.add_argument('--row-group-size', type=int, default=50000, help='Rows per Parquet row group')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(os.path.join(tmpdir, 'jobs.db'))
+        db.create_tables()
+        populate(db, args.jobs, args.seed)
+        print(f"{args.jobs} jobs, chunk size {args.chunk_size}, row group size {args.row_group_size}")
+
+        elapsed, peak, jobs = measure(lambda: db.get_jobs_by_status('active'))
+        print(f"  load all as ORM objects   {elapsed:6.1f}s  peak {peak:7.1f} MB  (no file written)")
+        del jobs
+
+        formats = [('csv', 'jobs.csv'), ('jsonl', 'jobs.jsonl.gz')]
+        try:
+            import pyarrow  # noqa: F401
+            formats.append(('parquet', 'jobs.parquet'))
+        except ImportError:
+            print("  (pyarrow not installed: skipping Parquet)")
+        for fmt, name in formats:
+            path = os.path.join(tmpdir, name)
+            elapsed, peak, stats = measure(lambda: export_jobs(
+                db, path, fmt, chunk_size=args.chunk_size, row_group_size=args.row_group_size))
+            print(f"  {fmt:<8} {name:<16} {elapsed:6.1f}s  peak {peak:7.1f} MB  "
+                  f"{stats['rows'] / elapsed:9,.0f} rows/s  {os.path.getsize(path) / 1024 / 1024:7.1f} MB file")
+        db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python
+"""
+Email digest delivery throughput against a local SMTP sink (aiosmtpd).
+
+Compares opening a fresh SMTP connection per message with reusing one
+connection, and measures how long the caller is blocked when digests are
+queued for background delivery instead.
+
+Requires aiosmtpd (pip install aiosmtpd); nothing leaves the machine.
+
+Usage:
+    python benchmarks/bench_notifier.py --messages 200 --jobs 25
+"""
+import argparse
+import io
+import os
+import socket
+import sys
+import time
+from contextlib import redirect_stdout
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.notifications.email_notifier import EmailNotifier
+
+
+class CountingHandler:
+    """aiosmtpd handler that accepts and counts messages."""
+
+    def __init__(self):
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        return '250 OK'
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def sample_jobs(n):
+    return [{'title': f'Software Engineer {i}', 'company': f'Company {i % 7}', 'location': 'Remote',
+             'salary_min': 120000 + i * 1000, 'salary_max': 160000 + i * 1000, 'salary_period': 'yearly',
+             'url': f'https://www.indeed.com/viewjob?jk={i:016x}', 'board_source': 'indeed'} for i in range(n)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=200, help='Digests to deliver per mode')
+    parser.add_argument('--jobs', type=int, default=25, help='Jobs per digest')
+    args = parser.parse_args()
+
+    try:
+        from aiosmtpd.controller import Controller
+    except ImportError:
+        sys.exit("aiosmtpd is required: pip install aiosmtpd")
+
+    handler = CountingHandler()
+    port = free_port()
+    controller = Controller(handler, hostname='127.0.0.1', port=port)
+    controller.start()
+    jobs = sample_jobs(args.jobs)
+    recipients = [f'user{i}@example.com' for i in range(args.messages)]
+
+    def new_notifier():
+        return EmailNotifier('127.0.0.1', port, 'tracker@example.com', '', use_tls=False)
+
+    try:
+        print(f"{args.messages} digests of {args.jobs} jobs to 127.0.0.1:{port}")
+
+        notifier = new_notifier()
+        start = time.perf_counter()
+        for recipient in recipients:
+            notifier.send_notification(recipient, jobs)
+            notifier.close()  # force a new connection for every message
+        per_message = time.perf_counter() - start
+        print(f"  connection per message  {args.messages / per_message:8.0f} msgs/s")
+
+        notifier = new_notifier()
+        start = time.perf_counter()
+        for recipient in recipients:
+            notifier.send_notification(recipient, jobs)
+        notifier.close()
+        reused = time.perf_counter() - start
+        print(f"  reused connection       {args.messages / reused:8.0f} msgs/s  "
+              f"({per_message / reused:.1f}x)")
+
+        notifier = new_notifier()
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            for recipient in recipients:
+                notifier.enqueue(recipient, jobs)
+            blocked = time.perf_counter() - start
+            notifier.close()
+        total = time.perf_counter() - start
+        print(f"  background queue        {args.messages / total:8.0f} msgs/s, "
+              f"caller blocked {blocked * 1000:.1f} ms total "
+              f"({notifier.report()['connections']} connections)")
+    finally:
+        controller.stop()
+
+    expected = args.messages * 3
+    if handler.received != expected:
+        print(f"WARNING: sink received {handler.received} of {expected} messages")
+
+
+if __name__ == '__main__':
+    main()
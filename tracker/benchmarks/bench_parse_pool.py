@@ -0,0 +1,101 @@
+#!/usr/bin/env python
+"""
+Detail pages per minute with HTML parsing inline vs in a ParsePool.
+
+Each "page load" sleeps for --nav-ms (the browser doing network and
+rendering work, during which Python is idle) and returns a synthetic Indeed
+detail page of realistic size. Inline, every page is parsed before the next
+navigation starts; with workers, parsing overlaps the next navigation.
+The randomized human delays between pages are excluded.
+
+Usage:
+    python benchmarks/bench_parse_pool.py --pages 60 --workers 1 2 4
+    python benchmarks/bench_parse_pool.py --nav-ms 0   # parsing throughput only
+"""
+import argparse
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scrapers.indeed_scraper import IndeedScraper
+from src.scrapers.parse_pool import ParsePool
+
+
+def detail_page(i: int, filler_blocks: int) -> str:
+    """A detail page shaped like Indeed's: lots of layout markup around the fields we read."""
+    filler = ''.join(
+        f'<div class="css-{j % 97}x"><span class="e1wnkr790">Related job {j}</span>'
+        f'<a href="/rc/clk?jk={i}{j}">Similar role {j}</a><ul><li>Perk {j}</li><li>Team {j}</li></ul></div>'
+        for j in range(filler_blocks)
+    )
+    description = ''.join(f'<p>Responsibility {k} for role {i}: build and operate services.</p>'
+                          for k in range(40))
+    return (f'<html><head><title>Job {i}</title></head><body>{filler}'
+            f'<div id="salaryInfoAndJobType"><span>${100 + i % 50},000 - ${150 + i % 50},000 a year</span></div>'
+            f'<div id="jobDescriptionText">{description}</div>{filler}</body></html>')
+
+
+class SimulatedScraper(IndeedScraper):
+    """Indeed scraper whose browser is replaced by a fixed navigation delay."""
+
+    DETAIL_DELAY = (0, 0)
+    nav_seconds = 0.0
+    pages = {}
+
+    def fetch_detail_html(self, basic_info):
+        time.sleep(self.nav_seconds)
+        return self.pages[basic_info['url']]
+
+
+def run(workers: int, basics, repeat: int):
+    """Return (best pages/min, jobs) for one pool size."""
+    pool = ParsePool(workers=workers)
+    best = 0.0
+    jobs = []
+    try:
+        for _ in range(repeat):
+            scraper = SimulatedScraper('software engineer', 'Remote', parse_pool=pool)
+            with redirect_stdout(io.StringIO()):
+                start = time.perf_counter()
+                jobs = scraper.fetch_details_pipelined(basics)
+                elapsed = time.perf_counter() - start
+            best = max(best, len(basics) / elapsed * 60)
+    finally:
+        pool.close()
+    return best, jobs
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pages', type=int, default=60, help='Detail pages per run')
+    parser.add_argument('--nav-ms', type=float, default=150, help='Simulated browser time per page')
+    parser.add_argument('--filler', type=int, default=400, help='Layout blocks per page (page size)')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4], help='Pool sizes to compare')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per configuration (best is reported)')
+    args = parser.parse_args()
+
+    SimulatedScraper.nav_seconds = args.nav_ms / 1000
+    SimulatedScraper.pages = {f'https://www.indeed.com/viewjob?jk={i}': detail_page(i, args.filler)
+                              for i in range(args.pages)}
+    basics = [{'title': f'Job {i}', 'company': 'Acme', 'location': 'Remote', 'url': url}
+              for i, url in enumerate(SimulatedScraper.pages)]
+    size_kb = sum(len(html) for html in SimulatedScraper.pages.values()) / len(basics) / 1024
+
+    print(f"{args.pages} pages of ~{size_kb:.0f} KB, {args.nav_ms:.0f} ms simulated navigation, "
+          f"{os.cpu_count()} CPUs")
+    baseline, baseline_jobs = run(0, basics, args.repeat)
+    print(f"  inline        {baseline:8.0f} pages/min")
+    for workers in args.workers:
+        rate, jobs = run(workers, basics, args.repeat)
+        print(f"  {workers} worker(s)   {rate:8.0f} pages/min  ({rate / baseline:.2f}x)")
+        if [job['description'] for job in jobs] != [job['description'] for job in baseline_jobs]:
+            print("  WARNING: pooled parsing returned different jobs")
+
+
+if __name__ == '__main__':
+    main()
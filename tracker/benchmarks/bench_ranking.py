@@ -0,0 +1,97 @@
+#!/usr/bin/env python
+"""
+Relevance scoring latency on a synthetic index of job descriptions.
+
+Builds a RelevanceIndex of --jobs synthetic jobs (in a temporary file), then
+times scoring every job against a candidate profile: once with all rows
+merged into the sorted postings, and once with --tail jobs still in the
+unsorted tail, as after a run's incremental inserts.
+
+Usage:
+    python benchmarks/bench_ranking.py --jobs 100000 --repeat 20
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.tracker.ranking import CandidateProfile, RelevanceIndex
+
+WORDS = (
+    "python java go rust backend frontend platform data cloud aws docker kubernetes "
+    "api services design build scale team product mentor lead senior remote hybrid "
+    "postgres redis kafka spark ml pipelines testing ci cd security reliability "
+    "customers growth startup enterprise equity benefits salary health vacation "
+    "react typescript django flask terraform linux networking observability analytics"
+).split()
+TITLES = ["Software Engineer", "Backend Engineer", "Data Engineer", "Platform Engineer",
+          "Frontend Developer", "ML Engineer", "Site Reliability Engineer", "Registered Nurse",
+          "Account Executive", "Product Manager"]
+
+
+def synthetic_job(rng: random.Random, i: int) -> dict:
+    """Generate one synthetic job with a random description and salary."""
+    return {
+        'url': f"https://www.indeed.com/viewjob?jk={i:012x}",
+        'title': rng.choice(TITLES),
+        'description': ' '.join(rng.choice(WORDS) for _ in range(rng.randint(80, 200))),
+        'salary_max': rng.choice([None, rng.randint(60, 250) * 1000]),
+        'salary_period': 'yearly',
+    }
+
+
+def time_scoring(index: RelevanceIndex, profile: CandidateProfile, repeat: int):
+    """Return sorted per-call latencies (ms) of scoring and ranking every job."""
+    index.rank(profile, limit=20)  # warm-up
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        index.rank(profile, limit=20)
+        latencies.append((time.perf_counter() - start) * 1000)
+    return sorted(latencies)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=100000, help='Jobs in the index')
+    parser.add_argument('--tail', type=int, default=200, help='Jobs left unmerged for the incremental case')
+    parser.add_argument('--repeat', type=int, default=20, help='Scoring calls to time')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    jobs = [synthetic_job(rng, i) for i in range(args.jobs + args.tail)]
+    profile = CandidateProfile(skills=['python', 'aws', 'kubernetes', 'postgres', 'terraform'],
+                               titles=['Backend Engineer', 'Platform Engineer'], min_salary=150000)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        index = RelevanceIndex(os.path.join(tmpdir, 'ranking.db'))
+        start = time.perf_counter()
+        for i in range(0, args.jobs, 5000):
+            index.add_jobs(jobs[i:i + 5000])
+        index._merge()
+        build = time.perf_counter() - start
+        print(f"Indexed {len(index)} jobs in {build:.1f}s ({len(index._feats) / len(index):.0f} features/job)")
+
+        latencies = time_scoring(index, profile, args.repeat)
+        print(f"  merged      median {statistics.median(latencies):7.2f} ms   max {latencies[-1]:7.2f} ms")
+
+        index.add_jobs(jobs[args.jobs:])
+        latencies = time_scoring(index, profile, args.repeat)
+        print(f"  +{args.tail} tail   median {statistics.median(latencies):7.2f} ms   max {latencies[-1]:7.2f} ms")
+
+        start = time.perf_counter()
+        reopened = RelevanceIndex(os.path.join(tmpdir, 'ranking.db'))
+        print(f"  reopen (load + sort)  {(time.perf_counter() - start) * 1000:.0f} ms")
+        reopened.close()
+        index.close()
+
+
+if __name__ == '__main__':
+    main()
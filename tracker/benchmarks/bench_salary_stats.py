@@ -0,0 +1,109 @@
+#!/usr/bin/env python
+"""
+Salary analytics on a synthetic SQLite history: ORM loop vs projection + NumPy.
+
+The baseline loads every active job as an ORM object (descriptions
+included) and computes per-company percentiles in Python, which is what a
+straightforward `show_stats`-style implementation would do. The projection
+path is what the `salaries` command runs: a column-only query, NumPy
+annualization and vectorized group percentiles. The cached path is a repeat
+call with no new jobs.
+
+Usage:
+    python benchmarks/bench_salary_stats.py --jobs 200000 --companies 2000
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.db import Database
+from src.database.models import Job
+from src.tracker.ranking import YEARLY_FACTORS
+from src.tracker.salary_stats import cached_salary_report
+
+
+def populate(db: Database, n: int, companies: int, seed: int):
+    """Bulk-insert n jobs, about two thirds of them with a salary."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    description = "Build and operate services. " * 80
+    rows = []
+    for i in range(n):
+        period = rng.choice(['yearly', 'yearly', 'yearly', 'hourly', None])
+        low = rng.randint(60, 220) * 1000 if period != 'hourly' else rng.randint(25, 110)
+        has_salary = rng.random() < 0.66
+        rows.append({
+            'title': f'Engineer {i}', 'company': f'Company {rng.randrange(companies)}',
+            'url': f'https://www.indeed.com/viewjob?jk={i:012x}', 'board_source': rng.choice(['indeed', 'linkedin']),
+            'location': rng.choice(['Remote', 'New York, NY', 'Austin, TX']), 'status': 'active',
+            'posted_date': now - timedelta(days=rng.randint(0, 365)), 'description': description,
+            'salary_min': low if has_salary else None,
+            'salary_max': int(low * 1.25) if has_salary else None,
+            'salary_period': period if has_salary else None,
+        })
+    with db.engine.begin() as conn:
+        conn.execute(Job.__table__.insert(), rows)
+
+
+def orm_baseline(db: Database):
+    """Per-company quartiles by iterating ORM objects."""
+    by_company = {}
+    for job in db.get_jobs_by_status('active'):
+        if not job.salary_min and not job.salary_max:
+            continue
+        low, high = job.salary_min or job.salary_max, job.salary_max or job.salary_min
+        by_company.setdefault(job.company, []).append(
+            (low + high) / 2 * YEARLY_FACTORS.get(job.salary_period or 'yearly', 1))
+    return {company: statistics.quantiles(values, n=4) for company, values in by_company.items()
+            if len(values) >= 3}
+
+
+def timed(fn, repeat):
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=200000, help='Jobs in the synthetic history')
+    parser.add_argument('--companies', type=int, default=2000, help='Distinct companies')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per path (best is reported)')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(os.path.join(tmpdir, 'jobs.db'))
+        db.create_tables()
+        populate(db, args.jobs, args.companies, args.seed)
+        cache_path = os.path.join(tmpdir, 'salary_cache.json')
+        print(f"{args.jobs} jobs, {args.companies} companies")
+
+        baseline, _ = timed(lambda: orm_baseline(db), args.repeat)
+        print(f"  ORM objects + Python        {baseline:9.1f} ms")
+
+        projected, (report, _) = timed(
+            lambda: cached_salary_report(db, None, group_by='company', min_count=3), args.repeat)
+        print(f"  projection + NumPy          {projected:9.1f} ms  ({baseline / projected:.1f}x, "
+              f"{report['count']} salaries, {len(report['groups'])} companies)")
+
+        cached_salary_report(db, cache_path, group_by='company', min_count=3)
+        cached, (_, hit) = timed(
+            lambda: cached_salary_report(db, cache_path, group_by='company', min_count=3), args.repeat)
+        print(f"  cached (no new jobs)        {cached:9.1f} ms  ({'hit' if hit else 'MISS'})")
+        db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
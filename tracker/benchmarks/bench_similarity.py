@@ -0,0 +1,131 @@
+#!/usr/bin/env python
+"""
+Similarity index build time and query latency on synthetic jobs.
+
+Fits the hashing + SVD model on a sample (reporting its peak traced
+memory), embeds --jobs jobs into the memory-mapped matrix, then times
+single-job queries from a freshly opened index (what the `similar` command
+pays), batched queries, and queries that only probe the nearest clusters
+(with their recall against the exact scan).
+
+Jobs come from benchmarks/synthetic.py by default: posting-length
+descriptions of real sentences, so the sparse matrix has as many entries
+per job as scraped jobs do. `--vocabulary topics` uses short descriptions
+drawn from a few dozen words per topic, which cluster cleanly but
+understate the fit's cost.
+
+Usage:
+    python benchmarks/bench_similarity.py --jobs 100000 --queries 50 --probe 4
+    python benchmarks/bench_similarity.py --jobs 20000 --sample 3000 --vocabulary topics
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import JobGenerator
+from src.tracker.similarity import SimilarityIndex
+
+TOPICS = [
+    "python java go backend api services aws docker kubernetes postgres redis kafka microservices",
+    "react typescript css javascript frontend design components accessibility browser ui",
+    "spark ml pipelines data analytics sql warehouse airflow statistics models python",
+    "patient care icu shifts hospital medication clinical charting nursing",
+    "quota pipeline prospecting crm negotiation enterprise customers revenue sales",
+    "terraform linux networking observability reliability incident oncall kubernetes cloud",
+]
+COMMON = "team growth benefits salary health vacation remote hybrid equity culture".split()
+TITLES = ["Backend Engineer", "Frontend Developer", "Data Scientist", "Registered Nurse",
+          "Account Executive", "Site Reliability Engineer"]
+
+
+def synthetic_job(rng: random.Random, i: int) -> dict:
+    """One job drawn mostly from a single topic's vocabulary."""
+    topic = rng.randrange(len(TOPICS))
+    words = TOPICS[topic].split()
+    description = ' '.join(rng.choice(words) if rng.random() < 0.7 else rng.choice(COMMON)
+                           for _ in range(rng.randint(60, 160)))
+    return {'url': f"https://www.indeed.com/viewjob?jk={i:012x}", 'title': TITLES[topic],
+            'description': description}
+
+
+def summary(latencies):
+    latencies = sorted(latencies)
+    return f"median {statistics.median(latencies):7.2f} ms   max {latencies[-1]:7.2f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=100000, help='Jobs in the index')
+    parser.add_argument('--queries', type=int, default=50, help='Query jobs to time')
+    parser.add_argument('--k', type=int, default=10, help='Results per query')
+    parser.add_argument('--probe', type=int, default=4, help='Clusters to probe in the narrowed search')
+    parser.add_argument('--sample', type=int, default=10000, help='Jobs the model is fitted on')
+    parser.add_argument('--vocabulary', choices=['synthetic', 'topics'], default='synthetic',
+                        help='Realistic postings, or short descriptions from per-topic word lists')
+    parser.add_argument('--dims', type=int, default=64)
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    if args.vocabulary == 'synthetic':
+        jobs = list(JobGenerator(seed=args.seed).jobs(args.jobs))
+    else:
+        jobs = [synthetic_job(rng, i) for i in range(args.jobs)]
+    query_keys = [job['url'] for job in rng.sample(jobs, args.queries)]
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'similarity')
+        index = SimilarityIndex(path, dims=args.dims)
+        tracemalloc.start()
+        start = time.perf_counter()
+        index.fit(jobs, sample=args.sample)
+        fitted = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        start = time.perf_counter()
+        for i in range(0, len(jobs), 5000):
+            index.add_jobs(jobs[i:i + 5000])
+        print(f"Fitted model on {min(args.sample, len(jobs))} jobs in {fitted:.1f}s "
+              f"(peak {peak / 1024 / 1024:.0f} MB), indexed {len(index)} jobs in "
+              f"{time.perf_counter() - start:.1f}s "
+              f"({os.path.getsize(os.path.join(path, 'vectors.f32')) / 1024 / 1024:.0f} MB matrix)")
+        index.close()
+
+        latencies, exact = [], {}
+        for key in query_keys:
+            start = time.perf_counter()
+            index = SimilarityIndex(path, dims=args.dims)
+            exact[key] = index.similar(key, k=args.k)
+            index.close()
+            latencies.append((time.perf_counter() - start) * 1000)
+        print(f"  open + query (exact)   {summary(latencies)}")
+
+        index = SimilarityIndex(path, dims=args.dims)
+        queries = [index.vector(key) for key in query_keys]
+        start = time.perf_counter()
+        index.search(queries, k=args.k + 1)
+        batched = (time.perf_counter() - start) * 1000
+        print(f"  batch of {args.queries} (exact)     {batched:7.2f} ms total, {batched / args.queries:.2f} ms/query")
+
+        latencies, recall = [], []
+        for key in query_keys:
+            start = time.perf_counter()
+            probed = index.similar(key, k=args.k, probe=args.probe)
+            latencies.append((time.perf_counter() - start) * 1000)
+            expected = {url for url, _ in exact[key]}
+            recall.append(len(expected & {url for url, _ in probed}) / max(1, len(expected)))
+        print(f"  query (probe {args.probe:>2})       {summary(latencies)}   "
+              f"recall@{args.k} {statistics.mean(recall):.2f}")
+        index.close()
+
+
+if __name__ == '__main__':
+    main()
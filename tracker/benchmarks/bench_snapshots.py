@@ -0,0 +1,106 @@
+#!/usr/bin/env python
+"""
+Dashboard data per request: reading every job vs reading a precomputed snapshot.
+
+The baseline is what /api/stats does today: load every job posted in the
+last year (full items, descriptions included) and aggregate them on each
+request; its transfer is the JSON size of those items. The snapshot rows
+publish one version to a temporary directory, then time what a request
+would do instead: read and decompress stats.json.gz or one jobs page.
+
+Usage:
+    python benchmarks/bench_snapshots.py --jobs 100000 --requests 20
+"""
+import argparse
+import gzip
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.db import Database
+from src.database.models import Job
+from src.tracker.snapshots import LocalSnapshotStore, build_snapshots, publish_snapshots
+
+
+def populate(db: Database, n: int, seed: int):
+    """Bulk-insert n jobs with ~2 KB descriptions posted over the past two years."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    description = "Build and operate services. " * 80
+    rows = []
+    for i in range(n):
+        posted = now - timedelta(seconds=rng.randint(0, 730 * 86400))
+        rows.append({
+            'title': f'Engineer {i}', 'company': f'Company {rng.randrange(2000)}',
+            'url': f'https://www.indeed.com/viewjob?jk={i:012x}', 'board_source': rng.choice(['indeed', 'linkedin']),
+            'location': rng.choice(['Remote', 'New York, NY', 'San Francisco, CA', 'Austin, TX']),
+            'status': 'active', 'posted_date': posted, 'description': description,
+            'salary_min': rng.choice([None, rng.randint(60, 220) * 1000]), 'created_at': posted, 'updated_at': posted,
+        })
+    with db.engine.begin() as conn:
+        conn.execute(Job.__table__.insert(), rows)
+
+
+def full_read(db: Database) -> int:
+    """Load a year of full items and aggregate them, as /api/stats does; returns the bytes moved."""
+    jobs = [row for rows in db.iter_jobs(since=datetime.utcnow() - timedelta(days=365)) for row in rows]
+    sources = {}
+    for job in jobs:
+        sources[job['board_source']] = sources.get(job['board_source'], 0) + 1
+    return len(json.dumps(jobs, default=str))
+
+
+def read_snapshot(path: str) -> int:
+    with open(path, 'rb') as f:
+        body = f.read()
+    json.loads(gzip.decompress(body))
+    return len(body)
+
+
+def timed(fn, repeat: int):
+    """Mean seconds per call and the last result."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = fn()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=100000, help='Jobs in the database')
+    parser.add_argument('--requests', type=int, default=20, help='Requests timed per row')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        db = Database(os.path.join(tmpdir, 'jobs.db'))
+        db.create_tables()
+        populate(db, args.jobs, args.seed)
+        print(f"{args.jobs} jobs")
+
+        seconds, size = timed(lambda: full_read(db), max(1, args.requests // 10))
+        print(f"  per request: read a year of jobs     {seconds * 1000:9.1f} ms  {size / 1024 / 1024:9.1f} MB")
+
+        seconds, _ = timed(lambda: build_snapshots(db), 1)
+        print(f"  once per run: build snapshots        {seconds * 1000:9.1f} ms")
+        store = LocalSnapshotStore(os.path.join(tmpdir, 'snapshots'))
+        seconds, stats = timed(lambda: publish_snapshots(db, store), 1)
+        print(f"  once per run: build + publish        {seconds * 1000:9.1f} ms  {stats['bytes'] / 1024 / 1024:9.1f} MB "
+              f"gzipped ({stats['raw_bytes'] / 1024 / 1024:.1f} MB raw, {stats['files']} files)")
+
+        version_dir = os.path.join(store.directory, stats['version'])
+        for label, name in (('stats', 'stats.json.gz'), ('one jobs page', os.path.join('jobs', 'page-0001.json.gz'))):
+            seconds, size = timed(lambda: read_snapshot(os.path.join(version_dir, name)), args.requests)
+            print(f"  per request: snapshot {label:<14} {seconds * 1000:9.3f} ms  {size / 1024:9.1f} KB")
+        db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+"""
+Benchmark CLI startup time using `python -X importtime`.
+
+Runs a read command (default: stats) against a throwaway SQLite database,
+reports wall time per run, the slowest imports, and whether any heavy
+scrape-only modules (browser stacks, numpy, the unused DB driver) were loaded.
+
+Usage:
+    python benchmarks/bench_startup.py --command stats --runs 5
+"""
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MAIN = os.path.join(ROOT, 'src', 'main.py')
+
+# Top-level packages a read command should never need to import
+HEAVY_MODULES = ('playwright', 'selenium', 'numpy', 'pynamodb', 'botocore')
+
+
+def parse_importtime(stderr: str):
+    """Parse -X importtime output into (module, self_us, cumulative_us, depth) rows."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|')
+        # Nested imports are indented two spaces per level after the single separator space
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        rows.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    return rows
+
+
+def run_once(command, env, importtime=False):
+    """Run the CLI once; return (wall seconds, stderr)."""
+    args = [sys.executable] + (['-X', 'importtime'] if importtime else []) + [MAIN] + command
+    start = time.perf_counter()
+    result = subprocess.run(args, env=env, cwd=ROOT, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(command)} failed:\n{result.stderr[-2000:]}")
+    return elapsed, result.stderr
+
+
+def main():
+    parser = argparse.ArgumentParser(description='CLI startup benchmark')
+    parser.add_argument('--command', default='stats', help='CLI command to run (list, search, stats, runs)')
+    parser.add_argument('--keyword', default='python', help='Keyword for the search command')
+    parser.add_argument('--runs', type=int, default=5, help='Number of timed runs')
+    parser.add_argument('--top', type=int, default=15, help='Show the N slowest imports')
+    args = parser.parse_args()
+
+    command = [args.command] + (['--keyword', args.keyword] if args.command == 'search' else [])
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        env = {**os.environ, 'DATABASE_TYPE': 'sqlite', 'DATABASE_PATH': os.path.join(tmpdir, 'jobs.db')}
+
+        # Warm-up run creates the database and fills the OS/bytecode caches
+        run_once(command, env)
+        timings = sorted(run_once(command, env)[0] for _ in range(args.runs))
+        _, stderr = run_once(command, env, importtime=True)
+
+    rows = parse_importtime(stderr)
+    top_level = [row for row in rows if row[3] == 0]
+    total_ms = sum(row[1] for row in rows) / 1000
+    loaded_heavy = sorted({row[0].split('.')[0] for row in rows} & set(HEAVY_MODULES))
+
+    print(f"Command: main.py {' '.join(command)}")
+    print(f"Wall time over {args.runs} runs: min={timings[0] * 1000:.0f}ms  "
+          f"median={timings[len(timings) // 2] * 1000:.0f}ms  max={timings[-1] * 1000:.0f}ms")
+    print(f"Total import time: {total_ms:.0f}ms across {len(rows)} modules")
+    print(f"Heavy modules loaded: {', '.join(loaded_heavy) if loaded_heavy else 'none'}")
+    print("\nSlowest top-level imports (cumulative):")
+    for name, _, cumulative_us, _ in sorted(top_level, key=lambda row: row[2], reverse=True)[:args.top]:
+        print(f"  {cumulative_us / 1000:>8.1f}ms  {name}")
+
+
+if __name__ == "__main__":
+    main()
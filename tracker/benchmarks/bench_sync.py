@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+"""
+Sync throughput on synthetic SQLite databases: per-row copy vs batched full vs incremental.
+
+The per-row baseline is what a one-off script would do (add_job() per
+job, one transaction each), timed on a sample and reported as rows/s. The
+full sync copies every job in batched upserts; the incremental sync runs
+after a fraction of the jobs changed and reads only those through the
+updated_at index.
+
+Usage:
+    python benchmarks/bench_sync.py --jobs 100000 --changed 0.01
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import update
+
+from src.database.db import Database
+from src.database.models import Job
+from src.database.sync import sync_jobs
+
+
+def populate(db: Database, n: int, seed: int):
+    """Bulk-insert n jobs with ~2 KB descriptions, last updated over the past year."""
+    rng = random.Random(seed)
+    now = datetime.utcnow()
+    description = "Build and operate services. " * 80
+    rows = []
+    for i in range(n):
+        updated = now - timedelta(seconds=rng.randint(86400, 365 * 86400))
+        rows.append({
+            'title': f'Engineer {i}', 'company': f'Company {rng.randrange(5000)}',
+            'url': f'https://www.indeed.com/viewjob?jk={i:012x}', 'board_source': rng.choice(['indeed', 'linkedin']),
+            'location': 'Remote', 'status': 'active', 'posted_date': updated, 'description': description,
+            'salary_min': rng.randint(60, 220) * 1000, 'created_at': updated, 'updated_at': updated,
+        })
+    with db.engine.begin() as conn:
+        conn.execute(Job.__table__.insert(), rows)
+
+
+def per_row_copy(source: Database, target: Database, sample: int):
+    """Copy the first `sample` jobs with one add_job() each; returns rows/s."""
+    jobs = next(source.iter_jobs(chunk_size=sample))
+    start = time.perf_counter()
+    for job in jobs:
+        target.add_job(**{column: job[column] for column in (
+            'title', 'company', 'url', 'board_source', 'location', 'posted_date', 'description', 'salary_min')})
+    return len(jobs) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--jobs', type=int, default=100000, help='Jobs in the source database')
+    parser.add_argument('--changed', type=float, default=0.01, help='Fraction of jobs changed before the incremental sync')
+    parser.add_argument('--chunk-size', type=int, default=1000, help='Rows per batch')
+    parser.add_argument('--sample', type=int, default=2000, help='Jobs copied by the per-row baseline')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        source, target, scratch = (Database(os.path.join(tmpdir, name)) for name in ('source.db', 'target.db', 'scratch.db'))
+        for db in (source, target, scratch):
+            db.create_tables()
+        populate(source, args.jobs, args.seed)
+        checkpoint_path = os.path.join(tmpdir, 'sync_checkpoint.json')
+        print(f"{args.jobs} jobs, chunk size {args.chunk_size}")
+
+        rate = per_row_copy(source, scratch, args.sample)
+        print(f"  per-row add_job() copy     {args.jobs / rate:7.1f}s  {rate:9,.0f} rows/s  (estimated from {args.sample})")
+
+        stats = sync_jobs(source, target, checkpoint_path, 'bench', chunk_size=args.chunk_size)
+        print(f"  full sync                  {stats['seconds']:7.1f}s  {stats['rows'] / stats['seconds']:9,.0f} rows/s")
+
+        rng = random.Random(args.seed)
+        changed = rng.sample(range(1, args.jobs + 1), int(args.jobs * args.changed))
+        with source.engine.begin() as conn:
+            conn.execute(update(Job).where(Job.id.in_(changed)).values(status='expired', updated_at=datetime.utcnow()))
+
+        stats = sync_jobs(source, target, checkpoint_path, 'bench', chunk_size=args.chunk_size)
+        print(f"  incremental sync           {stats['seconds']:7.1f}s  {stats['rows']:9,} rows copied  "
+              f"({len(changed)} changed)")
+        for db in (source, target, scratch):
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    main()
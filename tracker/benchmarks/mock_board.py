@@ -0,0 +1,357 @@
+#!/usr/bin/env python
+"""
+Local mock job board serving Indeed- and LinkedIn-shaped pages.
+
+Search and detail pages are rendered from templates that carry the markup
+the scrapers select on (.job_seen_beacon cards, #jobDescriptionText and
+#salaryInfoAndJobType on Indeed; .base-card cards, the show-more-less
+description and compensation block on LinkedIn) plus a JSON-LD
+JobPosting, filled with synthetic jobs (benchmarks/synthetic.py). A job's
+content is a function of its id, so a card and its detail page always
+agree and repeated runs see the same jobs.
+
+Both boards are served from one origin; their paths do not overlap:
+
+    /jobs?q=&l=&start=         Indeed search (links to /rc/clk?jk=...)
+    /viewjob?jk=, /rc/clk?jk=  Indeed detail
+    /jobs/search?keywords=&location=&start=
+                               LinkedIn search
+    /jobs/view/<slug>-<id>     LinkedIn detail
+    /stats                     Request counters (JSON)
+
+Point the scrapers at it with INDEED_SITE_URL and LINKEDIN_SITE_URL (and
+SCRAPER_DELAY_SCALE=0 to skip the human-like pauses). Responses can be
+slowed down (--latency, --jitter), searches paginated (--pages), salaries
+shown on a share of jobs (--salary-fraction), and a share of detail pages
+replaced by an "additional verification" block page (--block-rate).
+
+Usage:
+    python benchmarks/mock_board.py --port 8765 --latency 0.2 --block-rate 0.05
+    INDEED_SITE_URL=http://127.0.0.1:8765 LINKEDIN_SITE_URL=http://127.0.0.1:8765 \\
+        SCRAPER_DELAY_SCALE=0 python src/main.py
+"""
+import argparse
+import html
+import json
+import os
+import random
+import re
+import sys
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, quote, urlparse
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.synthetic import JobGenerator
+
+# Job ids of one search: a block of this many ids per (board, query, location)
+SEARCH_BLOCK = 100000
+LINKEDIN_ID_BASE = 4000000000
+
+EMPLOYMENT_TYPES = {'Full-time': 'FULL_TIME', 'Part-time': 'PART_TIME', 'Contract': 'CONTRACTOR',
+                    'Temporary': 'TEMPORARY', 'Internship': 'INTERN'}
+UNIT_TEXT = {'yearly': 'YEAR', 'hourly': 'HOUR', 'monthly': 'MONTH', 'weekly': 'WEEK'}
+PERIOD_WORDS = {'yearly': 'a year', 'hourly': 'an hour', 'monthly': 'a month', 'weekly': 'a week'}
+
+PAGE = """<!DOCTYPE html>
+<html lang="en"><head><meta charset="utf-8"><title>{title}</title>{head}</head>
+<body>{body}</body></html>"""
+
+BLOCK_PAGE = PAGE.format(
+    title="Blocked - Additional Verification Required", head="",
+    body="<h1>Additional Verification Required</h1><p>Please verify you are a human to continue.</p>")
+
+INDEED_CARD = """<div class="job_seen_beacon"><table><tr><td class="resultContent">
+<h2 class="jobTitle"><a href="/rc/clk?jk={jk}&amp;fccid={fccid}&amp;vjs=3" data-jk="{jk}"><span title="{title}">{title}</span></a></h2>
+<div class="company_location"><span data-testid="company-name">{company}</span>
+<div data-testid="text-location">{location}</div></div>
+{salary}</td></tr></table></div>"""
+
+INDEED_DETAIL = """<div class="jobsearch-JobInfoHeader-title-container"><h1>{title}</h1></div>
+<div data-testid="inlineHeader-companyName">{company}</div><div data-testid="inlineHeader-companyLocation">{location}</div>
+<div id="salaryInfoAndJobType">{salary}<span class="css-k5flys"> - {job_type}</span></div>
+<div id="jobDescriptionText" class="jobsearch-jobDescriptionText">{description}</div>"""
+
+LINKEDIN_CARD = """<li><div class="base-card base-search-card job-search-card" data-entity-urn="urn:li:jobPosting:{job_id}">
+<a class="base-card__full-link" href="{origin}/jobs/view/{slug}-{job_id}?refId={ref}&amp;trackingId={ref}&amp;position={position}&amp;pageNum=0"><span class="sr-only">{title}</span></a>
+<div class="base-search-card__info"><h3 class="base-search-card__title">{title}</h3>
+<h4 class="base-search-card__subtitle"><a class="hidden-nested-link" href="{origin}/company/{company_slug}">{company}</a></h4>
+<div class="base-search-card__metadata"><span class="job-search-card__location">{location}</span>
+{salary}<time class="job-search-card__listdate" datetime="{posted}">{posted}</time></div></div></div></li>"""
+
+LINKEDIN_DETAIL = """<section class="top-card-layout"><h1 class="top-card-layout__title">{title}</h1>
+<a class="topcard__org-name-link" href="{origin}/company/{company_slug}">{company}</a>
+<span class="topcard__flavor topcard__flavor--bullet">{location}</span></section>
+{salary}<section class="description"><div class="description__text description__text--rich">
+<div class="show-more-less-html__markup">{description}</div></div></section>
+<ul class="description__job-criteria-list"><li><h3>Employment type</h3><span>{job_type}</span></li></ul>"""
+
+
+def _slug(text: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', text.lower()).strip('-')
+
+
+def _paragraphs(text: str, sentences: int = 3) -> str:
+    """Description text as HTML paragraphs of a few sentences each."""
+    parts = re.split(r'(?<=\.) ', text)
+    return ''.join(f"<p>{html.escape(' '.join(parts[i:i + sentences]))}</p>" for i in range(0, len(parts), sentences))
+
+
+class MockJobBoard:
+    """Synthetic job content and request counters shared by the handler threads."""
+
+    def __init__(self, seed: int = 42, pages: int = 3, jobs_per_page: int = 25, latency: float = 0.0,
+                 jitter: float = 0.0, salary_fraction: float = 0.55, block_rate: float = 0.0,
+                 structured_data: bool = True):
+        """
+        Args:
+            seed: Random seed for job content (the same seed serves the same jobs)
+            pages: Search result pages per search; later pages are empty
+            jobs_per_page: Cards per search page
+            latency: Seconds added to every response
+            jitter: Extra random delay, uniform in [0, jitter] seconds
+            salary_fraction: Share of jobs that show a salary
+            block_rate: Share of detail pages answered with a verification block page
+            structured_data: Embed a JSON-LD JobPosting in detail pages
+        """
+        self.seed = seed
+        self.pages = pages
+        self.jobs_per_page = jobs_per_page
+        self.latency = latency
+        self.jitter = jitter
+        self.block_rate = block_rate
+        self.structured_data = structured_data
+        self.generator = JobGenerator(seed=seed, salary_fraction=salary_fraction)
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {}
+
+    def count(self, name: str):
+        with self.lock:
+            self.counts[name] = self.counts.get(name, 0) + 1
+
+    def stats(self) -> Dict:
+        with self.lock:
+            return dict(self.counts)
+
+    def delay(self):
+        """Sleep the configured latency (in the handler thread, so requests overlap)."""
+        with self.lock:
+            seconds = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0)
+        if seconds > 0:
+            time.sleep(seconds)
+
+    def blocked(self) -> bool:
+        if self.block_rate <= 0:
+            return False
+        with self.lock:
+            return self.rng.random() < self.block_rate
+
+    def job(self, index: int) -> Dict:
+        """Job `index`; its content depends only on the seed and the index."""
+        with self.lock:
+            self.generator.rng.seed(self.seed * 1000003 + index)
+            return self.generator.job(index)
+
+    def search_ids(self, board: str, query: str, location: str, start: int) -> List[int]:
+        """Job ids on the search page starting at result `start` (none past the last page)."""
+        total = self.pages * self.jobs_per_page
+        if start >= total:
+            return []
+        block = zlib.crc32(f'{board}|{query.lower()}|{location.lower()}'.encode()) % 10000
+        first = block * SEARCH_BLOCK + start
+        return list(range(first, first + min(self.jobs_per_page, total - start)))
+
+    @staticmethod
+    def salary_text(job: Dict) -> Optional[str]:
+        """The job's salary as Indeed displays it ("$120,000 - $150,000 a year")."""
+        if job['salary_min'] is None:
+            return None
+        words = PERIOD_WORDS.get(job['salary_period'], 'a year')
+        if job['salary_min'] == job['salary_max']:
+            return f"${job['salary_min']:,} {words}"
+        return f"${job['salary_min']:,} - ${job['salary_max']:,} {words}"
+
+    def json_ld(self, job: Dict) -> str:
+        if not self.structured_data:
+            return ''
+        posting = {
+            '@context': 'https://schema.org/',
+            '@type': 'JobPosting',
+            'title': job['title'],
+            'description': _paragraphs(job['description']),
+            'datePosted': job['posted_date'].strftime('%Y-%m-%dT%H:%M:%S.000Z'),
+            'employmentType': EMPLOYMENT_TYPES.get(job['job_type'], 'OTHER'),
+            'hiringOrganization': {'@type': 'Organization', 'name': job['company']},
+            'jobLocation': {'@type': 'Place', 'address': {'@type': 'PostalAddress', 'addressLocality': job['location']}},
+        }
+        if job['work_mode'] == 'Remote':
+            posting['jobLocationType'] = 'TELECOMMUTE'
+        if job['salary_min'] is not None:
+            posting['baseSalary'] = {'@type': 'MonetaryAmount', 'currency': 'USD', 'value': {
+                '@type': 'QuantitativeValue', 'minValue': job['salary_min'], 'maxValue': job['salary_max'],
+                'unitText': UNIT_TEXT.get(job['salary_period'], 'YEAR')}}
+        return f'<script type="application/ld+json">{json.dumps(posting)}</script>'
+
+    # Indeed
+
+    def indeed_search(self, params: Dict) -> str:
+        query, location = params.get('q', ''), params.get('l', '')
+        start = int(params.get('start') or 0)
+        cards = []
+        for index in self.search_ids('indeed', query, location, start):
+            job = self.job(index)
+            salary = self.salary_text(job)
+            cards.append(INDEED_CARD.format(
+                jk=f'{index:016x}', fccid=f'{zlib.crc32(job["company"].encode()):08x}',
+                title=html.escape(job['title']), company=html.escape(job['company']),
+                location=html.escape(job['location']),
+                salary=f'<div class="salary-snippet-container">{salary}</div>' if salary else ''))
+        if cards:
+            results = f'<div id="mosaic-provider-jobcards"><ul>{"".join(f"<li>{c}</li>" for c in cards)}</ul></div>'
+        else:
+            results = '<div class="jobsearch-NoResult-messageContainer">did not match any jobs</div>'
+        if cards and start + self.jobs_per_page < self.pages * self.jobs_per_page:
+            results += (f'<nav><a data-testid="pagination-page-next" href="/jobs?q={quote(query)}&amp;'
+                        f'l={quote(location)}&amp;start={start + self.jobs_per_page}">Next</a></nav>')
+        return PAGE.format(title=f'{html.escape(query)} Jobs, Employment | Indeed', head='', body=results)
+
+    def indeed_detail(self, params: Dict) -> Optional[str]:
+        try:
+            index = int(params.get('jk', ''), 16)
+        except ValueError:
+            return None
+        job = self.job(index)
+        salary = self.salary_text(job)
+        body = INDEED_DETAIL.format(
+            title=html.escape(job['title']), company=html.escape(job['company']),
+            location=html.escape(job['location']), job_type=job['job_type'],
+            salary=f'<span class="css-19j1a75">{salary}</span>' if salary else '',
+            description=_paragraphs(job['description']))
+        return PAGE.format(title=f'{html.escape(job["title"])} - {html.escape(job["company"])} | Indeed',
+                           head=self.json_ld(job), body=body)
+
+    # LinkedIn
+
+    def linkedin_search(self, params: Dict, origin: str) -> str:
+        query, location = params.get('keywords', ''), params.get('location', '')
+        start = int(params.get('start') or 0)
+        cards = []
+        for position, index in enumerate(self.search_ids('linkedin', query, location, start), 1):
+            job = self.job(index)
+            salary = self.salary_text(job)
+            cards.append(LINKEDIN_CARD.format(
+                origin=origin, job_id=LINKEDIN_ID_BASE + index, slug=_slug(f"{job['title']} at {job['company']}"),
+                ref=f'{zlib.crc32(str(index).encode()):08x}', position=position,
+                title=html.escape(job['title']), company=html.escape(job['company']),
+                company_slug=_slug(job['company']), location=html.escape(job['location']),
+                posted=job['posted_date'].strftime('%Y-%m-%d'),
+                salary=f'<span class="job-search-card__salary-info">{salary.replace(" a year", "/yr")}</span>'
+                if salary else ''))
+        body = f'<ul class="jobs-search__results-list">{"".join(cards)}</ul>'
+        return PAGE.format(title=f'{html.escape(query)} Jobs | LinkedIn', head='', body=body)
+
+    def linkedin_detail(self, path: str, origin: str) -> Optional[str]:
+        match = re.search(r'(\d+)/?$', path)
+        if not match or int(match.group(1)) < LINKEDIN_ID_BASE:
+            return None
+        job = self.job(int(match.group(1)) - LINKEDIN_ID_BASE)
+        salary = ''
+        if job['salary_min'] is not None:
+            suffix = '/yr' if job['salary_period'] == 'yearly' else '/hr'
+            salary = (f'<div class="compensation__salary-range"><h3>Base pay range</h3>'
+                      f'<div class="salary compensation__salary">${job["salary_min"]:,}.00{suffix} - '
+                      f'${job["salary_max"]:,}.00{suffix}</div></div>')
+        body = LINKEDIN_DETAIL.format(
+            origin=origin, title=html.escape(job['title']), company=html.escape(job['company']),
+            company_slug=_slug(job['company']), location=html.escape(job['location']), job_type=job['job_type'],
+            salary=salary, description=_paragraphs(job['description']))
+        return PAGE.format(title=f'{html.escape(job["company"])} hiring {html.escape(job["title"])} | LinkedIn',
+                           head=self.json_ld(job), body=body)
+
+    def render(self, path: str, query: str, origin: str) -> Tuple[int, str, str]:
+        """Route a GET; returns (status, counter name, body)."""
+        params = {key: values[0] for key, values in parse_qs(query).items()}
+        if path == '/stats':
+            return 200, 'stats', json.dumps(self.stats())
+        if path == '/jobs':
+            return 200, 'indeed_search', self.indeed_search(params)
+        if path == '/jobs/search':
+            return 200, 'linkedin_search', self.linkedin_search(params, origin)
+        if path in ('/viewjob', '/rc/clk') or path.startswith('/jobs/view/'):
+            board = 'linkedin' if path.startswith('/jobs/view/') else 'indeed'
+            if self.blocked():
+                return 403, f'{board}_blocked', BLOCK_PAGE
+            page = self.linkedin_detail(path, origin) if board == 'linkedin' else self.indeed_detail(params)
+            if page is not None:
+                return 200, f'{board}_detail', page
+        return 404, 'not_found', PAGE.format(title='Page not found', head='', body='<h1>Page not found</h1>')
+
+
+class MockBoardHandler(BaseHTTPRequestHandler):
+    """Serves MockJobBoard pages; the board is attached to the server as `board`."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        board = self.server.board
+        parsed = urlparse(self.path)
+        origin = f"http://{self.headers.get('Host') or '%s:%d' % self.server.server_address[:2]}"
+        if parsed.path != '/stats':
+            board.delay()
+        status, name, body = board.render(parsed.path, parsed.query, origin)
+        board.count(name)
+        payload = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json' if name == 'stats' else 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_server(board: MockJobBoard, host: str = '127.0.0.1', port: int = 0) -> ThreadingHTTPServer:
+    """Serve `board` from a daemon thread; port 0 picks a free port (see server.server_address)."""
+    server = ThreadingHTTPServer((host, port), MockBoardHandler)
+    server.daemon_threads = True
+    server.board = board
+    threading.Thread(target=server.serve_forever, name='mock-board', daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--pages', type=int, default=3, help='Result pages per search')
+    parser.add_argument('--jobs-per-page', type=int, default=25)
+    parser.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    parser.add_argument('--jitter', type=float, default=0.0, help='Extra random delay, up to this many seconds')
+    parser.add_argument('--salary-fraction', type=float, default=0.55, help='Share of jobs that show a salary')
+    parser.add_argument('--block-rate', type=float, default=0.0, help='Share of detail pages that are blocked')
+    parser.add_argument('--no-structured-data', action='store_true', help='Omit JSON-LD from detail pages')
+    args = parser.parse_args()
+
+    board = MockJobBoard(seed=args.seed, pages=args.pages, jobs_per_page=args.jobs_per_page, latency=args.latency,
+                         jitter=args.jitter, salary_fraction=args.salary_fraction, block_rate=args.block_rate,
+                         structured_data=not args.no_structured_data)
+    server = start_server(board, args.host, args.port)
+    print(f"Mock job board on http://{args.host}:{server.server_address[1]} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+        print(f"Requests: {board.stats()}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,262 @@
+"""
+Synthetic job postings for benchmarks and load tests.
+
+JobGenerator produces jobs shaped like the scrapers' output (and, for
+seeding, like stored rows) with realistic distributions:
+
+- titles from seniority x role x specialty, so keyword searches have a
+  realistic mix of common and rare matches
+- companies drawn from a Zipf-like distribution: a few employers post a
+  large share of the jobs, most post one or two
+- descriptions assembled from a pool of sentences, log-normally sized
+  (median ~2 KB, long tail to ~12 KB)
+- salary strings in the boards' formats ("$120,000 - $150,000 a year",
+  "$55 - $70 an hour", "From $90,000 a year"), missing for about half the
+  jobs, parsed with BaseScraper.parse_salary like scraped salaries
+- posted dates skewed toward the present (exponential ages, ~20 day mean),
+  with fewer postings on weekends; older jobs are more often expired
+
+URLs are derived from the job index (job i always has the same URL), so a
+benchmark can build batches that mix already stored and new jobs.
+"""
+import bisect
+import itertools
+import math
+import random
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List
+
+from src.database.models import JOB_COLUMNS
+from src.scrapers.base import BaseScraper
+
+SENIORITY = [('', 'Mid-Senior level', 40), ('Senior ', 'Mid-Senior level', 25), ('Junior ', 'Entry level', 8),
+             ('Staff ', 'Mid-Senior level', 7), ('Lead ', 'Mid-Senior level', 6), ('Principal ', 'Director', 3),
+             ('Associate ', 'Associate', 6), ('Intern - ', 'Internship', 5)]
+ROLES = [('Software Engineer', 30), ('Backend Engineer', 10), ('Frontend Engineer', 8),
+         ('Full Stack Developer', 9), ('Data Engineer', 7), ('Data Scientist', 6), ('DevOps Engineer', 5),
+         ('Site Reliability Engineer', 4), ('Machine Learning Engineer', 5), ('Mobile Developer', 3),
+         ('QA Engineer', 3), ('Security Engineer', 3), ('Engineering Manager', 3), ('Platform Engineer', 4)]
+SPECIALTIES = [('', 60), (' (Python)', 6), (' (Java)', 4), (' (Go)', 3), (' - Payments', 3), (', Platform', 4),
+               (' - Infrastructure', 4), (' (React)', 4), (', Data Platform', 3), (' - AI/ML', 4), (' (Remote)', 5)]
+LOCATIONS = [('Remote', 30), ('New York, NY', 10), ('San Francisco, CA', 8), ('Seattle, WA', 6), ('Austin, TX', 5),
+             ('Boston, MA', 4), ('Chicago, IL', 4), ('Denver, CO', 3), ('Los Angeles, CA', 3), ('Atlanta, GA', 2),
+             ('Hybrid - New York, NY', 4), ('Hybrid - San Francisco, CA', 3), ('United States', 8),
+             ('Raleigh, NC', 2), ('Portland, OR', 2), ('Miami, FL', 2)]
+JOB_TYPES = [('Full-time', 82), ('Contract', 10), ('Part-time', 3), ('Temporary', 2), ('Internship', 3)]
+
+COMPANY_PREFIXES = ['Acme', 'Globex', 'Initech', 'Umbrella', 'Stark', 'Wayne', 'Hooli', 'Vandelay', 'Soylent',
+                    'Cyberdyne', 'Tyrell', 'Wonka', 'Aperture', 'Massive', 'Blue', 'Bright', 'North', 'Summit',
+                    'Cloud', 'Data', 'Quantum', 'Vector', 'Pixel', 'Atlas', 'Beacon', 'Cobalt', 'Delta',
+                    'Ember', 'Falcon', 'Granite', 'Harbor', 'Iron', 'Juniper', 'Keystone', 'Lumen', 'Meridian']
+COMPANY_SUFFIXES = ['Labs', 'Systems', 'Technologies', 'Health', 'Financial', 'Software', 'Analytics',
+                    'Networks', 'Dynamics', 'Robotics', 'Media', 'Logistics', 'Energy', 'Bio', 'Group', 'AI']
+
+SENTENCES = [
+    "We are looking for an engineer to design, build and operate services used by millions of customers.",
+    "You will work closely with product managers, designers and other engineers in a small, autonomous team.",
+    "Our stack is Python, PostgreSQL and Redis, deployed on AWS with Kubernetes and Terraform.",
+    "Experience with React and TypeScript is a plus for this full stack role.",
+    "You have 3+ years of professional experience building backend systems in Python, Go or Java.",
+    "Familiarity with distributed systems, message queues such as Kafka, and event-driven architectures.",
+    "You care about testing, code review and writing clear documentation.",
+    "Experience with machine learning pipelines, feature stores or model serving is a strong plus.",
+    "You will own services end to end, from design through on-call and incident response.",
+    "We value clear communication, curiosity and a bias toward shipping incremental improvements.",
+    "Build and maintain data pipelines with Spark, Airflow and dbt feeding our Snowflake warehouse.",
+    "Improve the reliability and performance of our CI/CD pipelines and developer tooling.",
+    "Help us scale our platform to handle 10x growth in traffic over the next two years.",
+    "Mentor junior engineers and contribute to our engineering culture and hiring process.",
+    "Knowledge of security best practices, OAuth, and secure handling of customer data.",
+    "Experience with mobile development on iOS (Swift) or Android (Kotlin) is welcome.",
+    "You are comfortable working with ambiguous requirements and turning them into concrete plans.",
+    "We offer competitive salary, equity, comprehensive health benefits and a 401(k) match.",
+    "Flexible working hours, generous parental leave and an annual learning budget.",
+    "This position is eligible for remote work anywhere in the United States.",
+    "Candidates must be authorized to work in the United States without sponsorship.",
+    "We are an equal opportunity employer and value diversity at our company.",
+    "Our team practices trunk-based development, feature flags and continuous deployment.",
+    "Strong SQL skills and experience optimizing queries on large datasets.",
+    "Experience with observability tooling such as Prometheus, Grafana and OpenTelemetry.",
+    "You will collaborate with data scientists to productionize models and run experiments.",
+    "Exposure to payments, billing or financial systems is a plus.",
+    "Participate in a shared on-call rotation with clear runbooks and blameless postmortems.",
+    "Design APIs that are easy to use, well documented and backward compatible.",
+    "Our interview process consists of a recruiter call, a technical screen and a virtual onsite.",
+]
+
+
+class _Weighted:
+    """Fast weighted choice over (value..., weight) tuples (weight last)."""
+
+    def __init__(self, options: List):
+        self.options = options
+        self.cumulative = list(itertools.accumulate(option[-1] for option in options))
+
+    def pick(self, rng: random.Random):
+        return self.options[bisect.bisect(self.cumulative, rng.random() * self.cumulative[-1])]
+
+
+class JobGenerator:
+    """Deterministic (per seed) stream of synthetic jobs."""
+
+    def __init__(self, seed: int = 42, now: datetime = None, companies: int = 5000, mean_age_days: float = 20,
+                 salary_fraction: float = 0.55, indeed_fraction: float = 0.6):
+        """
+        Args:
+            seed: Random seed; the same seed gives the same jobs
+            now: Reference time for posted dates (default: now, UTC)
+            companies: Distinct employers
+            mean_age_days: Mean age of a posting (ages are exponential, capped at two years)
+            salary_fraction: Share of jobs that show a salary
+            indeed_fraction: Share of jobs from Indeed (the rest are LinkedIn)
+        """
+        self.rng = random.Random(seed)
+        self.now = now or datetime.utcnow()
+        self.mean_age_days = mean_age_days
+        self.salary_fraction = salary_fraction
+        self.indeed_fraction = indeed_fraction
+
+        names = [f'{a} {b}' for a in COMPANY_PREFIXES for b in COMPANY_SUFFIXES]
+        random.Random(seed).shuffle(names)
+        self.companies = [names[i] if i < len(names) else f'{names[i % len(names)]} {i // len(names) + 1}'
+                          for i in range(companies)]
+        # Zipf-like: employer k posts in proportion to 1 / k^0.8 (the top one ~4% of jobs)
+        self.company_weights = list(itertools.accumulate(1 / (k ** 0.8) for k in range(1, companies + 1)))
+        self.seniority = _Weighted(SENIORITY)
+        self.roles = _Weighted(ROLES)
+        self.specialties = _Weighted(SPECIALTIES)
+        self.locations = _Weighted(LOCATIONS)
+        self.job_types = _Weighted(JOB_TYPES)
+
+    @staticmethod
+    def url(index: int, board: str) -> str:
+        """Canonical URL of job `index` on a board."""
+        if board == 'indeed':
+            return f'https://www.indeed.com/viewjob?jk={index:016x}'
+        return f'https://www.linkedin.com/jobs/view/{4000000000 + index}'
+
+    def board(self, index: int) -> str:
+        """Board of job `index` (a function of the index, so URLs are stable)."""
+        return 'indeed' if (index * 2654435761) % 1000 < self.indeed_fraction * 1000 else 'linkedin'
+
+    def _company(self) -> str:
+        position = bisect.bisect(self.company_weights, self.rng.random() * self.company_weights[-1])
+        return self.companies[min(position, len(self.companies) - 1)]
+
+    def _description(self) -> str:
+        target = min(12000, max(300, int(self.rng.lognormvariate(math.log(2000), 0.6))))
+        parts, size = [], 0
+        while size < target:
+            sentence = self.rng.choice(SENTENCES)
+            parts.append(sentence)
+            size += len(sentence) + 1
+        return ' '.join(parts)
+
+    def _salary(self, seniority: str) -> str:
+        """A salary string as boards display it, or None."""
+        rng = self.rng
+        if rng.random() >= self.salary_fraction:
+            return None
+        level = {'Junior ': 0.7, 'Associate ': 0.75, 'Intern - ': 0.4, 'Senior ': 1.3, 'Staff ': 1.6,
+                 'Lead ': 1.45, 'Principal ': 1.8}.get(seniority, 1.0)
+        kind = rng.random()
+        if kind < 0.18:
+            low = round(rng.gauss(55, 12) * level)
+            return f'${max(low, 15)} - ${max(low, 15) + rng.randint(5, 25)} an hour'
+        low = round(rng.gauss(120000, 25000) * level / 1000) * 1000
+        low = max(low, 30000)
+        if kind < 0.28:
+            return f'From ${low:,} a year'
+        if kind < 0.35:
+            return f'${low:,} a year'
+        return f'${low:,} - ${low + rng.randint(10, 60) * 1000:,} a year'
+
+    def _posted(self) -> datetime:
+        age = min(self.rng.expovariate(1 / self.mean_age_days), 730)
+        posted = self.now - timedelta(days=age)
+        # Fewer postings on weekends: most weekend dates move to the nearest weekday
+        if posted.weekday() >= 5 and self.rng.random() < 0.7:
+            monday = posted + timedelta(days=1)
+            posted = monday if posted.weekday() == 6 and monday <= self.now else posted - timedelta(
+                days=posted.weekday() - 4)
+        return posted
+
+    def job(self, index: int) -> Dict:
+        """One scraper-shaped job (what build_job returns) for index `index`."""
+        prefix, experience, _ = self.seniority.pick(self.rng)
+        role, _ = self.roles.pick(self.rng)
+        specialty, _ = self.specialties.pick(self.rng)
+        location, _ = self.locations.pick(self.rng)
+        board = self.board(index)
+        salary = self._salary(prefix)
+        salary_min, salary_max, salary_period = BaseScraper.parse_salary(salary) if salary else (None, None, None)
+        if location == 'Remote' or specialty == ' (Remote)':
+            work_mode = 'Remote'
+        elif location.startswith('Hybrid'):
+            work_mode = 'Hybrid'
+        else:
+            work_mode = 'On-site'
+        return {
+            'title': f'{prefix}{role}{specialty}',
+            'company': self._company(),
+            'location': location,
+            'url': self.url(index, board),
+            'board_source': board,
+            'posted_date': self._posted(),
+            'description': self._description(),
+            'salary_min': salary_min,
+            'salary_max': salary_max,
+            'salary_period': salary_period,
+            'job_type': self.job_types.pick(self.rng)[0],
+            'work_mode': work_mode,
+            'experience_level': experience,
+        }
+
+    def jobs(self, count: int, start: int = 0) -> Iterator[Dict]:
+        """Scraper-shaped jobs for indexes start .. start + count - 1."""
+        for index in range(start, start + count):
+            yield self.job(index)
+
+    def rows(self, count: int, start: int = 0) -> Iterator[Dict]:
+        """Stored-row dicts (JOB_COLUMNS) for seeding; job index i gets id i + 1."""
+        for index, job in enumerate(self.jobs(count, start), start):
+            age_days = (self.now - job['posted_date']).total_seconds() / 86400
+            created = min(job['posted_date'] + timedelta(hours=self.rng.uniform(0, 24)), self.now)
+            row = dict.fromkeys(JOB_COLUMNS)
+            row.update(job, id=index + 1, salary_currency='USD', created_at=created, updated_at=created,
+                       status='expired' if self.rng.random() < min(0.6, age_days / 60) else 'active',
+                       is_duplicate=False, applied=False)
+            yield row
+
+
+def _chunks(iterator: Iterator, size: int) -> Iterator[List]:
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def seed_sqlite(database, count: int, generator: JobGenerator, chunk_size: int = 5000) -> int:
+    """Bulk-insert `count` generated jobs into a (SQLite) Database; returns the rows inserted."""
+    from src.database.models import Job
+
+    inserted = 0
+    for rows in _chunks(generator.rows(count), chunk_size):
+        with database.engine.begin() as conn:
+            conn.execute(Job.__table__.insert(), rows)
+        inserted += len(rows)
+    return inserted
+
+
+def seed_dynamodb(count: int, generator: JobGenerator) -> int:
+    """Batch-write `count` generated jobs into the current JobModel table; returns the items written."""
+    from src.database.dynamodb import JobModel
+
+    written = 0
+    with JobModel.batch_write() as batch:
+        for row in generator.rows(count):
+            # Unset attributes are left out so the model's defaults and null handling apply
+            batch.save(JobModel(**{column: value for column, value in row.items() if value is not None}))
+            written += 1
+    return written
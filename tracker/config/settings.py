@@ -10,20 +10,127 @@ load_dotenv()
 DATABASE_TYPE = os.getenv('DATABASE_TYPE', 'sqlite')  # 'sqlite' or 'dynamodb'
 DATABASE_PATH = os.getenv('DATABASE_PATH', 'jobs.db')
 DYNAMODB_TABLE_NAME = os.getenv('DYNAMODB_TABLE_NAME', 'job-tracker-jobs')
+DYNAMODB_RUNS_TABLE_NAME = os.getenv('DYNAMODB_RUNS_TABLE_NAME', 'job-tracker-runs')
 AWS_REGION = os.getenv('AWS_REGION', 'us-east-1')
+DYNAMODB_ENDPOINT = os.getenv('DYNAMODB_ENDPOINT', '')  # e.g. http://localhost:8000 for DynamoDB Local
+DYNAMODB_SCAN_SEGMENTS = int(os.getenv('DYNAMODB_SCAN_SEGMENTS', 4))  # Parallel workers per full-table scan
+
+# `sync` command: incremental copies between the SQLite file and the DynamoDB table
+SYNC_CHECKPOINT_PATH = os.getenv('SYNC_CHECKPOINT_PATH', 'sync_checkpoint.json')
+SYNC_SEGMENTS = int(os.getenv('SYNC_SEGMENTS', 4))  # Parallel scan segments when reading DynamoDB
+SYNC_OVERLAP_SECONDS = float(os.getenv('SYNC_OVERLAP_SECONDS', 300))  # Re-read before the watermark
+
+# Read-through cache of query results (stats, recent jobs, ...); writes invalidate it
+DB_CACHE_ENABLED = os.getenv('DB_CACHE_ENABLED', 'true').lower() == 'true'
+DB_CACHE_TTL = float(os.getenv('DB_CACHE_TTL', 300))  # seconds
+DB_CACHE_MAX_ENTRIES = int(os.getenv('DB_CACHE_MAX_ENTRIES', 256))  # In-process LRU size
+DB_CACHE_PATH = os.getenv('DB_CACHE_PATH', '')  # SQLite file shared between processes; empty = in-process only
+DB_CACHE_MAX_MB = int(os.getenv('DB_CACHE_MAX_MB', 50))
+
+# Dashboard snapshots: precomputed stats, chart series and job pages published after each run
+SNAPSHOT_DIR = os.getenv('SNAPSHOT_DIR', '')  # Local directory; empty (and no bucket) = off
+SNAPSHOT_S3_BUCKET = os.getenv('SNAPSHOT_S3_BUCKET', '')  # Takes precedence over SNAPSHOT_DIR
+SNAPSHOT_S3_PREFIX = os.getenv('SNAPSHOT_S3_PREFIX', 'dashboard')
+SNAPSHOT_S3_ENDPOINT = os.getenv('SNAPSHOT_S3_ENDPOINT', '')  # e.g. http://localhost:9000 for MinIO
+SNAPSHOT_PAGE_SIZE = int(os.getenv('SNAPSHOT_PAGE_SIZE', 25))  # Jobs per page of the job list
+SNAPSHOT_KEEP = int(os.getenv('SNAPSHOT_KEEP', 5))  # Versions kept, newest first
 
 # Scraper settings
 SEARCH_QUERY = os.getenv('SEARCH_QUERY', 'software engineer')
 LOCATION = os.getenv('LOCATION', 'Remote')
+# Multiple searches: semicolon-separated "query|location|board" entries
+# (location and board optional). Overrides SEARCH_QUERY/LOCATION when set.
+SEARCHES = os.getenv('SEARCHES', '')
 SCRAPE_INTERVAL_HOURS = int(os.getenv('SCRAPE_INTERVAL_HOURS', 6))
+# Job board origins; point both at a local mock board (benchmarks/mock_board.py) for load tests
+INDEED_SITE_URL = os.getenv('INDEED_SITE_URL', 'https://www.indeed.com').rstrip('/')
+LINKEDIN_SITE_URL = os.getenv('LINKEDIN_SITE_URL', 'https://www.linkedin.com').rstrip('/')
+# Multiplier on the human-like pauses between page loads (0 disables them, e.g. against the mock board)
+SCRAPER_DELAY_SCALE = float(os.getenv('SCRAPER_DELAY_SCALE', 1))
+
+# Detail-fetch task queue (resumable runs)
+TASK_QUEUE_ENABLED = os.getenv('TASK_QUEUE_ENABLED', 'true').lower() == 'true'
+TASK_QUEUE_PATH = os.getenv('TASK_QUEUE_PATH', 'tasks.db')
+TASK_MAX_ATTEMPTS = int(os.getenv('TASK_MAX_ATTEMPTS', 4))
+TASK_LEASE_SECONDS = int(os.getenv('TASK_LEASE_SECONDS', 300))
+TASK_BACKOFF_SECONDS = float(os.getenv('TASK_BACKOFF_SECONDS', 30))
+
+# Browser lifecycle: keep Chromium within the container's memory (ECS task has 1 GB)
+BROWSER_MEMORY_LIMIT_MB = float(os.getenv('BROWSER_MEMORY_LIMIT_MB', 0)) or None  # 0 disables
+BROWSER_RECYCLE_FRACTION = float(os.getenv('BROWSER_RECYCLE_FRACTION', 0.8))
+BROWSER_PAGE_TIMEOUT_SECONDS = float(os.getenv('BROWSER_PAGE_TIMEOUT_SECONDS', 90))
+BROWSER_MAX_PAGES = int(os.getenv('BROWSER_MAX_PAGES', 25))  # Recycle long-lived browsers after N pages
+BROWSER_LOW_MEMORY = os.getenv('BROWSER_LOW_MEMORY', 'false').lower() == 'true'
+
+# Worker processes parsing detail-page HTML while the browser loads the next page (0 parses inline)
+PARSE_WORKERS = int(os.getenv('PARSE_WORKERS', 2))
+
+# Per-board circuit breaker: stop fetching detail pages once a board keeps blocking us
+CIRCUIT_BREAKER_ENABLED = os.getenv('CIRCUIT_BREAKER_ENABLED', 'true').lower() == 'true'
+CIRCUIT_BREAKER_PATH = os.getenv('CIRCUIT_BREAKER_PATH', 'circuit_breaker.json')
+CIRCUIT_BREAKER_BLOCK_RATIO = float(os.getenv('CIRCUIT_BREAKER_BLOCK_RATIO', 0.3))
+CIRCUIT_BREAKER_ERROR_RATIO = float(os.getenv('CIRCUIT_BREAKER_ERROR_RATIO', 0.5))
+CIRCUIT_BREAKER_MIN_REQUESTS = int(os.getenv('CIRCUIT_BREAKER_MIN_REQUESTS', 5))
+CIRCUIT_BREAKER_COOLDOWN_SECONDS = int(os.getenv('CIRCUIT_BREAKER_COOLDOWN_SECONDS', 1800))
+
+# On-disk page cache: search pages go stale quickly, detail pages rarely change
+PAGE_CACHE_ENABLED = os.getenv('PAGE_CACHE_ENABLED', 'true').lower() == 'true'
+PAGE_CACHE_PATH = os.getenv('PAGE_CACHE_PATH', 'page_cache.db')
+PAGE_CACHE_SEARCH_TTL = int(os.getenv('PAGE_CACHE_SEARCH_TTL', 600))  # seconds
+PAGE_CACHE_DETAIL_TTL = int(os.getenv('PAGE_CACHE_DETAIL_TTL', 7 * 24 * 3600))  # seconds
+PAGE_CACHE_MAX_MB = int(os.getenv('PAGE_CACHE_MAX_MB', 200))
+
+# Run metrics: JSON run report, plus optional Prometheus text file
+METRICS_REPORT_PATH = os.getenv('METRICS_REPORT_PATH', 'run_report.json')
+METRICS_PROMETHEUS_PATH = os.getenv('METRICS_PROMETHEUS_PATH', '')
+
+# Sampling profiler (also enabled per run with `python src/main.py --profile`)
+PROFILE_ENABLED = os.getenv('PROFILE_ENABLED', 'false').lower() == 'true'
+PROFILE_OUTPUT_DIR = os.getenv('PROFILE_OUTPUT_DIR', 'profiles')
+PROFILE_INTERVAL_MS = float(os.getenv('PROFILE_INTERVAL_MS', 10))
+PROFILE_TOP_N = int(os.getenv('PROFILE_TOP_N', 25))
 
 # Email notification settings
 SMTP_SERVER = os.getenv('SMTP_SERVER', 'smtp.gmail.com')
 SMTP_PORT = int(os.getenv('SMTP_PORT', 587))
 SENDER_EMAIL = os.getenv('SENDER_EMAIL', '')
 SENDER_PASSWORD = os.getenv('SENDER_PASSWORD', '')
-RECIPIENT_EMAIL = os.getenv('RECIPIENT_EMAIL', '')
+RECIPIENT_EMAIL = os.getenv('RECIPIENT_EMAIL', '')  # Comma-separated for several recipients
+SMTP_USE_TLS = os.getenv('SMTP_USE_TLS', 'true').lower() == 'true'  # false only for local test servers
 
 # Notification settings
 NOTIFY_ON_NEW_JOBS = os.getenv('NOTIFY_ON_NEW_JOBS', 'true').lower() == 'true'
+# 0 sends one digest per run; otherwise a long-running scheduler batches runs into one digest per window
+NOTIFY_DIGEST_WINDOW_MINUTES = float(os.getenv('NOTIFY_DIGEST_WINDOW_MINUTES', 0))
+NOTIFY_MAX_ATTEMPTS = int(os.getenv('NOTIFY_MAX_ATTEMPTS', 3))
+# Keyword filter: comma-separated terms, optionally prefixed with a field
+# (title:, company:, location:, description:). Jobs must match at least one
+# KEYWORDS_FILTER term (if any) and no KEYWORDS_EXCLUDE term.
 KEYWORDS_FILTER = os.getenv('KEYWORDS_FILTER', '').split(',') if os.getenv('KEYWORDS_FILTER') else []
+KEYWORDS_EXCLUDE = os.getenv('KEYWORDS_EXCLUDE', '').split(',') if os.getenv('KEYWORDS_EXCLUDE') else []
+
+# Near-duplicate detection settings
+DEDUPE_ENABLED = os.getenv('DEDUPE_ENABLED', 'true').lower() == 'true'
+DEDUPE_INDEX_PATH = os.getenv('DEDUPE_INDEX_PATH', 'dedupe.db')
+DEDUPE_THRESHOLD = float(os.getenv('DEDUPE_THRESHOLD', 0.8))
+
+# Relevance ranking against a candidate profile (comma-separated skills and
+# titles; minimum salary is yearly, 0 for no floor). Without skills or titles,
+# new jobs are listed in scrape order.
+RANKING_ENABLED = os.getenv('RANKING_ENABLED', 'true').lower() == 'true'
+RANKING_INDEX_PATH = os.getenv('RANKING_INDEX_PATH', 'ranking.db')
+CANDIDATE_SKILLS = [s.strip() for s in os.getenv('CANDIDATE_SKILLS', '').split(',') if s.strip()]
+CANDIDATE_TITLES = [t.strip() for t in os.getenv('CANDIDATE_TITLES', '').split(',') if t.strip()]
+CANDIDATE_MIN_SALARY = float(os.getenv('CANDIDATE_MIN_SALARY', 0)) or None
+
+# "More like this" similarity index (`similar` command). The model is fitted
+# on first use; new jobs are then embedded as they are stored.
+SIMILARITY_ENABLED = os.getenv('SIMILARITY_ENABLED', 'true').lower() == 'true'
+SIMILARITY_INDEX_DIR = os.getenv('SIMILARITY_INDEX_DIR', 'similarity')
+SIMILARITY_DIMS = int(os.getenv('SIMILARITY_DIMS', 64))
+SIMILARITY_PROBE = int(os.getenv('SIMILARITY_PROBE', 0))  # Nearest clusters to scan (0 = all jobs)
+
+# Salary analytics (`salaries` command): reports are cached here until jobs change
+SALARY_CACHE_PATH = os.getenv('SALARY_CACHE_PATH', 'salary_cache.json')
+# Recompute after this long regardless, for writes made outside the tracker (e.g. the dashboard); 0 = never
+SALARY_CACHE_TTL = float(os.getenv('SALARY_CACHE_TTL', 3600))  # seconds
@@ -2,11 +2,19 @@
 CLI commands for interacting with the job tracker.
 """
 import argparse
+import os
 from datetime import datetime, timedelta
 
+from src.tracker.run_history import summarize_runs
+
 class CLI:
     """Command-line interface handler."""
 
+    COMMANDS = ['list', 'search', 'stats', 'runs', 'top', 'similar', 'salaries', 'export', 'sync', 'snapshot']
+    # Commands that only read, so remote schema checks can be skipped
+    # ('top', 'similar', 'salaries', 'export' and 'snapshot' write only to files or the snapshot store)
+    READ_ONLY_COMMANDS = ['list', 'search', 'stats', 'runs', 'top', 'similar', 'salaries', 'export', 'snapshot']
+
     def __init__(self, database, monitor):
         self.db = database
         self.monitor = monitor
@@ -14,15 +22,46 @@ class CLI:
     def run(self):
         """Run the CLI."""
         parser = argparse.ArgumentParser(description='Job Board Tracker')
-        parser.add_argument('command', choices=['list', 'search', 'stats'],
+        parser.add_argument('command', choices=self.COMMANDS,
                           help='Command to execute')
         parser.add_argument('--keyword', help='Keyword to search for')
-        parser.add_argument('--days', type=int, default=7, help='Number of days to look back')
+        parser.add_argument('--days', type=int,
+                          help='Number of days to look back (default 7; salaries: full history)')
+        parser.add_argument('--window', choices=['day', 'week', 'month'], default=None,
+                          help='Aggregation window for the runs and salaries commands')
+        parser.add_argument('--limit', type=int, default=20, help='Number of jobs to show (top, similar)')
+        parser.add_argument('--id', type=int, help='Job ID to find similar jobs for (similar command)')
+        parser.add_argument('--probe', type=int, help='Nearest clusters to scan (default: SIMILARITY_PROBE)')
+        parser.add_argument('--rebuild', action='store_true', help='Refit the similarity index from all jobs')
+        parser.add_argument('--skills', help='Comma-separated skills to rank by (default: CANDIDATE_SKILLS)')
+        parser.add_argument('--titles', help='Comma-separated titles to rank by (default: CANDIDATE_TITLES)')
+        parser.add_argument('--min-salary', type=float,
+                          help='Yearly salary floor (default: CANDIDATE_MIN_SALARY)')
+        parser.add_argument('--group-by', choices=['company', 'location', 'board', 'window'],
+                          help='Break salaries down by this field (salaries command)')
+        parser.add_argument('--min-count', type=int, default=3,
+                          help='Hide salary groups with fewer jobs than this')
+        parser.add_argument('--currency', default='USD', help='Currency to analyze (salaries command)')
+        parser.add_argument('--output', help='Export file (.csv, .jsonl or .parquet; .gz compresses csv/jsonl); '
+                                             'snapshot: directory (default: SNAPSHOT_DIR / SNAPSHOT_S3_BUCKET)')
+        parser.add_argument('--format', choices=['csv', 'jsonl', 'parquet'],
+                          help='Export format (default: from the --output extension)')
+        parser.add_argument('--status', help='Only export jobs with this status (default: all)')
+        parser.add_argument('--source', help='Only export jobs from this board')
+        parser.add_argument('--chunk-size', type=int, default=1000, help='Rows read per database round trip')
+        parser.add_argument('--compression', default='zstd', help='Parquet compression codec')
+        parser.add_argument('--row-group-size', type=int, default=50000, help='Rows per Parquet row group')
+        parser.add_argument('--direction', choices=['pull', 'push'],
+                          help='sync: pull copies DynamoDB into SQLite, push copies SQLite into DynamoDB')
+        parser.add_argument('--full', action='store_true', help='sync: copy every job, not just changes')
+        parser.add_argument('--segments', type=int, help='sync: parallel DynamoDB scan segments '
+                                                         '(default: SYNC_SEGMENTS)')
 
         args = parser.parse_args()
+        days = args.days if args.days is not None else 7
 
         if args.command == 'list':
-            self.list_jobs(args.days)
+            self.list_jobs(days)
         elif args.command == 'search':
             if not args.keyword:
                 print("Error: --keyword is required for search command")
@@ -30,6 +69,34 @@ class CLI:
             self.search_jobs(args.keyword)
         elif args.command == 'stats':
             self.show_stats()
+        elif args.command == 'runs':
+            if args.window == 'month':
+                print("Error: --window must be day or week for runs command")
+                return
+            self.show_runs(days, args.window or 'day')
+        elif args.command == 'top':
+            self.show_top(days, args.limit, args.skills, args.titles, args.min_salary)
+        elif args.command == 'similar':
+            if args.id is None:
+                print("Error: --id is required for similar command")
+                return
+            self.show_similar(args.id, args.limit, args.probe, args.rebuild)
+        elif args.command == 'salaries':
+            self.show_salaries(args.group_by, args.window or 'week', args.days, args.limit,
+                               args.min_count, args.currency)
+        elif args.command == 'export':
+            if not args.output:
+                print("Error: --output is required for export command")
+                return
+            self.export(args.output, args.format, args.status, args.source, args.days,
+                        args.chunk_size, args.compression, args.row_group_size)
+        elif args.command == 'sync':
+            if not args.direction:
+                print("Error: --direction (pull or push) is required for sync command")
+                return
+            self.sync(args.direction, args.full, args.segments, args.chunk_size)
+        elif args.command == 'snapshot':
+            self.snapshot(args.output)
 
     def list_jobs(self, days: int):
         """List recent jobs."""
@@ -56,6 +123,7 @@ class CLI:
                 time_str = "N/A"
 
             print(f"{i}. {job.title}")
+            print(f"   ID: {job.id}")
             print(f"   Company: {job.company}")
             print(f"   Location: {job.location or 'N/A'}")
 
@@ -86,6 +154,7 @@ class CLI:
 
         for i, job in enumerate(jobs, 1):
             print(f"{i}. {job.title}")
+            print(f"   ID: {job.id}")
             print(f"   Company: {job.company}")
             print(f"   Location: {job.location or 'N/A'}")
 
@@ -105,13 +174,14 @@ class CLI:
 
     def show_stats(self):
         """Show tracking statistics."""
-        # Get all jobs
-        all_jobs = self.db.get_jobs_by_status('active')
+        # Counts only: no job rows are loaded
+        total = self.db.count_jobs('active')
 
         # Get jobs by time period
-        today = self.db.get_recent_jobs(days=1)
-        this_week = self.db.get_recent_jobs(days=7)
-        this_month = self.db.get_recent_jobs(days=30)
+        now = datetime.utcnow()
+        today = self.db.count_jobs('active', since=now - timedelta(days=1))
+        this_week = self.db.count_jobs('active', since=now - timedelta(days=7))
+        this_month = self.db.count_jobs('active', since=now - timedelta(days=30))
 
         # Get stats by source
         source_stats = self.db.get_job_count_by_source()
@@ -121,10 +191,10 @@ class CLI:
         print(f"{'='*80}\n")
 
         print("📊 OVERVIEW")
-        print(f"   Total jobs tracked: {len(all_jobs)}")
-        print(f"   Jobs found today: {len(today)}")
-        print(f"   Jobs this week: {len(this_week)}")
-        print(f"   Jobs this month: {len(this_month)}")
+        print(f"   Total jobs tracked: {total}")
+        print(f"   Jobs found today: {today}")
+        print(f"   Jobs this week: {this_week}")
+        print(f"   Jobs this month: {this_month}")
         print()
 
         print("📈 BY SOURCE")
@@ -136,9 +206,7 @@ class CLI:
         print()
 
         # Top companies
-        company_counts = {}
-        for job in all_jobs:
-            company_counts[job.company] = company_counts.get(job.company, 0) + 1
+        company_counts = self.db.get_job_count_by_company('active')
 
         top_companies = sorted(company_counts.items(), key=lambda x: x[1], reverse=True)[:5]
 
@@ -149,3 +217,284 @@ class CLI:
             print()
 
         print(f"{'='*80}\n")
+
+    def show_runs(self, days: int, window: str = 'day'):
+        """Show run history trends aggregated by day or week."""
+        since = datetime.utcnow() - timedelta(days=days)
+        runs = self.db.get_scrape_runs(since=since)
+
+        print(f"\n{'='*80}")
+        print(f"RUN HISTORY - LAST {days} DAYS: {len(runs)} runs (by {window})")
+        print(f"{'='*80}\n")
+
+        if not runs:
+            print("No runs recorded in this time period.")
+            return
+
+        print(f"{'Window':<12}{'Runs':>6}{'Failed':>8}{'Avg dur':>10}{'Max dur':>10}"
+              f"{'Fetches':>9}{'Blocks':>8}{'Block %':>9}{'New':>6}{'New/run':>9}{'Updated':>9}{'Errors':>8}")
+        summaries = summarize_runs(runs, window)
+        for summary in summaries:
+            avg = f"{summary['avg_duration_seconds']:.0f}s" if summary['avg_duration_seconds'] is not None else 'N/A'
+            peak = f"{summary['max_duration_seconds']:.0f}s" if summary['max_duration_seconds'] is not None else 'N/A'
+            print(f"{summary['window_start'].strftime('%Y-%m-%d'):<12}{summary['runs']:>6}"
+                  f"{summary['failed_runs']:>8}{avg:>10}{peak:>10}{summary['detail_fetches']:>9}"
+                  f"{summary['blocks']:>8}{summary['block_rate'] * 100:>8.1f}%{summary['new']:>6}"
+                  f"{summary['new_per_run']:>9.1f}{summary['updated']:>9}{summary['errors']:>8}")
+        print()
+
+        print("📈 BY SOURCE")
+        totals = {}
+        for summary in summaries:
+            for board, source in summary['sources'].items():
+                agg = totals.setdefault(board, {'duration_seconds': 0.0, 'detail_fetches': 0, 'blocks': 0, 'new': 0})
+                for field in agg:
+                    agg[field] += source[field]
+        for board, agg in totals.items():
+            block_rate = agg['blocks'] / agg['detail_fetches'] * 100 if agg['detail_fetches'] else 0.0
+            print(f"   {board.capitalize()}: {agg['duration_seconds'] / len(runs):.0f}s avg/run, "
+                  f"{agg['detail_fetches']} fetches, {block_rate:.1f}% blocked, {agg['new']} new jobs")
+        print()
+
+        print(f"{'='*80}\n")
+
+    def show_top(self, days: int, limit: int, skills: str = None, titles: str = None,
+                 min_salary: float = None):
+        """Show recent jobs ranked by relevance to the candidate profile."""
+        # numpy is only needed here; keep it out of other commands' startup
+        from config.settings import RANKING_INDEX_PATH, CANDIDATE_SKILLS, CANDIDATE_TITLES, CANDIDATE_MIN_SALARY
+        from src.tracker.ranking import CandidateProfile, RelevanceIndex
+
+        def split(value, default):
+            return [part.strip() for part in value.split(',') if part.strip()] if value else default
+
+        profile = CandidateProfile(
+            split(skills, CANDIDATE_SKILLS),
+            split(titles, CANDIDATE_TITLES),
+            min_salary if min_salary is not None else CANDIDATE_MIN_SALARY
+        )
+        if not profile:
+            print("Error: set CANDIDATE_SKILLS/CANDIDATE_TITLES or pass --skills/--titles for the top command")
+            return
+
+        jobs = [job for job in self.monitor.get_recent_jobs(days=days) if not getattr(job, 'is_duplicate', False)]
+        index = RelevanceIndex(RANKING_INDEX_PATH)
+        try:
+            # Jobs tracked before ranking was enabled (or by another host) are indexed on first use
+            added = index.add_jobs(jobs)
+            ranked = index.rank(profile, keys=[job.url for job in jobs], limit=limit)
+        finally:
+            index.close()
+        by_url = {job.url: job for job in jobs}
+
+        print(f"\n{'='*80}")
+        print(f"TOP {len(ranked)} OF {len(jobs)} JOBS FROM LAST {days} DAYS")
+        print(f"Skills: {', '.join(profile.skills) or '-'} | Titles: {', '.join(profile.titles) or '-'}"
+              + (f" | Min salary: ${profile.min_salary:,.0f}" if profile.min_salary else ""))
+        print(f"{'='*80}\n")
+        if added:
+            print(f"(indexed {added} jobs not yet in the relevance index)\n")
+
+        if not ranked:
+            print("No jobs found in this time period.")
+            return
+
+        for i, (url, score) in enumerate(ranked, 1):
+            job = by_url[url]
+            print(f"{i}. {job.title}  [{score:.0%} match]")
+            print(f"   ID: {job.id}")
+            print(f"   Company: {job.company}")
+            print(f"   Location: {job.location or 'N/A'}")
+            if job.salary_min or job.salary_max:
+                low, high = job.salary_min or job.salary_max, job.salary_max or job.salary_min
+                amount = f"${low:,}" if low == high else f"${low:,} - ${high:,}"
+                print(f"   Salary: {amount} {job.salary_period or 'yearly'}")
+            print(f"   Source: {job.board_source}")
+            print(f"   URL: {job.url}")
+            print()
+
+    def show_similar(self, job_id: int, limit: int, probe: int = None, rebuild: bool = False):
+        """Show the stored jobs most similar to one job."""
+        from config.settings import SIMILARITY_INDEX_DIR, SIMILARITY_DIMS, SIMILARITY_PROBE
+        from src.tracker.similarity import SimilarityIndex
+
+        job = self.db.get_job_by_id(job_id)
+        if job is None:
+            print(f"Error: no job with ID {job_id}")
+            return
+
+        index = SimilarityIndex(SIMILARITY_INDEX_DIR, dims=SIMILARITY_DIMS)
+        try:
+            if rebuild or not index.fitted:
+                jobs = self.db.get_jobs_by_status('active')
+                if job.url not in {j.url for j in jobs}:
+                    jobs.append(job)
+                print(f"Building similarity index from {len(jobs)} jobs...")
+                index.fit(jobs)
+                index.add_jobs(jobs)
+            elif job.url not in index:
+                index.add_jobs([job])
+            similar = index.similar(job.url, k=limit, probe=SIMILARITY_PROBE if probe is None else probe)
+        finally:
+            index.close()
+
+        print(f"\n{'='*80}")
+        print(f"JOBS SIMILAR TO #{job_id}: {job.title} - {job.company}")
+        print(f"{'='*80}\n")
+
+        if not similar:
+            print("No similar jobs found.")
+            return
+
+        shown = 0
+        for url, score in similar:
+            other = self.db.get_job_by_url(url)
+            if other is None:
+                continue
+            shown += 1
+            print(f"{shown}. {other.title}  [{score:.0%} similar]")
+            print(f"   ID: {other.id}")
+            print(f"   Company: {other.company}")
+            print(f"   Location: {other.location or 'N/A'}")
+            if other.status != 'active':
+                print(f"   Status: {other.status}")
+            print(f"   Source: {other.board_source}")
+            print(f"   URL: {other.url}")
+            print()
+
+    def show_salaries(self, group_by: str = None, window: str = 'week', days: int = None,
+                      limit: int = 20, min_count: int = 3, currency: str = 'USD'):
+        """Show annualized salary percentiles and distribution, optionally per group."""
+        from config.settings import SALARY_CACHE_PATH, SALARY_CACHE_TTL
+        from src.tracker.salary_stats import cached_salary_report
+
+        report, cached = cached_salary_report(self.db, SALARY_CACHE_PATH, currency=currency,
+                                              max_age=SALARY_CACHE_TTL, group_by=group_by, window=window, days=days,
+                                              min_count=min_count)
+
+        def money(value):
+            amount = f"{value / 1000:,.0f}k"
+            return f"${amount}" if currency == 'USD' else f"{amount} {currency}"
+
+        period = f"LAST {days} DAYS" if days is not None else "ALL ACTIVE JOBS"
+        print(f"\n{'='*80}")
+        print(f"SALARIES - {period}: {report['count']} jobs with a {currency} salary (annualized)"
+              + (" [cached]" if cached else ""))
+        print(f"{'='*80}\n")
+
+        if not report['count']:
+            print("No salaries found in this time period.")
+            return
+
+        labels = [f"p{p}" if p != 50 else 'median' for p in report['percentiles']]
+        print("💰 OVERALL")
+        print("   " + "".join(f"{label:>10}" for label in labels + ['mean']))
+        print("   " + "".join(f"{money(value):>10}" for value in report['overall'] + [report['mean']]))
+        print()
+
+        print("📊 DISTRIBUTION")
+        histogram = report['histogram']
+        peak = max(histogram['counts']) or 1
+        for low, high, count in zip(histogram['edges'], histogram['edges'][1:], histogram['counts']):
+            print(f"   {money(low):>8} - {money(high):<8} {'█' * round(count / peak * 40):<40} {count}")
+        print()
+
+        if group_by:
+            groups = report['groups'] if group_by == 'window' else report['groups'][:limit]
+            title = f"BY {window.upper()}" if group_by == 'window' else f"BY {group_by.upper()}"
+            hidden = f" (groups with at least {min_count} jobs)" if min_count > 1 else ""
+            print(f"📈 {title}{hidden}")
+            if not groups:
+                print("   No group has enough salaries.")
+            else:
+                print(f"   {'':<30}{'Jobs':>6}" + "".join(f"{label:>10}" for label in labels))
+                for group in groups:
+                    print(f"   {group['key'][:29]:<30}{group['count']:>6}"
+                          + "".join(f"{money(value):>10}" for value in group['percentiles']))
+            print()
+
+        print(f"{'='*80}\n")
+
+    def export(self, output: str, fmt: str = None, status: str = None, source: str = None,
+               days: int = None, chunk_size: int = 1000, compression: str = 'zstd',
+               row_group_size: int = 50000):
+        """Stream jobs to a CSV, JSONL or Parquet file."""
+        from src.tracker.export import export_jobs, infer_format
+
+        try:
+            fmt = fmt or infer_format(output)
+        except ValueError as e:
+            print(f"Error: {e}")
+            return
+        since = datetime.utcnow() - timedelta(days=days) if days is not None else None
+        filters = ', '.join(f"{name}={value}" for name, value in
+                            (('status', status), ('source', source), ('days', days)) if value is not None)
+        print(f"Exporting jobs{f' ({filters})' if filters else ''} to {output} as {fmt}...")
+        try:
+            stats = export_jobs(self.db, output, fmt, status=status, since=since, source=source,
+                                chunk_size=chunk_size, compression=compression, row_group_size=row_group_size)
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            return
+        rate = stats['rows'] / stats['seconds'] if stats['seconds'] else 0
+        print(f"✓ Exported {stats['rows']} jobs in {stats['chunks']} chunks "
+              f"({stats['seconds']:.1f}s, {rate:,.0f} rows/s)")
+
+    def sync(self, direction: str, full: bool = False, segments: int = None, chunk_size: int = 1000):
+        """Copy jobs changed since the last sync between SQLite and DynamoDB."""
+        from config.settings import (DATABASE_PATH, DYNAMODB_TABLE_NAME, DYNAMODB_RUNS_TABLE_NAME,
+                                     DYNAMODB_ENDPOINT, DYNAMODB_SCAN_SEGMENTS,
+                                     SYNC_CHECKPOINT_PATH, SYNC_SEGMENTS, SYNC_OVERLAP_SECONDS)
+        from src.database.db import Database
+        from src.database.dynamodb import DynamoDatabase
+        from src.database.sync import sync_jobs
+
+        # One side is the configured backend (possibly behind the result cache, which
+        # writes must go through to invalidate it); open the other one
+        configured = getattr(self.db, 'database', self.db)
+        sqlite = self.db if isinstance(configured, Database) else Database(db_path=DATABASE_PATH)
+        dynamo = self.db if isinstance(configured, DynamoDatabase) else DynamoDatabase(
+            table_name=DYNAMODB_TABLE_NAME, runs_table_name=DYNAMODB_RUNS_TABLE_NAME,
+            scan_segments=DYNAMODB_SCAN_SEGMENTS, host=DYNAMODB_ENDPOINT or None)
+        if direction == 'pull':
+            source, target = dynamo, sqlite
+            label = f"DynamoDB ({DYNAMODB_TABLE_NAME}) -> SQLite ({DATABASE_PATH})"
+        else:
+            source, target = sqlite, dynamo
+            label = f"SQLite ({DATABASE_PATH}) -> DynamoDB ({DYNAMODB_TABLE_NAME})"
+        target.create_tables()
+
+        key = f"{direction}:{os.path.abspath(DATABASE_PATH)}:{DYNAMODB_TABLE_NAME}"
+        print(f"Syncing {label}{' (full)' if full else ''}...")
+        stats = sync_jobs(source, target, SYNC_CHECKPOINT_PATH, key, chunk_size=chunk_size,
+                          segments=segments or SYNC_SEGMENTS, overlap_seconds=SYNC_OVERLAP_SECONDS, full=full)
+        if stats['resumed']:
+            print("  Resumed an interrupted sync from its checkpoint")
+        if stats['since']:
+            print(f"  Jobs changed since {stats['since']}")
+        rate = stats['rows'] / stats['seconds'] if stats['seconds'] else 0
+        print(f"✓ Synced {stats['rows']} jobs in {stats['chunks']} chunks "
+              f"({stats['seconds']:.1f}s, {rate:,.0f} rows/s)")
+        if stats['watermark']:
+            print(f"  Watermark: {stats['watermark']}")
+
+    def snapshot(self, output: str = None):
+        """Publish dashboard snapshots now (normally done at the end of each run)."""
+        from config.settings import (AWS_REGION, SNAPSHOT_DIR, SNAPSHOT_S3_BUCKET, SNAPSHOT_S3_PREFIX,
+                                     SNAPSHOT_S3_ENDPOINT, SNAPSHOT_PAGE_SIZE, SNAPSHOT_KEEP)
+        from src.tracker.snapshots import open_store, publish_snapshots
+
+        if output:
+            store = open_store(directory=output)
+        else:
+            store = open_store(SNAPSHOT_DIR, SNAPSHOT_S3_BUCKET, SNAPSHOT_S3_PREFIX, SNAPSHOT_S3_ENDPOINT, AWS_REGION)
+        if store is None:
+            print("Error: set SNAPSHOT_DIR or SNAPSHOT_S3_BUCKET, or pass --output DIR")
+            return
+        print(f"Publishing dashboard snapshot to {store}...")
+        stats = publish_snapshots(self.db, store, page_size=SNAPSHOT_PAGE_SIZE, keep=SNAPSHOT_KEEP)
+        ratio = stats['raw_bytes'] / stats['bytes'] if stats['bytes'] else 0
+        print(f"✓ Version {stats['version']}: {stats['jobs']} jobs listed, {stats['files']} files, "
+              f"{stats['bytes'] / 1024:.0f} KB gzipped ({ratio:.1f}x smaller), {stats['seconds']:.1f}s")
+        if stats['pruned']:
+            print(f"  Removed {stats['pruned']} old version(s)")
@@ -0,0 +1,315 @@
+"""
+Read-through cache of query results in front of Database / DynamoDatabase.
+
+Results of the read methods in READ_METHODS are kept for a TTL in an
+in-process LRU, keyed by method name and (normalized) arguments. An
+optional SQLite file adds a second tier shared by every process using the
+same path, so the scheduler and one-off CLI commands reuse each other's
+results. Every write in WRITE_METHODS bumps a generation counter that is
+part of each key (stored in the SQLite file when there is one, so writes
+in one process invalidate the others); writes that bypass the cache (another
+host, the AWS task) are only picked up once the TTL runs out.
+
+Cached results are shared, not copied: callers must not modify them.
+"""
+import inspect
+import pickle
+import sqlite3
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Tuple
+
+from src.metrics import metrics
+
+# Cached read methods. get_job_by_url is left out on purpose: the monitor looks up
+# each scraped URL once and adds it right after, so caching it would only churn.
+# get_salary_columns is left out because salary reports are already cached by data version.
+READ_METHODS = frozenset([
+    'get_job_by_id', 'get_jobs_by_status', 'get_jobs_since', 'get_recent_jobs', 'search_jobs',
+    'count_jobs', 'get_job_count_by_source', 'get_job_count_by_company', 'get_scrape_runs',
+])
+
+# Methods that change stored data; each one invalidates every cached result
+WRITE_METHODS = frozenset(['add_job', 'mark_job_expired', 'update_job', 'upsert_jobs', 'add_scrape_run'])
+
+
+class ResultCache:
+    """TTL + LRU store of query results, optionally backed by a shared SQLite file."""
+
+    def __init__(self, ttl: float = 300, max_entries: int = 256, cache_path: str = None,
+                 max_bytes: int = 50 * 1024 * 1024, key_resolution: int = 60):
+        """
+        Args:
+            ttl: Seconds a result stays fresh
+            max_entries: Results kept in memory (least recently used are dropped first)
+            cache_path: SQLite file shared between processes (None keeps results in memory only)
+            max_bytes: Upper bound on the pickled size of results in the SQLite file
+            key_resolution: Datetime arguments are rounded down to this many seconds in keys,
+                so "since 7 days ago" asked a few seconds apart hits the same entry
+        """
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.key_resolution = key_resolution
+        self._entries = OrderedDict()  # (generation, key) -> (expires_at, value)
+        self._generation = 0
+
+        self.conn = None
+        self._total_bytes = 0
+        if cache_path:
+            self.conn = sqlite3.connect(cache_path, isolation_level=None, timeout=30)
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            # Losing the last few entries in a power cut is fine for a cache
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS results (
+                    key TEXT PRIMARY KEY,
+                    expires_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    value BLOB NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_results_accessed ON results (accessed_at);
+                CREATE TABLE IF NOT EXISTS generation (
+                    id INTEGER PRIMARY KEY CHECK (id = 1),
+                    value INTEGER NOT NULL
+                );
+                INSERT OR IGNORE INTO generation (id, value) VALUES (1, 0);
+            """)
+            self._total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+
+        # In-process stats, overall and per method
+        self.stats = {
+            'hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'expired': 0,
+            'stores': 0,
+            'evictions': 0,
+            'invalidations': 0,
+        }
+        self.methods: Dict[str, Dict[str, int]] = {}
+
+    @property
+    def generation(self) -> int:
+        """Current generation; bumped by every invalidate()."""
+        if self.conn is not None:
+            return self.conn.execute("SELECT value FROM generation WHERE id = 1").fetchone()[0]
+        return self._generation
+
+    def make_key(self, method: str, arguments: Dict[str, Any]) -> str:
+        """Cache key for a call, from its bound arguments (defaults applied)."""
+        return f"{method}({', '.join(f'{name}={self._freeze(value)}' for name, value in arguments.items())})"
+
+    def _freeze(self, value) -> str:
+        if isinstance(value, datetime) and self.key_resolution:
+            epoch = datetime(1970, 1, 1, tzinfo=value.tzinfo)
+            seconds = int((value - epoch).total_seconds())
+            return f"@{seconds - seconds % self.key_resolution}{'' if value.tzinfo is None else 'Z'}"
+        return repr(value)
+
+    def get(self, method: str, key: str, generation: int) -> Tuple[bool, Any]:
+        """
+        Look up a result.
+
+        Args:
+            method: Read method name (for per-method stats)
+            key: make_key() for the call
+            generation: The generation read before the lookup
+
+        Returns:
+            (found, value)
+        """
+        now = time.time()
+        entry = self._entries.get((generation, key))
+        if entry is not None:
+            if entry[0] > now:
+                self._entries.move_to_end((generation, key))
+                self._record(method, 'hit')
+                return True, entry[1]
+            del self._entries[(generation, key)]
+            self.stats['expired'] += 1
+
+        if self.conn is not None:
+            row = self.conn.execute("SELECT expires_at, value FROM results WHERE key = ?",
+                                    (f'{generation}:{key}',)).fetchone()
+            if row is not None and row[0] > now:
+                self.conn.execute("UPDATE results SET accessed_at = ? WHERE key = ?", (now, f'{generation}:{key}'))
+                value = pickle.loads(row[1])
+                self._remember(generation, key, row[0], value)
+                self.stats['disk_hits'] += 1
+                self._record(method, 'hit')
+                return True, value
+            if row is not None:
+                self.stats['expired'] += 1
+
+        self._record(method, 'miss')
+        return False, None
+
+    def put(self, key: str, value: Any, generation: int):
+        """
+        Store a result computed under `generation`.
+
+        Results whose generation is no longer current are dropped: a write
+        landed while the query ran, so the result may already be stale.
+        """
+        if generation != self.generation:
+            return
+        now = time.time()
+        expires_at = now + self.ttl
+        self._remember(generation, key, expires_at, value)
+        self.stats['stores'] += 1
+
+        if self.conn is None:
+            return
+        try:
+            body = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError):
+            return  # Kept in memory only
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            old = self.conn.execute("SELECT size FROM results WHERE key = ?", (f'{generation}:{key}',)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO results (key, expires_at, accessed_at, size, value) VALUES (?, ?, ?, ?, ?)",
+                (f'{generation}:{key}', expires_at, now, len(body), body)
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        self._total_bytes += len(body) - (old[0] if old else 0)
+
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _remember(self, generation: int, key: str, expires_at: float, value: Any):
+        self._entries[(generation, key)] = (expires_at, value)
+        self._entries.move_to_end((generation, key))
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats['evictions'] += 1
+
+    def _evict(self):
+        """Delete least recently used results from the SQLite file until it fits in max_bytes."""
+        # Evict down to 90% so a full cache doesn't evict on every put
+        target = self.max_bytes * 0.9
+        rows = self.conn.execute("SELECT key, size FROM results ORDER BY accessed_at").fetchall()
+        evicted = []
+        for key, size in rows:
+            if self._total_bytes <= target:
+                break
+            evicted.append((key,))
+            self._total_bytes -= size
+
+        self.conn.executemany("DELETE FROM results WHERE key = ?", evicted)
+        self.stats['evictions'] += len(evicted)
+
+    def invalidate(self):
+        """Forget every cached result (in this process and, via the SQLite file, in others)."""
+        self._entries.clear()
+        self.stats['invalidations'] += 1
+        if self.conn is None:
+            self._generation += 1
+            return
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            self.conn.execute("UPDATE generation SET value = value + 1 WHERE id = 1")
+            self.conn.execute("DELETE FROM results")
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        self._total_bytes = 0
+
+    def _record(self, method: str, outcome: str):
+        self.stats['hits' if outcome == 'hit' else 'misses'] += 1
+        counts = self.methods.setdefault(method, {'hits': 0, 'misses': 0})
+        counts['hits' if outcome == 'hit' else 'misses'] += 1
+        metrics.incr('db_cache_requests_total', method=method, outcome=outcome)
+
+    def purge_expired(self) -> int:
+        """Delete expired results; returns the number removed from the SQLite file."""
+        now = time.time()
+        for entry_key in [k for k, (expires_at, _) in self._entries.items() if expires_at <= now]:
+            del self._entries[entry_key]
+        if self.conn is None:
+            return 0
+        removed = self.conn.execute("DELETE FROM results WHERE expires_at <= ?", (now,)).rowcount
+        self._total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+        return removed
+
+    def report(self) -> Dict:
+        """Stats since this cache was created, overall and per method, plus its current size."""
+        def rate(counts):
+            lookups = counts['hits'] + counts['misses']
+            return round(counts['hits'] / lookups, 3) if lookups else 0.0
+
+        return {
+            **self.stats,
+            'hit_rate': rate(self.stats),
+            'entries': len(self._entries),
+            'size_bytes': self._total_bytes,
+            'methods': {method: {**counts, 'hit_rate': rate(counts)} for method, counts in sorted(self.methods.items())},
+        }
+
+    def close(self):
+        """Close the underlying SQLite connection, if any."""
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+class CachedDatabase:
+    """
+    Database / DynamoDatabase wrapper that answers READ_METHODS from a ResultCache.
+
+    WRITE_METHODS go to the wrapped database and then invalidate the cache;
+    everything else (iter_jobs, get_data_version, create_tables, ...) is
+    passed through unchanged. The wrapped instance is `database`.
+    """
+
+    def __init__(self, database, cache: ResultCache):
+        self.database = database
+        self.cache = cache
+
+    def __getattr__(self, name):
+        attr = getattr(self.database, name)
+        if name in READ_METHODS:
+            wrapper = self._cached(name, attr)
+        elif name in WRITE_METHODS:
+            wrapper = self._invalidating(attr)
+        else:
+            return attr
+        # Later lookups find the wrapper directly, without going through __getattr__
+        setattr(self, name, wrapper)
+        return wrapper
+
+    def _cached(self, name, method):
+        signature = inspect.signature(method)
+
+        def read(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            key = self.cache.make_key(name, bound.arguments)
+            generation = self.cache.generation
+            found, value = self.cache.get(name, key, generation)
+            if not found:
+                value = method(*args, **kwargs)
+                self.cache.put(key, value, generation)
+            return value
+
+        read.__name__ = name
+        read.__doc__ = method.__doc__
+        return read
+
+    def _invalidating(self, method):
+        def write(*args, **kwargs):
+            try:
+                return method(*args, **kwargs)
+            finally:
+                self.cache.invalidate()
+
+        write.__name__ = method.__name__
+        write.__doc__ = method.__doc__
+        return write
@@ -1,11 +1,13 @@
 """
 Database connection and operations.
 """
-from sqlalchemy import create_engine, and_
+from sqlalchemy import create_engine, and_, func, inspect, text, select, tuple_, type_coerce, String
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime, timedelta
-from typing import List, Optional
-from .models import Base, Job
+from typing import Dict, Iterator, List, Optional, Tuple
+from .models import Base, Job, ScrapeRun, JOB_COLUMNS, SALARY_COLUMNS
+from src.metrics import metrics
 
 class Database:
     """Database connection manager."""
@@ -14,20 +16,54 @@ class Database:
         self.engine = create_engine(f'sqlite:///{db_path}')
         self.Session = sessionmaker(bind=self.engine)
 
-    def create_tables(self):
-        """Create all database tables."""
+    @metrics.timed('db_operation_seconds', backend='sqlite', operation='create_tables')
+    def create_tables(self, read_only: bool = False):
+        """
+        Create all database tables and add any columns missing from older databases.
+
+        Args:
+            read_only: Accepted for interface parity with DynamoDatabase; the local
+                schema check is cheap and still needed to migrate old databases
+        """
         Base.metadata.create_all(self.engine)
+        self._add_missing_columns()
+        self._add_missing_indexes()
+
+    def _add_missing_columns(self):
+        """
+        Add model columns that an existing SQLite table does not have yet.
+
+        create_all() only creates missing tables, so databases created before a
+        column was added to the model would otherwise fail on every query.
+        """
+        inspector = inspect(self.engine)
+        with self.engine.begin() as conn:
+            for table in Base.metadata.sorted_tables:
+                existing = {col['name'] for col in inspector.get_columns(table.name)}
+                for column in table.columns:
+                    if column.name not in existing:
+                        col_type = column.type.compile(dialect=self.engine.dialect)
+                        conn.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column.name} {col_type}'))
+
+    def _add_missing_indexes(self):
+        """Create model indexes that an existing table does not have yet (create_all() skips them)."""
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(self.engine, checkfirst=True)
 
     def get_session(self):
         """Get a new database session."""
         return self.Session()
 
+    @metrics.timed('db_operation_seconds', backend='sqlite', operation='add_job')
     def add_job(self, title: str, company: str, url: str, board_source: str,
                 location: str = None, posted_date: datetime = None,
                 job_type: str = None, work_mode: str = None,
                 experience_level: str = None, description: str = None,
                 salary_min: int = None, salary_max: int = None,
-                salary_currency: str = 'USD', salary_period: str = None) -> Job:
+                salary_currency: str = 'USD', salary_period: str = None,
+                cluster_id: str = None, is_duplicate: bool = False,
+                matched_queries: str = None) -> Job:
         """
         Add a new job to the database.
 
@@ -50,7 +86,10 @@ class Database:
                 salary_min=salary_min,
                 salary_max=salary_max,
                 salary_currency=salary_currency,
-                salary_period=salary_period
+                salary_period=salary_period,
+                cluster_id=cluster_id,
+                is_duplicate=is_duplicate,
+                matched_queries=matched_queries
             )
             session.add(job)
             session.commit()
@@ -59,6 +98,7 @@ class Database:
         finally:
             session.close()
 
+    @metrics.timed('db_operation_seconds', backend='sqlite', operation='get_job_by_url')
     def get_job_by_url(self, url: str) -> Optional[Job]:
         """Get a job by its URL."""
         session = self.get_session()
@@ -67,6 +107,16 @@ class Database:
         finally:
             session.close()
 
+    @metrics.timed('db_operation_seconds', backend='sqlite', operation='get_job_by_id')
+    def get_job_by_id(self, job_id: int) -> Optional[Job]:
+        """Get a job by its ID."""
+        session = self.get_session()
+        try:
+            return session.query(Job).filter(Job.id == job_id).first()
+        finally:
+            session.close()
+
+    @metrics.timed('db_operation_seconds', backend='sqlite', operation='get_jobs_by_status')
     def get_jobs_by_status(self, status: str = 'active') -> List[Job]:
         """Get all jobs with a specific status."""
         session = self.get_session()
@@ -75,6 +125,7 @@ class Database:
         finally:
             session.close()
 
+    @metrics.timed('db_operation_seconds', backend='sqlite', operation='get_jobs_since')
     def get_jobs_since(self, since: datetime, status: str = 'active') -> List[Job]:
         """Get jobs added since a specific datetime."""
         session = self.get_session()
@@ -90,6 +141,7 @@ class Database:
         since = datetime.utcnow() - timedelta(days=days)
         return self.get_jobs_since(since, status)
 
+    @metrics.timed('db_operation_seconds', backend='sqlite', operation='mark_job_expired')
     def mark_job_expired(self, job_id: int) -> bool:
         """Mark a job as expired."""
         session = self.get_session()
@@ -103,6 +155,22 @@ class Database:
         finally:
             session.close()
 
+    @metrics.timed('db_operation_seconds', backend='sqlite', operation='update_job')
+    def update_job(self, url: str, **fields) -> bool:
+        """Overwrite fields of a job (found by URL) whose listing changed."""
+        session = self.get_session()
+        try:
+            job = session.query(Job).filter(Job.url == url).first()
+            if job:
+                for field, value in fields.items():
+                    setattr(job, field, value)
+                session.commit()
+                return True
+            return False
+        finally:
+            session.close()
+
+    @metrics.timed('db_operation_seconds', backend='sqlite', operation='search_jobs')
     def search_jobs(self, keyword: str, status: str = 'active') -> List[Job]:
         """Search jobs by keyword in title or company."""
         session = self.get_session()
@@ -117,23 +185,178 @@ class Database:
         finally:
             session.close()
 
+    @metrics.timed('db_operation_seconds', backend='sqlite', operation='get_job_count_by_source')
     def get_job_count_by_source(self) -> dict:
         """Get count of jobs grouped by board source."""
+        query = select(Job.board_source, Job.status, func.count()).group_by(Job.board_source, Job.status)
+        with self.engine.connect() as conn:
+            results = conn.execute(query).all()
+
+        stats = {}
+        for source, status, count in results:
+            if source not in stats:
+                stats[source] = {}
+            stats[source][status] = count
+        return stats
+
+    @metrics.timed('db_operation_seconds', backend='sqlite', operation='count_jobs')
+    def count_jobs(self, status: str = 'active', since: datetime = None) -> int:
+        """Number of jobs with a status, optionally only those posted since a datetime."""
+        query = select(func.count()).select_from(Job).where(Job.status == status)
+        if since:
+            query = query.where(Job.posted_date >= since)
+        with self.engine.connect() as conn:
+            return conn.execute(query).scalar()
+
+    @metrics.timed('db_operation_seconds', backend='sqlite', operation='get_job_count_by_company')
+    def get_job_count_by_company(self, status: str = 'active') -> Dict[str, int]:
+        """Get count of jobs with a status, grouped by company."""
+        query = select(Job.company, func.count()).where(Job.status == status).group_by(Job.company)
+        with self.engine.connect() as conn:
+            return dict(conn.execute(query).all())
+
+    @metrics.timed('db_operation_seconds', backend='sqlite', operation='get_salary_columns')
+    def get_salary_columns(self, status: str = 'active') -> Dict[str, list]:
+        """
+        Salary fields of every job with a salary, as one list per column.
+
+        Selects only SALARY_COLUMNS, so no ORM objects (or descriptions) are loaded;
+        posted_date values are ISO strings.
+        """
+        # Dates come back as their stored ISO text: NumPy parses those much faster than
+        # SQLAlchemy builds datetime objects. The ix_jobs_salary covering index answers
+        # the query without reading table rows.
+        selected = [type_coerce(Job.posted_date, String) if column == 'posted_date' else getattr(Job, column)
+                    for column in SALARY_COLUMNS]
+        query = select(*selected).where(
+            and_(Job.status == status, (Job.salary_min.isnot(None) | Job.salary_max.isnot(None))))
+        with self.engine.connect() as conn:
+            rows = conn.execute(query).all()
+        columns = list(zip(*rows)) or [()] * len(SALARY_COLUMNS)
+        return {column: list(values) for column, values in zip(SALARY_COLUMNS, columns)}
+
+    def iter_jobs(self, status: str = None, since: datetime = None, source: str = None,
+                  chunk_size: int = 1000, after_id: int = 0) -> Iterator[List[Dict]]:
+        """
+        Stream jobs as lists of at most chunk_size row dicts, oldest first.
+
+        Pages by primary key (WHERE id > last seen id), so each chunk is an
+        index range read and memory stays bounded however large the table is.
+
+        Args:
+            status: Only jobs with this status (None for all)
+            since: Only jobs posted at or after this datetime
+            source: Only jobs from this board
+            chunk_size: Rows per chunk
+            after_id: Start after this job ID (to resume an interrupted read)
+        """
+        table = Job.__table__
+        conditions = []
+        if status:
+            conditions.append(table.c.status == status)
+        if since:
+            conditions.append(table.c.posted_date >= since)
+        if source:
+            conditions.append(table.c.board_source == source)
+
+        last_id = after_id
+        while True:
+            query = select(table).where(and_(table.c.id > last_id, *conditions)).order_by(table.c.id).limit(chunk_size)
+            with metrics.timer('db_operation_seconds', backend='sqlite', operation='iter_jobs'):
+                with self.engine.connect() as conn:
+                    rows = [dict(row._mapping) for row in conn.execute(query)]
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1]['id']
+
+    def iter_changes(self, updated_since: datetime = None, chunk_size: int = 1000, position: Dict = None,
+                     segments: int = 1) -> Iterator[Tuple[List[Dict], Dict]]:
+        """
+        Stream jobs changed at or after updated_since as (rows, position) pairs, for sync.
+
+        A full read (no updated_since) pages by ID. An incremental one pages by
+        (updated_at, id) on ix_jobs_updated_at, oldest change first, so it reads
+        only the changed rows rather than the whole table. Passing the last
+        position back resumes an interrupted read after the last chunk returned.
+        segments is accepted for interface parity with DynamoDatabase.
+        """
+        position = position or {}
+        if updated_since is None:
+            for rows in self.iter_jobs(chunk_size=chunk_size, after_id=position.get('last_id', 0)):
+                yield rows, {'last_id': rows[-1]['id']}
+            return
+
+        table = Job.__table__
+        # IDs start at 1, so (updated_since, 0) selects updated_at >= updated_since
+        last = (datetime.fromisoformat(position['updated_at']), position['last_id']) if position \
+            else (updated_since, 0)
+        while True:
+            query = select(table).where(tuple_(table.c.updated_at, table.c.id) > last) \
+                .order_by(table.c.updated_at, table.c.id).limit(chunk_size)
+            with metrics.timer('db_operation_seconds', backend='sqlite', operation='iter_changes'):
+                with self.engine.connect() as conn:
+                    rows = [dict(row._mapping) for row in conn.execute(query)]
+            if not rows:
+                return
+            last = (rows[-1]['updated_at'], rows[-1]['id'])
+            yield rows, {'updated_at': last[0].isoformat(), 'last_id': last[1]}
+
+    @metrics.timed('db_operation_seconds', backend='sqlite', operation='upsert_jobs')
+    def upsert_jobs(self, rows: List[Dict]) -> int:
+        """
+        Insert or update jobs from iter_jobs()-style row dicts (e.g. from DynamoDB), matched by URL.
+
+        All fields are copied as given, updated_at included, so a synced row keeps the
+        timestamp it had in the source. IDs are local: new rows get the next ID and
+        existing rows keep theirs.
+        """
+        if not rows:
+            return 0
+        columns = [column for column in JOB_COLUMNS if column != 'id']
+        statement = sqlite_insert(Job.__table__)
+        statement = statement.on_conflict_do_update(
+            index_elements=['url'],
+            set_={column: statement.excluded[column] for column in columns if column != 'url'})
+        with self.engine.begin() as conn:
+            conn.execute(statement, [{column: row.get(column) for column in columns} for row in rows])
+        return len(rows)
+
+    @metrics.timed('db_operation_seconds', backend='sqlite', operation='get_data_version')
+    def get_data_version(self) -> str:
+        """Opaque token that changes whenever jobs are added or change status (for result caches)."""
+        # Answered from indexes (ix_jobs_salary, ix_jobs_updated_at) rather than the (large)
+        # table rows; MAX(updated_at) catches rows changed in place, e.g. by a sync
+        with self.engine.connect() as conn:
+            count, last_id, active, updated = conn.execute(
+                text("SELECT COUNT(*), MAX(id), SUM(status = 'active'), MAX(updated_at) FROM jobs")).one()
+        return f"{count}:{last_id}:{active}:{updated}"
+
+    def flush_data_version(self):
+        """No-op: the SQLite data version is read from the jobs table itself."""
+        pass
+
+    @metrics.timed('db_operation_seconds', backend='sqlite', operation='add_scrape_run')
+    def add_scrape_run(self, **fields) -> ScrapeRun:
+        """Record a finished tracker run (see ScrapeRun for fields)."""
+        session = self.get_session()
+        try:
+            run = ScrapeRun(**fields)
+            session.add(run)
+            session.commit()
+            session.refresh(run)
+            return run
+        finally:
+            session.close()
+
+    @metrics.timed('db_operation_seconds', backend='sqlite', operation='get_scrape_runs')
+    def get_scrape_runs(self, since: datetime = None) -> List[ScrapeRun]:
+        """Get recorded runs, oldest first, optionally only those started since a datetime."""
         session = self.get_session()
         try:
-            results = session.query(
-                Job.board_source,
-                Job.status,
-                session.query(Job.id).filter(
-                    and_(Job.board_source == Job.board_source, Job.status == Job.status)
-                ).count()
-            ).group_by(Job.board_source, Job.status).all()
-
-            stats = {}
-            for source, status, count in results:
-                if source not in stats:
-                    stats[source] = {}
-                stats[source][status] = count
-            return stats
+            query = session.query(ScrapeRun)
+            if since:
+                query = query.filter(ScrapeRun.started_at >= since)
+            return query.order_by(ScrapeRun.started_at).all()
         finally:
             session.close()
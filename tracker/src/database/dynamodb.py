@@ -1,11 +1,21 @@
 """
 DynamoDB database implementation for AWS deployment.
 """
+from botocore.exceptions import BotoCoreError, ClientError
 from pynamodb.models import Model
 from pynamodb.attributes import UnicodeAttribute, UTCDateTimeAttribute, NumberAttribute, BooleanAttribute
+from pynamodb.exceptions import ScanError
+from pynamodb.expressions.projection import create_projection_expression
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from datetime import datetime, timedelta
-from typing import List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 import os
+import queue
+import threading
+
+from src.metrics import metrics
+from .models import JOB_COLUMNS, SALARY_COLUMNS
 
 
 class JobModel(Model):
@@ -35,6 +45,13 @@ class JobModel(Model):
     salary_currency = UnicodeAttribute(null=True, default='USD')
     salary_period = UnicodeAttribute(null=True)  # 'yearly', 'hourly', 'monthly'
 
+    # Near-duplicate tracking
+    cluster_id = UnicodeAttribute(null=True)  # URL of the first job in the near-duplicate cluster
+    is_duplicate = BooleanAttribute(default=False)
+
+    # Searches that returned this job (JSON list of "query @ location")
+    matched_queries = UnicodeAttribute(null=True)
+
     # Metadata
     created_at = UTCDateTimeAttribute(default=datetime.utcnow)
     updated_at = UTCDateTimeAttribute(default=datetime.utcnow)
@@ -45,29 +62,99 @@ class JobModel(Model):
     application_status = UnicodeAttribute(default='not_applied')  # 'not_applied', 'applied', 'interview', 'rejected', 'offer'
 
 
+class ScrapeRunModel(Model):
+    """DynamoDB model for tracker run history (equivalent of the scrape_runs table)."""
+    class Meta:
+        table_name = os.getenv('DYNAMODB_RUNS_TABLE_NAME', 'job-tracker-runs')
+        region = os.getenv('AWS_REGION', 'us-east-1')
+
+    run_id = UnicodeAttribute(hash_key=True)  # ISO start timestamp
+    started_at = UTCDateTimeAttribute()
+    finished_at = UTCDateTimeAttribute(null=True)
+    duration_seconds = NumberAttribute(null=True)
+    status = UnicodeAttribute(default='success')
+
+    # Run totals
+    search_pages = NumberAttribute(default=0)
+    cards_found = NumberAttribute(default=0)
+    detail_fetches = NumberAttribute(default=0)
+    blocks = NumberAttribute(default=0)
+    new_count = NumberAttribute(default=0)
+    seen_count = NumberAttribute(default=0)
+    updated_count = NumberAttribute(default=0)
+    duplicate_count = NumberAttribute(default=0)
+    error_count = NumberAttribute(default=0)
+    error_message = UnicodeAttribute(null=True)
+
+    # Per-source breakdown (JSON object keyed by board)
+    sources = UnicodeAttribute(null=True)
+
+    # Only on the DATA_VERSION_ITEM: bumped once per batch of job writes (see DynamoDatabase.get_data_version)
+    data_version = NumberAttribute(null=True)
+
+
+# Runs-table item holding the job data version counter; not a run
+DATA_VERSION_ITEM = '#data-version'
+
+
+# Tables confirmed to exist in this process, so repeated runs (the scheduler)
+# skip the DescribeTable round trip
+_verified_tables = set()
+
+
 class DynamoDatabase:
     """DynamoDB database manager - compatible with existing Database interface."""
 
-    def __init__(self, table_name: str = None):
-        """Initialize DynamoDB connection."""
+    def __init__(self, table_name: str = None, runs_table_name: str = None, scan_segments: int = 4,
+                 host: str = None):
+        """
+        Initialize DynamoDB connection.
+
+        No requests are made here; call create_tables() to check/create the tables.
+
+        Args:
+            scan_segments: Parallel Segment/TotalSegments workers for full-table scans
+            host: Endpoint URL override, e.g. http://localhost:8000 for DynamoDB Local
+        """
         if table_name:
             JobModel.Meta.table_name = table_name
+        if runs_table_name:
+            ScrapeRunModel.Meta.table_name = runs_table_name
+        if host:
+            for model in (JobModel, ScrapeRunModel):
+                model.Meta.host = host
+                model._connection = None  # Reconnect to the new endpoint
+        self.scan_segments = scan_segments
+        # Single-job writes since the last flush_data_version()
+        self._jobs_written = False
 
-        # Create table if it doesn't exist
-        if not JobModel.exists():
-            JobModel.create_table(read_capacity_units=1, write_capacity_units=1, wait=True)
+    @metrics.timed('db_operation_seconds', backend='dynamodb', operation='create_tables')
+    def create_tables(self, read_only: bool = False):
+        """
+        Create DynamoDB tables if they don't exist.
 
-    def create_tables(self):
-        """Create DynamoDB table if it doesn't exist."""
-        if not JobModel.exists():
-            JobModel.create_table(read_capacity_units=1, write_capacity_units=1, wait=True)
+        Args:
+            read_only: Skip the existence checks entirely (read commands fail
+                on a missing table anyway, and there is nothing to read)
+        """
+        if read_only:
+            return
+        for model in (JobModel, ScrapeRunModel):
+            if model.Meta.table_name in _verified_tables:
+                continue
+            if not model.exists():
+                model.create_table(read_capacity_units=1, write_capacity_units=1, wait=True)
+            _verified_tables.add(model.Meta.table_name)
 
+    @metrics.timed('db_operation_seconds', backend='dynamodb', operation='add_job')
     def add_job(self, title: str, company: str, url: str, board_source: str,
                 location: str = None, posted_date: datetime = None,
                 job_type: str = None, work_mode: str = None,
                 experience_level: str = None, description: str = None,
                 salary_min: int = None, salary_max: int = None,
-                salary_currency: str = 'USD', salary_period: str = None) -> JobModel:
+                salary_currency: str = 'USD', salary_period: str = None,
+                cluster_id: str = None, is_duplicate: bool = False,
+                matched_queries: str = None) -> JobModel:
         """
         Add a new job to DynamoDB.
 
@@ -93,11 +180,16 @@ class DynamoDatabase:
             salary_min=salary_min,
             salary_max=salary_max,
             salary_currency=salary_currency,
-            salary_period=salary_period
+            salary_period=salary_period,
+            cluster_id=cluster_id,
+            is_duplicate=is_duplicate,
+            matched_queries=matched_queries
         )
         job.save()
+        self._jobs_written = True
         return job
 
+    @metrics.timed('db_operation_seconds', backend='dynamodb', operation='get_job_by_url')
     def get_job_by_url(self, url: str) -> Optional[JobModel]:
         """Get a job by its URL."""
         try:
@@ -105,34 +197,74 @@ class DynamoDatabase:
         except JobModel.DoesNotExist:
             return None
 
+    @metrics.timed('db_operation_seconds', backend='dynamodb', operation='get_job_by_id')
+    def get_job_by_id(self, job_id: int) -> Optional[JobModel]:
+        """Get a job by its numeric ID."""
+        # 'id' is not a key attribute, so this scans; closing the scan at the first
+        # match stops the other segments
+        with closing(self._scan_segments(JobModel.id == job_id, operation='get_job_by_id')) as pages:
+            for _, jobs, _, _ in pages:
+                if jobs:
+                    return jobs[0]
+        return None
+
+    @metrics.timed('db_operation_seconds', backend='dynamodb', operation='get_jobs_by_status')
     def get_jobs_by_status(self, status: str = 'active') -> List[JobModel]:
         """Get all jobs with a specific status."""
         # Note: This requires a Global Secondary Index on 'status' for efficiency
-        # For now, we scan the entire table (acceptable for small datasets)
-        return list(JobModel.scan(JobModel.status == status))
+        # For now, we scan the entire table (in parallel segments)
+        return self._scan_jobs(JobModel.status == status, operation='get_jobs_by_status')
 
+    @metrics.timed('db_operation_seconds', backend='dynamodb', operation='get_jobs_since')
     def get_jobs_since(self, since: datetime, status: str = 'active') -> List[JobModel]:
         """Get jobs added since a specific datetime."""
-        jobs = JobModel.scan(
-            (JobModel.posted_date >= since) & (JobModel.status == status)
-        )
-        return sorted(list(jobs), key=lambda x: x.posted_date, reverse=True)
+        jobs = self._scan_jobs((JobModel.posted_date >= since) & (JobModel.status == status),
+                               operation='get_jobs_since')
+        return sorted(jobs, key=lambda x: x.posted_date, reverse=True)
+
+    @metrics.timed('db_operation_seconds', backend='dynamodb', operation='count_jobs')
+    def count_jobs(self, status: str = 'active', since: datetime = None) -> int:
+        """Number of jobs with a status, optionally only those posted since a datetime."""
+        # Select=COUNT: DynamoDB returns counts only, no items
+        condition = JobModel.status == status
+        if since:
+            condition = condition & (JobModel.posted_date >= since)
+        return sum(count for _, _, count, _ in
+                   self._scan_segments(condition, count_only=True, operation='count_jobs'))
 
     def get_recent_jobs(self, days: int = 7, status: str = 'active') -> List[JobModel]:
         """Get jobs from the last N days."""
         since = datetime.utcnow() - timedelta(days=days)
         return self.get_jobs_since(since, status)
 
+    @metrics.timed('db_operation_seconds', backend='dynamodb', operation='mark_job_expired')
     def mark_job_expired(self, url: str) -> bool:
         """Mark a job as expired by URL."""
         try:
             job = JobModel.get(url)
             job.status = 'expired'
+            job.updated_at = datetime.utcnow()  # Picked up by the next sync
+            job.save()
+            self._jobs_written = True
+            return True
+        except JobModel.DoesNotExist:
+            return False
+
+    @metrics.timed('db_operation_seconds', backend='dynamodb', operation='update_job')
+    def update_job(self, url: str, **fields) -> bool:
+        """Overwrite fields of a job (found by URL) whose listing changed."""
+        try:
+            job = JobModel.get(url)
+            for field, value in fields.items():
+                setattr(job, field, value)
+            job.updated_at = datetime.utcnow()  # Picked up by the next sync
             job.save()
+            self._jobs_written = True
             return True
         except JobModel.DoesNotExist:
             return False
 
+    @metrics.timed('db_operation_seconds', backend='dynamodb', operation='search_jobs')
     def search_jobs(self, keyword: str, status: str = 'active') -> List[JobModel]:
         """Search jobs by keyword in title or company."""
         keyword_lower = keyword.lower()
@@ -144,19 +276,276 @@ class DynamoDatabase:
             if keyword_lower in job.title.lower() or keyword_lower in job.company.lower()
         ]
 
+    @metrics.timed('db_operation_seconds', backend='dynamodb', operation='get_job_count_by_source')
     def get_job_count_by_source(self) -> dict:
         """Get count of jobs grouped by board source."""
-        all_jobs = list(JobModel.scan())
-
+        # Projected scan: counted page by page as segments return them, without
+        # holding (or transferring) full items
         stats = {}
-        for job in all_jobs:
-            source = job.board_source
-            status = job.status
+        for _, jobs, _, _ in self._scan_segments(attributes_to_get=['board_source', 'status'],
+                                                 operation='get_job_count_by_source'):
+            for job in jobs:
+                by_status = stats.setdefault(job.board_source, {})
+                by_status[job.status] = by_status.get(job.status, 0) + 1
+        return stats
 
-            if source not in stats:
-                stats[source] = {}
-            if status not in stats[source]:
-                stats[source][status] = 0
-            stats[source][status] += 1
+    @metrics.timed('db_operation_seconds', backend='dynamodb', operation='get_job_count_by_company')
+    def get_job_count_by_company(self, status: str = 'active') -> Dict[str, int]:
+        """Get count of jobs with a status, grouped by company."""
+        counts = {}
+        for _, jobs, _, _ in self._scan_segments(JobModel.status == status, attributes_to_get=['company'],
+                                                 operation='get_job_count_by_company'):
+            for job in jobs:
+                counts[job.company] = counts.get(job.company, 0) + 1
+        return counts
 
-        return stats
+    @metrics.timed('db_operation_seconds', backend='dynamodb', operation='get_salary_columns')
+    def get_salary_columns(self, status: str = 'active') -> Dict[str, list]:
+        """Salary fields of every job with a salary, as one list per column."""
+        # Projected scan: only the salary columns are read back, not descriptions
+        pages = self._scan_segments(
+            (JobModel.status == status) & (JobModel.salary_min.exists() | JobModel.salary_max.exists()),
+            attributes_to_get=list(SALARY_COLUMNS), operation='get_salary_columns')
+        columns = {column: [] for column in SALARY_COLUMNS}
+        for _, jobs, _, _ in pages:
+            for job in jobs:
+                for column, values in columns.items():
+                    values.append(getattr(job, column, None))
+        # Same shape as the SQLite backend: naive UTC ISO strings
+        columns['posted_date'] = [date.replace(tzinfo=None).isoformat() if date else None
+                                  for date in columns['posted_date']]
+        return columns
+
+    @staticmethod
+    def _job_row(job: JobModel) -> Dict:
+        """JOB_COLUMNS dict for a job, with naive UTC datetimes like the SQLite backend."""
+        row = {column: getattr(job, column, None) for column in JOB_COLUMNS}
+        for column, value in row.items():
+            if isinstance(value, datetime):
+                row[column] = value.replace(tzinfo=None)
+        return row
+
+    def iter_jobs(self, status: str = None, since: datetime = None, source: str = None,
+                  chunk_size: int = 1000) -> Iterator[List[Dict]]:
+        """
+        Stream jobs as lists of at most chunk_size row dicts (in scan order).
+
+        The scan is paginated by DynamoDB, one page of chunk_size items at a
+        time, so memory stays bounded however large the table is.
+        """
+        condition = None
+        for part in (JobModel.status == status if status else None,
+                     JobModel.posted_date >= since if since else None,
+                     JobModel.board_source == source if source else None):
+            if part is not None:
+                condition = part if condition is None else condition & part
+
+        chunk = []
+        for job in JobModel.scan(condition, page_size=chunk_size):
+            chunk.append(self._job_row(job))
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    @staticmethod
+    def _scan_page(condition=None, attributes_to_get: List[str] = None, count_only: bool = False,
+                   segment: int = 0, segments: int = 1, start_key: Dict = None,
+                   limit: int = None) -> Dict:
+        """
+        One Scan request on the jobs table; returns the raw response.
+
+        Issued below Model.scan() so it can ask for Select=COUNT and read
+        ConsumedCapacity. Projections and COUNT cut the data transferred, not the
+        read capacity: DynamoDB charges a scan for the full size of every item it reads.
+        """
+        names, values = {}, {}
+        kwargs = {'TableName': JobModel.Meta.table_name, 'Segment': segment, 'TotalSegments': segments,
+                  'ReturnConsumedCapacity': 'TOTAL'}
+        if condition is not None:
+            kwargs['FilterExpression'] = condition.serialize(names, values)
+        if count_only:
+            kwargs['Select'] = 'COUNT'
+        elif attributes_to_get:
+            kwargs['ProjectionExpression'] = create_projection_expression(attributes_to_get, names)
+        if names:
+            kwargs['ExpressionAttributeNames'] = {placeholder: name for name, placeholder in names.items()}
+        if values:
+            kwargs['ExpressionAttributeValues'] = values
+        if start_key:
+            kwargs['ExclusiveStartKey'] = start_key
+        if limit:
+            kwargs['Limit'] = limit
+        try:
+            return JobModel._get_connection().connection.dispatch('Scan', kwargs)
+        except (BotoCoreError, ClientError) as e:
+            raise ScanError(f"Failed to scan table: {e}", e)
+
+    def _scan_segments(self, condition=None, attributes_to_get: List[str] = None, count_only: bool = False,
+                       segments: int = None, page_size: int = None, start_keys: Dict = None,
+                       operation: str = 'scan') -> Iterator[Tuple[int, List[JobModel], int, Optional[Dict]]]:
+        """
+        Parallel scan: one thread per Segment/TotalSegments slice of the jobs table.
+
+        Yields (segment, jobs, count, last_key) for each page as workers receive
+        it, so callers can aggregate page by page instead of materializing the
+        table. count is the page's match count (jobs is empty with count_only).
+        last_key is where the segment's scan resumes, or None once it is
+        finished. Workers hand pages over through a bounded queue, so memory
+        stays at a few pages however large the table is. Consumed read capacity
+        is added to the dynamodb_consumed_capacity_total counter.
+
+        Args:
+            segments: Parallel workers (default: scan_segments)
+            page_size: Items evaluated per request (default: up to 1 MB per page)
+            start_keys: {str(segment): last_key} from an earlier scan with the same
+                number of segments; segments mapped to None are skipped as finished
+        """
+        segments = segments or self.scan_segments
+        start_keys = start_keys or {}
+        pending = [segment for segment in range(segments)
+                   if str(segment) not in start_keys or start_keys[str(segment)] is not None]
+        if not pending:
+            return
+        JobModel._get_connection().connection.client  # Create the (thread-safe) client before the threads share it
+        pages = queue.Queue(maxsize=2 * len(pending))
+        stop = threading.Event()
+
+        def put(item):
+            while not stop.is_set():
+                try:
+                    pages.put(item, timeout=0.1)
+                    return
+                except queue.Full:
+                    continue
+
+        def worker(segment):
+            try:
+                start_key = start_keys.get(str(segment))
+                while not stop.is_set():
+                    data = self._scan_page(condition, attributes_to_get, count_only, segment, segments,
+                                           start_key, page_size)
+                    start_key = data.get('LastEvaluatedKey')
+                    jobs = [JobModel.from_raw_data(item) for item in data.get('Items', [])]
+                    capacity = data.get('ConsumedCapacity', {}).get('CapacityUnits', 0)
+                    put((segment, jobs, data.get('Count', 0), start_key, capacity))
+                    if start_key is None:
+                        return
+            except Exception as e:
+                put(e)
+
+        with ThreadPoolExecutor(max_workers=len(pending), thread_name_prefix='scan') as pool:
+            for segment in pending:
+                pool.submit(worker, segment)
+            try:
+                remaining = len(pending)
+                while remaining:
+                    item = pages.get()
+                    if isinstance(item, Exception):
+                        raise item
+                    segment, jobs, count, last_key, capacity = item
+                    # Recorded here rather than in the workers: the registry is not thread-safe
+                    metrics.incr('dynamodb_consumed_capacity_total', capacity, operation=operation)
+                    if last_key is None:
+                        remaining -= 1
+                    yield segment, jobs, count, last_key
+            finally:
+                # Stops workers if the consumer gives up early or a segment failed
+                stop.set()
+
+    def _scan_jobs(self, condition=None, operation: str = 'scan') -> List[JobModel]:
+        """Every job matching condition, read with a parallel scan."""
+        return [job for _, jobs, _, _ in self._scan_segments(condition, operation=operation) for job in jobs]
+
+    def iter_changes(self, updated_since: datetime = None, chunk_size: int = 1000, position: Dict = None,
+                     segments: int = 4) -> Iterator[Tuple[List[Dict], Dict]]:
+        """
+        Stream jobs changed at or after updated_since as (rows, position) pairs, for sync.
+
+        Reads with `segments` parallel scans, chunk_size items per request.
+        position records where each segment's scan stopped; passing the last
+        position back resumes an interrupted read (with the same number of
+        segments) where it left off.
+        """
+        condition = JobModel.updated_at >= updated_since if updated_since else None
+        if not position or position.get('segments') != segments:
+            position = {'segments': segments, 'keys': {}}
+        keys = dict(position['keys'])
+        for segment, jobs, _, last_key in self._scan_segments(condition, segments=segments, page_size=chunk_size,
+                                                              start_keys=keys, operation='iter_changes'):
+            keys[str(segment)] = last_key
+            # Pages the filter emptied only advance the position
+            if jobs or last_key is None:
+                yield [self._job_row(job) for job in jobs], {'segments': segments, 'keys': dict(keys)}
+
+    @metrics.timed('db_operation_seconds', backend='dynamodb', operation='upsert_jobs')
+    def upsert_jobs(self, rows: List[Dict]) -> int:
+        """
+        Write jobs from iter_jobs()-style row dicts (e.g. from SQLite) with BatchWriteItem.
+
+        Items are keyed by URL and replaced whole, updated_at included, so a synced
+        job keeps the timestamp it had in the source. IDs are per backend: existing
+        items keep theirs (one BatchGetItem per 100 rows) and new ones get one as in
+        add_job().
+        """
+        if not rows:
+            return 0
+        existing = {job.url: job.id for job in
+                    JobModel.batch_get({row['url'] for row in rows}, attributes_to_get=['url', 'id'])}
+        next_id = int(datetime.utcnow().timestamp() * 1000000)
+        with JobModel.batch_write() as batch:
+            for offset, row in enumerate(rows):
+                # Unset fields fall back to the model defaults
+                fields = {column: value for column, value in row.items()
+                          if column in JOB_COLUMNS and column != 'id' and value is not None}
+                batch.save(JobModel(id=existing.get(row['url'], next_id + offset), **fields))
+        # One bump per batch, taking any pending single-job writes with it
+        self._jobs_written = False
+        self._bump_data_version()
+        return len(rows)
+
+    @metrics.timed('db_operation_seconds', backend='dynamodb', operation='get_data_version')
+    def get_data_version(self) -> str:
+        """Opaque token that changes whenever jobs are added or change status (for result caches)."""
+        # A counter bumped once per batch or run of job writes: one strongly consistent
+        # GetItem instead of a jobs scan
+        try:
+            item = ScrapeRunModel.get(DATA_VERSION_ITEM, consistent_read=True)
+        except ScrapeRunModel.DoesNotExist:
+            return 'jobs:0'
+        return f"jobs:{int(item.data_version or 0)}"
+
+    def flush_data_version(self):
+        """
+        Advance the data version if jobs were added, updated or expired since the last flush.
+
+        Single-job writes don't touch the counter themselves (that would be a second
+        write per job, all on one hot item); callers flush once after a batch of them,
+        e.g. at the end of a tracker run.
+        """
+        if self._jobs_written:
+            self._jobs_written = False
+            self._bump_data_version()
+
+    @staticmethod
+    def _bump_data_version():
+        """Atomically increment the job data version counter (creating it on first use)."""
+        ScrapeRunModel(DATA_VERSION_ITEM).update(actions=[ScrapeRunModel.data_version.add(1)])
+
+    @metrics.timed('db_operation_seconds', backend='dynamodb', operation='add_scrape_run')
+    def add_scrape_run(self, **fields) -> ScrapeRunModel:
+        """Record a finished tracker run (see ScrapeRunModel for fields)."""
+        run = ScrapeRunModel(run_id=fields['started_at'].isoformat(), **fields)
+        run.save()
+        return run
+
+    @metrics.timed('db_operation_seconds', backend='dynamodb', operation='get_scrape_runs')
+    def get_scrape_runs(self, since: datetime = None) -> List[ScrapeRunModel]:
+        """Get recorded runs, oldest first, optionally only those started since a datetime."""
+        # The runs table gets a handful of items per day, so a scan is cheap
+        if since:
+            runs = ScrapeRunModel.scan(ScrapeRunModel.started_at >= since)
+        else:
+            runs = ScrapeRunModel.scan()
+        return sorted((run for run in runs if run.run_id != DATA_VERSION_ITEM), key=lambda run: run.started_at)
@@ -7,7 +7,22 @@ import sys
 # Add parent directory to path to import config
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from config.settings import DATABASE_TYPE, DATABASE_PATH, DYNAMODB_TABLE_NAME
+from config.settings import (DATABASE_TYPE, DATABASE_PATH, DYNAMODB_TABLE_NAME, DYNAMODB_RUNS_TABLE_NAME,
+                             DYNAMODB_ENDPOINT, DYNAMODB_SCAN_SEGMENTS,
+                             DB_CACHE_ENABLED, DB_CACHE_TTL, DB_CACHE_MAX_ENTRIES, DB_CACHE_PATH, DB_CACHE_MAX_MB)
+from src.database.cache import CachedDatabase, ResultCache
+
+# Result cache kept across scheduled runs in the same process
+_result_cache = None
+
+
+def get_result_cache():
+    """The process-wide ResultCache, or None if DB_CACHE_ENABLED is off."""
+    global _result_cache
+    if _result_cache is None and DB_CACHE_ENABLED:
+        _result_cache = ResultCache(ttl=DB_CACHE_TTL, max_entries=DB_CACHE_MAX_ENTRIES,
+                                    cache_path=DB_CACHE_PATH or None, max_bytes=DB_CACHE_MAX_MB * 1024 * 1024)
+    return _result_cache
 
 
 def get_database():
@@ -15,13 +30,18 @@ def get_database():
     Factory function to get the appropriate database instance.
 
     Returns:
-        Database instance (either SQLite or DynamoDB based on DATABASE_TYPE)
+        Database instance (either SQLite or DynamoDB based on DATABASE_TYPE),
+        wrapped in a CachedDatabase unless DB_CACHE_ENABLED is off
     """
     if DATABASE_TYPE.lower() == 'dynamodb':
         from src.database.dynamodb import DynamoDatabase
         print(f"Using DynamoDB (table: {DYNAMODB_TABLE_NAME})")
-        return DynamoDatabase(table_name=DYNAMODB_TABLE_NAME)
+        database = DynamoDatabase(table_name=DYNAMODB_TABLE_NAME, runs_table_name=DYNAMODB_RUNS_TABLE_NAME,
+                                  scan_segments=DYNAMODB_SCAN_SEGMENTS, host=DYNAMODB_ENDPOINT or None)
     else:
         from src.database.db import Database
         print(f"Using SQLite (path: {DATABASE_PATH})")
-        return Database(db_path=DATABASE_PATH)
+        database = Database(db_path=DATABASE_PATH)
+
+    cache = get_result_cache()
+    return CachedDatabase(database, cache) if cache is not None else database
@@ -1,12 +1,16 @@
 """
 Database models using SQLAlchemy.
 """
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, Float, Index
 from sqlalchemy.ext.declarative import declarative_base
 from datetime import datetime
 
 Base = declarative_base()
 
+# Job fields loaded by salary analytics (see get_salary_columns)
+SALARY_COLUMNS = ('salary_min', 'salary_max', 'salary_period', 'salary_currency', 'company', 'location',
+                  'board_source', 'posted_date')
+
 class Job(Base):
     """Job listing model."""
     __tablename__ = 'jobs'
@@ -32,14 +36,60 @@ class Job(Base):
     salary_currency = Column(String, default='USD')
     salary_period = Column(String)  # 'yearly', 'hourly', 'monthly'
 
+    # Near-duplicate tracking
+    cluster_id = Column(String)  # URL of the first job in the near-duplicate cluster
+    is_duplicate = Column(Boolean, default=False)
+
+    # Searches that returned this job (JSON list of "query @ location")
+    matched_queries = Column(Text)
+
     # Metadata
     created_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, index=True)  # Sync watermark
 
     # Application tracking
     applied = Column(Boolean, default=False)
     applied_date = Column(DateTime)
     application_status = Column(String, default='not_applied')  # 'not_applied', 'applied', 'interview', 'rejected', 'offer'
 
+    __table_args__ = (
+        # Covering index for salary analytics: answers get_salary_columns() without
+        # reading table rows, which carry the full description
+        Index('ix_jobs_salary', 'status', *SALARY_COLUMNS),
+    )
+
     def __repr__(self):
         return f"<Job(title='{self.title}', company='{self.company}')>"
+
+
+# Job fields in table order, shared by both backends (e.g. for exports)
+JOB_COLUMNS = tuple(Job.__table__.columns.keys())
+
+
+class ScrapeRun(Base):
+    """One tracker run, for trend analysis of duration, yield and block rate."""
+    __tablename__ = 'scrape_runs'
+
+    id = Column(Integer, primary_key=True)
+    started_at = Column(DateTime, nullable=False, index=True)
+    finished_at = Column(DateTime)
+    duration_seconds = Column(Float)
+    status = Column(String, default='success')  # 'success', 'error'
+
+    # Run totals
+    search_pages = Column(Integer, default=0)
+    cards_found = Column(Integer, default=0)
+    detail_fetches = Column(Integer, default=0)
+    blocks = Column(Integer, default=0)
+    new_count = Column(Integer, default=0)
+    seen_count = Column(Integer, default=0)
+    updated_count = Column(Integer, default=0)
+    duplicate_count = Column(Integer, default=0)
+    error_count = Column(Integer, default=0)
+    error_message = Column(Text)
+
+    # Per-source breakdown (JSON object keyed by board)
+    sources = Column(Text)
+
+    def __repr__(self):
+        return f"<ScrapeRun(started_at='{self.started_at}', status='{self.status}')>"
@@ -3,92 +3,383 @@ Main entry point for the Job Board Tracker application.
 """
 import sys
 import os
+from datetime import datetime
 
 # Add parent directory to path to import config
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from config.settings import (
-    DATABASE_PATH, SEARCH_QUERY, LOCATION
+    DATABASE_PATH, SEARCH_QUERY, LOCATION, SEARCHES,
+    DEDUPE_ENABLED, DEDUPE_INDEX_PATH, DEDUPE_THRESHOLD,
+    RANKING_ENABLED, RANKING_INDEX_PATH, CANDIDATE_SKILLS, CANDIDATE_TITLES, CANDIDATE_MIN_SALARY,
+    SIMILARITY_ENABLED, SIMILARITY_INDEX_DIR, SIMILARITY_DIMS,
+    KEYWORDS_FILTER, KEYWORDS_EXCLUDE,
+    TASK_QUEUE_ENABLED, TASK_QUEUE_PATH, TASK_MAX_ATTEMPTS, TASK_LEASE_SECONDS, TASK_BACKOFF_SECONDS,
+    BROWSER_MEMORY_LIMIT_MB, BROWSER_RECYCLE_FRACTION, BROWSER_PAGE_TIMEOUT_SECONDS, BROWSER_MAX_PAGES,
+    BROWSER_LOW_MEMORY, PARSE_WORKERS,
+    CIRCUIT_BREAKER_ENABLED, CIRCUIT_BREAKER_PATH, CIRCUIT_BREAKER_BLOCK_RATIO, CIRCUIT_BREAKER_ERROR_RATIO,
+    CIRCUIT_BREAKER_MIN_REQUESTS, CIRCUIT_BREAKER_COOLDOWN_SECONDS,
+    PAGE_CACHE_ENABLED, PAGE_CACHE_PATH, PAGE_CACHE_SEARCH_TTL, PAGE_CACHE_DETAIL_TTL, PAGE_CACHE_MAX_MB,
+    METRICS_REPORT_PATH, METRICS_PROMETHEUS_PATH, AWS_REGION,
+    SNAPSHOT_DIR, SNAPSHOT_S3_BUCKET, SNAPSHOT_S3_PREFIX, SNAPSHOT_S3_ENDPOINT, SNAPSHOT_PAGE_SIZE, SNAPSHOT_KEEP,
+    NOTIFY_ON_NEW_JOBS, NOTIFY_DIGEST_WINDOW_MINUTES, NOTIFY_MAX_ATTEMPTS,
+    SMTP_SERVER, SMTP_PORT, SMTP_USE_TLS, SENDER_EMAIL, SENDER_PASSWORD, RECIPIENT_EMAIL,
+    PROFILE_ENABLED, PROFILE_OUTPUT_DIR, PROFILE_INTERVAL_MS, PROFILE_TOP_N
 )
-from src.database.factory import get_database
-from src.scrapers.indeed_scraper import IndeedScraper
-from src.scrapers.linkedin_scraper import LinkedInScraper
+from src import profiling
+from src.metrics import metrics
+from src.database.factory import get_database, get_result_cache
 from src.tracker.monitor import JobMonitor
 from src.cli.commands import CLI
 
-def run_scraper():
-    """Run the job scraper."""
+# Scrapers, the dedupe/ranking/similarity indexes (numpy) and the scrape-only helpers are imported
+# inside _run_scraper so CLI commands don't pay for Playwright/Selenium startup.
+
+# Email notifier kept across scheduled runs so digests can span a time window
+_notifier = None
+
+
+def _recipients():
+    return [address.strip() for address in RECIPIENT_EMAIL.split(',') if address.strip()]
+
+
+def get_notifier():
+    """The process-wide EmailNotifier, or None if notifications are off or not configured."""
+    global _notifier
+    if _notifier is None and NOTIFY_ON_NEW_JOBS and SENDER_EMAIL and _recipients():
+        from src.notifications.email_notifier import EmailNotifier
+        _notifier = EmailNotifier(
+            SMTP_SERVER, SMTP_PORT, SENDER_EMAIL, SENDER_PASSWORD,
+            use_tls=SMTP_USE_TLS,
+            max_attempts=NOTIFY_MAX_ATTEMPTS,
+            digest_window_seconds=NOTIFY_DIGEST_WINDOW_MINUTES * 60
+        )
+    return _notifier
+
+
+def close_notifier():
+    """Send any pending digest and wait for queued emails to be delivered."""
+    global _notifier
+    if _notifier is None:
+        return
+    _notifier.flush(_recipients(), force=True)
+    _notifier.close()
+    report = _notifier.report()
+    print(f"Notifications: {report['sent']} sent, {report['failed']} failed, {report['retries']} retries")
+    _notifier = None
+
+
+def run_scraper(profile: bool = None):
+    """
+    Run the job scraper.
+
+    Args:
+        profile: Sample the run with the built-in profiler (defaults to PROFILE_ENABLED)
+    """
+    enabled = PROFILE_ENABLED if profile is None else profile
+    with profiling.profiled(enabled, PROFILE_OUTPUT_DIR, PROFILE_INTERVAL_MS / 1000, PROFILE_TOP_N):
+        _run_scraper()
+
+def _run_scraper():
+    from src.scrapers.keyword_filter import KeywordFilter
+    from src.scrapers.page_cache import PageCache
+    from src.scrapers.browser_manager import BrowserManager
+    from src.scrapers.parse_pool import ParsePool
+    from src.tracker.dedupe import NearDuplicateIndex
+    from src.tracker.ranking import CandidateProfile, RelevanceIndex
+    from src.tracker.similarity import SimilarityIndex
+    from src.tracker.search_plan import MultiSearchRunner, load_scraper_class, parse_searches
+    from src.tracker.task_queue import DetailTaskQueue
+    from src.tracker.circuit_breaker import CircuitBreaker
+    from src.tracker.run_history import build_run_record
+
     print("=" * 60)
     print("Job Board Tracker - Starting...")
     print("=" * 60)
+    metrics.reset()
+    started_at = datetime.utcnow()
 
     # Initialize database
     print(f"\nInitializing database...")
-    db = get_database()
-    db.create_tables()
+    with metrics.timer('run_stage_seconds', stage='db_init'):
+        db = get_database()
+        db.create_tables()
     print("✓ Database initialized")
 
-    # Initialize monitor
-    monitor = JobMonitor(db)
+    # Initialize monitor (with near-duplicate index if enabled)
+    dedupe_index = None
+    if DEDUPE_ENABLED:
+        dedupe_index = NearDuplicateIndex(DEDUPE_INDEX_PATH, threshold=DEDUPE_THRESHOLD)
+        print(f"✓ Near-duplicate index loaded ({len(dedupe_index)} jobs)")
+    ranking_index = None
+    candidate = CandidateProfile(CANDIDATE_SKILLS, CANDIDATE_TITLES, CANDIDATE_MIN_SALARY)
+    if RANKING_ENABLED and candidate:
+        # Loading the index reads every stored vector; without a profile nothing is ranked,
+        # and the `top` command indexes the jobs this run skips on first use
+        ranking_index = RelevanceIndex(RANKING_INDEX_PATH)
+        print(f"✓ Relevance index loaded ({len(ranking_index)} jobs)")
+    similarity_index = None
+    if SIMILARITY_ENABLED:
+        # Stays empty until the `similar` command fits a model
+        similarity_index = SimilarityIndex(SIMILARITY_INDEX_DIR, dims=SIMILARITY_DIMS)
+    monitor = JobMonitor(db, dedupe_index=dedupe_index, ranking_index=ranking_index,
+                         similarity_index=similarity_index)
 
     # Initialize scrapers
-    print(f"\nSearch Query: '{SEARCH_QUERY}'")
-    print(f"Location: '{LOCATION}'")
+    searches = parse_searches(SEARCHES, SEARCH_QUERY, LOCATION)
+    print("\nSearches:")
+    for spec in searches:
+        print(f"  - [{spec.board}] '{spec.query}' in '{spec.location}'")
+    keyword_filter = KeywordFilter(include=KEYWORDS_FILTER, exclude=KEYWORDS_EXCLUDE)
+    if keyword_filter:
+        print(f"Keyword filter: include={KEYWORDS_FILTER} exclude={KEYWORDS_EXCLUDE}")
     print("\nScraping job boards...")
 
+    task_queue = None
+    if TASK_QUEUE_ENABLED:
+        task_queue = DetailTaskQueue(
+            TASK_QUEUE_PATH,
+            lease_seconds=TASK_LEASE_SECONDS,
+            max_attempts=TASK_MAX_ATTEMPTS,
+            backoff_base=TASK_BACKOFF_SECONDS
+        )
+
+    page_cache = None
+    if PAGE_CACHE_ENABLED:
+        page_cache = PageCache(
+            PAGE_CACHE_PATH,
+            ttls={'search': PAGE_CACHE_SEARCH_TTL, 'detail': PAGE_CACHE_DETAIL_TTL},
+            max_bytes=PAGE_CACHE_MAX_MB * 1024 * 1024
+        )
+
+    browser_manager = BrowserManager(
+        memory_limit_mb=BROWSER_MEMORY_LIMIT_MB,
+        recycle_fraction=BROWSER_RECYCLE_FRACTION,
+        page_timeout=BROWSER_PAGE_TIMEOUT_SECONDS,
+        max_pages_per_browser=BROWSER_MAX_PAGES,
+        low_memory=BROWSER_LOW_MEMORY
+    )
+    # Start parse workers now, while no browser process exists to be forked along
+    parse_pool = ParsePool(workers=PARSE_WORKERS)
+
+    circuit_breaker = None
+    if CIRCUIT_BREAKER_ENABLED:
+        circuit_breaker = CircuitBreaker(
+            CIRCUIT_BREAKER_PATH,
+            block_ratio=CIRCUIT_BREAKER_BLOCK_RATIO,
+            error_ratio=CIRCUIT_BREAKER_ERROR_RATIO,
+            min_requests=CIRCUIT_BREAKER_MIN_REQUESTS,
+            cooldown_seconds=CIRCUIT_BREAKER_COOLDOWN_SECONDS
+        )
+
+    runner = MultiSearchRunner(
+        searches,
+        {board: load_scraper_class(board) for board in dict.fromkeys(spec.board for spec in searches)},
+        keyword_filter=keyword_filter,
+        task_queue=task_queue,
+        page_cache=page_cache,
+        circuit_breaker=circuit_breaker,
+        browser_manager=browser_manager,
+        parse_pool=parse_pool
+    )
+
     all_new_jobs = []
     total_scraped = 0
     total_new = 0
     total_seen_again = 0
+    total_updated = 0
+    total_duplicates = 0
+    board_results = {}
 
-    # Scrape Indeed
-    print("\n[1/2] Scraping Indeed...")
-    indeed_scraper = IndeedScraper(SEARCH_QUERY, LOCATION)
-    indeed_jobs = indeed_scraper.scrape()
-
-    # Process Indeed jobs
-    print(f"Processing {len(indeed_jobs)} jobs from Indeed...")
-    indeed_results = monitor.process_jobs(indeed_jobs, 'indeed')
-    all_new_jobs.extend(indeed_results['new'])
-    total_scraped += indeed_results['total_processed']
-    total_new += indeed_results['new_count']
-    total_seen_again += indeed_results['seen_again_count']
-
-    # Scrape LinkedIn
-    print("\n[2/2] Scraping LinkedIn...")
-    linkedin_scraper = LinkedInScraper(SEARCH_QUERY, LOCATION)
-    linkedin_jobs = linkedin_scraper.scrape()
-
-    # Process LinkedIn jobs
-    print(f"Processing {len(linkedin_jobs)} jobs from LinkedIn...")
-    linkedin_results = monitor.process_jobs(linkedin_jobs, 'linkedin')
-    all_new_jobs.extend(linkedin_results['new'])
-    total_scraped += linkedin_results['total_processed']
-    total_new += linkedin_results['new_count']
-    total_seen_again += linkedin_results['seen_again_count']
-
-    # Display results
-    print("\n" + "=" * 60)
-    print("RESULTS")
-    print("=" * 60)
-    print(f"Total jobs scraped: {total_scraped}")
-    print(f"New jobs found: {total_new}")
-    print(f"Previously seen: {total_seen_again}")
-
-    # Show new jobs
-    if total_new > 0:
-        print("\n--- NEW JOBS ---")
-        for job in all_new_jobs:
-            print(f"\n• {job.title}")
-            print(f"  Company: {job.company}")
-            print(f"  Location: {job.location or 'N/A'}")
-            if job.salary_min and job.salary_max:
-                if job.salary_min == job.salary_max:
-                    print(f"  Salary: ${job.salary_min:,} {job.salary_period or 'yearly'}")
-                else:
-                    print(f"  Salary: ${job.salary_min:,} - ${job.salary_max:,} {job.salary_period or 'yearly'}")
-            print(f"  Source: {job.board_source}")
-            print(f"  URL: {job.url}")
+    run_error = None
+    boards = runner.boards()
+    try:
+        for i, board in enumerate(boards, 1):
+            # Scrape all searches for this board, fetching each unique job once
+            print(f"\n[{i}/{len(boards)}] Scraping {board.capitalize()}...")
+            with metrics.timer('run_stage_seconds', stage='scrape', board=board), profiling.stage('scrape'):
+                board_jobs = runner.run_board(board)
+
+            # Process jobs
+            print(f"Processing {len(board_jobs)} jobs from {board.capitalize()}...")
+            with metrics.timer('run_stage_seconds', stage='ingest', board=board), profiling.stage('ingest'):
+                results = monitor.process_jobs(board_jobs, board)
+                runner.ack(board)
+            board_results[board] = {
+                'scraped': results['total_processed'],
+                'new': results['new_count'],
+                'seen_again': results['seen_again_count'],
+                'updated': results['updated_count'],
+                'duplicates': results['duplicate_count'],
+            }
+            all_new_jobs.extend(results['new'])
+            total_scraped += results['total_processed']
+            total_new += results['new_count']
+            total_seen_again += results['seen_again_count']
+            total_updated += results['updated_count']
+            total_duplicates += results['duplicate_count']
+    except Exception as e:
+        # Still record the partial run below, then re-raise
+        run_error = e
+        print(f"\nERROR during scrape: {e}")
+
+    # One data version bump for all of this run's job writes (salary/snapshot caches key on it)
+    try:
+        db.flush_data_version()
+    except Exception as e:
+        print(f"Warning: could not update the data version: {e}")
+
+    # Display results, report and run history (profiled as the "stats" stage)
+    with profiling.stage('stats'):
+        print("\n" + "=" * 60)
+        print("RESULTS")
+        print("=" * 60)
+        print(f"Total jobs scraped: {total_scraped}")
+        print(f"New jobs found: {total_new}")
+        print(f"Previously seen: {total_seen_again} ({total_updated} with changed listings)")
+        print(f"Near-duplicates flagged: {total_duplicates}")
+        print(f"Search pages fetched: {runner.stats['search_pages']} "
+              f"({runner.stats['cards_found']} cards, {runner.stats['unique_cards']} unique)")
+        if keyword_filter:
+            stats = keyword_filter.stats
+            print(f"Keyword filter: {stats['cards_dropped']}/{stats['cards_seen']} cards dropped "
+                  f"({stats['detail_fetches_saved']} detail fetches saved), "
+                  f"{stats['details_dropped']} dropped after description")
+        queue_report = None
+        if task_queue is not None:
+            queue_report = task_queue.report()
+            print(f"Detail queue: {queue_report['completed']} fetched, {queue_report['retried']} retried, "
+                  f"{queue_report['failed']} failed, {queue_report['resumed']} resumed "
+                  f"({queue_report['completed_per_minute']}/min)")
+
+        browser_report = browser_manager.report()
+        print(f"Browsers: peak RSS {browser_report['peak_rss_mb']} MB, "
+              f"{browser_report['recycles']} recycles, {browser_report['hard_timeouts']} hard timeouts")
+        parse_report = parse_pool.report()
+        print(f"Detail parsing: {parse_report['structured']} from structured data, "
+              f"{parse_report['selectors']} from selectors, {parse_report['errors']} errors "
+              f"({parse_report['workers']} workers)")
+        breaker_report = None
+        if circuit_breaker is not None:
+            breaker_report = circuit_breaker.report()
+            if breaker_report['trips'] or breaker_report['deferred']:
+                print(f"Circuit breaker: {breaker_report['trips']} trips, "
+                      f"{breaker_report['deferred']} detail fetches deferred "
+                      f"({', '.join(f'{b}={s}' for b, s in breaker_report['boards'].items())})")
+        cache_report = None
+        if page_cache is not None:
+            cache_report = page_cache.report()
+            print(f"Page cache: {cache_report['hits']} hits, {cache_report['misses']} misses "
+                  f"({cache_report['hit_rate']:.0%}), {cache_report['pages']} pages, "
+                  f"{cache_report['size_bytes'] / 1024 / 1024:.1f} MB")
+        db_cache_report = None
+        if get_result_cache() is not None:
+            db_cache_report = get_result_cache().report()
+            print(f"DB cache: {db_cache_report['hits']} hits, {db_cache_report['misses']} misses "
+                  f"({db_cache_report['hit_rate']:.0%}), {db_cache_report['entries']} entries, "
+                  f"{db_cache_report['invalidations']} invalidations (since the process started)")
+
+        # Rank new jobs against the candidate profile, best matches first
+        scores = {}
+        if ranking_index is not None and candidate and all_new_jobs:
+            with metrics.timer('run_stage_seconds', stage='rank'):
+                scores = dict(ranking_index.rank(candidate, keys=[job.url for job in all_new_jobs]))
+            all_new_jobs.sort(key=lambda job: -scores[job.url])
+
+        # Show new jobs
+        if total_new > 0:
+            print("\n--- NEW JOBS ---" + (" (best matches first)" if scores else ""))
+            for job in all_new_jobs:
+                print(f"\n• {job.title}")
+                if scores:
+                    print(f"  Match: {scores[job.url]:.0%}")
+                print(f"  Company: {job.company}")
+                print(f"  Location: {job.location or 'N/A'}")
+                if job.salary_min and job.salary_max:
+                    if job.salary_min == job.salary_max:
+                        print(f"  Salary: ${job.salary_min:,} {job.salary_period or 'yearly'}")
+                    else:
+                        print(f"  Salary: ${job.salary_min:,} - ${job.salary_max:,} {job.salary_period or 'yearly'}")
+                print(f"  Source: {job.board_source}")
+                print(f"  URL: {job.url}")
+
+        # Hand new jobs to the notifier; delivery happens on its background thread
+        notifier = get_notifier()
+        notification_report = None
+        if notifier is not None:
+            notifier.add_jobs(all_new_jobs, scores=scores)
+            notifier.flush(_recipients())
+            notification_report = notifier.report()
+
+        if task_queue is not None:
+            task_queue.purge()
+            task_queue.close()
+
+        if dedupe_index is not None:
+            dedupe_index.close()
+
+        if ranking_index is not None:
+            ranking_index.close()
+
+        if similarity_index is not None:
+            similarity_index.close()
+
+        parse_pool.close()
+
+        if page_cache is not None:
+            page_cache.purge_expired()
+            page_cache.close()
+
+        if get_result_cache() is not None:
+            get_result_cache().purge_expired()
+
+        # Write machine-readable run report
+        if METRICS_REPORT_PATH:
+            metrics.write_json(
+                METRICS_REPORT_PATH,
+                totals={
+                    'scraped': total_scraped,
+                    'new': total_new,
+                    'seen_again': total_seen_again,
+                    'updated': total_updated,
+                    'duplicates': total_duplicates,
+                },
+                boards=board_results,
+                searches=runner.stats,
+                keyword_filter=keyword_filter.stats if keyword_filter else None,
+                task_queue=queue_report,
+                page_cache=cache_report,
+                db_cache=db_cache_report,
+                circuit_breaker=breaker_report,
+                browsers=browser_report,
+                parsing=parse_report,
+                notifications=notification_report
+            )
+            print(f"\nRun report written to {METRICS_REPORT_PATH}")
+        if METRICS_PROMETHEUS_PATH:
+            metrics.write_prometheus(METRICS_PROMETHEUS_PATH)
+
+        # Record run history for trend queries (`runs` command)
+        try:
+            db.add_scrape_run(**build_run_record(started_at, board_results, runner.stats, error=run_error))
+        except Exception as e:
+            print(f"Warning: could not record run history: {e}")
+
+        # Publish precomputed dashboard data, so the dashboard doesn't scan the table per request
+        if SNAPSHOT_DIR or SNAPSHOT_S3_BUCKET:
+            from src.tracker.snapshots import open_store, publish_snapshots
+            try:
+                store = open_store(SNAPSHOT_DIR, SNAPSHOT_S3_BUCKET, SNAPSHOT_S3_PREFIX, SNAPSHOT_S3_ENDPOINT,
+                                   AWS_REGION)
+                with metrics.timer('run_stage_seconds', stage='snapshots'):
+                    snapshot = publish_snapshots(db, store, page_size=SNAPSHOT_PAGE_SIZE, keep=SNAPSHOT_KEEP)
+                print(f"Dashboard snapshot {snapshot['version']} published to {store} "
+                      f"({snapshot['files']} files, {snapshot['bytes'] / 1024:.0f} KB)")
+            except Exception as e:
+                print(f"Warning: could not publish dashboard snapshot: {e}")
+
+    if run_error is not None:
+        raise run_error
 
     print("\n" + "=" * 60)
     print("Tracking complete!")
@@ -96,17 +387,29 @@ def run_scraper():
 
 def main():
     """Main application entry point."""
+    # --profile works in either mode; strip it before CLI argument parsing
+    profile = PROFILE_ENABLED
+    if '--profile' in sys.argv:
+        sys.argv.remove('--profile')
+        profile = True
+
     # Check if CLI command was provided
-    if len(sys.argv) > 1 and sys.argv[1] in ['list', 'search', 'stats']:
+    if len(sys.argv) > 1 and sys.argv[1] in CLI.COMMANDS:
         # CLI mode
-        db = get_database()
-        db.create_tables()
-        monitor = JobMonitor(db)
-        cli = CLI(db, monitor)
-        cli.run()
+        command = sys.argv[1]
+        with profiling.profiled(profile, PROFILE_OUTPUT_DIR, PROFILE_INTERVAL_MS / 1000, PROFILE_TOP_N), \
+                profiling.stage('cli'):
+            db = get_database()
+            db.create_tables(read_only=command in CLI.READ_ONLY_COMMANDS)
+            monitor = JobMonitor(db)
+            cli = CLI(db, monitor)
+            cli.run()
     else:
         # Scraper mode (default)
-        run_scraper()
+        try:
+            run_scraper(profile=profile)
+        finally:
+            close_notifier()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,221 @@
+"""
+Lightweight run instrumentation: counters, timers and histograms.
+
+A single module-level registry collects measurements from the scrapers,
+the monitor and the database classes. At the end of a run it is written
+out as a JSON run report and, optionally, in Prometheus text format (for
+node_exporter's textfile collector or any scraper that reads files).
+
+Usage:
+    from src.metrics import metrics
+
+    with metrics.timer('scraper_stage_seconds', board='indeed', stage='navigation'):
+        page.goto(url)
+    metrics.incr('detail_fetches_total', board='indeed', outcome='blocked')
+"""
+import functools
+import json
+import os
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Tuple
+
+# Histogram bucket upper bounds in seconds (Prometheus style, +Inf implied)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict) -> LabelKey:
+    return tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def _escape_label_value(value) -> str:
+    """Escape a label value as the Prometheus text format requires."""
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(key: LabelKey, extra: Dict = None) -> str:
+    pairs = list(key) + sorted((extra or {}).items())
+    if not pairs:
+        return ''
+    inner = ','.join(f'{k}="{_escape_label_value(v)}"' for k, v in pairs)
+    return '{' + inner + '}'
+
+
+class _Histogram:
+    """Bucketed histogram that also keeps raw samples for percentiles."""
+
+    MAX_SAMPLES = 10000
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.bucket_counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = None
+        self.samples = []
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.bucket_counts[i] += 1
+        if len(self.samples) < self.MAX_SAMPLES:
+            self.samples.append(value)
+
+    def percentile(self, pct: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+    def summary(self) -> Dict:
+        return {
+            'count': self.count,
+            'sum': round(self.sum, 6),
+            'min': round(self.min, 6) if self.min is not None else None,
+            'max': round(self.max, 6) if self.max is not None else None,
+            'mean': round(self.sum / self.count, 6) if self.count else None,
+            'p50': round(self.percentile(50), 6),
+            'p95': round(self.percentile(95), 6),
+            'p99': round(self.percentile(99), 6),
+        }
+
+
+class MetricsRegistry:
+    """In-process store of counters, gauges and histograms keyed by name and labels."""
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        """Clear all measurements (called at the start of each run)."""
+        self.counters: Dict[str, Dict[LabelKey, float]] = {}
+        self.gauges: Dict[str, Dict[LabelKey, float]] = {}
+        self.histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+        self.started_at = datetime.utcnow()
+        self._start = time.perf_counter()
+
+    def incr(self, name: str, value: float = 1, **labels):
+        """Increment a counter."""
+        series = self.counters.setdefault(name, {})
+        key = _label_key(labels)
+        series[key] = series.get(key, 0) + value
+
+    def set_gauge(self, name: str, value: float, **labels):
+        """Set a gauge to an absolute value."""
+        self.gauges.setdefault(name, {})[_label_key(labels)] = value
+
+    def observe(self, name: str, value: float, **labels):
+        """Record one observation in a histogram."""
+        series = self.histograms.setdefault(name, {})
+        key = _label_key(labels)
+        if key not in series:
+            series[key] = _Histogram()
+        series[key].observe(value)
+
+    @contextmanager
+    def timer(self, name: str, **labels):
+        """Time a block and record the duration (seconds) in a histogram."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def timed(self, name: str, **labels):
+        """Decorator form of timer()."""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.timer(name, **labels):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def _matching(series: Dict, labels: Dict):
+        """Yield values whose labels include all of the given labels."""
+        wanted = set(_label_key(labels))
+        for key, value in series.items():
+            if wanted <= set(key):
+                yield value
+
+    def counter_total(self, name: str, **labels) -> float:
+        """Sum a counter over all series matching the given labels."""
+        return sum(self._matching(self.counters.get(name, {}), labels))
+
+    def histogram_total(self, name: str, **labels) -> float:
+        """Sum of all observations in series matching the given labels."""
+        return sum(h.sum for h in self._matching(self.histograms.get(name, {}), labels))
+
+    def report(self, **extra) -> Dict:
+        """Build a JSON-serializable run report."""
+        def series_list(store, render):
+            return {
+                name: [{'labels': dict(key), **render(value)} for key, value in series.items()]
+                for name, series in sorted(store.items())
+            }
+
+        return {
+            'started_at': self.started_at.isoformat(),
+            'finished_at': datetime.utcnow().isoformat(),
+            'duration_seconds': round(time.perf_counter() - self._start, 3),
+            **extra,
+            'counters': series_list(self.counters, lambda v: {'value': v}),
+            'gauges': series_list(self.gauges, lambda v: {'value': v}),
+            'histograms': series_list(self.histograms, lambda h: h.summary()),
+        }
+
+    def to_prometheus(self, prefix: str = 'job_tracker_') -> str:
+        """Render all metrics in Prometheus text exposition format."""
+        lines = []
+        for name, series in sorted(self.counters.items()):
+            lines.append(f'# TYPE {prefix}{name} counter')
+            for key, value in series.items():
+                lines.append(f'{prefix}{name}{_format_labels(key)} {value}')
+        for name, series in sorted(self.gauges.items()):
+            lines.append(f'# TYPE {prefix}{name} gauge')
+            for key, value in series.items():
+                lines.append(f'{prefix}{name}{_format_labels(key)} {value}')
+        for name, series in sorted(self.histograms.items()):
+            lines.append(f'# TYPE {prefix}{name} histogram')
+            for key, hist in series.items():
+                for bound, count in zip(hist.buckets, hist.bucket_counts):
+                    lines.append(f'{prefix}{name}_bucket{_format_labels(key, {"le": bound})} {count}')
+                lines.append(f'{prefix}{name}_bucket{_format_labels(key, {"le": "+Inf"})} {hist.count}')
+                lines.append(f'{prefix}{name}_sum{_format_labels(key)} {hist.sum}')
+                lines.append(f'{prefix}{name}_count{_format_labels(key)} {hist.count}')
+        lines.append(f'# TYPE {prefix}run_duration_seconds gauge')
+        lines.append(f'{prefix}run_duration_seconds {time.perf_counter() - self._start}')
+        return '\n'.join(lines) + '\n'
+
+    def write_json(self, path: str, **extra) -> Dict:
+        """Write the run report to a JSON file and return it."""
+        report = self.report(**extra)
+        _atomic_write(path, json.dumps(report, indent=2, default=str))
+        return report
+
+    def write_prometheus(self, path: str):
+        """Write Prometheus text format to a file (atomically, for textfile collectors)."""
+        _atomic_write(path, self.to_prometheus())
+
+
+def _atomic_write(path: str, content: str):
+    """Write via a temp file and rename so readers never see a partial file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+# Shared registry used across the application
+metrics = MetricsRegistry()
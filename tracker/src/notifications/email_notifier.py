@@ -1,27 +1,298 @@
 """
 Email notification handler.
+
+New jobs are collected into a digest: one email per run, or per time
+window when the scheduler keeps the notifier alive between runs. Messages
+are delivered by a background thread so scraping never waits on SMTP. The
+thread keeps one authenticated connection open across messages and retries
+transient failures (dropped connections, 4xx replies) with exponential
+backoff; permanent failures (5xx, bad credentials) are not retried.
 """
+import html
+import queue
 import smtplib
+import ssl
+import threading
+import time
+from datetime import datetime
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
-from typing import List, Dict
+from typing import List, Dict, Optional
+
+from src.metrics import metrics
+
+# Job fields copied into the digest (jobs may be model objects or dicts)
+DIGEST_FIELDS = ('title', 'company', 'location', 'salary_min', 'salary_max', 'salary_period',
+                 'url', 'board_source')
+
+_STOP = object()
+
+
+def _job_summary(job) -> Dict:
+    if isinstance(job, dict):
+        return {**{field: job.get(field) for field in DIGEST_FIELDS}, 'score': job.get('score')}
+    # Relevance scores aren't model attributes; add_jobs() attaches them to the summary
+    return {**{field: getattr(job, field, None) for field in DIGEST_FIELDS}, 'score': None}
+
+
+def _format_salary(job: Dict) -> Optional[str]:
+    if not job['salary_min'] and not job['salary_max']:
+        return None
+    low, high = job['salary_min'] or job['salary_max'], job['salary_max'] or job['salary_min']
+    amount = f"${low:,}" if low == high else f"${low:,} - ${high:,}"
+    return f"{amount} {job['salary_period'] or 'yearly'}"
+
+
+def _is_transient(error: Exception) -> bool:
+    """Whether a send failure is worth retrying on a fresh connection."""
+    if isinstance(error, smtplib.SMTPAuthenticationError):
+        return False
+    if isinstance(error, smtplib.SMTPRecipientsRefused):
+        return all(400 <= code < 500 for code, _ in error.recipients.values())
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    if isinstance(error, smtplib.SMTPServerDisconnected):
+        return True
+    if isinstance(error, (smtplib.SMTPException, ssl.SSLError)):
+        # e.g. STARTTLS unsupported or a bad certificate: retrying won't help
+        return False
+    # Refused connections, socket errors and timeouts
+    return isinstance(error, OSError)
+
 
 class EmailNotifier:
     """Send email notifications for new job listings."""
 
-    def __init__(self, smtp_server: str, smtp_port: int, sender_email: str, sender_password: str):
+    def __init__(self, smtp_server: str, smtp_port: int, sender_email: str, sender_password: str,
+                 use_tls: bool = True, timeout: float = 30, max_attempts: int = 3,
+                 retry_backoff: float = 2.0, digest_window_seconds: float = 0):
+        """
+        Args:
+            smtp_server: SMTP host
+            smtp_port: SMTP port (465 uses implicit TLS)
+            sender_email: From address, also the login user
+            sender_password: Login password (empty skips authentication)
+            use_tls: Require STARTTLS (or implicit TLS on port 465) before logging in
+            timeout: Socket timeout in seconds
+            max_attempts: Delivery attempts per message for transient failures
+            retry_backoff: Seconds before the first retry, doubled for each further retry
+            digest_window_seconds: Collect new jobs for this long before sending a digest
+                (0 sends one digest per flush, i.e. per run)
+        """
         self.smtp_server = smtp_server
         self.smtp_port = smtp_port
         self.sender_email = sender_email
         self.sender_password = sender_password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.max_attempts = max_attempts
+        self.retry_backoff = retry_backoff
+        self.digest_window_seconds = digest_window_seconds
+
+        self._connection = None
+        self._queue = queue.Queue()
+        self._worker = None
+        self._lock = threading.Lock()
+        self._pending: List[Dict] = []
+        self._window_started = None
+
+        # Delivery stats since the notifier was created
+        self.stats = {
+            'queued': 0,
+            'sent': 0,
+            'failed': 0,
+            'retries': 0,
+            'connections': 0,
+        }
+
+    # Digest rendering
+
+    def render_digest(self, jobs: List) -> MIMEMultipart:
+        """Render jobs (model objects or dicts) as a plain-text + HTML digest message."""
+        jobs = [_job_summary(job) for job in jobs]
+        subject = f"{len(jobs)} new job{'s' if len(jobs) != 1 else ''} found"
+        text_lines = [f"{subject} ({datetime.now().strftime('%Y-%m-%d %H:%M')})", ""]
+        html_items = []
+        for job in jobs:
+            salary = _format_salary(job)
+            text_lines.append(f"* {job['title']} - {job['company']}")
+            match = f"{job['score']:.0%} match" if job['score'] is not None else None
+            text_lines.append(f"  {job['location'] or 'N/A'}" + (f" | {salary}" if salary else "")
+                              + (f" | {match}" if match else ""))
+            text_lines.append(f"  {job['url']}")
+            text_lines.append("")
+            details = ' | '.join(html.escape(str(part)) for part in
+                                 (job['company'], job['location'] or 'N/A', salary, job['board_source'], match)
+                                 if part)
+            html_items.append(f'<li><a href="{html.escape(job["url"] or "", quote=True)}">'
+                              f'{html.escape(job["title"] or "")}</a><br>{details}</li>')
+
+        message = MIMEMultipart('alternative')
+        message['Subject'] = f"Job Tracker: {subject}"
+        message['From'] = self.sender_email
+        message.attach(MIMEText('\n'.join(text_lines), 'plain', 'utf-8'))
+        message.attach(MIMEText(f"<h2>{html.escape(subject)}</h2><ul>{''.join(html_items)}</ul>", 'html', 'utf-8'))
+        return message
+
+    # Synchronous delivery (used by the background thread)
+
+    def _connect(self) -> smtplib.SMTP:
+        if self.use_tls and self.smtp_port == 465:
+            connection = smtplib.SMTP_SSL(self.smtp_server, self.smtp_port, timeout=self.timeout,
+                                          context=ssl.create_default_context())
+        else:
+            connection = smtplib.SMTP(self.smtp_server, self.smtp_port, timeout=self.timeout)
+        try:
+            if not isinstance(connection, smtplib.SMTP_SSL):
+                connection.ehlo()
+                if self.use_tls:
+                    # Never send credentials in the clear: starttls() raises if unsupported
+                    connection.starttls(context=ssl.create_default_context())
+                    connection.ehlo()
+            if self.sender_password:
+                connection.login(self.sender_email, self.sender_password)
+        except Exception:
+            connection.close()
+            raise
+        self.stats['connections'] += 1
+        return connection
 
-    def send_notification(self, recipient: str, jobs: List[Dict]):
+    def _disconnect(self):
+        if self._connection is None:
+            return
+        try:
+            self._connection.quit()
+        except Exception:
+            self._connection.close()
+        self._connection = None
+
+    def send_notification(self, recipient: str, jobs: List):
         """
         Send email notification with new job listings.
 
+        Blocks until the message is delivered or has failed; reuses the open
+        connection if there is one.
+
         Args:
             recipient: Email address to send notification to
-            jobs: List of job dictionaries to include in notification
+            jobs: List of jobs (model objects or dictionaries) to include in notification
+
+        Returns:
+            Whether the message was delivered
+        """
+        if not jobs:
+            return False
+        message = self.render_digest(jobs)
+        message['To'] = recipient
+        return self._deliver(recipient, message)
+
+    def _deliver(self, recipient: str, message: MIMEMultipart) -> bool:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                if self._connection is None:
+                    self._connection = self._connect()
+                with metrics.timer('notification_send_seconds'):
+                    self._connection.send_message(message, self.sender_email, [recipient])
+            except Exception as e:
+                # The connection's state is unknown after any failure; start a fresh one
+                self._disconnect()
+                if not _is_transient(e) or attempt == self.max_attempts:
+                    print(f"Failed to send notification to {recipient}: {e}")
+                    self.stats['failed'] += 1
+                    metrics.incr('notifications_total', outcome='failed')
+                    return False
+                delay = self.retry_backoff * 2 ** (attempt - 1)
+                print(f"Notification to {recipient} failed ({e}), retrying in {delay:.0f}s")
+                self.stats['retries'] += 1
+                metrics.incr('notification_retries_total')
+                time.sleep(delay)
+            else:
+                self.stats['sent'] += 1
+                metrics.incr('notifications_total', outcome='sent')
+                return True
+        return False
+
+    # Background delivery
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            try:
+                if item is _STOP:
+                    return
+                recipient, jobs = item
+                self.send_notification(recipient, jobs)
+            except Exception as e:
+                print(f"Notification worker error: {e}")
+            finally:
+                if self._queue.empty():
+                    # Nothing else waiting: don't hold the server's connection open between digests
+                    self._disconnect()
+                self._queue.task_done()
+
+    def enqueue(self, recipient: str, jobs: List):
+        """Queue a digest for background delivery and return immediately."""
+        if not jobs:
+            return
+        with self._lock:
+            if self._worker is None or not self._worker.is_alive():
+                self._worker = threading.Thread(target=self._run, name='email-notifier', daemon=True)
+                self._worker.start()
+        # Copy the fields now: model objects shouldn't cross into the delivery thread
+        self._queue.put((recipient, [_job_summary(job) for job in jobs]))
+        self.stats['queued'] += 1
+
+    def add_jobs(self, jobs: List, scores: Dict[str, float] = None):
+        """
+        Add new jobs to the pending digest.
+
+        Args:
+            jobs: Jobs (model objects or dictionaries)
+            scores: Optional relevance score per job URL; the digest lists the best matches first
+        """
+        if not jobs:
+            return
+        if not self._pending:
+            self._window_started = time.time()
+        for job in jobs:
+            summary = _job_summary(job)
+            if scores and summary['url'] in scores:
+                summary['score'] = scores[summary['url']]
+            self._pending.append(summary)
+
+    def flush(self, recipients: List[str], force: bool = False) -> bool:
+        """
+        Queue the pending digest for each recipient once its window has elapsed.
+
+        Args:
+            recipients: Addresses to send the digest to
+            force: Send now regardless of the digest window
+
+        Returns:
+            Whether a digest was queued
         """
-        # TODO: Implement email sending logic
-        pass
+        if not self._pending or not recipients:
+            return False
+        if not force and time.time() - self._window_started < self.digest_window_seconds:
+            return False
+        if any(job['score'] is not None for job in self._pending):
+            # Jobs collected over several runs: best matches first across the whole window
+            self._pending.sort(key=lambda job: -(job['score'] or 0.0))
+        for recipient in recipients:
+            self.enqueue(recipient, self._pending)
+        print(f"Queued digest of {len(self._pending)} new jobs for {len(recipients)} recipient(s)")
+        self._pending = []
+        self._window_started = None
+        return True
+
+    def close(self, timeout: float = None):
+        """Wait for queued messages to be delivered, then stop the worker and close the connection."""
+        if self._worker is not None and self._worker.is_alive():
+            self._queue.put(_STOP)
+            self._worker.join(timeout)
+        self._worker = None
+        self._disconnect()
+
+    def report(self) -> Dict:
+        """Delivery stats, plus jobs still waiting for their digest window."""
+        return {**self.stats, 'pending_jobs': len(self._pending)}
@@ -0,0 +1,183 @@
+"""
+Low-overhead sampling profiler for tracker runs.
+
+A background thread snapshots the profiled thread's Python stack at a fixed
+interval (sys._current_frames), so the run itself is not traced and overhead
+stays small enough to use in production. Samples are tagged with the current
+stage (scrape/ingest/stats) and written as:
+
+    <prefix>.collapsed  - flamegraph-compatible collapsed stacks
+                          ("stage;outer;...;inner count"), usable with
+                          flamegraph.pl or speedscope
+    <prefix>-top.txt    - top-N hot functions per stage (self and total samples)
+"""
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+# Profiler currently attached to the run, if any (see stage())
+_active: Optional['SamplingProfiler'] = None
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    label = f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+    # ';' separates frames in the collapsed format
+    return label.replace(';', ':')
+
+
+class SamplingProfiler:
+    """Samples one thread's stack on an interval and aggregates by stage."""
+
+    def __init__(self, interval: float = 0.01, max_depth: int = 200):
+        """
+        Args:
+            interval: Seconds between samples
+            max_depth: Deepest stack recorded per sample
+        """
+        self.interval = interval
+        self.max_depth = max_depth
+        self.samples: Counter = Counter()  # (stage, stack tuple root-first) -> count
+        self.current_stage = 'main'
+        self.started_at = None
+        self.elapsed = 0.0
+        self._target_thread = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        """Start sampling the calling thread."""
+        global _active
+        self._target_thread = threading.get_ident()
+        self._stop.clear()
+        self.started_at = datetime.utcnow()
+        self._start = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+        _active = self
+
+    def stop(self):
+        """Stop sampling."""
+        global _active
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.elapsed = time.perf_counter() - self._start
+        if _active is self:
+            _active = None
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._target_thread)
+            if frame is None:
+                continue
+            stack = []
+            while frame is not None and len(stack) < self.max_depth:
+                stack.append(_frame_label(frame))
+                frame = frame.f_back
+            stack.reverse()
+            self.samples[(self.current_stage, tuple(stack))] += 1
+
+    @contextmanager
+    def stage(self, name: str):
+        """Tag samples taken inside the block with a stage name."""
+        previous = self.current_stage
+        self.current_stage = name
+        try:
+            yield
+        finally:
+            self.current_stage = previous
+
+    def collapsed_lines(self) -> List[str]:
+        """Samples in collapsed-stack format, stage as the root frame."""
+        return [f"{';'.join((stage,) + stack)} {count}"
+                for (stage, stack), count in sorted(self.samples.items())]
+
+    def top_functions(self, n: int = 25) -> Dict[str, List[Tuple[str, int, int]]]:
+        """
+        Hottest functions per stage.
+
+        Returns:
+            {stage: [(function, self_samples, total_samples), ...]} sorted by self samples
+        """
+        by_stage: Dict[str, Tuple[Counter, Counter]] = {}
+        for (stage, stack), count in self.samples.items():
+            self_counts, total_counts = by_stage.setdefault(stage, (Counter(), Counter()))
+            if stack:
+                self_counts[stack[-1]] += count
+            for label in set(stack):
+                total_counts[label] += count
+
+        result = {}
+        for stage, (self_counts, total_counts) in by_stage.items():
+            ranked = sorted(total_counts, key=lambda label: (self_counts[label], total_counts[label]), reverse=True)
+            result[stage] = [(label, self_counts[label], total_counts[label]) for label in ranked[:n]]
+        return result
+
+    def write(self, output_dir: str = 'profiles', prefix: str = None, top_n: int = 25) -> Tuple[str, str]:
+        """
+        Write the collapsed-stack file and the top-N summary.
+
+        Returns:
+            (collapsed_path, summary_path)
+        """
+        os.makedirs(output_dir, exist_ok=True)
+        prefix = prefix or f"profile-{(self.started_at or datetime.utcnow()).strftime('%Y%m%dT%H%M%S')}"
+        collapsed_path = os.path.join(output_dir, f"{prefix}.collapsed")
+        summary_path = os.path.join(output_dir, f"{prefix}-top.txt")
+
+        with open(collapsed_path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(self.collapsed_lines()) + '\n')
+
+        stage_totals = Counter()
+        for (stage, _), count in self.samples.items():
+            stage_totals[stage] += count
+        total = sum(stage_totals.values()) or 1
+
+        with open(summary_path, 'w', encoding='utf-8') as f:
+            f.write(f"Sampling profile started {self.started_at} UTC\n")
+            f.write(f"Wall time: {self.elapsed:.1f}s, interval: {self.interval * 1000:.0f}ms, "
+                    f"samples: {sum(stage_totals.values())}\n\n")
+            f.write("STAGES\n")
+            for stage, count in stage_totals.most_common():
+                f.write(f"  {stage:<12} {count:>8} samples  {count / total * 100:5.1f}%  "
+                        f"~{count * self.interval:.1f}s\n")
+            for stage, rows in self.top_functions(top_n).items():
+                f.write(f"\nTOP FUNCTIONS - {stage} ({stage_totals[stage]} samples)\n")
+                f.write(f"  {'self':>7} {'total':>7}  function\n")
+                for label, self_count, total_count in rows:
+                    f.write(f"  {self_count:>7} {total_count:>7}  {label}\n")
+
+        return collapsed_path, summary_path
+
+
+@contextmanager
+def stage(name: str):
+    """Tag the enclosed work with a stage on the active profiler (no-op when not profiling)."""
+    if _active is None:
+        yield
+        return
+    with _active.stage(name):
+        yield
+
+
+@contextmanager
+def profiled(enabled: bool, output_dir: str = 'profiles', interval: float = 0.01, top_n: int = 25):
+    """Profile the enclosed block if enabled, writing results when it finishes."""
+    if not enabled:
+        yield None
+        return
+
+    profiler = SamplingProfiler(interval=interval)
+    profiler.start()
+    try:
+        yield profiler
+    finally:
+        profiler.stop()
+        collapsed_path, summary_path = profiler.write(output_dir, top_n=top_n)
+        print(f"\nProfile written to {collapsed_path} and {summary_path}")
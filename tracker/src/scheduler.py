@@ -10,8 +10,8 @@ from datetime import datetime
 # Add parent directory to path to import config
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from config.settings import SCRAPE_INTERVAL_HOURS
-from src.main import run_scraper
+from config.settings import SCRAPE_INTERVAL_HOURS, PROFILE_ENABLED, PROFILE_OUTPUT_DIR
+from src.main import run_scraper, close_notifier
 
 def job():
     """Wrapper function that runs the scraper and handles errors."""
@@ -35,6 +35,9 @@ def main():
     print(f"\n{'='*60}")
     print("Job Tracker Scheduler - Starting...")
     print(f"Will run every {SCRAPE_INTERVAL_HOURS} hours")
+    if PROFILE_ENABLED:
+        # run_scraper() picks up PROFILE_ENABLED and writes one profile per run
+        print(f"Profiling enabled, writing profiles to {PROFILE_OUTPUT_DIR}/")
     print(f"{'='*60}\n")
 
     # Schedule the job
@@ -57,4 +60,5 @@ if __name__ == "__main__":
         main()
     except KeyboardInterrupt:
         print("\n\nScheduler stopped by user.")
+        close_notifier()
         sys.exit(0)
@@ -2,16 +2,65 @@
 Base scraper class that all job board scrapers inherit from.
 """
 from abc import ABC, abstractmethod
+from concurrent.futures import Future
 from typing import List, Dict, Tuple, Optional
 from urllib.parse import urlparse, parse_qs
+from datetime import datetime
+import random
 import re
+import time
+
+from config.settings import INDEED_SITE_URL, LINKEDIN_SITE_URL, SCRAPER_DELAY_SCALE
+from src.metrics import metrics
+from .browser_manager import BrowserManager
+from .parse_pool import ParsePool
+
+# Origin each board's job URLs are normalized to (the real sites unless overridden for load tests)
+SITE_URLS = {'indeed': INDEED_SITE_URL, 'linkedin': LINKEDIN_SITE_URL}
+BOARD_DOMAINS = {'indeed': 'indeed.com', 'linkedin': 'linkedin.com'}
+
+
+def _on_board(netloc: str, board: str) -> bool:
+    """Whether a URL host belongs to a board's real site or its configured override."""
+    return BOARD_DOMAINS[board] in netloc or netloc == urlparse(SITE_URLS[board]).netloc
+
+
+class DetailFetchError(Exception):
+    """Raised when a job detail page could not be fetched or was blocked."""
+
+    def __init__(self, message: str, blocked: bool = False):
+        super().__init__(message)
+        self.blocked = blocked
+
 
 class BaseScraper(ABC):
     """Abstract base class for job board scrapers."""
 
-    def __init__(self, search_query: str, location: str):
+    # Board name stored as board_source on scraped jobs
+    SOURCE = None
+    # Random delay range (seconds) between detail page visits
+    DETAIL_DELAY = (1.0, 2.0)
+
+    def __init__(self, search_query: str, location: str, keyword_filter=None, page_cache=None,
+                 browser_manager: BrowserManager = None, parse_pool: ParsePool = None):
+        """
+        Args:
+            search_query: Search keywords
+            location: Search location
+            keyword_filter: Optional KeywordFilter used to prune cards before detail fetch
+            page_cache: Optional PageCache serving fresh search/detail pages from disk
+            browser_manager: BrowserManager bounding browser memory and page time
+                (defaults to one with no limits)
+            parse_pool: ParsePool parsing detail pages (defaults to parsing inline)
+        """
         self.search_query = search_query
         self.location = location
+        self.keyword_filter = keyword_filter
+        self.page_cache = page_cache
+        self.browsers = browser_manager or BrowserManager()
+        self.parser = parse_pool or ParsePool()
+        # Whether the last detail fetch was served from the page cache (no pause needed)
+        self.last_detail_cached = False
 
     @abstractmethod
     def scrape(self) -> List[Dict]:
@@ -23,6 +72,207 @@ class BaseScraper(ABC):
         """
         pass
 
+    @abstractmethod
+    def collect_cards(self, search_query: str = None, location: str = None) -> List[Dict]:
+        """
+        Collect basic card info (title, company, location, url) from a search page.
+
+        Together with fetch_details() this lets multi-search runs deduplicate
+        cards across searches before any detail page is fetched.
+
+        Args:
+            search_query: Search keywords (defaults to the scraper's query)
+            location: Search location (defaults to the scraper's location)
+        """
+        pass
+
+    @abstractmethod
+    def fetch_details(self, job_basics: List[Dict]) -> List[Dict]:
+        """Fetch detail pages for collected cards and return full job dictionaries."""
+        pass
+
+    @abstractmethod
+    def fetch_detail_html(self, basic_info: Dict) -> str:
+        """
+        Load a job's detail page in the browser and return its HTML.
+
+        fetch_detail() and submit_detail() build on this, so every scraper
+        can work through the detail task queue.
+
+        Raises:
+            DetailFetchError: If the page could not be loaded or was blocked
+        """
+        pass
+
+    def fetch_detail(self, basic_info: Dict) -> Dict:
+        """
+        Fetch a single job's detail page.
+
+        Returns:
+            Full job dictionary
+
+        Raises:
+            DetailFetchError: If the page could not be loaded or was blocked
+        """
+        return self.finish_detail(basic_info, self.submit_detail(basic_info))
+
+    def submit_detail(self, basic_info: Dict) -> Future:
+        """
+        Load a job's detail page (from the cache if fresh) and queue its HTML for parsing.
+
+        The browser is free for the next page as soon as this returns; pass the
+        Future to finish_detail() to build the job.
+
+        Raises:
+            DetailFetchError: If the page could not be loaded or was blocked
+        """
+        html = self.cached_page(basic_info['url'], 'detail')
+        self.last_detail_cached = html is not None
+        if html is None:
+            html = self.fetch_detail_html(basic_info)
+        return self.parser.submit_detail(type(self), html)
+
+    def finish_detail(self, basic_info: Dict, future: Future) -> Dict:
+        """Build the job from a parsed detail page (card-level data only if parsing failed)."""
+        parsed = self.parser.result(future, board=self.SOURCE)
+        if parsed is None:
+            return self.build_job(basic_info, None, None)
+        return self.build_job(basic_info, parsed['salary'], parsed['description'], parsed['structured'])
+
+    def fetch_details_pipelined(self, job_basics: List[Dict]) -> List[Dict]:
+        """
+        Fetch detail pages one after another, parsing each while the next one loads.
+
+        Jobs whose page failed keep their card-level data.
+        """
+        pending = []
+        for i, basic_info in enumerate(job_basics, 1):
+            print(f"Processing job {i}/{len(job_basics)}: {basic_info['title'][:50]}...")
+            try:
+                pending.append((basic_info, self.submit_detail(basic_info)))
+            except DetailFetchError:
+                pending.append((basic_info, None))
+            # Random delay between independent visits
+            self.pause_between_details()
+
+        return [self.finish_detail(basic_info, future) if future else self.build_job(basic_info, None, None)
+                for basic_info, future in pending]
+
+    def close(self):
+        """Release any browser held open between fetch_detail() calls."""
+        pass
+
+    @abstractmethod
+    def parse_cards_html(self, html: str) -> List[Dict]:
+        """Extract job cards from a saved search results page."""
+        pass
+
+    @abstractmethod
+    def parse_detail_html(self, html: str) -> Tuple[Optional[str], Optional[str]]:
+        """Extract (salary, description) from a saved detail page."""
+        pass
+
+    def cached_page(self, url: str, page_type: str) -> Optional[str]:
+        """Return a fresh cached page, or None if there is no cache or no fresh copy."""
+        if self.page_cache is None:
+            return None
+        return self.page_cache.get(url, page_type)
+
+    def cache_page(self, url: str, page_type: str, html: str):
+        """Save a successfully loaded page to the cache, if one is configured."""
+        if self.page_cache is not None:
+            self.page_cache.put(url, page_type, html)
+
+    def cards_from_cache(self, url: str) -> Optional[List[Dict]]:
+        """Parse cards from a fresh cached search page, or None on a cache miss."""
+        html = self.cached_page(url, 'search')
+        if html is None:
+            return None
+        with self.stage('card_extraction'):
+            job_basics = self.parse_cards_html(html)[:20]
+        print(f"Extracted basic info for {len(job_basics)} jobs (cached search page)")
+        metrics.incr('cards_extracted_total', value=len(job_basics), board=self.SOURCE)
+        return job_basics
+
+    def detail_from_cache(self, basic_info: Dict) -> Optional[Dict]:
+        """Build the job from a fresh cached detail page, or None on a cache miss."""
+        html = self.cached_page(basic_info['url'], 'detail')
+        self.last_detail_cached = html is not None
+        if html is None:
+            return None
+        with self.stage('detail_extraction'):
+            return self.finish_detail(basic_info, self.parser.submit_detail(type(self), html))
+
+    def stage(self, name: str):
+        """Context manager timing one scraper stage (browser_launch, navigation, extraction, ...)."""
+        return metrics.timer('scraper_stage_seconds', board=self.SOURCE, stage=name)
+
+    def human_delay(self, low: float, high: float):
+        """Sleep a random interval to mimic a human (scaled by SCRAPER_DELAY_SCALE), recorded as the 'sleep' stage."""
+        if SCRAPER_DELAY_SCALE <= 0:
+            return
+        with self.stage('sleep'):
+            time.sleep(random.uniform(low, high) * SCRAPER_DELAY_SCALE)
+
+    def pause_between_details(self):
+        """Sleep a random interval between detail page visits (not needed after a cache hit)."""
+        if self.last_detail_cached:
+            return
+        self.human_delay(*self.DETAIL_DELAY)
+
+    def build_job(self, basic_info: Dict, salary: Optional[str], description: Optional[str],
+                  structured: Dict = None) -> Dict:
+        """
+        Combine card info with detail page salary and description.
+
+        Args:
+            basic_info: Card fields (title, company, location, url, ...)
+            salary: Raw salary text found by selectors
+            description: Description text found by selectors
+            structured: Fields from embedded structured data; these take precedence
+        """
+        structured = structured or {}
+        # Parse salary to extract min, max, and period
+        salary_min, salary_max, salary_period = self.parse_salary(salary) if salary else (None, None, None)
+        if structured.get('salary_min') is not None:
+            salary_min, salary_max = structured['salary_min'], structured['salary_max']
+            salary_period = structured['salary_period']
+
+        job = {
+            **basic_info,
+            'salary_min': salary_min,
+            'salary_max': salary_max,
+            'salary_period': salary_period,
+            'description': structured.get('description') or description,
+            'job_type': structured.get('job_type'),
+            # Without a published date, fall back to when we first saw the job
+            'posted_date': structured.get('posted_date') or datetime.utcnow(),
+            'board_source': self.SOURCE
+        }
+        if structured.get('salary_currency'):
+            job['salary_currency'] = structured['salary_currency']
+        if structured.get('work_mode') and not basic_info.get('work_mode'):
+            job['work_mode'] = structured['work_mode']
+        return job
+
+    def filter_cards(self, job_basics: List[Dict]) -> List[Dict]:
+        """Drop irrelevant job cards before their detail pages are fetched."""
+        if not self.keyword_filter:
+            return job_basics
+        kept = self.keyword_filter.filter_cards(job_basics)
+        if len(kept) != len(job_basics):
+            print(f"Keyword filter skipped {len(job_basics) - len(kept)} detail fetches")
+        return kept
+
+    def filter_jobs(self, jobs: List[Dict]) -> List[Dict]:
+        """Re-apply the keyword filter once descriptions are available."""
+        if not self.keyword_filter:
+            return jobs
+        kept = self.keyword_filter.filter_jobs(jobs)
+        if len(kept) != len(jobs):
+            print(f"Keyword filter dropped {len(jobs) - len(kept)} jobs after reading descriptions")
+        return kept
+
     @staticmethod
     def normalize_url(url: str, source: str = None) -> str:
         """
@@ -43,13 +293,13 @@ class BaseScraper(ABC):
         params = parse_qs(parsed.query)
 
         # For Indeed: use the 'jk' parameter (job key) as the unique identifier
-        if 'indeed.com' in parsed.netloc:
-            if 'jk' in params:
-                job_key = params['jk'][0]
-                return f"https://www.indeed.com/viewjob?jk={job_key}"
+        if _on_board(parsed.netloc, 'indeed') and 'jk' in params:
+            job_key = params['jk'][0]
+            return f"{SITE_URLS['indeed']}/viewjob?jk={job_key}"
 
         # For LinkedIn: extract job ID from URL path or params
-        elif 'linkedin.com' in parsed.netloc:
+        # (a mock board may serve both sites from one host, so this is not an elif)
+        if _on_board(parsed.netloc, 'linkedin'):
             # LinkedIn URLs look like /jobs/view/software-engineer-at-company-4296417197
             # The job ID is the numeric part at the end before any query params
             if '/jobs/view/' in parsed.path:
@@ -63,7 +313,7 @@ class BaseScraper(ABC):
                         job_id = part
                         break
                 if job_id:
-                    return f"https://www.linkedin.com/jobs/view/{job_id}"
+                    return f"{SITE_URLS['linkedin']}/jobs/view/{job_id}"
 
         # Default: return original URL
         return url
@@ -0,0 +1,265 @@
+"""
+Memory-bounded browser lifecycle management.
+
+The ECS task has 1 GB of RAM shared by Python, the Playwright driver,
+ChromeDriver and every Chromium process they start. This module:
+
+- measures the RSS of this process and all its descendants (from /proc),
+- tells scrapers when to recycle a long-lived browser (memory ceiling or
+  page count reached),
+- enforces a hard per-page timeout with a watchdog that kills the browser
+  processes if a navigation hangs past the driver's own timeout,
+- kills automation Chromium/ChromeDriver processes left behind by crashed
+  runs, and
+- supplies a low-memory Chromium flag profile.
+
+Process inspection reads /proc, so on platforms without it (macOS dev
+machines) measurements return None and orphan cleanup is a no-op.
+"""
+import os
+import signal
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from src.metrics import metrics
+
+# Chromium flags that trade features we don't need for a smaller footprint
+LOW_MEMORY_ARGS = [
+    '--disable-gpu',
+    '--disable-extensions',
+    '--disable-background-networking',
+    '--disable-background-timer-throttling',
+    '--disable-renderer-backgrounding',
+    '--disable-backgrounding-occluded-windows',
+    '--disable-component-update',
+    '--disable-default-apps',
+    '--disable-sync',
+    '--no-first-run',
+    '--mute-audio',
+    '--disable-features=site-per-process,TranslateUI,OptimizationHints,MediaRouter',
+    '--renderer-process-limit=1',
+    '--js-flags=--max-old-space-size=256',
+    '--blink-settings=imagesEnabled=false',
+    '--disk-cache-size=1',
+]
+
+# Process names started by Playwright / Selenium for Chromium (/proc truncates names to 15 chars)
+BROWSER_PROCESS_NAMES = ('chrome', 'chromium', 'chromium-browse', 'headless_shell', 'chromedriver')
+# Command-line markers of a browser started by automation (never kill a user's own browser)
+AUTOMATION_MARKERS = ('--enable-automation', '--headless', '--remote-debugging', 'chromedriver')
+
+PROC = '/proc'
+
+
+def _read_stat(pid: int) -> Optional[Dict]:
+    """Name, parent pid and RSS (bytes) of a process, or None if it is gone."""
+    try:
+        with open(f'{PROC}/{pid}/status', encoding='utf-8') as f:
+            fields = dict(line.split(':', 1) for line in f if ':' in line)
+    except (OSError, ValueError):
+        return None
+    rss_kb = fields.get('VmRSS', '0 kB').split()[0]
+    return {
+        'pid': pid,
+        'name': fields.get('Name', '').strip(),
+        'ppid': int(fields.get('PPid', '0').strip() or 0),
+        'uid': int(fields.get('Uid', '0').split()[0]),
+        'rss': int(rss_kb) * 1024,
+    }
+
+
+def _cmdline(pid: int) -> str:
+    try:
+        with open(f'{PROC}/{pid}/cmdline', 'rb') as f:
+            return f.read().replace(b'\0', b' ').decode('utf-8', 'replace')
+    except OSError:
+        return ''
+
+
+def list_processes() -> List[Dict]:
+    """All processes visible in /proc (empty where /proc is unavailable)."""
+    if not os.path.isdir(PROC):
+        return []
+    processes = []
+    for entry in os.listdir(PROC):
+        if entry.isdigit():
+            stat = _read_stat(int(entry))
+            if stat:
+                processes.append(stat)
+    return processes
+
+
+def _descendants(root: int, processes: List[Dict]) -> List[Dict]:
+    children = {}
+    for proc in processes:
+        children.setdefault(proc['ppid'], []).append(proc)
+    found, stack = [], [root]
+    while stack:
+        for child in children.get(stack.pop(), []):
+            found.append(child)
+            stack.append(child['pid'])
+    return found
+
+
+def process_tree_rss(root: int = None) -> Optional[int]:
+    """RSS in bytes of a process and all its descendants (None without /proc)."""
+    root = root or os.getpid()
+    processes = list_processes()
+    if not processes:
+        return None
+    by_pid = {proc['pid']: proc for proc in processes}
+    own = by_pid.get(root, {}).get('rss', 0)
+    return own + sum(proc['rss'] for proc in _descendants(root, processes))
+
+
+def find_orphaned_browsers() -> List[Dict]:
+    """
+    Automation browser processes left behind by earlier browsers.
+
+    Only meaningful while no managed browser is open: any automation
+    Chromium/ChromeDriver that is our descendant, or was reparented to init
+    after its launcher died, counts as orphaned. Processes of other users are
+    never included.
+    """
+    processes = list_processes()
+    uid = os.getuid()
+    ours = {proc['pid'] for proc in _descendants(os.getpid(), processes)}
+    orphans = []
+    for proc in processes:
+        if proc['uid'] != uid or proc['name'] not in BROWSER_PROCESS_NAMES:
+            continue
+        if proc['pid'] not in ours and proc['ppid'] != 1:
+            continue
+        if any(marker in _cmdline(proc['pid']) for marker in AUTOMATION_MARKERS):
+            orphans.append(proc)
+    return orphans
+
+
+def kill_orphaned_browsers() -> int:
+    """Kill orphaned automation browsers; returns the number of processes killed."""
+    killed = 0
+    for proc in find_orphaned_browsers():
+        try:
+            os.kill(proc['pid'], signal.SIGKILL)
+            killed += 1
+        except OSError:
+            pass
+    if killed:
+        print(f"Killed {killed} orphaned browser processes")
+        metrics.incr('browser_orphans_killed_total', value=killed)
+    return killed
+
+
+class BrowserManager:
+    """Keeps browser memory under a ceiling and bounds how long any page may take."""
+
+    def __init__(self, memory_limit_mb: float = None, recycle_fraction: float = 0.8,
+                 page_timeout: float = None, max_pages_per_browser: int = None,
+                 low_memory: bool = False):
+        """
+        Args:
+            memory_limit_mb: Memory available to the whole process tree (None disables the check)
+            recycle_fraction: Recycle long-lived browsers once RSS passes this fraction of the limit
+            page_timeout: Hard limit (seconds) on a single navigation before the browser is killed
+            max_pages_per_browser: Recycle a long-lived browser after this many pages
+            low_memory: Add the low-memory Chromium flag profile
+        """
+        self.memory_limit = memory_limit_mb * 1024 * 1024 if memory_limit_mb else None
+        self.recycle_fraction = recycle_fraction
+        self.page_timeout = page_timeout
+        self.max_pages_per_browser = max_pages_per_browser
+        self.low_memory = low_memory
+        self.pages_since_launch = 0
+        self.peak_rss = 0
+        self.stats = {
+            'recycles': 0,
+            'hard_timeouts': 0,
+        }
+
+    def chromium_args(self, args: List[str]) -> List[str]:
+        """Add the low-memory profile (if enabled) to a scraper's launch flags."""
+        if not self.low_memory:
+            return list(args)
+        return list(args) + [flag for flag in LOW_MEMORY_ARGS if flag not in args]
+
+    def sample(self) -> Optional[int]:
+        """Measure the process tree's RSS and record it (and the run's peak) as gauges."""
+        rss = process_tree_rss()
+        if rss is None:
+            return None
+        self.peak_rss = max(self.peak_rss, rss)
+        metrics.set_gauge('process_tree_rss_bytes', rss)
+        metrics.set_gauge('process_tree_rss_peak_bytes', self.peak_rss)
+        return rss
+
+    def browser_launched(self):
+        """Reset the page count for a newly started browser."""
+        self.pages_since_launch = 0
+
+    def page_loaded(self):
+        """Count a page on the current browser and sample memory."""
+        self.pages_since_launch += 1
+        self.sample()
+
+    def memory_pressure(self) -> bool:
+        """Whether the process tree is past recycle_fraction of the memory limit."""
+        if not self.memory_limit:
+            return False
+        rss = self.sample()
+        return rss is not None and rss >= self.memory_limit * self.recycle_fraction
+
+    def should_recycle(self) -> bool:
+        """Whether a long-lived browser should be closed and relaunched before the next page."""
+        if self.max_pages_per_browser and self.pages_since_launch >= self.max_pages_per_browser:
+            reason = f"{self.pages_since_launch} pages"
+        elif self.memory_pressure():
+            reason = f"RSS {self.peak_rss / 1024 / 1024:.0f} MB peak, limit {self.memory_limit / 1024 / 1024:.0f} MB"
+        else:
+            return False
+        print(f"  Recycling browser ({reason})")
+        self.stats['recycles'] += 1
+        metrics.incr('browser_recycles_total')
+        return True
+
+    @contextmanager
+    def hard_timeout(self, board: str = None):
+        """
+        Kill the browser processes if the enclosed page operation outlives page_timeout.
+
+        Killing the browser makes the blocked driver call fail, so a hung
+        navigation turns into an ordinary error instead of stalling the run.
+        """
+        if not self.page_timeout:
+            yield
+            return
+
+        fired = threading.Event()
+
+        def on_timeout():
+            fired.set()
+            self.stats['hard_timeouts'] += 1
+            metrics.incr('browser_hard_timeouts_total', board=board)
+            print(f"  ⚠ Page exceeded {self.page_timeout:.0f}s hard timeout, killing browser")
+            for proc in _descendants(os.getpid(), list_processes()):
+                if proc['name'] in BROWSER_PROCESS_NAMES:
+                    try:
+                        os.kill(proc['pid'], signal.SIGKILL)
+                    except OSError:
+                        pass
+
+        timer = threading.Timer(self.page_timeout, on_timeout)
+        timer.daemon = True
+        timer.start()
+        try:
+            yield
+        except Exception as e:
+            if fired.is_set():
+                raise TimeoutError(f"page exceeded {self.page_timeout:.0f}s hard timeout") from e
+            raise
+        finally:
+            timer.cancel()
+
+    def report(self) -> Dict:
+        """Stats for this run, including the peak RSS seen."""
+        return {**self.stats, 'peak_rss_mb': round(self.peak_rss / 1024 / 1024, 1)}
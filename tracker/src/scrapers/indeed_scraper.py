@@ -2,111 +2,169 @@
 Indeed scraper using Playwright for browser automation.
 """
 from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from bs4 import BeautifulSoup
 from typing import List, Dict
-from datetime import datetime
-import time
-import random
 import re
-from .base import BaseScraper
+from .base import BaseScraper, DetailFetchError
+from .browser_manager import kill_orphaned_browsers
+from config.settings import INDEED_SITE_URL
+from src.metrics import metrics
 
 class IndeedScraper(BaseScraper):
     """Scraper for Indeed.com using Playwright."""
 
-    BASE_URL = "https://www.indeed.com/jobs"
+    SITE_URL = INDEED_SITE_URL
+    BASE_URL = f"{SITE_URL}/jobs"
+    SOURCE = 'indeed'
+    DETAIL_DELAY = (3.0, 6.0)
+
+    # Returns every card's fields in a single round trip (same selectors as _extract_basic_info_from_card)
+    CARDS_JS = """
+        () => Array.from(document.querySelectorAll('.job_seen_beacon')).map(card => {
+            const text = selector => {
+                const el = card.querySelector(selector);
+                return el ? el.innerText.trim() : null;
+            };
+            const link = card.querySelector('h2.jobTitle a');
+            return {
+                title: text('h2.jobTitle'),
+                company: text("span[data-testid='company-name']"),
+                location: text("div[data-testid='text-location']"),
+                url: link ? link.getAttribute('href') : null,
+            };
+        })
+    """
 
     def scrape(self) -> List[Dict]:
         """Scrape job listings from Indeed using Playwright browser automation."""
-        jobs = []
+        job_basics = self.filter_cards(self.collect_cards())
+        return self.fetch_details(job_basics)
+
+    def collect_cards(self, search_query: str = None, location: str = None) -> List[Dict]:
+        """Get basic info for all job cards on the search results page."""
+        search_query = search_query or self.search_query
+        location = location or self.location
         job_basics = []
 
+        # Build search URL
+        url = f"{self.BASE_URL}?q={search_query}&l={location}&sort=date"
+
+        # A recent copy of the search page needs no browser at all
+        cached = self.cards_from_cache(url)
+        if cached is not None:
+            return cached
+
         # Step 1: Get all job URLs from search page
         with sync_playwright() as p:
             try:
-                browser = p.chromium.launch(
-                    headless=True,
-                    args=[
-                        '--disable-blink-features=AutomationControlled',
-                        '--no-sandbox',
-                        '--disable-dev-shm-usage',
-                    ]
-                )
-
-                context = browser.new_context(
-                    viewport={'width': 1920, 'height': 1080},
-                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                    locale='en-US',
-                    timezone_id='America/New_York',
-                )
-
-                context.add_init_script("""
-                    Object.defineProperty(navigator, 'webdriver', {
-                        get: () => undefined
-                    });
-                """)
-
-                page = context.new_page()
-
-                # Build search URL
-                url = f"{self.BASE_URL}?q={self.search_query}&l={self.location}&sort=date"
+                with self.stage('browser_launch'):
+                    browser = p.chromium.launch(
+                        headless=True,
+                        args=self.browsers.chromium_args([
+                            '--disable-blink-features=AutomationControlled',
+                            '--no-sandbox',
+                            '--disable-dev-shm-usage',
+                        ])
+                    )
+
+                    context = browser.new_context(
+                        viewport={'width': 1920, 'height': 1080},
+                        user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                        locale='en-US',
+                        timezone_id='America/New_York',
+                    )
+
+                    context.add_init_script("""
+                        Object.defineProperty(navigator, 'webdriver', {
+                            get: () => undefined
+                        });
+                    """)
+
+                    page = context.new_page()
 
                 # Navigate to Indeed search page
-                page.goto(url, wait_until='domcontentloaded', timeout=60000)
-                time.sleep(random.uniform(3, 5))
+                with self.stage('search_navigation'), self.browsers.hard_timeout(self.SOURCE):
+                    page.goto(url, wait_until='domcontentloaded', timeout=60000)
+                self.human_delay(3, 5)
 
                 # Wait for job cards to load
-                page.wait_for_selector(".job_seen_beacon", timeout=15000)
-
-                # Find all job cards
-                job_cards = page.query_selector_all(".job_seen_beacon")
-                print(f"Found {len(job_cards)} job cards on page")
-
-                # Extract all basic info from job cards
-                for card in job_cards[:20]:  # Limit to first 20 jobs
-                    try:
-                        basic_info = self._extract_basic_info_from_card(card)
-                        if basic_info:
-                            job_basics.append(basic_info)
-                    except Exception as e:
-                        print(f"Error extracting basic info: {e}")
-                        continue
+                with self.stage('search_navigation'):
+                    page.wait_for_selector(".job_seen_beacon", timeout=15000)
+                self.cache_page(url, 'search', page.content())
+
+                with self.stage('card_extraction'):
+                    job_basics = self._extract_cards(page)
 
                 print(f"Extracted basic info for {len(job_basics)} jobs")
+                metrics.incr('cards_extracted_total', value=len(job_basics), board=self.SOURCE)
+
+                self.browsers.sample()
 
                 # IMPORTANT: Close browser completely before visiting job details
                 browser.close()
 
             except Exception as e:
                 print(f"Error getting job URLs from Indeed: {e}")
-                return jobs
+                metrics.incr('search_errors_total', board=self.SOURCE)
 
-        # Step 2: Visit each job URL independently with a fresh browser
-        # This makes each visit look like a standalone page visit (not scraping pattern)
-        for i, basic_info in enumerate(job_basics, 1):
-            print(f"Processing job {i}/{len(job_basics)}: {basic_info['title'][:50]}...")
-
-            salary, description = self._extract_salary_and_description_standalone(basic_info['url'])
-
-            # Parse salary to extract min, max, and period
-            salary_min, salary_max, salary_period = self.parse_salary(salary) if salary else (None, None, None)
-
-            # Combine basic info with salary and description
-            job_data = {
-                **basic_info,
-                'salary_min': salary_min,
-                'salary_max': salary_max,
-                'salary_period': salary_period,
-                'description': description,
-                'posted_date': datetime.utcnow(),
-                'board_source': 'indeed'
-            }
-            jobs.append(job_data)
-
-            # Random delay between independent visits
-            time.sleep(random.uniform(3.0, 6.0))
+        return job_basics
 
+    def fetch_details(self, job_basics: List[Dict]) -> List[Dict]:
+        """Visit each job's detail page and combine it with the card info."""
+        # Step 2: Visit each job URL independently with a fresh browser
+        # This makes each visit look like a standalone page visit (not scraping pattern).
+        # Failed pages keep their card-level data.
+        jobs = self.filter_jobs(self.fetch_details_pipelined(job_basics))
         print(f"Indeed: Successfully scraped {len(jobs)} jobs")
         return jobs
 
+    def fetch_detail_html(self, basic_info: Dict) -> str:
+        """Load one job's detail page with a fresh browser, raising DetailFetchError if it fails."""
+        return self._load_detail_page_standalone(basic_info['url'])
+
+    def _extract_cards(self, page) -> List[Dict]:
+        """Extract job cards in one round trip, falling back to per-element extraction."""
+        try:
+            job_basics = self._extract_cards_js(page)
+            metrics.incr('card_extraction_total', board=self.SOURCE, method='js')
+        except Exception as e:
+            print(f"Single-call card extraction failed ({e}), using per-element extraction")
+            job_basics = self._extract_cards_per_element(page)
+            metrics.incr('card_extraction_total', board=self.SOURCE, method='fallback')
+        return job_basics
+
+    def _extract_cards_js(self, page) -> List[Dict]:
+        """Extract the fields of every job card in one page.evaluate round trip."""
+        raw_cards = page.evaluate(self.CARDS_JS)
+        print(f"Found {len(raw_cards)} job cards on page")
+
+        job_basics = []
+        for raw in raw_cards[:20]:  # Limit to first 20 jobs
+            basic_info = self._build_card(raw.get('title'), raw.get('company') or "Unknown",
+                                          raw.get('location'), raw.get('url'))
+            if basic_info:
+                job_basics.append(basic_info)
+        return job_basics
+
+    def _extract_cards_per_element(self, page) -> List[Dict]:
+        """Extract job cards with one query per field (several browser round trips per card)."""
+        job_basics = []
+
+        # Find all job cards
+        job_cards = page.query_selector_all(".job_seen_beacon")
+        print(f"Found {len(job_cards)} job cards on page")
+
+        # Extract all basic info from job cards
+        for card in job_cards[:20]:  # Limit to first 20 jobs
+            try:
+                basic_info = self._extract_basic_info_from_card(card)
+                if basic_info:
+                    job_basics.append(basic_info)
+            except Exception as e:
+                print(f"Error extracting basic info: {e}")
+                continue
+        return job_basics
+
     def _extract_basic_info_from_card(self, card) -> Dict:
         """Extract basic information from a job card (no navigation required)."""
         try:
@@ -126,186 +184,147 @@ class IndeedScraper(BaseScraper):
             link_elem = card.query_selector("h2.jobTitle a")
             job_url = link_elem.get_attribute('href') if link_elem else None
 
-            if not title or not job_url:
-                return None
+            return self._build_card(title, company, location, job_url)
 
-            # Convert relative URL to absolute URL
-            if job_url.startswith('/'):
-                job_url = f"https://www.indeed.com{job_url}"
+        except Exception as e:
+            return None
 
-            # Normalize URL to remove tracking parameters
-            normalized_url = self.normalize_url(job_url, 'indeed')
+    def _build_card(self, title: str, company: str, location: str, job_url: str) -> Dict:
+        """Assemble card info, making the URL absolute and stripping tracking parameters."""
+        if not title or not job_url:
+            return None
 
-            return {
-                'title': title,
-                'company': company,
-                'location': location,
-                'url': normalized_url
-            }
+        # Convert relative URL to absolute URL
+        if job_url.startswith('/'):
+            job_url = f"{self.SITE_URL}{job_url}"
+
+        # Normalize URL to remove tracking parameters
+        normalized_url = self.normalize_url(job_url, 'indeed')
+
+        return {
+            'title': title,
+            'company': company,
+            'location': location,
+            'url': normalized_url
+        }
+
+    def parse_cards_html(self, html: str) -> List[Dict]:
+        """Extract job cards from saved search page HTML (same selectors as the live page)."""
+        soup = BeautifulSoup(html, 'html.parser')
+        cards = []
+        for card in soup.select(".job_seen_beacon"):
+            title_elem = card.select_one("h2.jobTitle")
+            company_elem = card.select_one("span[data-testid='company-name']")
+            location_elem = card.select_one("div[data-testid='text-location']")
+            link_elem = card.select_one("h2.jobTitle a")
+            basic_info = self._build_card(
+                title_elem.get_text().strip() if title_elem else None,
+                company_elem.get_text().strip() if company_elem else "Unknown",
+                location_elem.get_text().strip() if location_elem else None,
+                link_elem.get('href') if link_elem else None
+            )
+            if basic_info:
+                cards.append(basic_info)
+        return cards
+
+    def parse_detail_html(self, html: str) -> tuple:
+        """Extract salary and description from saved detail page HTML."""
+        soup = BeautifulSoup(html, 'html.parser')
+        salary = None
+        description = None
+        salary_pattern = r'\$[\d,]+(?:\s*-\s*\$[\d,]+)?(?:\s+(?:a|an)\s+(?:year|hour|month|week))?'
+
+        description_elem = soup.select_one("#jobDescriptionText")
+        if description_elem:
+            description = description_elem.get_text('\n', strip=True)
+
+        salary_container = soup.select_one("#salaryInfoAndJobType")
+        if salary_container:
+            lines = salary_container.get_text('\n', strip=True).split('\n')
+            match = re.search(salary_pattern, lines[0]) if lines else None
+            if match:
+                return match.group(0), description
+
+        for selector in ("span.css-1oc7tea",
+                         "[data-testid='jobsearch-JobMetadataHeader-salary']",
+                         "div.jobsearch-JobMetadataHeader-item"):
+            for elem in soup.select(selector):
+                text = elem.get_text().strip()
+                if '$' in text or 'year' in text.lower() or 'hour' in text.lower():
+                    match = re.search(salary_pattern, text)
+                    if match:
+                        return match.group(0), description
 
-        except Exception as e:
-            return None
+        return salary, description
 
-    def _extract_salary_and_description_standalone(self, job_url: str) -> tuple:
+    def _load_detail_page_standalone(self, job_url: str) -> str:
         """
-        Visit a job URL with a completely fresh browser instance.
+        Visit a job URL with a completely fresh browser instance and return the page HTML.
         This makes each visit appear independent (not part of a scraping session).
+
+        Args:
+            job_url: Job detail page URL
+
+        Raises:
+            DetailFetchError: If the page was blocked or failed to load
         """
-        salary = None
-        description = None
+
+        # No browser is open between detail pages, so anything still running is leftover
+        if self.browsers.memory_pressure():
+            kill_orphaned_browsers()
 
         with sync_playwright() as p:
             try:
                 # Fresh browser for this single job
-                browser = p.chromium.launch(
-                    headless=True,
-                    args=[
-                        '--disable-blink-features=AutomationControlled',
-                        '--no-sandbox',
-                        '--disable-dev-shm-usage',
-                    ]
-                )
-
-                context = browser.new_context(
-                    viewport={'width': 1920, 'height': 1080},
-                    user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-                    locale='en-US',
-                    timezone_id='America/New_York',
-                )
-
-                context.add_init_script("""
-                    Object.defineProperty(navigator, 'webdriver', {
-                        get: () => undefined
-                    });
-                """)
-
-                page = context.new_page()
+                with self.stage('browser_launch'):
+                    browser = p.chromium.launch(
+                        headless=True,
+                        args=self.browsers.chromium_args([
+                            '--disable-blink-features=AutomationControlled',
+                            '--no-sandbox',
+                            '--disable-dev-shm-usage',
+                        ])
+                    )
+
+                    context = browser.new_context(
+                        viewport={'width': 1920, 'height': 1080},
+                        user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+                        locale='en-US',
+                        timezone_id='America/New_York',
+                    )
+
+                    context.add_init_script("""
+                        Object.defineProperty(navigator, 'webdriver', {
+                            get: () => undefined
+                        });
+                    """)
+
+                    page = context.new_page()
 
                 # Navigate directly to this job (like a user clicking a link)
-                page.goto(job_url, wait_until='domcontentloaded', timeout=60000)
-                time.sleep(random.uniform(2.5, 4.0))
+                with self.stage('detail_navigation'), self.browsers.hard_timeout(self.SOURCE):
+                    page.goto(job_url, wait_until='domcontentloaded', timeout=60000)
+                self.human_delay(2.5, 4.0)
 
                 # Check if blocked
-                page_content = page.content().lower()
-                if "blocked" in page.title().lower() or "additional verification" in page_content:
+                html = page.content()
+                if "blocked" in page.title().lower() or "additional verification" in html.lower():
                     print("  ⚠ Bot detection triggered")
+                    metrics.incr('detail_fetches_total', board=self.SOURCE, outcome='blocked')
                     browser.close()
-                    return None, None
+                    raise DetailFetchError("bot detection triggered", blocked=True)
+                self.cache_page(job_url, 'detail', html)
 
-                # Extract salary and description
-                salary, description = self._extract_salary_and_description_from_page(page)
-
-                browser.close()
+                self.browsers.page_loaded()
+                with self.stage('browser_close'):
+                    browser.close()
+                metrics.incr('detail_fetches_total', board=self.SOURCE, outcome='ok')
 
+            except DetailFetchError:
+                raise
             except Exception as e:
                 print(f"  Error: {str(e)[:50]}")
+                metrics.incr('detail_fetches_total', board=self.SOURCE, outcome='error')
+                raise DetailFetchError(str(e)) from e
 
-        return salary, description
-
-    def _extract_salary_and_description_from_page(self, page) -> tuple:
-        """Extract salary and description from an already-loaded page."""
-        salary = None
-        description = None
-
-        # Extract job description
-        try:
-            description_elem = page.query_selector("#jobDescriptionText")
-            if description_elem:
-                description = description_elem.inner_text().strip()
-        except:
-            pass
-
-        # Extract salary
-        try:
-            # Try to find salary using the ID selector
-            salary_container = page.query_selector("#salaryInfoAndJobType")
-            if salary_container:
-                salary_text = salary_container.inner_text().strip()
-                lines = salary_text.split('\n')
-                if lines:
-                    salary_line = lines[0].strip()
-                    salary_pattern = r'\$[\d,]+(?:\s*-\s*\$[\d,]+)?(?:\s+(?:a|an)\s+(?:year|hour|month|week))?'
-                    match = re.search(salary_pattern, salary_line)
-                    if match:
-                        salary = match.group(0)
-                        print(f"  ✓ Found salary: {salary}")
-                        return salary, description
-
-            # Fallback: Try alternative selectors
-            salary_selectors = [
-                "span.css-1oc7tea",
-                "[data-testid='jobsearch-JobMetadataHeader-salary']",
-                "div.jobsearch-JobMetadataHeader-item",
-            ]
-
-            for selector in salary_selectors:
-                elements = page.query_selector_all(selector)
-                for elem in elements:
-                    text = elem.inner_text().strip()
-                    if '$' in text or 'year' in text.lower() or 'hour' in text.lower():
-                        salary_pattern = r'\$[\d,]+(?:\s*-\s*\$[\d,]+)?(?:\s+(?:a|an)\s+(?:year|hour|month|week))?'
-                        match = re.search(salary_pattern, text)
-                        if match:
-                            salary = match.group(0)
-                            print(f"  ✓ Found salary: {salary}")
-                            return salary
-
-        except Exception as e:
-            pass
-
-        return salary, description
-
-    def _extract_salary_from_detail_page(self, page, job_url: str) -> str:
-        """Navigate to job detail page and extract salary information."""
-        salary = None
-        try:
-            # Navigate to detail page - use 'domcontentloaded' for reliability
-            page.goto(job_url, wait_until='domcontentloaded', timeout=60000)
-            time.sleep(random.uniform(2.5, 4.0))  # Longer wait for Indeed
-
-            # Check if we got blocked
-            page_content = page.content().lower()
-            if "blocked" in page.title().lower() or "additional verification" in page_content:
-                print("  ⚠ Bot detection triggered, skipping salary extraction")
-                return None
-
-            # Try to find salary using the ID selector from the user's example
-            salary_container = page.query_selector("#salaryInfoAndJobType")
-            if salary_container:
-                salary_text = salary_container.inner_text().strip()
-
-                # Extract just the salary part (first line usually)
-                lines = salary_text.split('\n')
-                if lines:
-                    salary_line = lines[0].strip()
-                    # Clean up the salary text - more flexible pattern
-                    salary_pattern = r'\$[\d,]+(?:\s*-\s*\$[\d,]+)?(?:\s+(?:a|an)\s+(?:year|hour|month|week))?'
-                    match = re.search(salary_pattern, salary_line)
-                    if match:
-                        salary = match.group(0)
-                        print(f"  ✓ Found salary: {salary}")
-                        return salary, description
-
-            # Fallback: Try alternative selectors
-            salary_selectors = [
-                "span.css-1oc7tea",
-                "[data-testid='jobsearch-JobMetadataHeader-salary']",
-                "div.jobsearch-JobMetadataHeader-item",
-            ]
-
-            for selector in salary_selectors:
-                elements = page.query_selector_all(selector)
-                for elem in elements:
-                    text = elem.inner_text().strip()
-                    if '$' in text or 'year' in text.lower() or 'hour' in text.lower():
-                        salary_pattern = r'\$[\d,]+(?:\s*-\s*\$[\d,]+)?(?:\s+(?:a|an)\s+(?:year|hour|month|week))?'
-                        match = re.search(salary_pattern, text)
-                        if match:
-                            salary = match.group(0)
-                            print(f"  ✓ Found salary: {salary}")
-                            return salary
-
-        except Exception as e:
-            print(f"  Error extracting salary: {e}")
-
-        return salary
+        return html
@@ -0,0 +1,165 @@
+"""
+Compiled keyword filter for pruning job cards before the detail-page fetch.
+
+All include/exclude terms are compiled into a single Aho-Corasick automaton,
+so each field is scanned once regardless of how many keywords are configured.
+
+Terms may target specific fields with a ``field:`` prefix, e.g.
+``title:senior`` or ``company:staffing``. Unprefixed terms match any field.
+"""
+from collections import deque
+from typing import Dict, Iterable, List, Optional, Set
+
+CARD_FIELDS = ('title', 'company', 'location')
+ALL_FIELDS = CARD_FIELDS + ('description',)
+
+
+class AhoCorasick:
+    """Multi-pattern substring matcher (case-insensitive, whole words only)."""
+
+    def __init__(self, patterns: Iterable[str]):
+        self.patterns = [p.lower() for p in patterns]
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[int]] = [[]]
+
+        for pattern_id, pattern in enumerate(self.patterns):
+            node = 0
+            for char in pattern:
+                nxt = self._goto[node].get(char)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto[node][char] = nxt
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                node = nxt
+            self._out[node].append(pattern_id)
+
+        # Breadth-first pass to build failure links
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, nxt in self._goto[node].items():
+                queue.append(nxt)
+                fail = self._fail[node]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[nxt] = self._goto[fail].get(char, 0)
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> Set[int]:
+        """Return the ids of all patterns that occur in text as whole words."""
+        found = set()
+        if not text:
+            return found
+        text = text.lower()
+        node = 0
+        for end, char in enumerate(text):
+            while node and char not in self._goto[node]:
+                node = self._fail[node]
+            node = self._goto[node].get(char, 0)
+            for pattern_id in self._out[node]:
+                start = end - len(self.patterns[pattern_id]) + 1
+                before_ok = start == 0 or not text[start - 1].isalnum()
+                after_ok = end + 1 == len(text) or not text[end + 1].isalnum()
+                if before_ok and after_ok:
+                    found.add(pattern_id)
+        return found
+
+
+class KeywordFilter:
+    """Include/exclude keyword filter applied at card level and again after detail fetch."""
+
+    def __init__(self, include: Iterable[str] = (), exclude: Iterable[str] = ()):
+        """
+        Args:
+            include: Terms of which at least one must match (if any are given)
+            exclude: Terms that drop a job when matched
+        """
+        self._terms = []  # (is_exclude, fields)
+        patterns = []
+        for is_exclude, terms in ((False, include), (True, exclude)):
+            for raw in terms:
+                term, fields = self._parse_term(raw)
+                if term:
+                    patterns.append(term)
+                    self._terms.append((is_exclude, fields))
+
+        self._matcher = AhoCorasick(patterns)
+        self.has_includes = any(not is_exclude for is_exclude, _ in self._terms)
+        # Includes that can only match the description cannot be judged from a card
+        self._card_decidable = all(
+            set(fields) <= set(CARD_FIELDS)
+            for is_exclude, fields in self._terms if not is_exclude
+        )
+
+        self.stats = {
+            'cards_seen': 0,
+            'cards_dropped': 0,
+            'detail_fetches_saved': 0,
+            'details_seen': 0,
+            'details_dropped': 0,
+        }
+
+    @staticmethod
+    def _parse_term(raw: str):
+        """Split an optional ``field:`` prefix off a term."""
+        raw = raw.strip()
+        if ':' in raw:
+            prefix, term = raw.split(':', 1)
+            if prefix.strip().lower() in ALL_FIELDS:
+                return term.strip(), (prefix.strip().lower(),)
+        return raw, ALL_FIELDS
+
+    def __bool__(self) -> bool:
+        return bool(self._terms)
+
+    def _evaluate(self, job: Dict, fields: Iterable[str]) -> Optional[bool]:
+        """
+        Evaluate the filter over the given fields of a job.
+
+        Returns:
+            False if an exclude matched, True if an include matched (or there
+            are no includes), None if no include has matched yet
+        """
+        matched_include = False
+        for field in fields:
+            for term_id in self._matcher.find(job.get(field) or ''):
+                is_exclude, term_fields = self._terms[term_id]
+                if field not in term_fields:
+                    continue
+                if is_exclude:
+                    return False
+                matched_include = True
+        if matched_include or not self.has_includes:
+            return True
+        return None
+
+    def filter_cards(self, cards: List[Dict]) -> List[Dict]:
+        """Drop cards that are irrelevant based on title/company/location alone."""
+        if not self:
+            return cards
+        kept = []
+        for card in cards:
+            self.stats['cards_seen'] += 1
+            verdict = self._evaluate(card, CARD_FIELDS)
+            if verdict is False or (verdict is None and self._card_decidable):
+                self.stats['cards_dropped'] += 1
+                self.stats['detail_fetches_saved'] += 1
+                continue
+            kept.append(card)
+        return kept
+
+    def filter_jobs(self, jobs: List[Dict]) -> List[Dict]:
+        """Re-apply the filter to fully scraped jobs, including their descriptions."""
+        if not self:
+            return jobs
+        kept = []
+        for job in jobs:
+            self.stats['details_seen'] += 1
+            if self._evaluate(job, ALL_FIELDS):
+                kept.append(job)
+            else:
+                self.stats['details_dropped'] += 1
+        return kept
@@ -6,105 +6,233 @@ from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
+from bs4 import BeautifulSoup
 from typing import List, Dict
-from datetime import datetime
-import time
-import random
 import re
-from .base import BaseScraper
+from .base import BaseScraper, DetailFetchError
+from config.settings import LINKEDIN_SITE_URL
+from src.metrics import metrics
 
 class LinkedInScraper(BaseScraper):
     """Scraper for LinkedIn job listings."""
 
-    BASE_URL = "https://www.linkedin.com/jobs/search"
+    SITE_URL = LINKEDIN_SITE_URL
+    BASE_URL = f"{SITE_URL}/jobs/search"
+    SOURCE = 'linkedin'
+    DETAIL_DELAY = (0.5, 1.0)
+
+    # Returns every card's fields in a single round trip (same selectors as _extract_basic_info_from_card)
+    CARDS_JS = """
+        return Array.from(document.getElementsByClassName('base-card')).map(card => {
+            const text = selector => {
+                const el = card.querySelector(selector);
+                return el ? (el.innerText || el.textContent || '').trim() : '';
+            };
+            const link = card.querySelector('a.base-card__full-link');
+            let url = link ? link.href : '';
+            if (link && !url) {
+                const alt = card.querySelector("a[href*='/jobs/view/']");
+                url = alt ? alt.href : '';
+            }
+            return {
+                title: text('h3.base-search-card__title'),
+                company: text('h4.base-search-card__subtitle a.hidden-nested-link')
+                    || text('h4.base-search-card__subtitle'),
+                location: text('span.job-search-card__location'),
+                url: url,
+            };
+        });
+    """
+
+    def __init__(self, search_query: str, location: str, keyword_filter=None, page_cache=None,
+                 browser_manager=None, parse_pool=None):
+        super().__init__(search_query, location, keyword_filter=keyword_filter, page_cache=page_cache,
+                         browser_manager=browser_manager, parse_pool=parse_pool)
+        self._driver = None
 
     def scrape(self) -> List[Dict]:
         """Scrape job listings from LinkedIn using browser automation."""
-        jobs = []
+        job_basics = self.filter_cards(self.collect_cards())
+        return self.fetch_details(job_basics)
 
+    def _create_driver(self):
+        """Create a headless Chrome driver."""
         # Set up Chrome options for headless browsing
         chrome_options = Options()
-        chrome_options.add_argument('--headless')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--disable-dev-shm-usage')
-        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+        for arg in self.browsers.chromium_args([
+            '--headless',
+            '--no-sandbox',
+            '--disable-dev-shm-usage',
+            '--disable-blink-features=AutomationControlled',
+        ]):
+            chrome_options.add_argument(arg)
         chrome_options.add_argument('user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
 
+        driver = webdriver.Chrome(options=chrome_options)
+        if self.browsers.page_timeout:
+            driver.set_page_load_timeout(self.browsers.page_timeout)
+        self.browsers.browser_launched()
+        return driver
+
+    def collect_cards(self, search_query: str = None, location: str = None) -> List[Dict]:
+        """Get basic info for all job cards on the search results page."""
+        search_query = search_query or self.search_query
+        location = location or self.location
+        job_basics = []
+
+        # Build search URL
+        # f_TPR=r604800 filters to jobs posted in last 7 days
+        # sortBy=DD sorts by date (most recent)
+        url = f"{self.BASE_URL}?keywords={search_query}&location={location}&f_TPR=r604800&sortBy=DD"
+
+        # A recent copy of the search page needs no browser at all
+        cached = self.cards_from_cache(url)
+        if cached is not None:
+            return cached
+
         driver = None
         try:
             # Initialize Chrome driver
-            driver = webdriver.Chrome(options=chrome_options)
-
-            # Build search URL
-            # f_TPR=r604800 filters to jobs posted in last 7 days
-            # sortBy=DD sorts by date (most recent)
-            url = f"{self.BASE_URL}?keywords={self.search_query}&location={self.location}&f_TPR=r604800&sortBy=DD"
+            with self.stage('browser_launch'):
+                driver = self._create_driver()
 
             # Navigate to LinkedIn
-            driver.get(url)
+            with self.stage('search_navigation'), self.browsers.hard_timeout(self.SOURCE):
+                driver.get(url)
 
             # Random delay to mimic human behavior
-            time.sleep(random.uniform(2, 4))
+            self.human_delay(2, 4)
 
             # Wait for job cards to load
-            wait = WebDriverWait(driver, 10)
-            wait.until(EC.presence_of_element_located((By.CLASS_NAME, "base-card")))
+            with self.stage('search_navigation'):
+                wait = WebDriverWait(driver, 10)
+                wait.until(EC.presence_of_element_located((By.CLASS_NAME, "base-card")))
+            self.cache_page(url, 'search', driver.page_source)
 
-            # Find all job cards
-            job_cards = driver.find_elements(By.CLASS_NAME, "base-card")
+            with self.stage('card_extraction'):
+                job_basics = self._extract_cards(driver)
 
-            print(f"Found {len(job_cards)} job cards on page")
+            print(f"Extracted basic info for {len(job_basics)} jobs")
+            metrics.incr('cards_extracted_total', value=len(job_basics), board=self.SOURCE)
 
-            # First pass: Extract all basic info from job cards (while elements are fresh)
-            job_basics = []
-            for card in job_cards[:20]:  # Limit to first 20 jobs for MVP
-                try:
-                    basic_info = self._extract_basic_info_from_card(card)
-                    if basic_info:
-                        job_basics.append(basic_info)
-                except Exception as e:
-                    print(f"Error extracting basic info: {e}")
-                    continue
+        except Exception as e:
+            print(f"Error scraping LinkedIn with Selenium: {e}")
+            metrics.incr('search_errors_total', board=self.SOURCE)
 
-            print(f"Extracted basic info for {len(job_basics)} jobs")
+        finally:
+            if driver:
+                with self.stage('browser_close'):
+                    driver.quit()
 
-            # Second pass: Visit each job detail page for salary (avoids stale element issues)
+        return job_basics
+
+    def fetch_details(self, job_basics: List[Dict]) -> List[Dict]:
+        """Visit each job's detail page and combine it with the card info."""
+        jobs = []
+        if not job_basics:
+            return jobs
+
+        try:
+            # Visit each job detail page for salary (avoids stale element issues);
+            # each page is parsed while the driver loads the next one
+            pending = []
             for i, basic_info in enumerate(job_basics, 1):
                 try:
                     print(f"Processing job {i}/{len(job_basics)}: {basic_info['title'][:50]}...")
-                    salary, description = self._extract_salary_and_description_from_detail_page(driver, basic_info['url'])
-
-                    # Parse salary to extract min, max, and period
-                    salary_min, salary_max, salary_period = self.parse_salary(salary) if salary else (None, None, None)
-
-                    # Combine basic info with salary and description
-                    job_data = {
-                        **basic_info,
-                        'salary_min': salary_min,
-                        'salary_max': salary_max,
-                        'salary_period': salary_period,
-                        'description': description,
-                        'posted_date': datetime.utcnow(),
-                        'board_source': 'linkedin'
-                    }
-                    jobs.append(job_data)
-
-                    time.sleep(random.uniform(0.5, 1.0))
-                except Exception as e:
+                    pending.append((basic_info, self.submit_detail(basic_info)))
+                    self.pause_between_details()
+                except DetailFetchError as e:
                     print(f"Error processing job: {e}")
                     continue
 
+            jobs = self.filter_jobs([self.finish_detail(basic_info, future) for basic_info, future in pending])
             print(f"LinkedIn: Successfully scraped {len(jobs)} jobs")
 
-        except Exception as e:
-            print(f"Error scraping LinkedIn with Selenium: {e}")
-
         finally:
-            if driver:
-                driver.quit()
+            self.close()
 
         return jobs
 
+    def fetch_detail_html(self, basic_info: Dict) -> str:
+        """Load one job's detail page, reusing a driver across calls."""
+        try:
+            # Relaunch the long-lived driver before it grows past the memory ceiling
+            if self._driver is not None and self.browsers.should_recycle():
+                self.close()
+            if self._driver is None:
+                with self.stage('browser_launch'):
+                    self._driver = self._create_driver()
+            html = self._load_detail_page(self._driver, basic_info['url'])
+        except Exception as e:
+            print(f"Error loading job detail page: {e}")
+            metrics.incr('detail_fetches_total', board=self.SOURCE, outcome='error')
+            if isinstance(e, TimeoutError):
+                # The hard timeout killed the browser; start a fresh one next time
+                self.close()
+            raise DetailFetchError(str(e)) from e
+        metrics.incr('detail_fetches_total', board=self.SOURCE, outcome='ok')
+        return html
+
+    def close(self):
+        """Quit the detail-page driver if one is open."""
+        if self._driver is not None:
+            with self.stage('browser_close'):
+                try:
+                    self._driver.quit()
+                except Exception as e:
+                    print(f"Error closing browser: {e}")
+            self._driver = None
+
+    def _extract_cards(self, driver) -> List[Dict]:
+        """Extract job cards in one round trip, falling back to per-element extraction."""
+        try:
+            job_basics = self._extract_cards_js(driver)
+            metrics.incr('card_extraction_total', board=self.SOURCE, method='js')
+        except Exception as e:
+            print(f"Single-call card extraction failed ({e}), using per-element extraction")
+            job_basics = self._extract_cards_per_element(driver)
+            metrics.incr('card_extraction_total', board=self.SOURCE, method='fallback')
+        return job_basics
+
+    def _extract_cards_js(self, driver) -> List[Dict]:
+        """Extract the fields of every job card in one execute_script round trip."""
+        raw_cards = driver.execute_script(self.CARDS_JS)
+        print(f"Found {len(raw_cards)} job cards on page")
+
+        job_basics = []
+        for raw in raw_cards[:20]:  # Limit to first 20 jobs for MVP
+            title = raw.get('title') or ""
+            job_url = raw.get('url')
+            if not title or not job_url:
+                continue
+            job_basics.append({
+                'title': title,
+                'company': raw.get('company') or "",
+                'location': raw.get('location') or None,
+                'url': self.normalize_url(job_url, 'linkedin')
+            })
+        return job_basics
+
+    def _extract_cards_per_element(self, driver) -> List[Dict]:
+        """Extract job cards with one WebDriver call per field (several round trips per card)."""
+        job_basics = []
+
+        # Find all job cards
+        job_cards = driver.find_elements(By.CLASS_NAME, "base-card")
+
+        print(f"Found {len(job_cards)} job cards on page")
+
+        # Extract all basic info from job cards (while elements are fresh)
+        for card in job_cards[:20]:  # Limit to first 20 jobs for MVP
+            try:
+                basic_info = self._extract_basic_info_from_card(card)
+                if basic_info:
+                    job_basics.append(basic_info)
+            except Exception as e:
+                print(f"Error extracting basic info: {e}")
+                continue
+        return job_basics
+
     def _extract_basic_info_from_card(self, card) -> Dict:
         """Extract basic information from a job card (no navigation required)."""
         try:
@@ -162,61 +290,70 @@ class LinkedInScraper(BaseScraper):
         except Exception as e:
             return None
 
-    def _extract_salary_and_description_from_detail_page(self, driver, job_url: str) -> tuple:
-        """Navigate to job detail page and extract salary and description."""
+    def parse_cards_html(self, html: str) -> List[Dict]:
+        """Extract job cards from saved search page HTML (same selectors as the live page)."""
+        soup = BeautifulSoup(html, 'html.parser')
+        cards = []
+        for card in soup.select(".base-card"):
+            link_elem = card.select_one("a.base-card__full-link[href]") or card.select_one("a[href*='/jobs/view/']")
+            title_elem = card.select_one("h3.base-search-card__title")
+            company_elem = (card.select_one("h4.base-search-card__subtitle a.hidden-nested-link")
+                            or card.select_one("h4.base-search-card__subtitle"))
+            location_elem = card.select_one("span.job-search-card__location")
+
+            job_url = link_elem.get('href') if link_elem else None
+            title = title_elem.get_text().strip() if title_elem else ""
+            if not title or not job_url:
+                continue
+            cards.append({
+                'title': title,
+                'company': company_elem.get_text().strip() if company_elem else "",
+                'location': (location_elem.get_text().strip() or None) if location_elem else None,
+                'url': self.normalize_url(job_url, 'linkedin')
+            })
+        return cards
+
+    def parse_detail_html(self, html: str) -> tuple:
+        """Extract salary and description from saved detail page HTML."""
+        soup = BeautifulSoup(html, 'html.parser')
         salary = None
         description = None
-        try:
-            # Navigate to detail page
-            driver.get(job_url)
-            time.sleep(random.uniform(1.5, 2.5))  # Wait for page to load
-
-            # Extract job description
-            try:
-                description_elem = driver.find_element(By.CSS_SELECTOR, "div.show-more-less-html__markup")
-                description = (description_elem.get_attribute('innerText') or description_elem.text or "").strip()
-            except:
-                # Try alternative selector
-                try:
-                    description_elem = driver.find_element(By.CSS_SELECTOR, "div.description__text")
-                    description = (description_elem.get_attribute('innerText') or description_elem.text or "").strip()
-                except:
-                    pass
 
-            # Try to find compensation section first (most accurate)
-            try:
-                compensation_elem = driver.find_element(By.CSS_SELECTOR, "[class*='compensation']")
-                compensation_text = (compensation_elem.get_attribute('innerText') or compensation_elem.text or "").strip()
-
-                # Look for salary range in the compensation section
-                salary_pattern = r'\$[\d,]+(?:\.\d+)?(?:/yr|/year)?\s*-\s*\$[\d,]+(?:\.\d+)?(?:/yr|/year)?'
-                match = re.search(salary_pattern, compensation_text)
-                if match:
-                    salary = match.group(0)
-                    # Clean up formatting
-                    salary = salary.replace('.00', '').replace(',', '')
-            except:
-                pass
+        description_elem = (soup.select_one("div.show-more-less-html__markup")
+                            or soup.select_one("div.description__text"))
+        if description_elem:
+            description = description_elem.get_text('\n', strip=True)
+
+        compensation_elem = soup.select_one("[class*='compensation']")
+        if compensation_elem:
+            salary_pattern = r'\$[\d,]+(?:\.\d+)?(?:/yr|/year)?\s*-\s*\$[\d,]+(?:\.\d+)?(?:/yr|/year)?'
+            match = re.search(salary_pattern, compensation_elem.get_text(' ', strip=True))
+            if match:
+                salary = match.group(0).replace('.00', '').replace(',', '')
+
+        if not salary:
+            salary_pattern = r'\$[\d,]+(?:\.\d+)?(?:/yr|/year)?(?:\s*-\s*\$[\d,]+(?:\.\d+)?(?:/yr|/year)?)?'
+            for elem in soup.select("[class*='salary']")[:3]:  # Check first 3 to avoid similar jobs
+                text = elem.get_text(' ', strip=True)
+                if '$' in text and any(c.isdigit() for c in text):
+                    match = re.search(salary_pattern, text)
+                    if match:
+                        salary = match.group(0).replace('.00', '').replace(',', '')
+                        break
 
-            # Fallback: try to find salary elements if not found yet
-            if not salary:
-                try:
-                    salary_elements = driver.find_elements(By.CSS_SELECTOR, "[class*='salary']")
-                    for elem in salary_elements[:3]:  # Check first 3 to avoid similar jobs
-                        text = (elem.get_attribute('innerText') or elem.text or "").strip()
-                        # Look for salary pattern
-                        if '$' in text and any(c.isdigit() for c in text):
-                            # Check if it contains a range or single value
-                            salary_pattern = r'\$[\d,]+(?:\.\d+)?(?:/yr|/year)?(?:\s*-\s*\$[\d,]+(?:\.\d+)?(?:/yr|/year)?)?'
-                            match = re.search(salary_pattern, text)
-                            if match:
-                                salary = match.group(0)
-                                salary = salary.replace('.00', '').replace(',', '')
-                                break
-                except:
-                    pass
+        return salary, description
 
-        except Exception as e:
-            print(f"Error extracting salary and description: {e}")
+    def _load_detail_page(self, driver, job_url: str) -> str:
+        """
+        Navigate to a job detail page and return its HTML.
 
-        return salary, description
+        Raises:
+            TimeoutError: If the navigation outlived the hard page timeout
+        """
+        with self.stage('detail_navigation'), self.browsers.hard_timeout(self.SOURCE):
+            driver.get(job_url)
+        self.human_delay(1.5, 2.5)  # Wait for page to load
+        self.browsers.page_loaded()
+        html = driver.page_source
+        self.cache_page(job_url, 'detail', html)
+        return html
@@ -0,0 +1,185 @@
+"""
+On-disk cache of fetched search and detail pages.
+
+Pages are stored zlib-compressed in a SQLite file, keyed by normalized URL.
+Each page type has its own TTL: search results go stale within minutes,
+while a job's detail page rarely changes, so re-runs (and extractor
+debugging) can parse detail pages from disk instead of opening a browser.
+The cache is bounded in size; the least recently used pages are evicted
+first.
+"""
+import sqlite3
+import time
+import zlib
+from typing import Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+from src.metrics import metrics
+from .base import BaseScraper
+
+# Default time-to-live per page type, in seconds
+DEFAULT_TTLS = {
+    'search': 10 * 60,
+    'detail': 7 * 24 * 3600,
+}
+
+
+class PageCache:
+    """Size-bounded LRU cache of compressed HTML with per-page-type TTLs."""
+
+    def __init__(self, cache_path: str = 'page_cache.db', ttls: Dict[str, float] = None,
+                 max_bytes: int = 200 * 1024 * 1024, compress_level: int = 6):
+        """
+        Args:
+            cache_path: SQLite file holding the cached pages
+            ttls: Seconds a page stays fresh, keyed by page type ('search', 'detail')
+            max_bytes: Upper bound on the total compressed size of cached pages
+            compress_level: zlib compression level (1 fastest - 9 smallest)
+        """
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_bytes = max_bytes
+        self.compress_level = compress_level
+
+        self.conn = sqlite3.connect(cache_path, isolation_level=None, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                page_type TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                accessed_at REAL NOT NULL,
+                size INTEGER NOT NULL,
+                body BLOB NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_pages_accessed ON pages (accessed_at);
+        """)
+        self._total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+        # In-process stats for this run
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'expired': 0,
+            'stores': 0,
+            'evictions': 0,
+        }
+
+    @staticmethod
+    def cache_key(url: str) -> str:
+        """
+        Normalize a URL for use as a cache key.
+
+        Job URLs are reduced to their stable job id (BaseScraper.normalize_url);
+        other URLs get a lowercased host, sorted query parameters and no fragment.
+        """
+        url = BaseScraper.normalize_url(url)
+        parsed = urlparse(url)
+        query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+        return urlunparse((parsed.scheme.lower(), parsed.netloc.lower(), parsed.path or '/',
+                           parsed.params, query, ''))
+
+    def get(self, url: str, page_type: str) -> Optional[str]:
+        """
+        Return the cached HTML for a URL if present and still fresh.
+
+        Args:
+            url: Page URL
+            page_type: 'search' or 'detail' (selects the TTL)
+        """
+        key = self.cache_key(url)
+        row = self.conn.execute("SELECT fetched_at, body FROM pages WHERE url = ?", (key,)).fetchone()
+        now = time.time()
+
+        if row is None:
+            self._record(page_type, 'miss')
+            return None
+
+        fetched_at, body = row
+        if now - fetched_at > self.ttls.get(page_type, 0):
+            self._delete(key)
+            self.stats['expired'] += 1
+            self._record(page_type, 'miss')
+            return None
+
+        self.conn.execute("UPDATE pages SET accessed_at = ? WHERE url = ?", (now, key))
+        self._record(page_type, 'hit')
+        return zlib.decompress(body).decode('utf-8')
+
+    def put(self, url: str, page_type: str, html: str):
+        """Store a page, evicting least recently used pages if over the size bound."""
+        if not html:
+            return
+        key = self.cache_key(url)
+        body = zlib.compress(html.encode('utf-8'), self.compress_level)
+        now = time.time()
+
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            old = self.conn.execute("SELECT size FROM pages WHERE url = ?", (key,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO pages (url, page_type, fetched_at, accessed_at, size, body) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (key, page_type, now, now, len(body), body)
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        self._total_bytes += len(body) - (old[0] if old else 0)
+        self.stats['stores'] += 1
+
+        if self._total_bytes > self.max_bytes:
+            self._evict()
+
+    def _evict(self):
+        """Delete least recently used pages until the cache fits in max_bytes."""
+        # Evict down to 90% so a full cache doesn't evict on every put
+        target = self.max_bytes * 0.9
+        rows = self.conn.execute("SELECT url, size FROM pages ORDER BY accessed_at").fetchall()
+        evicted = []
+        for url, size in rows:
+            if self._total_bytes <= target:
+                break
+            evicted.append((url,))
+            self._total_bytes -= size
+
+        self.conn.executemany("DELETE FROM pages WHERE url = ?", evicted)
+        self.stats['evictions'] += len(evicted)
+
+    def _delete(self, key: str):
+        row = self.conn.execute("SELECT size FROM pages WHERE url = ?", (key,)).fetchone()
+        if row:
+            self.conn.execute("DELETE FROM pages WHERE url = ?", (key,))
+            self._total_bytes -= row[0]
+
+    def _record(self, page_type: str, outcome: str):
+        self.stats['hits' if outcome == 'hit' else 'misses'] += 1
+        metrics.incr('page_cache_requests_total', page_type=page_type, outcome=outcome)
+
+    def purge_expired(self) -> int:
+        """Delete pages older than their page type's TTL; returns the number removed."""
+        now = time.time()
+        removed = 0
+        for page_type, ttl in self.ttls.items():
+            removed += self.conn.execute(
+                "DELETE FROM pages WHERE page_type = ? AND fetched_at < ?", (page_type, now - ttl)
+            ).rowcount
+        self._total_bytes = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        return removed
+
+    def report(self) -> Dict:
+        """Stats for this run plus the cache's current size."""
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'hit_rate': round(self.stats['hits'] / lookups, 3) if lookups else 0.0,
+            'pages': len(self),
+            'size_bytes': self._total_bytes,
+        }
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM pages").fetchone()[0]
+
+    def close(self):
+        """Close the underlying SQLite connection."""
+        self.conn.close()
@@ -0,0 +1,119 @@
+"""
+Detail-page parsing off the browser's critical path.
+
+Scrapers capture a detail page's HTML once (page.content() / page_source)
+and hand it to a ParsePool instead of extracting fields through live
+browser calls. With workers > 0 the HTML is parsed (structured data first,
+then the scraper's BeautifulSoup selectors) in a ProcessPoolExecutor, so
+the browser can start the next navigation while earlier pages are parsed on
+other cores. With workers=0 parsing runs inline and the returned futures
+are already resolved, so callers use one code path either way.
+"""
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Dict, Optional
+
+from src.metrics import metrics
+from .structured_data import extract_structured_job
+
+# One parser instance per scraper class in each worker process
+_parsers = {}
+
+
+def _parser(scraper_cls):
+    if scraper_cls not in _parsers:
+        _parsers[scraper_cls] = scraper_cls('', '')
+    return _parsers[scraper_cls]
+
+
+def parse_detail_page(scraper_cls, html: str) -> Dict:
+    """
+    Parse a detail page's HTML (runs in a worker process when pooled).
+
+    Structured fields win (see BaseScraper.build_job). The selectors still run
+    when structured data lacks the description or the salary, so a JSON-LD
+    posting without baseSalary keeps the salary shown on the page.
+
+    Returns:
+        {'salary': str|None, 'description': str|None, 'structured': Dict,
+         'method': 'structured'|'selectors'}
+    """
+    structured = extract_structured_job(html)
+    if not structured.get('description'):
+        salary, description = _parser(scraper_cls).parse_detail_html(html)
+        return {'salary': salary, 'description': description, 'structured': structured, 'method': 'selectors'}
+    salary = description = None
+    if structured.get('salary_min') is None:
+        try:
+            salary, description = _parser(scraper_cls).parse_detail_html(html)
+        except Exception:
+            pass  # The structured fields are still usable
+    return {'salary': salary, 'description': description, 'structured': structured, 'method': 'structured'}
+
+
+def _warm_up():
+    return None
+
+
+class ParsePool:
+    """Parses detail pages inline or in a pool of worker processes."""
+
+    def __init__(self, workers: int = 0):
+        """
+        Args:
+            workers: Worker processes (0 parses inline in the calling thread)
+        """
+        self.workers = workers
+        self._executor = None
+        if workers > 0:
+            # Fork (where available) starts workers without re-importing the app. The
+            # workers are started here, before any browser or driver process exists.
+            methods = multiprocessing.get_all_start_methods()
+            context = multiprocessing.get_context('fork' if 'fork' in methods else None)
+            self._executor = ProcessPoolExecutor(max_workers=workers, mp_context=context)
+            for future in [self._executor.submit(_warm_up) for _ in range(workers)]:
+                future.result()
+
+        # In-process stats for this run
+        self.stats = {
+            'submitted': 0,
+            'structured': 0,
+            'selectors': 0,
+            'errors': 0,
+        }
+
+    def submit_detail(self, scraper_cls, html: str) -> Future:
+        """Queue a detail page for parsing; the Future resolves to parse_detail_page()'s result."""
+        self.stats['submitted'] += 1
+        if self._executor is not None:
+            return self._executor.submit(parse_detail_page, scraper_cls, html)
+
+        future = Future()
+        try:
+            future.set_result(parse_detail_page(scraper_cls, html))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+    def result(self, future: Future, board: str = None) -> Optional[Dict]:
+        """Wait for a parse, recording which extraction path it took (None if parsing failed)."""
+        try:
+            parsed = future.result()
+        except Exception as e:
+            print(f"  Error parsing detail page: {str(e)[:50]}")
+            self.stats['errors'] += 1
+            metrics.incr('detail_extraction_total', board=board, method='error')
+            return None
+        self.stats[parsed['method']] += 1
+        metrics.incr('detail_extraction_total', board=board, method=parsed['method'])
+        return parsed
+
+    def report(self) -> Dict:
+        """Stats for this run."""
+        return {**self.stats, 'workers': self.workers}
+
+    def close(self):
+        """Shut down the worker processes."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,244 @@
+"""
+Extract job fields from structured data embedded in detail pages.
+
+Job boards publish a schema.org JobPosting as JSON-LD for search engines,
+and Indeed also ships its page state as a JSON blob (window._initialData).
+One JSON parse gives salary, employment type, posted date and description
+without walking CSS selectors or regex-scraping rendered text; scrapers fall
+back to their selectors for whatever the structured data leaves out.
+"""
+import html as html_lib
+import json
+import re
+from datetime import datetime, timezone
+from typing import Dict, Iterator, Optional
+
+from bs4 import BeautifulSoup
+
+JSON_LD_RE = re.compile(
+    r'<script[^>]*type\s*=\s*["\']application/ld\+json["\'][^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL
+)
+
+# JavaScript assignments holding server-provided page state
+STATE_MARKERS = ('window._initialData', 'window.__INITIAL_STATE__')
+
+EMPLOYMENT_TYPES = {
+    'FULL_TIME': 'Full-time',
+    'PART_TIME': 'Part-time',
+    'CONTRACTOR': 'Contract',
+    'CONTRACT': 'Contract',
+    'TEMPORARY': 'Temporary',
+    'INTERN': 'Internship',
+    'INTERNSHIP': 'Internship',
+    'PER_DIEM': 'Per diem',
+    'VOLUNTEER': 'Volunteer',
+}
+
+SALARY_PERIODS = {
+    'YEAR': 'yearly',
+    'YEARLY': 'yearly',
+    'MONTH': 'monthly',
+    'MONTHLY': 'monthly',
+    'WEEK': 'weekly',
+    'WEEKLY': 'weekly',
+    'DAY': 'daily',
+    'DAILY': 'daily',
+    'HOUR': 'hourly',
+    'HOURLY': 'hourly',
+}
+
+
+def _json_ld_objects(html: str) -> Iterator[Dict]:
+    """Yield every JSON-LD object in the page, flattening lists and @graph."""
+    for match in JSON_LD_RE.finditer(html):
+        try:
+            data = json.loads(match.group(1).strip().rstrip(';'))
+        except ValueError:
+            continue
+        stack = [data]
+        while stack:
+            item = stack.pop()
+            if isinstance(item, list):
+                stack.extend(item)
+            elif isinstance(item, dict):
+                stack.extend(item.get('@graph', []))
+                yield item
+
+
+def find_job_posting(html: str) -> Optional[Dict]:
+    """Return the page's schema.org JobPosting object, if any."""
+    for item in _json_ld_objects(html):
+        types = item.get('@type')
+        if types == 'JobPosting' or (isinstance(types, list) and 'JobPosting' in types):
+            return item
+    return None
+
+
+def find_page_state(html: str) -> Optional[Dict]:
+    """Decode the first server-provided JSON state object assigned in an inline script."""
+    decoder = json.JSONDecoder()
+    for marker in STATE_MARKERS:
+        start = html.find(marker)
+        if start < 0:
+            continue
+        brace = html.find('{', start)
+        if brace < 0:
+            continue
+        try:
+            state, _ = decoder.raw_decode(html, brace)
+        except ValueError:
+            continue
+        if isinstance(state, dict):
+            return state
+    return None
+
+
+def _find_key(obj, names, depth: int = 0):
+    """Depth-first search of nested dicts/lists for the first non-empty value under any of names."""
+    if depth > 12:
+        return None
+    if isinstance(obj, dict):
+        for name in names:
+            if obj.get(name) not in (None, '', [], {}):
+                return obj[name]
+        children = obj.values()
+    elif isinstance(obj, list):
+        children = obj
+    else:
+        return None
+    for child in children:
+        if isinstance(child, (dict, list)):
+            found = _find_key(child, names, depth + 1)
+            if found is not None:
+                return found
+    return None
+
+
+BLOCK_TAGS = ('p', 'div', 'li', 'br', 'ul', 'ol', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'tr')
+
+
+def _html_to_text(value: str) -> Optional[str]:
+    """Render a description's HTML as text, one line per block element."""
+    if not value:
+        return None
+    soup = BeautifulSoup(html_lib.unescape(value), 'html.parser')
+    for tag in soup.find_all(BLOCK_TAGS):
+        tag.append('\n')
+    lines = (' '.join(line.split()) for line in soup.get_text().split('\n'))
+    text = '\n'.join(line for line in lines if line)
+    return text or None
+
+
+def _to_int(value) -> Optional[int]:
+    try:
+        return int(float(str(value).replace(',', '').replace('$', '')))
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_date(value) -> Optional[datetime]:
+    """Parse an ISO date/datetime or epoch milliseconds into a naive UTC datetime."""
+    if value in (None, ''):
+        return None
+    if isinstance(value, (int, float)):
+        return datetime.fromtimestamp(value / 1000 if value > 1e11 else value, tz=timezone.utc).replace(tzinfo=None)
+    try:
+        parsed = datetime.fromisoformat(str(value).strip().replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def _employment_type(value) -> Optional[str]:
+    if isinstance(value, list):
+        value = value[0] if value else None
+    if not value:
+        return None
+    key = str(value).strip().upper().replace('-', '_').replace(' ', '_')
+    return EMPLOYMENT_TYPES.get(key, str(value).strip())
+
+
+def _salary_fields(base_salary) -> Dict:
+    """Convert a schema.org MonetaryAmount into salary_min/max/period/currency."""
+    if not isinstance(base_salary, dict):
+        return {}
+    value = base_salary.get('value')
+    unit = base_salary.get('unitText')
+    if isinstance(value, dict):
+        unit = value.get('unitText', unit)
+        low = _to_int(value.get('minValue', value.get('value')))
+        high = _to_int(value.get('maxValue', value.get('value')))
+    else:
+        low = high = _to_int(value)
+    if low is None and high is None:
+        return {}
+    fields = {
+        'salary_min': low if low is not None else high,
+        'salary_max': high if high is not None else low,
+        'salary_period': SALARY_PERIODS.get(str(unit or 'YEAR').upper(), 'yearly'),
+    }
+    if base_salary.get('currency'):
+        fields['salary_currency'] = base_salary['currency']
+    return fields
+
+
+def _from_job_posting(posting: Dict) -> Dict:
+    fields = {
+        'description': _html_to_text(posting.get('description')),
+        'job_type': _employment_type(posting.get('employmentType')),
+        'posted_date': _parse_date(posting.get('datePosted')),
+    }
+    if str(posting.get('jobLocationType', '')).upper() == 'TELECOMMUTE':
+        fields['work_mode'] = 'Remote'
+    fields.update(_salary_fields(posting.get('baseSalary')))
+    return fields
+
+
+def _from_page_state(state: Dict) -> Dict:
+    """Best-effort mapping of Indeed-style page state keys onto job fields."""
+    fields = {
+        'description': _html_to_text(_find_key(state, ('sanitizedJobDescription', 'jobDescription'))),
+        'job_type': _employment_type(_find_key(state, ('jobTypes', 'jobType'))),
+        'posted_date': _parse_date(_find_key(state, ('datePosted', 'pubDate', 'createDate'))),
+    }
+    salary = _find_key(state, ('salaryInfoModel', 'baseSalary'))
+    if isinstance(salary, dict):
+        if 'salaryMin' in salary or 'salaryMax' in salary:
+            low, high = _to_int(salary.get('salaryMin')), _to_int(salary.get('salaryMax'))
+            if low is not None or high is not None:
+                fields['salary_min'] = low if low is not None else high
+                fields['salary_max'] = high if high is not None else low
+                fields['salary_period'] = SALARY_PERIODS.get(str(salary.get('salaryType', 'YEARLY')).upper(),
+                                                             'yearly')
+        else:
+            fields.update(_salary_fields(salary))
+    return fields
+
+
+def extract_structured_job(html: str) -> Dict:
+    """
+    Extract job fields from JSON-LD JobPosting and embedded page state.
+
+    Returns:
+        Dictionary with any of: description, job_type, posted_date, work_mode,
+        salary_min, salary_max, salary_period, salary_currency. Fields that
+        could not be found are omitted; an empty dict means no structured data.
+    """
+    if not html:
+        return {}
+    fields = {}
+    posting = find_job_posting(html)
+    if posting:
+        fields.update({k: v for k, v in _from_job_posting(posting).items() if v is not None})
+
+    # Page state fills whatever JSON-LD did not provide
+    if not all(key in fields for key in ('description', 'job_type', 'posted_date', 'salary_min')):
+        state = find_page_state(html)
+        if state:
+            for key, value in _from_page_state(state).items():
+                if value is not None:
+                    fields.setdefault(key, value)
+    return fields
@@ -0,0 +1,146 @@
+"""
+Per-board circuit breaker for detail-page fetches.
+
+Once a board starts serving bot-detection pages, every further request is
+likely to be blocked too, and each one costs a browser launch plus a
+randomized sleep. The breaker watches the outcomes of recent fetches per
+board and opens when the block (or overall error) ratio crosses a
+threshold. While open, remaining fetches are deferred. After a cooldown it
+half-opens: the next real fetch is a probe that closes the breaker on
+success or re-opens it (with a doubled cooldown) on failure.
+
+States are saved to a JSON file so an open breaker carries over to the
+next run.
+
+States:
+    closed    - fetches allowed, outcomes tracked
+    open      - fetches deferred until the cooldown expires
+    half_open - next fetch is a probe
+"""
+import json
+import os
+import time
+from collections import deque
+from typing import Dict
+
+from src.metrics import metrics
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitBreaker:
+    """Tracks detail-fetch outcomes per board and decides whether to keep fetching."""
+
+    def __init__(self, state_path: str = None, block_ratio: float = 0.3, error_ratio: float = 0.5,
+                 min_requests: int = 5, window: int = 10, cooldown_seconds: float = 1800,
+                 max_cooldown_seconds: float = 6 * 3600):
+        """
+        Args:
+            state_path: JSON file persisting breaker state between runs (None keeps it in memory)
+            block_ratio: Open when this fraction of recent fetches hit bot detection
+            error_ratio: Open when this fraction of recent fetches failed for any reason
+            min_requests: Fetches needed in the window before the ratios are checked
+            window: Number of recent fetches the ratios are computed over
+            cooldown_seconds: How long the breaker stays open before probing
+            max_cooldown_seconds: Upper bound on the cooldown after repeated failed probes
+        """
+        self.state_path = state_path
+        self.block_ratio = block_ratio
+        self.error_ratio = error_ratio
+        self.min_requests = min_requests
+        self.window = window
+        self.cooldown_seconds = cooldown_seconds
+        self.max_cooldown_seconds = max_cooldown_seconds
+
+        self._boards: Dict[str, Dict] = {}
+        self._outcomes: Dict[str, deque] = {}
+        if state_path and os.path.exists(state_path):
+            with open(state_path, encoding='utf-8') as f:
+                self._boards = json.load(f)
+
+        # In-process stats for this run
+        self.stats = {
+            'trips': 0,
+            'deferred': 0,
+            'probes': 0,
+        }
+
+    def _board(self, board: str) -> Dict:
+        return self._boards.setdefault(board, {'state': CLOSED, 'opened_at': None, 'cooldown': None})
+
+    def state(self, board: str) -> str:
+        """Current state for a board, moving open to half_open once the cooldown has passed."""
+        entry = self._board(board)
+        if entry['state'] == OPEN and time.time() >= entry['opened_at'] + entry['cooldown']:
+            self._transition(board, HALF_OPEN)
+            self.stats['probes'] += 1
+        return entry['state']
+
+    def allow(self, board: str) -> bool:
+        """Whether a live detail fetch should be attempted for this board."""
+        return self.state(board) != OPEN
+
+    def defer(self, board: str, count: int = 1):
+        """Record fetches skipped because the breaker is open."""
+        self.stats['deferred'] += count
+        metrics.incr('detail_fetches_deferred_total', value=count, board=board)
+
+    def record_success(self, board: str):
+        """Record a successful live fetch."""
+        if self.state(board) == HALF_OPEN:
+            print(f"  Circuit breaker for {board} closed after a successful probe")
+            self._board(board)['cooldown'] = None
+            self._transition(board, CLOSED)
+            return
+        self._outcomes.setdefault(board, deque(maxlen=self.window)).append('ok')
+
+    def record_failure(self, board: str, blocked: bool = False):
+        """Record a failed live fetch; opens the breaker if the ratios are exceeded."""
+        entry = self._board(board)
+        if self.state(board) == HALF_OPEN:
+            # Failed probe: back off for longer before the next one
+            cooldown = min((entry['cooldown'] or self.cooldown_seconds) * 2, self.max_cooldown_seconds)
+            self._open(board, cooldown, 'probe failed')
+            return
+
+        outcomes = self._outcomes.setdefault(board, deque(maxlen=self.window))
+        outcomes.append('blocked' if blocked else 'error')
+        if len(outcomes) < self.min_requests:
+            return
+
+        blocks = sum(1 for outcome in outcomes if outcome == 'blocked')
+        failures = sum(1 for outcome in outcomes if outcome != 'ok')
+        if blocks / len(outcomes) >= self.block_ratio:
+            self._open(board, self.cooldown_seconds, f"{blocks}/{len(outcomes)} recent fetches blocked")
+        elif failures / len(outcomes) >= self.error_ratio:
+            self._open(board, self.cooldown_seconds, f"{failures}/{len(outcomes)} recent fetches failed")
+
+    def _open(self, board: str, cooldown: float, reason: str):
+        entry = self._board(board)
+        entry['opened_at'] = time.time()
+        entry['cooldown'] = cooldown
+        self._outcomes.pop(board, None)
+        self.stats['trips'] += 1
+        print(f"  ⚠ Circuit breaker for {board} opened ({reason}); "
+              f"deferring detail fetches for {cooldown / 60:.0f} min")
+        self._transition(board, OPEN)
+
+    def _transition(self, board: str, state: str):
+        self._board(board)['state'] = state
+        metrics.incr('circuit_breaker_transitions_total', board=board, state=state)
+        self.save()
+
+    def save(self):
+        """Persist breaker states so an open breaker carries over to the next run."""
+        if not self.state_path:
+            return
+        tmp_path = f'{self.state_path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self._boards, f, indent=2)
+        os.replace(tmp_path, self.state_path)
+
+    def report(self) -> Dict:
+        """Stats for this run plus each board's current state."""
+        return {**self.stats, 'boards': {board: entry['state'] for board, entry in self._boards.items()}}
@@ -0,0 +1,189 @@
+"""
+Near-duplicate job detection using MinHash signatures and LSH banding.
+
+The same posting is often listed on several boards, or reposted under a new
+job ID, so exact URL matching misses it. Each job is reduced to a MinHash
+signature of its title/company/description shingles. Signatures are split
+into bands and each band is hashed into a bucket; only jobs sharing a bucket
+are compared, so inserts stay sublinear in the number of stored jobs.
+
+Jobs without a description (or with too little text) are never matched:
+title and company alone are the same for one company's openings in
+different cities, so they would all collapse into one cluster.
+"""
+import hashlib
+import re
+import sqlite3
+import zlib
+from typing import Iterable, NamedTuple, Optional, Set
+
+import numpy as np
+
+_WORD_RE = re.compile(r'\w+')
+
+
+class DedupeResult(NamedTuple):
+    """Outcome of inserting a job into the index."""
+    cluster_id: str
+    duplicate_of: Optional[str]
+    similarity: float
+
+    @property
+    def is_duplicate(self) -> bool:
+        return self.duplicate_of is not None
+
+
+class NearDuplicateIndex:
+    """Persisted MinHash LSH index that assigns canonical cluster ids."""
+
+    def __init__(self, index_path: str = 'dedupe.db', num_perm: int = 128,
+                 bands: int = 16, threshold: float = 0.8, shingle_size: int = 3,
+                 seed: int = 1, min_shingles: int = 10):
+        """
+        Open (or create) the index.
+
+        Args:
+            index_path: SQLite file holding signatures and LSH buckets
+            num_perm: Number of MinHash permutations (signature length)
+            bands: Number of LSH bands; must divide num_perm
+            threshold: Minimum estimated Jaccard similarity to call a duplicate
+            shingle_size: Number of words per shingle
+            seed: Seed for the hash permutations (must stay fixed for an index)
+            min_shingles: Fewer shingles than this and a job is neither matched nor
+                matchable (too little text to tell postings apart)
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.min_shingles = min_shingles
+
+        # Multiply-shift hash family: h(x) = ((a * x + b) mod 2^64) >> 32, a odd
+        rng = np.random.RandomState(seed)
+        self._a = (rng.randint(0, 2 ** 32, size=num_perm, dtype=np.uint64) << np.uint64(32)) \
+            | rng.randint(0, 2 ** 32, size=num_perm, dtype=np.uint64) | np.uint64(1)
+        self._b = (rng.randint(0, 2 ** 32, size=num_perm, dtype=np.uint64) << np.uint64(32)) \
+            | rng.randint(0, 2 ** 32, size=num_perm, dtype=np.uint64)
+
+        self.conn = sqlite3.connect(index_path)
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS signatures (
+                key TEXT PRIMARY KEY,
+                cluster_id TEXT NOT NULL,
+                signature BLOB NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS buckets (
+                band INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                key TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_buckets_band_bucket ON buckets (band, bucket);
+        """)
+        self.conn.commit()
+
+    def close(self):
+        """Close the underlying SQLite connection."""
+        self.conn.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM signatures").fetchone()[0]
+
+    def shingles(self, title: str, company: str, description: str = None) -> Set[int]:
+        """Hash word shingles of the job text into a set of 32-bit integers."""
+        text = ' '.join(part for part in (title, company, description) if part)
+        words = _WORD_RE.findall(text.lower())
+        if len(words) < self.shingle_size:
+            grams = [' '.join(words)] if words else []
+        else:
+            grams = [' '.join(words[i:i + self.shingle_size])
+                     for i in range(len(words) - self.shingle_size + 1)]
+        return {zlib.crc32(gram.encode('utf-8')) for gram in grams}
+
+    def signature(self, shingle_hashes: Iterable[int]) -> np.ndarray:
+        """Compute the MinHash signature for a set of shingle hashes."""
+        values = np.fromiter(shingle_hashes, dtype=np.uint64)
+        if values.size == 0:
+            return np.full(self.num_perm, np.iinfo(np.uint32).max, dtype=np.uint32)
+        # (num_perm, n_shingles) matrix of permuted hashes; uint64 overflow is intended
+        hashed = (np.outer(self._a, values) + self._b[:, None]) >> np.uint64(32)
+        return hashed.min(axis=1).astype(np.uint32)
+
+    def _band_buckets(self, signature: np.ndarray):
+        """Yield (band, bucket) pairs for a signature."""
+        for band in range(self.bands):
+            chunk = signature[band * self.rows:(band + 1) * self.rows].tobytes()
+            digest = hashlib.blake2b(chunk, digest_size=8).digest()
+            yield band, int.from_bytes(digest, 'big', signed=True)
+
+    def query(self, signature: np.ndarray) -> Optional[DedupeResult]:
+        """
+        Find the most similar indexed job for a signature.
+
+        Returns:
+            DedupeResult for the best match above the threshold, or None
+        """
+        candidates = set()
+        for band, bucket in self._band_buckets(signature):
+            rows = self.conn.execute(
+                "SELECT key FROM buckets WHERE band = ? AND bucket = ?", (band, bucket)
+            ).fetchall()
+            candidates.update(row[0] for row in rows)
+
+        best = None
+        for key in candidates:
+            row = self.conn.execute(
+                "SELECT cluster_id, signature FROM signatures WHERE key = ?", (key,)
+            ).fetchone()
+            if not row:
+                continue
+            other = np.frombuffer(row[1], dtype=np.uint32)
+            similarity = float(np.mean(other == signature))
+            if similarity >= self.threshold and (best is None or similarity > best.similarity):
+                best = DedupeResult(cluster_id=row[0], duplicate_of=key, similarity=similarity)
+        return best
+
+    def add(self, key: str, title: str, company: str, description: str = None) -> DedupeResult:
+        """
+        Insert a job and assign it to a cluster.
+
+        Args:
+            key: Stable job key (normalized URL)
+            title: Job title
+            company: Company name
+            description: Job description, if available
+
+        Returns:
+            DedupeResult; cluster_id is the key of the first job in the cluster.
+            Jobs without a description get their own cluster and are not
+            bucketed, so later jobs can't match them either.
+        """
+        existing = self.conn.execute(
+            "SELECT cluster_id FROM signatures WHERE key = ?", (key,)
+        ).fetchone()
+        if existing:
+            return DedupeResult(cluster_id=existing[0], duplicate_of=None, similarity=1.0)
+
+        shingles = self.shingles(title, company, description)
+        matchable = bool(description and description.strip()) and len(shingles) >= self.min_shingles
+        signature = self.signature(shingles)
+        match = self.query(signature) if matchable else None
+        cluster_id = match.cluster_id if match else key
+
+        self.conn.execute(
+            "INSERT INTO signatures (key, cluster_id, signature) VALUES (?, ?, ?)",
+            (key, cluster_id, signature.tobytes())
+        )
+        if matchable:
+            self.conn.executemany(
+                "INSERT INTO buckets (band, bucket, key) VALUES (?, ?, ?)",
+                [(band, bucket, key) for band, bucket in self._band_buckets(signature)]
+            )
+        self.conn.commit()
+
+        if match:
+            return match
+        return DedupeResult(cluster_id=key, duplicate_of=None, similarity=0.0)
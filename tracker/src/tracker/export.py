@@ -0,0 +1,179 @@
+"""
+Streaming export of stored jobs to CSV, JSONL or Parquet.
+
+Rows are pulled from the database in fixed-size chunks (Database.iter_jobs /
+DynamoDatabase.iter_jobs) and written as they arrive, so memory is bounded
+by one chunk (or one Parquet row group) whatever the table size. Parquet
+files use an explicit schema (timestamps, integers and booleans keep their
+types) and can be queried directly with DuckDB or pandas.
+"""
+import csv
+import gzip
+import io
+import json
+import time
+from datetime import datetime
+from typing import Dict, List
+
+from src.database.models import JOB_COLUMNS
+from src.metrics import metrics
+
+FORMATS = ('csv', 'jsonl', 'parquet')
+
+# Column types for Parquet; everything else is a string
+INTEGER_COLUMNS = ('id', 'salary_min', 'salary_max')
+TIMESTAMP_COLUMNS = ('posted_date', 'created_at', 'updated_at', 'applied_date')
+BOOLEAN_COLUMNS = ('is_duplicate', 'applied')
+
+
+def infer_format(path: str) -> str:
+    """Export format implied by a file name (foo.csv, foo.jsonl.gz, foo.parquet)."""
+    name = path.lower()
+    if name.endswith('.gz'):
+        name = name[:-3]
+    for fmt, extensions in (('csv', ('.csv',)), ('jsonl', ('.jsonl', '.ndjson', '.json')),
+                            ('parquet', ('.parquet', '.pq'))):
+        if name.endswith(extensions):
+            return fmt
+    raise ValueError(f"Cannot infer export format from '{path}'; pass --format")
+
+
+def _open_text(path: str):
+    """Text file for writing; '.gz' files are gzip-compressed."""
+    if path.endswith('.gz'):
+        return gzip.open(path, 'wt', encoding='utf-8', newline='')
+    return open(path, 'w', encoding='utf-8', newline='')
+
+
+class CsvWriter:
+    """Header row, then one CSV row per job (datetimes as ISO 8601)."""
+
+    def __init__(self, path: str, columns=JOB_COLUMNS):
+        self.columns = columns
+        self.file = _open_text(path)
+        self.writer = csv.writer(self.file)
+        self.writer.writerow(columns)
+
+    def write(self, rows: List[Dict]):
+        self.writer.writerows(
+            [value.isoformat() if isinstance(value, datetime) else value
+             for value in (row.get(column) for column in self.columns)]
+            for row in rows
+        )
+
+    def close(self):
+        self.file.close()
+
+
+class JsonlWriter:
+    """One JSON object per line (datetimes as ISO 8601)."""
+
+    def __init__(self, path: str, columns=JOB_COLUMNS):
+        self.columns = columns
+        self.file = _open_text(path)
+
+    def write(self, rows: List[Dict]):
+        buffer = io.StringIO()
+        for row in rows:
+            json.dump({column: row.get(column) for column in self.columns}, buffer,
+                      default=lambda value: value.isoformat() if isinstance(value, datetime) else str(value))
+            buffer.write('\n')
+        self.file.write(buffer.getvalue())
+
+    def close(self):
+        self.file.close()
+
+
+class ParquetWriter:
+    """Typed Parquet file written one row group at a time (requires pyarrow)."""
+
+    def __init__(self, path: str, columns=JOB_COLUMNS, compression: str = 'zstd',
+                 row_group_size: int = 50000):
+        """
+        Args:
+            path: Output file
+            columns: Job columns to write
+            compression: Parquet codec (zstd, snappy, gzip, none)
+            row_group_size: Rows buffered per row group; bounds memory and sets the
+                granularity readers can skip by
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Parquet export requires pyarrow (pip install pyarrow)") from None
+
+        def field_type(column):
+            if column in INTEGER_COLUMNS:
+                return pa.int64()
+            if column in TIMESTAMP_COLUMNS:
+                return pa.timestamp('us')
+            if column in BOOLEAN_COLUMNS:
+                return pa.bool_()
+            return pa.string()
+
+        self.pa = pa
+        self.columns = columns
+        self.schema = pa.schema([(column, field_type(column)) for column in columns])
+        self.row_group_size = row_group_size
+        self.writer = pq.ParquetWriter(path, self.schema, compression=compression)
+        self._buffer: List[Dict] = []
+
+    def write(self, rows: List[Dict]):
+        self._buffer.extend(rows)
+        while len(self._buffer) >= self.row_group_size:
+            self._flush(self._buffer[:self.row_group_size])
+            self._buffer = self._buffer[self.row_group_size:]
+
+    def _flush(self, rows: List[Dict]):
+        if rows:
+            table = self.pa.Table.from_pydict(
+                {column: [row.get(column) for row in rows] for column in self.columns}, schema=self.schema)
+            self.writer.write_table(table, row_group_size=len(rows))
+
+    def close(self):
+        self._flush(self._buffer)
+        self._buffer = []
+        self.writer.close()
+
+
+def export_jobs(database, path: str, fmt: str = None, status: str = None, since: datetime = None,
+                source: str = None, chunk_size: int = 1000, compression: str = 'zstd',
+                row_group_size: int = 50000) -> Dict:
+    """
+    Stream jobs matching the filters from database to path.
+
+    Args:
+        database: Database or DynamoDatabase instance
+        path: Output file ('.gz' compresses CSV/JSONL)
+        fmt: 'csv', 'jsonl' or 'parquet' (default: from the file extension)
+        status, since, source: Filters passed to iter_jobs()
+        chunk_size: Rows fetched per database round trip
+        compression: Parquet codec
+        row_group_size: Rows per Parquet row group
+
+    Returns:
+        {'rows', 'chunks', 'seconds', 'format'}
+    """
+    fmt = fmt or infer_format(path)
+    if fmt == 'csv':
+        writer = CsvWriter(path)
+    elif fmt == 'jsonl':
+        writer = JsonlWriter(path)
+    elif fmt == 'parquet':
+        writer = ParquetWriter(path, compression=compression, row_group_size=row_group_size)
+    else:
+        raise ValueError(f"Unknown export format: {fmt}")
+
+    stats = {'rows': 0, 'chunks': 0, 'seconds': 0.0, 'format': fmt}
+    start = time.perf_counter()
+    try:
+        for rows in database.iter_jobs(status=status, since=since, source=source, chunk_size=chunk_size):
+            writer.write(rows)
+            stats['rows'] += len(rows)
+            stats['chunks'] += 1
+    finally:
+        writer.close()
+    stats['seconds'] = round(time.perf_counter() - start, 3)
+    metrics.incr('export_rows_total', stats['rows'], format=fmt)
+    return stats
@@ -1,16 +1,54 @@
 """
 Job monitoring and change detection logic.
 """
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import datetime
+import json
+
+from src.metrics import metrics
+
+# Listing fields a re-scraped job may change; posted_date is left out because
+# boards show it relative to today
+UPDATE_FIELDS = ('title', 'company', 'location', 'job_type', 'work_mode', 'experience_level', 'description',
+                 'salary_min', 'salary_max', 'salary_currency', 'salary_period')
+
 
 class JobMonitor:
     """Monitors job listings and detects changes."""
 
-    def __init__(self, database):
+    def __init__(self, database, dedupe_index=None, ranking_index=None, similarity_index=None):
+        """
+        Args:
+            database: Database or DynamoDatabase instance
+            dedupe_index: Optional NearDuplicateIndex for cross-board near-duplicate detection
+            ranking_index: Optional RelevanceIndex that new jobs are added to for ranking
+            similarity_index: Optional SimilarityIndex that new jobs are embedded into
+        """
         self.db = database
+        self.dedupe_index = dedupe_index
+        self.ranking_index = ranking_index
+        self.similarity_index = similarity_index
 
     def process_jobs(self, jobs: List[Dict], source: str) -> Dict:
+        """Process scraped jobs, recording how long ingestion takes."""
+        with metrics.timer('monitor_process_seconds', board=source):
+            results = self._process_jobs(jobs, source)
+        metrics.incr('jobs_processed_total', results['new_count'], board=source, outcome='new')
+        metrics.incr('jobs_processed_total', results['seen_again_count'], board=source, outcome='seen_again')
+        metrics.incr('jobs_processed_total', results['updated_count'], board=source, outcome='updated')
+        metrics.incr('jobs_processed_total', results['duplicate_count'], board=source, outcome='duplicate')
+        return results
+
+    @staticmethod
+    def _merged_queries(existing_job, matched_queries) -> Optional[str]:
+        """JSON list of the stored job's queries plus new ones, or None if nothing was added."""
+        if not matched_queries:
+            return None
+        stored = json.loads(getattr(existing_job, 'matched_queries', None) or '[]')
+        added = [query for query in matched_queries if query not in stored]
+        return json.dumps(stored + added) if added else None
+
+    def _process_jobs(self, jobs: List[Dict], source: str) -> Dict:
         """
         Process scraped jobs and identify new/updated/removed listings.
 
@@ -19,10 +57,16 @@ class JobMonitor:
             source: Job board source name
 
         Returns:
-            Dictionary with 'new', 'updated', 'seen_again' job lists and counts
+            Dictionary with 'new', 'duplicates', 'seen_again', 'updated' job lists
+            and counts. Near-duplicates of already tracked jobs are stored but
+            flagged, and reported under 'duplicates' instead of 'new'. Jobs seen
+            again whose listing changed are saved with the new fields and also
+            reported under 'updated'.
         """
         new_jobs = []
+        duplicates = []
         seen_again = []
+        updated = []
 
         for job_data in jobs:
             url = job_data.get('url')
@@ -35,8 +79,30 @@ class JobMonitor:
             if existing_job:
                 # Job exists - already tracked
                 seen_again.append(existing_job)
+                # Fields the scraper didn't find are kept, not cleared
+                changes = {field: job_data[field] for field in UPDATE_FIELDS
+                           if job_data.get(field) is not None and job_data[field] != getattr(existing_job, field, None)}
+                # Searches that found the job this time are added to the ones that found it before;
+                # saved in the same write, but not counted as a listing change
+                queries = self._merged_queries(existing_job, job_data.get('matched_queries'))
+                fields = {**changes, 'matched_queries': queries} if queries else changes
+                if fields and self.db.update_job(url, **fields) and changes:
+                    updated.append(existing_job)
             else:
-                # New job - add to database
+                # New URL - check whether it is a repost or cross-board copy
+                cluster_id = None
+                is_duplicate = False
+                if self.dedupe_index is not None:
+                    with metrics.timer('dedupe_insert_seconds'):
+                        result = self.dedupe_index.add(
+                            url,
+                            job_data.get('title'),
+                            job_data.get('company'),
+                            job_data.get('description')
+                        )
+                    cluster_id = result.cluster_id
+                    is_duplicate = result.is_duplicate
+
                 new_job = self.db.add_job(
                     title=job_data.get('title'),
                     company=job_data.get('company'),
@@ -51,15 +117,33 @@ class JobMonitor:
                     salary_min=job_data.get('salary_min'),
                     salary_max=job_data.get('salary_max'),
                     salary_currency=job_data.get('salary_currency', 'USD'),
-                    salary_period=job_data.get('salary_period')
+                    salary_period=job_data.get('salary_period'),
+                    cluster_id=cluster_id,
+                    is_duplicate=is_duplicate,
+                    matched_queries=json.dumps(job_data['matched_queries']) if job_data.get('matched_queries') else None
                 )
-                new_jobs.append(new_job)
+                if is_duplicate:
+                    duplicates.append(new_job)
+                else:
+                    new_jobs.append(new_job)
+
+        if self.ranking_index is not None:
+            # One batch (and one commit) per board rather than per job
+            with metrics.timer('ranking_insert_seconds'):
+                self.ranking_index.add_jobs(new_jobs + duplicates)
+        if self.similarity_index is not None:
+            with metrics.timer('similarity_insert_seconds'):
+                self.similarity_index.add_jobs(new_jobs + duplicates)
 
         return {
             'new': new_jobs,
             'new_count': len(new_jobs),
+            'duplicates': duplicates,
+            'duplicate_count': len(duplicates),
             'seen_again': seen_again,
             'seen_again_count': len(seen_again),
+            'updated': updated,
+            'updated_count': len(updated),
             'total_processed': len(jobs)
         }
 
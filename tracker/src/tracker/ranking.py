@@ -0,0 +1,279 @@
+"""
+Relevance ranking of jobs against a candidate profile.
+
+Each job's title and description are reduced to a hashed-feature vector
+(the hashing trick, so there is no vocabulary to maintain) and stored in a
+SQLite file as the job is ingested. In memory the vectors form a sparse
+matrix in coordinate form, kept sorted by feature: scoring a profile only
+touches the postings of the profile's own features, so ranking 100k jobs
+takes milliseconds.
+
+Weighting follows the lnc.ltc scheme: document vectors use log term
+frequency and are length-normalized when added (they never change), while
+IDF is applied on the query side from the live document frequencies, so
+new jobs never force existing rows to be reweighted. Rows added since the
+last sort are kept in a small unsorted tail and scanned directly.
+
+Jobs whose yearly salary is known to be below the profile's floor are
+down-weighted rather than hidden.
+"""
+import re
+import sqlite3
+import zlib
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+
+_WORD_RE = re.compile(r'[a-z0-9][a-z0-9+#.]*[a-z0-9+#]|[a-z0-9]')
+
+STOPWORDS = frozenset("""
+a an and are as at be by for from has have in is it its of on or our that the this to we will with
+you your who what which their they them not all can may must about into more other such than
+""".split())
+
+# Multipliers turning a salary into a yearly amount
+YEARLY_FACTORS = {
+    'yearly': 1,
+    'monthly': 12,
+    'weekly': 52,
+    'daily': 260,
+    'hourly': 2080,
+}
+
+
+class CandidateProfile(NamedTuple):
+    """What the candidate is looking for."""
+    skills: Sequence[str] = ()
+    titles: Sequence[str] = ()
+    min_salary: Optional[float] = None  # Yearly
+
+    def __bool__(self) -> bool:
+        return bool(self.skills or self.titles)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word tokens (keeps c++, c#, node.js), without stopwords."""
+    if not text:
+        return []
+    return [token for token in _WORD_RE.findall(text.lower()) if token not in STOPWORDS]
+
+
+def yearly_salary(salary_min, salary_max, salary_period) -> Optional[float]:
+    """Top of the salary range as a yearly amount (None if unknown)."""
+    amount = salary_max or salary_min
+    if not amount:
+        return None
+    return float(amount) * YEARLY_FACTORS.get(salary_period or 'yearly', 1)
+
+
+class RelevanceIndex:
+    """Persisted hashed-feature matrix of job text, scored against candidate profiles."""
+
+    def __init__(self, index_path: str = 'ranking.db', n_features: int = 2 ** 20,
+                 title_weight: float = 2.0, salary_penalty: float = 0.5):
+        """
+        Open (or create) the index and load its vectors.
+
+        Args:
+            index_path: SQLite file holding one feature vector per job
+            n_features: Hash space size (power of two; must stay fixed for an index)
+            title_weight: Weight of title terms relative to description terms
+            salary_penalty: Score multiplier for jobs paying below the profile's floor
+        """
+        if n_features & (n_features - 1):
+            raise ValueError("n_features must be a power of two")
+        self.n_features = n_features
+        self.title_weight = title_weight
+        self.salary_penalty = salary_penalty
+
+        self.conn = sqlite3.connect(index_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS vectors (
+                key TEXT PRIMARY KEY,
+                features BLOB NOT NULL,
+                weights BLOB NOT NULL,
+                salary REAL
+            )
+        """)
+        self.conn.commit()
+
+        self.keys: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._df = np.zeros(n_features, dtype=np.int32)
+        self._salary = np.empty(0, dtype=np.float32)
+        # Sorted postings (feature-ordered) plus the unsorted tail of recent rows
+        self._feats = np.empty(0, dtype=np.int32)
+        self._docs = np.empty(0, dtype=np.int32)
+        self._weights = np.empty(0, dtype=np.float32)
+        self._tail: List[Tuple[int, np.ndarray, np.ndarray]] = []
+
+        rows = self.conn.execute("SELECT key, features, weights, salary FROM vectors ORDER BY rowid").fetchall()
+        self._append([(key, np.frombuffer(feats, dtype=np.int32), np.frombuffer(weights, dtype=np.float32),
+                       salary) for key, feats, weights, salary in rows])
+        self._merge()
+
+    def close(self):
+        """Close the underlying SQLite connection."""
+        self.conn.close()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def _hash(self, tokens: Iterable[str], prefix: str = '') -> np.ndarray:
+        mask = self.n_features - 1
+        return np.fromiter((zlib.crc32((prefix + token).encode('utf-8')) & mask for token in tokens),
+                           dtype=np.int32)
+
+    def vectorize(self, title: str, description: str = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Hashed, length-normalized log-tf vector of a job.
+
+        Title words count both as ordinary terms and, weighted by
+        title_weight, in a separate title namespace.
+
+        Returns:
+            (feature ids, weights), feature ids unique and sorted
+        """
+        title_tokens = tokenize(title)
+        body = self._hash(title_tokens + tokenize(description))
+        titles = self._hash(title_tokens, 't:')
+        features, counts = np.unique(np.concatenate([body, titles]), return_counts=True)
+        weights = 1 + np.log(counts.astype(np.float32))
+        weights[np.isin(features, titles)] *= self.title_weight
+        norm = np.linalg.norm(weights)
+        return features.astype(np.int32), (weights / norm if norm else weights).astype(np.float32)
+
+    def _append(self, rows):
+        """Add (key, features, weights, salary) rows to the in-memory matrix."""
+        if not rows:
+            return
+        start = len(self.keys)
+        salaries = np.empty(len(rows), dtype=np.float32)
+        for i, (key, features, weights, salary) in enumerate(rows):
+            self._rows[key] = start + i
+            self.keys.append(key)
+            salaries[i] = np.nan if salary is None else salary
+            self._tail.append((start + i, features, weights))
+            self._df[features] += 1
+        self._salary = np.concatenate([self._salary, salaries])
+
+    def _tail_arrays(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """(docs, features, weights) postings of the unsorted tail."""
+        docs = np.concatenate([np.full(len(f), row, dtype=np.int32) for row, f, _ in self._tail])
+        feats = np.concatenate([f for _, f, _ in self._tail])
+        weights = np.concatenate([w for _, _, w in self._tail])
+        return docs, feats, weights
+
+    def _merge(self):
+        """Fold the unsorted tail into the feature-sorted postings."""
+        if not self._tail:
+            return
+        docs, feats, weights = self._tail_arrays()
+        feats = np.concatenate([self._feats, feats])
+        order = np.argsort(feats, kind='stable')
+        self._feats = feats[order]
+        self._docs = np.concatenate([self._docs, docs])[order]
+        self._weights = np.concatenate([self._weights, weights])[order]
+        self._tail = []
+
+    def add_jobs(self, jobs: Iterable) -> int:
+        """
+        Index jobs (model objects or dicts with url/title/description/salary fields).
+
+        Already indexed URLs are skipped. Returns the number of jobs added.
+        """
+        rows = []
+        for job in jobs:
+            get = job.get if isinstance(job, dict) else lambda field, job=job: getattr(job, field, None)
+            key = get('url')
+            if not key or key in self._rows:
+                continue
+            features, weights = self.vectorize(get('title'), get('description'))
+            rows.append((key, features, weights,
+                         yearly_salary(get('salary_min'), get('salary_max'), get('salary_period'))))
+        if not rows:
+            return 0
+
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO vectors (key, features, weights, salary) VALUES (?, ?, ?, ?)",
+            [(key, f.tobytes(), w.tobytes(), salary) for key, f, w, salary in rows]
+        )
+        self.conn.commit()
+        self._append(rows)
+        # Keep the tail small relative to the sorted postings
+        if sum(len(f) for _, f, _ in self._tail) > max(len(self._feats) // 4, 50000):
+            self._merge()
+        return len(rows)
+
+    def query_vector(self, profile: CandidateProfile) -> Tuple[np.ndarray, np.ndarray]:
+        """IDF-weighted, normalized (ltc) vector of a profile's skills and titles."""
+        skill_tokens = [token for skill in profile.skills for token in tokenize(skill)]
+        title_tokens = [token for title in profile.titles for token in tokenize(title)]
+        features, counts = np.unique(np.concatenate([
+            self._hash(skill_tokens + title_tokens), self._hash(title_tokens, 't:')
+        ]), return_counts=True)
+        if features.size == 0:
+            return features.astype(np.int32), np.empty(0, dtype=np.float32)
+        idf = np.log((1 + len(self.keys)) / (1 + self._df[features])) + 1
+        weights = (1 + np.log(counts)) * idf
+        return features.astype(np.int32), (weights / np.linalg.norm(weights)).astype(np.float32)
+
+    def scores(self, profile: CandidateProfile) -> np.ndarray:
+        """Relevance of every indexed job to the profile (cosine similarity, salary-adjusted)."""
+        result = np.zeros(len(self.keys), dtype=np.float32)
+        features, weights = self.query_vector(profile)
+        if features.size == 0 or not self.keys:
+            return result
+
+        # Sorted postings: one contiguous slice per profile feature
+        lo = np.searchsorted(self._feats, features, side='left')
+        hi = np.searchsorted(self._feats, features, side='right')
+        for start, end, weight in zip(lo, hi, weights):
+            if end > start:
+                result += np.bincount(self._docs[start:end], self._weights[start:end] * weight,
+                                      minlength=len(result)).astype(np.float32)
+
+        # Recent rows not merged yet: small enough to scan
+        if self._tail:
+            docs, feats, doc_weights = self._tail_arrays()
+            hits = np.isin(feats, features)
+            query_weights = weights[np.searchsorted(features, feats[hits])]
+            np.add.at(result, docs[hits], doc_weights[hits] * query_weights)
+
+        if profile.min_salary:
+            below = self._salary < profile.min_salary  # NaN (unknown salary) compares False
+            result[below] *= self.salary_penalty
+        return result
+
+    def rank(self, profile: CandidateProfile, keys: Iterable[str] = None,
+             limit: int = None) -> List[Tuple[str, float]]:
+        """
+        Jobs ordered by relevance to the profile.
+
+        Args:
+            profile: Candidate profile
+            keys: Only rank these job URLs (unindexed ones are scored 0)
+            limit: Return at most this many jobs
+
+        Returns:
+            [(url, score), ...] best first
+        """
+        scores = self.scores(profile)
+        if keys is None:
+            rows = np.arange(len(self.keys))
+            candidates = self.keys
+        else:
+            candidates = list(keys)
+            rows = np.array([self._rows.get(key, -1) for key in candidates], dtype=np.int64)
+        candidate_scores = np.where(rows >= 0, scores[np.maximum(rows, 0)], 0.0) if len(rows) else scores[:0]
+
+        if limit is not None and limit < len(candidate_scores):
+            top = np.argpartition(-candidate_scores, limit)[:limit]
+        else:
+            top = np.arange(len(candidate_scores))
+        top = top[np.argsort(-candidate_scores[top], kind='stable')]
+        return [(candidates[i], float(candidate_scores[i])) for i in top]
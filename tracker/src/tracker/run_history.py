@@ -0,0 +1,130 @@
+"""
+Run history: building scrape_runs records and aggregating them over time windows.
+"""
+import json
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from src.metrics import metrics
+
+
+def build_run_record(started_at: datetime, board_results: Dict[str, Dict],
+                     search_stats: Dict, error: Exception = None) -> Dict:
+    """
+    Build the fields of a scrape_runs row from this run's results and metrics.
+
+    Args:
+        started_at: When the run started (UTC)
+        board_results: Per-board counts from run_scraper ('scraped', 'new', ...)
+        search_stats: MultiSearchRunner.stats
+        error: Exception that aborted the run, if any
+
+    Returns:
+        Dictionary of ScrapeRun fields
+    """
+    finished_at = datetime.utcnow()
+    sources = {}
+    for board, results in board_results.items():
+        sources[board] = {
+            'duration_seconds': round(
+                metrics.histogram_total('run_stage_seconds', stage='scrape', board=board)
+                + metrics.histogram_total('run_stage_seconds', stage='ingest', board=board), 3),
+            'cards': int(metrics.counter_total('cards_extracted_total', board=board)),
+            'detail_fetches': int(metrics.counter_total('detail_fetches_total', board=board)),
+            'blocks': int(metrics.counter_total('detail_fetches_total', board=board, outcome='blocked')),
+            'errors': int(metrics.counter_total('detail_fetches_total', board=board, outcome='error')
+                          + metrics.counter_total('search_errors_total', board=board)),
+            'new': results.get('new', 0),
+            'seen': results.get('seen_again', 0),
+            'updated': results.get('updated', 0),
+            'duplicates': results.get('duplicates', 0),
+        }
+
+    def total(field):
+        return sum(source[field] for source in sources.values())
+
+    return {
+        'started_at': started_at,
+        'finished_at': finished_at,
+        'duration_seconds': round((finished_at - started_at).total_seconds(), 3),
+        'status': 'error' if error else 'success',
+        'search_pages': search_stats.get('search_pages', 0),
+        'cards_found': search_stats.get('cards_found', 0),
+        'detail_fetches': total('detail_fetches'),
+        'blocks': total('blocks'),
+        'new_count': total('new'),
+        'seen_count': total('seen'),
+        'updated_count': total('updated'),
+        'duplicate_count': total('duplicates'),
+        'error_count': total('errors') + (1 if error else 0),
+        'error_message': str(error)[:1000] if error else None,
+        'sources': json.dumps(sources),
+    }
+
+
+def _window_start(moment: datetime, window: str) -> datetime:
+    """Truncate a datetime to the start of its day or ISO week."""
+    day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if window == 'week':
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+def summarize_runs(runs: List, window: str = 'day') -> List[Dict]:
+    """
+    Aggregate runs into day or week buckets.
+
+    Args:
+        runs: ScrapeRun / ScrapeRunModel objects
+        window: 'day' or 'week'
+
+    Returns:
+        List of per-window summaries, oldest first
+    """
+    buckets = {}
+    for run in runs:
+        start = _window_start(run.started_at.replace(tzinfo=None), window)
+        bucket = buckets.setdefault(start, {
+            'window_start': start,
+            'runs': 0,
+            'failed_runs': 0,
+            'durations': [],
+            'cards_found': 0,
+            'detail_fetches': 0,
+            'blocks': 0,
+            'new': 0,
+            'seen': 0,
+            'updated': 0,
+            'duplicates': 0,
+            'errors': 0,
+            'sources': {},
+        })
+        bucket['runs'] += 1
+        bucket['failed_runs'] += run.status == 'error'
+        if run.duration_seconds is not None:
+            bucket['durations'].append(float(run.duration_seconds))
+        bucket['cards_found'] += int(run.cards_found or 0)
+        bucket['detail_fetches'] += int(run.detail_fetches or 0)
+        bucket['blocks'] += int(run.blocks or 0)
+        bucket['new'] += int(run.new_count or 0)
+        bucket['seen'] += int(run.seen_count or 0)
+        bucket['updated'] += int(run.updated_count or 0)
+        bucket['duplicates'] += int(run.duplicate_count or 0)
+        bucket['errors'] += int(run.error_count or 0)
+
+        for board, source in json.loads(run.sources or '{}').items():
+            agg = bucket['sources'].setdefault(board, {'duration_seconds': 0.0, 'detail_fetches': 0,
+                                                        'blocks': 0, 'new': 0})
+            for field in agg:
+                agg[field] += source.get(field, 0)
+
+    summaries = []
+    for start in sorted(buckets):
+        bucket = buckets[start]
+        durations = sorted(bucket.pop('durations'))
+        bucket['avg_duration_seconds'] = sum(durations) / len(durations) if durations else None
+        bucket['max_duration_seconds'] = durations[-1] if durations else None
+        bucket['block_rate'] = bucket['blocks'] / bucket['detail_fetches'] if bucket['detail_fetches'] else 0.0
+        bucket['new_per_run'] = bucket['new'] / bucket['runs']
+        summaries.append(bucket)
+    return summaries
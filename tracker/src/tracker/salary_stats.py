@@ -0,0 +1,195 @@
+"""
+Salary analytics: annualized percentiles and histograms over stored jobs.
+
+Salary columns are loaded with a projection query (no ORM objects) into
+NumPy arrays, converted to yearly amounts, and summarized with vectorized
+per-group percentiles: one sort by (group, salary) and index arithmetic,
+rather than a Python loop per group. Reports are cached on disk, keyed by
+the database's data version, so repeated calls are free until new jobs
+arrive.
+"""
+import json
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from src.tracker.ranking import YEARLY_FACTORS
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+GROUP_BY = ('company', 'location', 'board', 'window')
+WINDOWS = ('day', 'week', 'month')
+
+
+def annualize(columns: Dict[str, list], currency: str = 'USD') -> Dict[str, np.ndarray]:
+    """
+    Turn get_salary_columns() output into arrays of yearly salaries.
+
+    The midpoint of each range is used (or whichever end is known). Jobs in
+    other currencies, and ranges that don't annualize to a positive amount,
+    are dropped. Missing periods and currencies count as yearly and USD.
+
+    Returns:
+        {'annual', 'company', 'location', 'board', 'posted'} arrays of equal length
+    """
+    low = np.array(columns['salary_min'], dtype=np.float64)
+    high = np.array(columns['salary_max'], dtype=np.float64)
+    midpoint = np.where(np.isnan(low), high, np.where(np.isnan(high), low, (low + high) / 2))
+
+    factors = np.array([YEARLY_FACTORS.get(period or 'yearly', np.nan) for period in columns['salary_period']],
+                       dtype=np.float64)
+    annual = midpoint * factors
+
+    same_currency = np.array([(c or 'USD') == currency for c in columns['salary_currency']], dtype=bool)
+    keep = (annual > 0) & same_currency  # NaN compares False
+
+    def labels(values):
+        return np.array([value or 'N/A' for value in values], dtype=str)[keep]
+
+    return {
+        'annual': annual[keep],
+        'company': labels(columns['company']),
+        'location': labels(columns['location']),
+        'board': labels(columns['board_source']),
+        'posted': np.array(columns['posted_date'], dtype='datetime64[s]')[keep],
+    }
+
+
+def window_labels(posted: np.ndarray, window: str) -> np.ndarray:
+    """Start date (YYYY-MM-DD) of the day, Monday-based week or month each datetime falls in."""
+    days = posted.astype('datetime64[D]')
+    if window == 'week':
+        # 1970-01-01 was a Thursday (weekday 3 with Monday = 0)
+        starts = days - ((days.astype(np.int64) + 3) % 7).astype('timedelta64[D]')
+    elif window == 'month':
+        starts = days.astype('datetime64[M]').astype('datetime64[D]')
+    else:
+        starts = days
+    return starts.astype(str)
+
+
+def group_percentiles(values: np.ndarray, keys: np.ndarray,
+                      percentiles=PERCENTILES) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Percentiles of values within each group, all groups at once.
+
+    Matches np.percentile's default (linear) interpolation.
+
+    Returns:
+        (group keys, counts, (groups, len(percentiles)) percentiles, means)
+    """
+    groups, inverse = np.unique(keys, return_inverse=True)
+    counts = np.bincount(inverse, minlength=len(groups))
+    if len(groups) == 0:
+        return groups, counts, np.empty((0, len(percentiles))), np.empty(0)
+    ordered = values[np.lexsort((values, inverse))]
+    starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+    positions = starts[:, None] + np.asarray(percentiles) / 100 * (counts[:, None] - 1)
+    below = np.floor(positions).astype(np.int64)
+    above = np.ceil(positions).astype(np.int64)
+    fraction = positions - below
+    result = ordered[below] * (1 - fraction) + ordered[above] * fraction
+    return groups, counts, result, np.bincount(inverse, values) / counts
+
+
+def salary_report(arrays: Dict[str, np.ndarray], group_by: str = None, window: str = 'week',
+                  days: int = None, bins: int = 10, min_count: int = 1, now: datetime = None) -> Dict:
+    """
+    Percentiles, mean and histogram of yearly salaries, optionally per group.
+
+    Args:
+        arrays: Output of annualize()
+        group_by: 'company', 'location', 'board', 'window' or None
+        window: Time window when grouping by 'window' ('day', 'week', 'month')
+        days: Only jobs posted in the last N days (None for the full history)
+        bins: Histogram bins, spanning the 1st to 99th percentile (outliers fall in the end bins)
+        min_count: Leave out groups with fewer salaries than this
+
+    Returns:
+        JSON-serializable report
+    """
+    annual = arrays['annual']
+    mask = np.ones(len(annual), dtype=bool)
+    if days is not None:
+        since = np.datetime64((now or datetime.utcnow()) - timedelta(days=days), 's')
+        mask &= arrays['posted'] >= since  # NaT compares False
+    if group_by == 'window':
+        mask &= ~np.isnat(arrays['posted'])
+    annual = annual[mask]
+
+    report = {'count': int(len(annual)), 'percentiles': list(PERCENTILES), 'overall': None,
+              'mean': None, 'histogram': None, 'group_by': group_by, 'groups': []}
+    if len(annual) == 0:
+        return report
+
+    report['overall'] = np.percentile(annual, PERCENTILES).tolist()
+    report['mean'] = float(annual.mean())
+    low, high = np.percentile(annual, [1, 99])
+    if high <= low:
+        low, high = low - 1, high + 1
+    counts, edges = np.histogram(np.clip(annual, low, high), bins=bins, range=(low, high))
+    report['histogram'] = {'edges': edges.tolist(), 'counts': counts.tolist()}
+
+    if group_by:
+        if group_by == 'window':
+            keys = window_labels(arrays['posted'][mask], window)
+        else:
+            keys = arrays[group_by][mask]
+        groups, group_counts, values, means = group_percentiles(annual, keys)
+        order = (np.arange(len(groups)) if group_by == 'window'
+                 else np.lexsort((groups, -group_counts)))  # most salaries first
+        report['groups'] = [
+            {'key': str(groups[i]), 'count': int(group_counts[i]), 'percentiles': values[i].tolist(),
+             'mean': float(means[i])}
+            for i in order if group_counts[i] >= min_count
+        ]
+    return report
+
+
+def cached_salary_report(database, cache_path: Optional[str], currency: str = 'USD', max_age: float = None,
+                         **params) -> Tuple[Dict, bool]:
+    """
+    salary_report() for a database, reusing the cached result until its data changes.
+
+    Args:
+        database: Database or DynamoDatabase instance
+        cache_path: JSON file holding reports for the current data version (None disables)
+        currency: Only jobs paid in this currency
+        max_age: Recompute cached reports older than this many seconds, even if the data
+            version is unchanged (None or 0 keeps them until it changes)
+        **params: salary_report() arguments
+
+    Returns:
+        (report, whether it came from the cache)
+    """
+    version = database.get_data_version()
+    # 'days' windows move with the clock, so they are part of the key along with today's date
+    key = json.dumps({**params, 'currency': currency,
+                      'today': datetime.utcnow().strftime('%Y-%m-%d') if params.get('days') else None},
+                     sort_keys=True)
+
+    now = time.time()
+    cache = {'version': version, 'created_at': now, 'reports': {}}
+    if cache_path and os.path.exists(cache_path):
+        try:
+            with open(cache_path) as f:
+                stored = json.load(f)
+            fresh = not max_age or now - stored.get('created_at', 0) < max_age
+            if stored.get('version') == version and fresh:
+                cache = stored
+        except (OSError, ValueError):
+            pass  # Unreadable cache: recompute
+    if key in cache['reports']:
+        return cache['reports'][key], True
+
+    report = salary_report(annualize(database.get_salary_columns(), currency), **params)
+    if cache_path:
+        cache['reports'][key] = report
+        tmp_path = f"{cache_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(cache, f)
+        os.replace(tmp_path, cache_path)
+    return report, False
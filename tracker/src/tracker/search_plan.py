@@ -0,0 +1,279 @@
+"""
+Multi-query, multi-location search runs with cross-query URL deduplication.
+"""
+import importlib
+import time
+from collections import deque
+from typing import Dict, List, NamedTuple, Optional
+
+from src.scrapers.base import DetailFetchError
+from src.scrapers.browser_manager import kill_orphaned_browsers
+
+BOARDS = ('indeed', 'linkedin')
+
+# Board -> (module, class); imported on demand so only the browser stack a run needs is loaded
+SCRAPER_CLASSES = {
+    'indeed': ('src.scrapers.indeed_scraper', 'IndeedScraper'),
+    'linkedin': ('src.scrapers.linkedin_scraper', 'LinkedInScraper'),
+}
+
+
+def load_scraper_class(board: str) -> type:
+    """Import and return the scraper class for a board."""
+    module_name, class_name = SCRAPER_CLASSES[board]
+    return getattr(importlib.import_module(module_name), class_name)
+
+
+class SearchSpec(NamedTuple):
+    """One search to run: a query and location on a single board."""
+    query: str
+    location: str
+    board: str
+
+    @property
+    def label(self) -> str:
+        return f"{self.query} @ {self.location}"
+
+
+def parse_searches(raw: Optional[str], default_query: str, default_location: str) -> List[SearchSpec]:
+    """
+    Parse the SEARCHES setting into a list of search specs.
+
+    Format: semicolon-separated ``query|location|board`` entries. Location
+    defaults to the LOCATION setting; omitting the board runs the search on
+    every board. Duplicate entries are dropped.
+
+    Example:
+        "software engineer|Remote;data engineer|New York|linkedin"
+
+    Returns:
+        List of SearchSpec; falls back to (default_query, default_location) on all boards
+    """
+    specs = []
+    for entry in (raw or '').split(';'):
+        parts = [part.strip() for part in entry.split('|')]
+        if not parts[0]:
+            continue
+        query = parts[0]
+        location = parts[1] if len(parts) > 1 and parts[1] else default_location
+        boards = [parts[2].lower()] if len(parts) > 2 and parts[2] else list(BOARDS)
+        for board in boards:
+            if board not in BOARDS:
+                raise ValueError(f"Unknown board '{board}' in SEARCHES (expected one of {BOARDS})")
+            specs.append(SearchSpec(query, location, board))
+
+    if not specs:
+        specs = [SearchSpec(default_query, default_location, board) for board in BOARDS]
+
+    # Keep first occurrence of each search so every search page is fetched once
+    return list(dict.fromkeys(specs))
+
+
+class MultiSearchRunner:
+    """Runs several searches per board and fetches each unique job once."""
+
+    def __init__(self, searches: List[SearchSpec], scraper_classes: Dict[str, type],
+                 keyword_filter=None, task_queue=None, page_cache=None, circuit_breaker=None,
+                 browser_manager=None, parse_pool=None, retry_wait_seconds: float = 60,
+                 parse_window: int = 4):
+        """
+        Args:
+            searches: Searches to run
+            scraper_classes: Mapping of board name to scraper class
+            keyword_filter: Optional KeywordFilter passed to every scraper
+            task_queue: Optional DetailTaskQueue making detail fetches durable and resumable
+            page_cache: Optional PageCache passed to every scraper
+            circuit_breaker: Optional CircuitBreaker deferring detail fetches for a board
+                that keeps getting blocked
+            browser_manager: Optional BrowserManager shared by every scraper
+            parse_pool: Optional ParsePool parsing detail pages for every scraper
+            retry_wait_seconds: Wait this long at most for a backed-off retry before
+                deferring it to the next run
+            parse_window: Queued detail pages parsed in the background before the oldest one
+                is waited for and marked done (bounds the work a crash can lose)
+        """
+        self.searches = searches
+        self.scraper_classes = scraper_classes
+        self.keyword_filter = keyword_filter
+        self.task_queue = task_queue
+        self.page_cache = page_cache
+        self.circuit_breaker = circuit_breaker
+        self.browser_manager = browser_manager
+        self.parse_pool = parse_pool
+        self.retry_wait_seconds = retry_wait_seconds
+        self.parse_window = parse_window
+        self.stats = {
+            'search_pages': 0,
+            'cards_found': 0,
+            'unique_cards': 0,
+            'detail_fetches': 0,
+        }
+
+    def boards(self) -> List[str]:
+        """Boards referenced by the configured searches, in first-seen order."""
+        return list(dict.fromkeys(spec.board for spec in self.searches))
+
+    def collect_cards(self, board: str, scraper) -> List[Dict]:
+        """
+        Run every search for a board and union the cards by URL.
+
+        Each returned card has a 'matched_queries' list of the searches that found it.
+        """
+        cards_by_url = {}
+        for spec in self.searches:
+            if spec.board != board:
+                continue
+            print(f"Searching {board}: '{spec.query}' in '{spec.location}'")
+            cards = scraper.collect_cards(spec.query, spec.location)
+            self.stats['search_pages'] += 1
+            self.stats['cards_found'] += len(cards)
+
+            for card in cards:
+                url = card.get('url')
+                if not url:
+                    continue
+                if url in cards_by_url:
+                    if spec.label not in cards_by_url[url]['matched_queries']:
+                        cards_by_url[url]['matched_queries'].append(spec.label)
+                else:
+                    cards_by_url[url] = {**card, 'matched_queries': [spec.label]}
+
+        unique = list(cards_by_url.values())
+        self.stats['unique_cards'] += len(unique)
+        return unique
+
+    def run_board(self, board: str) -> List[Dict]:
+        """Collect cards for all searches on a board, then fetch each unique job once."""
+        first = next(spec for spec in self.searches if spec.board == board)
+        scraper = self.scraper_classes[board](first.query, first.location,
+                                              keyword_filter=self.keyword_filter,
+                                              page_cache=self.page_cache,
+                                              browser_manager=self.browser_manager,
+                                              parse_pool=self.parse_pool)
+
+        # Clear out browsers leaked by a crashed run or a previous board
+        if self.browser_manager is not None:
+            kill_orphaned_browsers()
+
+        cards = self.collect_cards(board, scraper)
+        print(f"{board}: {len(cards)} unique jobs across searches")
+        cards = scraper.filter_cards(cards)
+        if self.task_queue is not None:
+            return self._fetch_with_queue(board, scraper, cards)
+        if self.circuit_breaker is not None:
+            return self._fetch_with_breaker(board, scraper, cards)
+        self.stats['detail_fetches'] += len(cards)
+        return scraper.fetch_details(cards)
+
+    def _record_outcome(self, board: str, scraper, error: DetailFetchError = None):
+        """Feed a live fetch outcome to the circuit breaker (cache hits don't count)."""
+        breaker = self.circuit_breaker
+        if breaker is None:
+            return
+        if error is not None:
+            breaker.record_failure(board, blocked=error.blocked)
+        elif not scraper.last_detail_cached:
+            breaker.record_success(board)
+
+    def _fetch_with_breaker(self, board: str, scraper, cards: List[Dict]) -> List[Dict]:
+        """Fetch details one by one, keeping card-level data for fetches deferred by an open breaker."""
+        breaker = self.circuit_breaker
+        # Jobs, or (card, parse future) pairs resolved once the browser work is done
+        results = []
+        # Jobs without a detail page: no description for the keyword filter to judge,
+        # so they are kept as on the queue path
+        card_only = []
+        deferred = 0
+        try:
+            for i, card in enumerate(cards, 1):
+                if not breaker.allow(board):
+                    # Pages still in the cache cost nothing; everything else waits for the next run
+                    job = scraper.detail_from_cache(card)
+                    if job is None:
+                        deferred += 1
+                        card_only.append(scraper.build_job(card, None, None))
+                    else:
+                        results.append(job)
+                    continue
+
+                print(f"Processing job {i}/{len(cards)}: {card.get('title', card['url'])[:50]}...")
+                try:
+                    results.append((card, scraper.submit_detail(card)))
+                except DetailFetchError as e:
+                    self._record_outcome(board, scraper, e)
+                    card_only.append(scraper.build_job(card, None, None))
+                else:
+                    self._record_outcome(board, scraper)
+                self.stats['detail_fetches'] += 1
+                scraper.pause_between_details()
+        finally:
+            scraper.close()
+
+        jobs = [scraper.finish_detail(*result) if isinstance(result, tuple) else result for result in results]
+
+        if deferred:
+            breaker.defer(board, deferred)
+            print(f"Circuit breaker open: kept card data for {deferred} jobs without fetching details")
+        return scraper.filter_jobs(jobs) + card_only
+
+    def _fetch_with_queue(self, board: str, scraper, cards: List[Dict]) -> List[Dict]:
+        """Fetch details through the durable task queue, resuming unfinished tasks first."""
+        queue = self.task_queue
+        resumed = queue.unfinished_count(board)
+        if resumed:
+            print(f"Resuming {resumed} unfinished detail fetches from a previous run")
+        # Cards finished in an earlier run are requeued, so their details are refetched
+        queue.enqueue(board, cards)
+
+        card_only = []
+
+        # (task, parse future) pairs: pages keep parsing while the browser loads the next ones
+        in_flight = deque()
+
+        def complete(limit: int):
+            while len(in_flight) > limit:
+                task, future = in_flight.popleft()
+                queue.complete(task, scraper.finish_detail(task.card, future))
+
+        try:
+            while True:
+                if self.circuit_breaker is not None and not self.circuit_breaker.allow(board):
+                    # Leave the remaining tasks pending for the next run
+                    self.circuit_breaker.defer(board, queue.unfinished_count(board))
+                    break
+                task = queue.claim(board)
+                if task is None:
+                    wait = queue.next_available_in(board)
+                    if wait is None or wait > self.retry_wait_seconds:
+                        break
+                    time.sleep(wait)
+                    continue
+
+                print(f"Fetching details: {task.card.get('title', task.url)[:50]}...")
+                try:
+                    future = scraper.submit_detail(task.card)
+                except DetailFetchError as e:
+                    self._record_outcome(board, scraper, e)
+                    if not queue.fail(task, str(e)):
+                        print(f"  Giving up after {task.attempts + 1} attempts")
+                        card_only.append(scraper.build_job(task.card, None, None))
+                else:
+                    in_flight.append((task, future))
+                    self._record_outcome(board, scraper)
+                    complete(self.parse_window)
+                self.stats['detail_fetches'] += 1
+                scraper.pause_between_details()
+        finally:
+            scraper.close()
+            # Parsing doesn't need the browser; finish (and mark done) whatever is still in flight
+            complete(0)
+
+        deferred = queue.unfinished_count(board)
+        if deferred:
+            print(f"Deferred {deferred} detail fetches to the next run")
+        return scraper.filter_jobs(queue.fetched_results(board)) + card_only
+
+    def ack(self, board: str):
+        """Mark a board's fetched jobs as ingested once the monitor has stored them."""
+        if self.task_queue is not None:
+            self.task_queue.ack(board)
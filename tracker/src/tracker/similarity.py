@@ -0,0 +1,348 @@
+"""
+"More like this" search over stored jobs.
+
+Jobs are embedded offline: the title and description are hashed into a
+sparse TF-IDF vector, then projected onto the top singular vectors of a
+sample of jobs (latent semantic analysis, fitted with a randomized SVD).
+The unit-length float32 embeddings are appended to a memory-mapped file, so
+opening the index reads nothing until a query touches it, and new jobs are
+added by projecting them with the fitted model.
+
+Queries scan the matrix in blocks, keeping a running top-K per query. A
+spherical k-means fitted with the model assigns each job a cluster; probing
+only the nearest clusters trades a little recall for a smaller scan.
+"""
+import os
+import sqlite3
+import zlib
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.tracker.ranking import tokenize
+
+MODEL_FILES = ('idf.npy', 'components.npy', 'centroids.npy')
+# Largest (entries x columns) float32 intermediate of a sparse product, about 4 MB
+PRODUCT_CHUNK_FLOATS = 1 << 20
+
+
+def _job_fields(job) -> Tuple[Optional[str], Optional[str], Optional[str]]:
+    if isinstance(job, dict):
+        return job.get('url'), job.get('title'), job.get('description')
+    return getattr(job, 'url', None), getattr(job, 'title', None), getattr(job, 'description', None)
+
+
+def _top_k(scores: np.ndarray, rows: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Best k columns of each row of scores (unordered), with their row ids."""
+    if scores.shape[1] <= k:
+        return scores, rows
+    best = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return np.take_along_axis(scores, best, axis=1), np.take_along_axis(rows, best, axis=1)
+
+
+def _sparse_dot(rows: np.ndarray, cols: np.ndarray, vals: np.ndarray, m: np.ndarray,
+                n_rows: int) -> np.ndarray:
+    """
+    Product of the COO matrix (rows, cols, vals) with dense m.
+
+    Entries must be sorted by row. They are multiplied in chunks of at most
+    PRODUCT_CHUNK_FLOATS floats and each chunk's runs of equal rows are summed
+    with reduceat, so memory stays bounded whatever the number of entries.
+    """
+    out = np.zeros((n_rows, m.shape[1]), dtype=np.float32)
+    chunk = max(1, PRODUCT_CHUNK_FLOATS // max(1, m.shape[1]))
+    for start in range(0, len(rows), chunk):
+        chunk_rows = rows[start:start + chunk]
+        products = vals[start:start + chunk, None] * m[cols[start:start + chunk]]
+        runs = np.flatnonzero(np.concatenate(([True], chunk_rows[1:] != chunk_rows[:-1])))
+        # A row split across two chunks gets one partial sum from each
+        out[chunk_rows[runs]] += np.add.reduceat(products, runs, axis=0)
+    return out
+
+
+class SimilarityIndex:
+    """Memory-mapped job embeddings with blocked top-K cosine search."""
+
+    def __init__(self, index_dir: str = 'similarity', dims: int = 64, n_features: int = 2 ** 14,
+                 block_rows: int = 16384):
+        """
+        Open (or create) the index directory. Nothing is loaded until first use.
+
+        Args:
+            index_dir: Directory holding the model, embedding matrix and key table
+            dims: Embedding size used when fitting a model
+            n_features: Hash space size for the sparse TF-IDF vectors
+            block_rows: Embeddings scored per block when searching
+        """
+        self.index_dir = index_dir
+        self.dims = dims
+        self.n_features = n_features
+        self.block_rows = block_rows
+        os.makedirs(index_dir, exist_ok=True)
+
+        self.conn = sqlite3.connect(os.path.join(index_dir, 'keys.db'))
+        self.conn.execute("""
+            CREATE TABLE IF NOT EXISTS rows (
+                row INTEGER PRIMARY KEY,
+                key TEXT UNIQUE NOT NULL
+            )
+        """)
+        self.conn.commit()
+
+        self._model = None
+        self._vectors = None
+        self._clusters = None
+
+    def close(self):
+        """Flush the embedding matrix and close the key table."""
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._clusters.flush()
+        self._vectors = self._clusters = None
+        self.conn.close()
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM rows").fetchone()[0]
+
+    def __contains__(self, key: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM rows WHERE key = ?", (key,)).fetchone() is not None
+
+    def _path(self, name: str) -> str:
+        return os.path.join(self.index_dir, name)
+
+    @property
+    def fitted(self) -> bool:
+        return all(os.path.exists(self._path(name)) for name in MODEL_FILES)
+
+    # Model
+
+    def _load_model(self):
+        """(idf, components, centroids), memory-mapped on first use."""
+        if self._model is None:
+            if not self.fitted:
+                raise RuntimeError(f"No similarity model in {self.index_dir}; fit() it first")
+            self._model = tuple(np.load(self._path(name), mmap_mode='r') for name in MODEL_FILES)
+        return self._model
+
+    def _sparse(self, jobs: List) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Log-tf hashed vectors of jobs as COO arrays (doc, feature, value)."""
+        mask = self.n_features - 1
+        docs, feats, vals = [], [], []
+        for i, job in enumerate(jobs):
+            _, title, description = _job_fields(job)
+            # Title words are counted twice: they say more about the job than boilerplate does
+            tokens = tokenize(title) * 2 + tokenize(description)
+            hashed = np.fromiter((zlib.crc32(token.encode('utf-8')) & mask for token in tokens),
+                                 dtype=np.int32, count=len(tokens))
+            features, counts = np.unique(hashed, return_counts=True)
+            docs.append(np.full(len(features), i, dtype=np.int32))
+            feats.append(features)
+            vals.append(1 + np.log(counts.astype(np.float32)))
+        if not docs:
+            return (np.empty(0, dtype=np.int32),) * 2 + (np.empty(0, dtype=np.float32),)
+        return np.concatenate(docs), np.concatenate(feats), np.concatenate(vals)
+
+    @staticmethod
+    def _normalize_rows(docs, vals, n):
+        norms = np.sqrt(np.bincount(docs, vals * vals, minlength=n)).astype(np.float32)
+        return vals / np.maximum(norms[docs], 1e-12)
+
+    def fit(self, jobs: List, sample: int = 10000, iterations: int = 2, seed: int = 0):
+        """
+        Fit the projection and clusters on (a sample of) jobs.
+
+        Replaces any previous model and clears the index, since old
+        embeddings are not comparable with the new ones; add the jobs
+        afterwards with add_jobs().
+        """
+        rng = np.random.default_rng(seed)
+        jobs = list(jobs)
+        if len(jobs) > sample:
+            jobs = [jobs[i] for i in rng.choice(len(jobs), sample, replace=False)]
+        if not jobs:
+            raise ValueError("Cannot fit a similarity model without jobs")
+        n = len(jobs)
+        docs, feats, vals = self._sparse(jobs)
+
+        idf = (np.log((1 + n) / (1 + np.bincount(feats, minlength=self.n_features))) + 1).astype(np.float32)
+        vals = self._normalize_rows(docs, vals * idf[feats], n)
+
+        # Entries are in document order; X.T products need them in feature order
+        by_feature = np.argsort(feats, kind='stable')
+        t_feats, t_docs, t_vals = feats[by_feature], docs[by_feature], vals[by_feature]
+
+        def x_dot(m):  # X @ m
+            return _sparse_dot(docs, feats, vals, m, n)
+
+        def xt_dot(m):  # X.T @ m
+            return _sparse_dot(t_feats, t_docs, t_vals, m, self.n_features)
+
+        # Randomized SVD (Halko et al.) using only sparse products with X
+        dims = min(self.dims, n)
+        q, _ = np.linalg.qr(x_dot(rng.standard_normal((self.n_features, dims + 10)).astype(np.float32)))
+        for _ in range(iterations):
+            q, _ = np.linalg.qr(x_dot(xt_dot(q)))
+        _, _, vt = np.linalg.svd(xt_dot(q).T, full_matrices=False)
+        components = np.ascontiguousarray(vt[:dims].T, dtype=np.float32)
+
+        embeddings = x_dot(components)
+        embeddings /= np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+        centroids = self._kmeans(embeddings, max(1, min(256, int(np.sqrt(n)))), rng)
+
+        self._reset()
+        for name, array in zip(MODEL_FILES, (idf, components, centroids)):
+            np.save(self._path(name), array)
+        self._model = None
+
+    @staticmethod
+    def _kmeans(embeddings: np.ndarray, k: int, rng, iterations: int = 10) -> np.ndarray:
+        """Spherical k-means: unit centroids maximizing cosine similarity."""
+        centroids = embeddings[rng.choice(len(embeddings), k, replace=False)].copy()
+        for _ in range(iterations):
+            labels = np.argmax(embeddings @ centroids.T, axis=1)
+            for c in range(k):
+                members = embeddings[labels == c]
+                if len(members):
+                    centroids[c] = members.sum(axis=0)
+            centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+        return centroids.astype(np.float32)
+
+    def _reset(self):
+        self._vectors = self._clusters = None
+        for name in ('vectors.f32', 'clusters.i32'):
+            if os.path.exists(self._path(name)):
+                os.remove(self._path(name))
+        self.conn.execute("DELETE FROM rows")
+        self.conn.commit()
+
+    def embed(self, jobs: List) -> np.ndarray:
+        """Unit-length embeddings of jobs under the fitted model."""
+        idf, components, _ = self._load_model()
+        docs, feats, vals = self._sparse(jobs)
+        vals = self._normalize_rows(docs, vals * idf[feats], len(jobs))
+        out = _sparse_dot(docs, feats, vals, components, len(jobs))
+        out /= np.maximum(np.linalg.norm(out, axis=1, keepdims=True), 1e-12)
+        return out
+
+    # Storage
+
+    def _open(self, rows: int):
+        """Memory-map the embedding and cluster files with room for at least `rows` rows."""
+        dims = self._load_model()[1].shape[1]
+        capacity = self._vectors.shape[0] if self._vectors is not None else 0
+        if self._vectors is not None and rows <= capacity:
+            return
+        path = self._path('vectors.f32')
+        on_disk = os.path.getsize(path) // (4 * dims) if os.path.exists(path) else 0
+        if rows > on_disk:
+            # Grow geometrically so incremental inserts don't rewrite the file each time
+            on_disk = max(rows, 2 * on_disk, 1024)
+            for name, width in (('vectors.f32', 4 * dims), ('clusters.i32', 4)):
+                with open(self._path(name), 'ab') as f:
+                    f.truncate(on_disk * width)
+        self._vectors = np.memmap(path, dtype=np.float32, mode='r+', shape=(on_disk, dims))
+        self._clusters = np.memmap(self._path('clusters.i32'), dtype=np.int32, mode='r+', shape=(on_disk,))
+
+    def add_jobs(self, jobs: Iterable) -> int:
+        """
+        Embed and append jobs not yet in the index.
+
+        Does nothing until a model has been fitted. Returns the number of jobs added.
+        """
+        if not self.fitted:
+            return 0
+        seen = set()
+        new = []
+        for job in jobs:
+            key = _job_fields(job)[0]
+            if key and key not in seen and key not in self:
+                seen.add(key)
+                new.append(job)
+        if not new:
+            return 0
+
+        start = len(self)
+        embeddings = self.embed(new)
+        self._open(start + len(new))
+        self._vectors[start:start + len(new)] = embeddings
+        self._clusters[start:start + len(new)] = np.argmax(embeddings @ self._load_model()[2].T, axis=1)
+        self._vectors.flush()
+        self._clusters.flush()
+        self.conn.executemany("INSERT INTO rows (row, key) VALUES (?, ?)",
+                              [(start + i, _job_fields(job)[0]) for i, job in enumerate(new)])
+        self.conn.commit()
+        return len(new)
+
+    # Search
+
+    def search(self, queries: np.ndarray, k: int = 10, probe: int = 0) -> List[List[Tuple[str, float]]]:
+        """
+        Top-k most similar indexed jobs for each query embedding.
+
+        Args:
+            queries: (q, dims) unit-length embeddings
+            k: Results per query
+            probe: Only scan jobs in each query's `probe` nearest clusters (0 scans everything)
+
+        Returns:
+            One [(url, cosine similarity), ...] list per query, best first
+        """
+        n = len(self)
+        queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+        if n == 0 or k <= 0:
+            return [[] for _ in queries]
+        self._open(n)
+        vectors = self._vectors[:n]
+
+        if probe:
+            # One candidate set for the whole batch: the union of each query's nearest clusters
+            nearest = np.argsort(-(queries @ self._load_model()[2].T), axis=1)[:, :probe]
+            candidates = np.flatnonzero(np.isin(self._clusters[:n], nearest))
+        else:
+            candidates = None
+
+        best_scores = np.full((len(queries), 0), -np.inf, dtype=np.float32)
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+        total = n if candidates is None else len(candidates)
+        for start in range(0, total, self.block_rows):
+            if candidates is None:
+                rows = np.arange(start, min(start + self.block_rows, n))
+                block = vectors[start:start + self.block_rows]
+            else:
+                rows = candidates[start:start + self.block_rows]
+                block = vectors[rows]
+            scores = queries @ np.asarray(block).T
+            best_scores, best_rows = _top_k(
+                np.concatenate([best_scores, scores], axis=1),
+                np.concatenate([best_rows, np.broadcast_to(rows, scores.shape)], axis=1), k)
+
+        order = np.argsort(-best_scores, axis=1)
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_rows = np.take_along_axis(best_rows, order, axis=1)
+        keys = self._keys(np.unique(best_rows))
+        return [[(keys[row], float(score)) for row, score in zip(rows, scores)]
+                for rows, scores in zip(best_rows.tolist(), best_scores.tolist())]
+
+    def _keys(self, rows: np.ndarray) -> dict:
+        keys = {}
+        rows = rows.tolist()
+        for i in range(0, len(rows), 500):
+            chunk = rows[i:i + 500]
+            keys.update(self.conn.execute(
+                f"SELECT row, key FROM rows WHERE row IN ({','.join('?' * len(chunk))})", chunk).fetchall())
+        return keys
+
+    def vector(self, key: str) -> Optional[np.ndarray]:
+        """Stored embedding of an indexed job, or None."""
+        found = self.conn.execute("SELECT row FROM rows WHERE key = ?", (key,)).fetchone()
+        if found is None:
+            return None
+        self._open(len(self))
+        return np.array(self._vectors[found[0]])
+
+    def similar(self, key: str, k: int = 10, probe: int = 0) -> List[Tuple[str, float]]:
+        """The k indexed jobs most similar to an indexed job (excluding itself)."""
+        vector = self.vector(key)
+        if vector is None:
+            return []
+        return [(other, score) for other, score in self.search(vector, k + 1, probe)[0] if other != key][:k]
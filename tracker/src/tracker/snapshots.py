@@ -0,0 +1,338 @@
+"""
+Precomputed dashboard data, published after each run.
+
+The dashboard's API routes (/api/stats, /api/charts/[type], /api/jobs) scan
+the whole jobs table on every request. build_snapshots() computes the same
+payloads in one streaming pass over the jobs (iter_jobs), and
+publish_snapshots() writes them as gzip-compressed JSON under a new version,
+then points latest.json at it:
+
+    latest.json                               {"version", "generated_at", "manifest"}
+    <version>/manifest.json.gz                data version, windows, files and sizes
+    <version>/stats.json.gz                   /api/stats
+    <version>/charts/<type>.json.gz           /api/charts/<type>
+    <version>/jobs/page-0001.json.gz, ...     /api/jobs pages, newest first
+
+latest.json is written last, so a reader that starts from it never sees a
+half-written version. Versioned files never change once written (long
+cache lifetimes are safe); only the newest `keep` versions are kept.
+Snapshots go to a local directory or to any S3-compatible bucket.
+"""
+import gzip
+import json
+import os
+import re
+import shutil
+import time
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from src.metrics import metrics
+
+SCHEMA_VERSION = 1
+
+# Versions are named after their UTC publish time; anything else under the store (a dashboard's
+# own assets when publishing into its public/ folder) is never listed, so never pruned
+VERSION_FORMAT = '%Y%m%dT%H%M%SZ'
+VERSION_RE = re.compile(r'^\d{8}T\d{6}Z$')
+
+# Look-back windows, matching the dashboard API defaults
+STATS_DAYS = 365
+CHART_DAYS = 90
+JOBS_DAYS = 30
+TOP_LIMIT = 10
+
+CHART_TYPES = ('source-distribution', 'timeline', 'top-companies', 'top-locations', 'job-types',
+               'work-modes', 'salary-distribution')
+SALARY_RANGES = [('<50k', 50000), ('50-75k', 75000), ('75-100k', 100000), ('100-125k', 125000),
+                 ('125-150k', 150000), ('150-200k', 200000), ('200k+', None)]
+
+# Job pages leave out descriptions: the jobs table doesn't show them and they dominate the size
+PAGE_EXCLUDED_COLUMNS = ('description',)
+
+
+def _iso(value: datetime) -> str:
+    """Naive UTC datetime as ISO 8601 with a Z suffix (so browsers don't read it as local time)."""
+    return value.isoformat(timespec='seconds') + 'Z'
+
+
+def _json_value(value):
+    return _iso(value) if isinstance(value, datetime) else value
+
+
+def _count(counts: Dict[str, int], key: str):
+    counts[key] = counts.get(key, 0) + 1
+
+
+def _top(counts: Dict[str, int], limit: int) -> List:
+    return sorted(counts.items(), key=lambda item: -item[1])[:limit]
+
+
+def build_snapshots(database, page_size: int = 25, now: datetime = None,
+                    chunk_size: int = 1000) -> Dict[str, Dict]:
+    """
+    Compute the dashboard payloads from the stored jobs.
+
+    Args:
+        database: Database or DynamoDatabase instance
+        page_size: Jobs per page of the job list
+        now: Reference time (default: now, UTC)
+        chunk_size: Rows fetched per database round trip
+
+    Returns:
+        Payloads keyed by file name without extension ('stats', 'charts/timeline',
+        'jobs/page-0001', ...)
+    """
+    now = now or datetime.utcnow()
+    today_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    week_start = today_start - timedelta(days=(today_start.weekday() + 1) % 7)  # Weeks start on Sunday
+    month_start = today_start.replace(day=1)
+    chart_cutoff = now - timedelta(days=CHART_DAYS)
+    jobs_cutoff = now - timedelta(days=JOBS_DAYS)
+
+    stats = {
+        'total_jobs': 0, 'jobs_today': 0, 'jobs_this_week': 0, 'jobs_this_month': 0, 'applied_count': 0,
+        'status_counts': {}, 'source_counts': {}, 'application_status_counts': {},
+    }
+    sources, dates, companies, locations, job_types, work_modes = {}, {}, {}, {}, {}, {}
+    salary_counts = [0] * len(SALARY_RANGES)
+    salaries = 0
+    listed = []
+
+    # posted_date >= since also drops jobs without a posted date, as the dashboard does
+    for rows in database.iter_jobs(since=now - timedelta(days=STATS_DAYS), chunk_size=chunk_size):
+        for row in rows:
+            posted = row['posted_date']
+            stats['total_jobs'] += 1
+            stats['jobs_today'] += posted >= today_start
+            stats['jobs_this_week'] += posted >= week_start
+            stats['jobs_this_month'] += posted >= month_start
+            stats['applied_count'] += bool(row['applied'])
+            _count(stats['status_counts'], row['status'] or 'unknown')
+            _count(stats['source_counts'], row['board_source'] or 'unknown')
+            _count(stats['application_status_counts'], row['application_status'] or 'not_applied')
+
+            if posted >= chart_cutoff:
+                _count(sources, row['board_source'] or 'unknown')
+                _count(dates, posted.strftime('%Y-%m-%d'))
+                if row['company']:
+                    _count(companies, row['company'])
+                if row['location']:
+                    _count(locations, row['location'])
+                _count(job_types, row['job_type'] or 'Not specified')
+                _count(work_modes, row['work_mode'] or 'Not specified')
+                low, high = row['salary_min'], row['salary_max']
+                salary = (low + high) / 2 if low and high else low or high
+                if salary:
+                    salaries += 1
+                    salary_counts[next(i for i, (_, upper) in enumerate(SALARY_RANGES)
+                                       if upper is None or salary < upper)] += 1
+
+            if posted >= jobs_cutoff:
+                listed.append({column: _json_value(value) for column, value in row.items()
+                               if column not in PAGE_EXCLUDED_COLUMNS})
+
+    top_companies, top_locations = _top(companies, TOP_LIMIT), _top(locations, TOP_LIMIT)
+    snapshots = {
+        'stats': stats,
+        'charts/source-distribution': {'labels': list(sources), 'values': list(sources.values())},
+        'charts/timeline': {'dates': sorted(dates), 'counts': [dates[date] for date in sorted(dates)]},
+        'charts/top-companies': {'companies': [name for name, _ in top_companies],
+                                 'counts': [count for _, count in top_companies]},
+        'charts/top-locations': {'locations': [name for name, _ in top_locations],
+                                 'counts': [count for _, count in top_locations]},
+        'charts/job-types': {'labels': list(job_types), 'values': list(job_types.values())},
+        'charts/work-modes': {'labels': list(work_modes), 'values': list(work_modes.values())},
+        'charts/salary-distribution': {'ranges': [label for label, _ in SALARY_RANGES], 'counts': salary_counts,
+                                       'total_with_salary': salaries},
+    }
+
+    listed.sort(key=lambda job: job['posted_date'], reverse=True)
+    total_pages = max(1, -(-len(listed) // page_size))
+    for page in range(1, total_pages + 1):
+        snapshots[f'jobs/page-{page:04d}'] = {
+            'jobs': listed[(page - 1) * page_size:page * page_size],
+            'pagination': {
+                'page': page,
+                'limit': page_size,
+                'totalJobs': len(listed),
+                'totalPages': total_pages,
+                'hasNextPage': page < total_pages,
+                'hasPreviousPage': page > 1,
+            },
+        }
+    return snapshots
+
+
+class LocalSnapshotStore:
+    """Snapshot files under a local directory (e.g. a dashboard's public/ folder or a synced volume)."""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+
+    def put(self, key: str, body: bytes, content_type: str, content_encoding: str = None,
+            cache_control: str = None):
+        """Write one file atomically (content headers only matter for S3)."""
+        path = os.path.join(self.directory, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f'{path}.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(body)
+        os.replace(tmp_path, path)
+
+    def list_versions(self) -> List[str]:
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name for name in os.listdir(self.directory)
+                      if VERSION_RE.match(name) and os.path.isdir(os.path.join(self.directory, name)))
+
+    def delete_version(self, version: str):
+        shutil.rmtree(os.path.join(self.directory, version), ignore_errors=True)
+
+    def __str__(self):
+        return self.directory
+
+
+class S3SnapshotStore:
+    """Snapshot objects under a prefix in an S3 (or S3-compatible, e.g. MinIO) bucket."""
+
+    def __init__(self, bucket: str, prefix: str = '', endpoint_url: str = None, region: str = None,
+                 client=None):
+        """
+        Args:
+            bucket: Bucket name
+            prefix: Key prefix ('dashboard' -> dashboard/latest.json)
+            endpoint_url: Endpoint of an S3-compatible store (None for AWS)
+            region: AWS region
+            client: Preconfigured S3 client (default: one from boto3)
+        """
+        if client is None:
+            import boto3
+            client = boto3.client('s3', endpoint_url=endpoint_url, region_name=region)
+        self.client = client
+        self.bucket = bucket
+        self.prefix = f"{prefix.strip('/')}/" if prefix.strip('/') else ''
+
+    def put(self, key: str, body: bytes, content_type: str, content_encoding: str = None,
+            cache_control: str = None):
+        """Upload one object; gzip files are tagged so browsers and CDNs decompress them."""
+        extra = {}
+        if content_encoding:
+            extra['ContentEncoding'] = content_encoding
+        if cache_control:
+            extra['CacheControl'] = cache_control
+        self.client.put_object(Bucket=self.bucket, Key=self.prefix + key, Body=body, ContentType=content_type,
+                               **extra)
+
+    def _list(self, prefix: str, delimiter: str = None) -> List[Dict]:
+        """All list_objects_v2 pages under a prefix."""
+        pages, token = [], None
+        while True:
+            kwargs = {'Bucket': self.bucket, 'Prefix': prefix}
+            if delimiter:
+                kwargs['Delimiter'] = delimiter
+            if token:
+                kwargs['ContinuationToken'] = token
+            page = self.client.list_objects_v2(**kwargs)
+            pages.append(page)
+            if not page.get('IsTruncated'):
+                return pages
+            token = page['NextContinuationToken']
+
+    def list_versions(self) -> List[str]:
+        names = (common['Prefix'][len(self.prefix):].rstrip('/')
+                 for page in self._list(self.prefix, delimiter='/')
+                 for common in page.get('CommonPrefixes', []))
+        return sorted(name for name in names if VERSION_RE.match(name))
+
+    def delete_version(self, version: str):
+        keys = [{'Key': item['Key']} for page in self._list(f'{self.prefix}{version}/')
+                for item in page.get('Contents', [])]
+        # DeleteObjects takes at most 1000 keys per request
+        for start in range(0, len(keys), 1000):
+            self.client.delete_objects(Bucket=self.bucket, Delete={'Objects': keys[start:start + 1000],
+                                                                   'Quiet': True})
+
+    def __str__(self):
+        return f's3://{self.bucket}/{self.prefix}'
+
+
+def open_store(directory: str = None, bucket: str = None, prefix: str = '', endpoint_url: str = None,
+               region: str = None):
+    """The configured snapshot store (a bucket takes precedence over a directory), or None."""
+    if bucket:
+        return S3SnapshotStore(bucket, prefix, endpoint_url=endpoint_url or None, region=region)
+    if directory:
+        return LocalSnapshotStore(directory)
+    return None
+
+
+def publish_snapshots(database, store, page_size: int = 25, keep: int = 5, now: datetime = None,
+                      compress_level: int = 6) -> Dict:
+    """
+    Build the dashboard snapshots and publish them as a new version.
+
+    Args:
+        database: Database or DynamoDatabase instance
+        store: LocalSnapshotStore or S3SnapshotStore
+        page_size: Jobs per page of the job list
+        keep: Versions to keep, including the new one
+        now: Reference time (default: now, UTC)
+        compress_level: gzip compression level (1 fastest - 9 smallest)
+
+    Returns:
+        {'version', 'files', 'jobs', 'bytes', 'raw_bytes', 'seconds', 'pruned'}
+    """
+    start = time.perf_counter()
+    now = now or datetime.utcnow()
+    version = now.strftime(VERSION_FORMAT)
+    data_version = database.get_data_version()
+    snapshots = build_snapshots(database, page_size=page_size, now=now)
+
+    files = {}
+    for name, payload in snapshots.items():
+        raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        # mtime=0 keeps the output identical for identical data
+        body = gzip.compress(raw, compresslevel=compress_level, mtime=0)
+        key = f'{version}/{name}.json.gz'
+        store.put(key, body, 'application/json', content_encoding='gzip',
+                  cache_control='public, max-age=31536000, immutable')
+        files[f'{name}.json.gz'] = {'bytes': len(body), 'raw_bytes': len(raw)}
+
+    manifest = {
+        'schema': SCHEMA_VERSION,
+        'version': version,
+        'generated_at': _iso(now),
+        'data_version': data_version,
+        'windows': {'stats_days': STATS_DAYS, 'chart_days': CHART_DAYS, 'jobs_days': JOBS_DAYS},
+        'charts': list(CHART_TYPES),
+        'jobs': snapshots['jobs/page-0001']['pagination']['totalJobs'],
+        'page_size': page_size,
+        'pages': snapshots['jobs/page-0001']['pagination']['totalPages'],
+        'files': files,
+    }
+    store.put(f'{version}/manifest.json.gz', gzip.compress(json.dumps(manifest).encode('utf-8'), mtime=0),
+              'application/json', content_encoding='gzip', cache_control='public, max-age=31536000, immutable')
+    # Publish: readers follow latest.json, so it goes last and must not be cached for long
+    latest = {'version': version, 'generated_at': manifest['generated_at'],
+              'manifest': f'{version}/manifest.json.gz'}
+    store.put('latest.json', json.dumps(latest).encode('utf-8'), 'application/json',
+              cache_control='no-cache')
+
+    older = [old for old in store.list_versions() if old != version]
+    pruned = older[:max(0, len(older) - (max(keep, 1) - 1))]
+    for old in pruned:
+        store.delete_version(old)
+
+    stats = {
+        'version': version,
+        'files': len(files) + 1,
+        'jobs': manifest['jobs'],
+        'bytes': sum(f['bytes'] for f in files.values()),
+        'raw_bytes': sum(f['raw_bytes'] for f in files.values()),
+        'seconds': round(time.perf_counter() - start, 3),
+        'pruned': len(pruned),
+    }
+    metrics.incr('snapshot_bytes_total', stats['bytes'])
+    return stats
+
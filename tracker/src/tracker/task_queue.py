@@ -0,0 +1,259 @@
+"""
+Durable SQLite-backed work queue for job detail fetches.
+
+Detail fetches are the slow, failure-prone part of a run. Queuing them on
+disk means a run that dies partway through (ECS task stopped, page timeouts)
+resumes where it left off instead of starting over from the search page.
+
+Task states:
+    pending  - waiting to be claimed (possibly backing off after a failure)
+    leased   - claimed by a worker until lease_expires
+    fetched  - detail page fetched, result stored, not yet ingested
+    done     - result ingested into the jobs database
+    failed   - gave up after max_attempts
+
+Done and failed tasks are kept (until purged) only as a record; a card seen
+again in a later run puts its task back to pending so the page is refetched.
+"""
+import json
+import sqlite3
+import time
+from datetime import datetime
+from typing import Dict, List, NamedTuple, Optional
+
+
+class Task(NamedTuple):
+    """A claimed detail-fetch task."""
+    id: int
+    url: str
+    board: str
+    card: Dict
+    attempts: int
+
+
+def _encode(value):
+    """JSON encoder for datetimes in job dictionaries."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+class DetailTaskQueue:
+    """Lease-based detail-fetch queue with exponential backoff retries."""
+
+    def __init__(self, queue_path: str = 'tasks.db', lease_seconds: int = 300,
+                 max_attempts: int = 4, backoff_base: float = 30.0, backoff_max: float = 3600.0):
+        """
+        Args:
+            queue_path: SQLite file holding the queue
+            lease_seconds: How long a claimed task is reserved before another worker may take it
+            max_attempts: Attempts before a task is marked failed
+            backoff_base: Delay (seconds) before the first retry; doubles on each failure
+            backoff_max: Upper bound on the retry delay
+        """
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.conn = sqlite3.connect(queue_path, isolation_level=None, timeout=30)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS tasks (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT NOT NULL UNIQUE,
+                board TEXT NOT NULL,
+                card TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                available_at REAL NOT NULL,
+                lease_expires REAL,
+                last_error TEXT,
+                result TEXT,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_tasks_board_state ON tasks (board, state, available_at);
+        """)
+
+        # In-process metrics for this run
+        self.metrics = {
+            'enqueued': 0,
+            'resumed': 0,
+            'claimed': 0,
+            'completed': 0,
+            'retried': 0,
+            'failed': 0,
+        }
+        self._started = time.time()
+
+    def close(self):
+        """Close the underlying SQLite connection."""
+        self.conn.close()
+
+    def enqueue(self, board: str, cards: List[Dict]) -> int:
+        """
+        Add detail-fetch tasks for cards not already queued.
+
+        Cards whose task is done or failed (from an earlier run) are requeued
+        as fresh pending tasks; pending, leased and fetched tasks are left alone.
+
+        Returns:
+            Number of tasks added or requeued
+        """
+        now = time.time()
+        added = 0
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            for card in cards:
+                cursor = self.conn.execute(
+                    "INSERT INTO tasks (url, board, card, available_at, created_at, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (url) DO UPDATE SET board = excluded.board, card = excluded.card, "
+                    "state = 'pending', attempts = 0, available_at = excluded.available_at, "
+                    "lease_expires = NULL, last_error = NULL, result = NULL, "
+                    "created_at = excluded.created_at, updated_at = excluded.updated_at "
+                    "WHERE tasks.state IN ('done', 'failed')",
+                    (card['url'], board, json.dumps(card, default=_encode), now, now, now)
+                )
+                added += cursor.rowcount
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+        self.metrics['enqueued'] += added
+        return added
+
+    def unfinished_count(self, board: str = None) -> int:
+        """Count tasks still pending or leased (e.g. left over from a previous run)."""
+        sql = "SELECT COUNT(*) FROM tasks WHERE state IN ('pending', 'leased')"
+        params = ()
+        if board:
+            sql += " AND board = ?"
+            params = (board,)
+        return self.conn.execute(sql, params).fetchone()[0]
+
+    def next_available_in(self, board: str) -> Optional[float]:
+        """Seconds until the next backed-off task for a board becomes claimable, or None."""
+        row = self.conn.execute(
+            "SELECT MIN(available_at) FROM tasks WHERE board = ? AND state = 'pending'", (board,)
+        ).fetchone()
+        if row[0] is None:
+            return None
+        return max(0.0, row[0] - time.time())
+
+    def claim(self, board: str) -> Optional[Task]:
+        """
+        Lease the oldest ready task for a board.
+
+        Tasks left over from earlier runs are older, so they are resumed first.
+        Leased tasks whose lease expired (crashed worker) are claimable again.
+        """
+        now = time.time()
+        self.conn.execute("BEGIN IMMEDIATE")
+        try:
+            row = self.conn.execute(
+                "SELECT id, url, board, card, attempts, created_at FROM tasks "
+                "WHERE board = ? AND ((state = 'pending' AND available_at <= ?) "
+                "OR (state = 'leased' AND lease_expires <= ?)) "
+                "ORDER BY created_at, id LIMIT 1",
+                (board, now, now)
+            ).fetchone()
+            if row is None:
+                self.conn.execute("COMMIT")
+                return None
+            self.conn.execute(
+                "UPDATE tasks SET state = 'leased', lease_expires = ?, updated_at = ? WHERE id = ?",
+                (now + self.lease_seconds, now, row[0])
+            )
+            self.conn.execute("COMMIT")
+        except Exception:
+            self.conn.execute("ROLLBACK")
+            raise
+
+        self.metrics['claimed'] += 1
+        if row[5] < self._started:
+            # Left over from an earlier (interrupted) run
+            self.metrics['resumed'] += 1
+        return Task(id=row[0], url=row[1], board=row[2], card=json.loads(row[3]), attempts=row[4])
+
+    def complete(self, task: Task, result: Dict):
+        """Store a fetched job and release the lease."""
+        self.conn.execute(
+            "UPDATE tasks SET state = 'fetched', result = ?, lease_expires = NULL, "
+            "last_error = NULL, updated_at = ? WHERE id = ?",
+            (json.dumps(result, default=_encode), time.time(), task.id)
+        )
+        self.metrics['completed'] += 1
+
+    def fail(self, task: Task, error: str) -> bool:
+        """
+        Record a failed attempt and schedule a retry with exponential backoff.
+
+        Returns:
+            True if the task will be retried, False if it has been marked failed
+        """
+        attempts = task.attempts + 1
+        now = time.time()
+        if attempts >= self.max_attempts:
+            self.conn.execute(
+                "UPDATE tasks SET state = 'failed', attempts = ?, last_error = ?, "
+                "lease_expires = NULL, updated_at = ? WHERE id = ?",
+                (attempts, error, now, task.id)
+            )
+            self.metrics['failed'] += 1
+            return False
+
+        delay = min(self.backoff_max, self.backoff_base * (2 ** (attempts - 1)))
+        self.conn.execute(
+            "UPDATE tasks SET state = 'pending', attempts = ?, last_error = ?, available_at = ?, "
+            "lease_expires = NULL, updated_at = ? WHERE id = ?",
+            (attempts, error, now + delay, now, task.id)
+        )
+        self.metrics['retried'] += 1
+        return True
+
+    def fetched_results(self, board: str) -> List[Dict]:
+        """Return jobs that were fetched but not yet ingested (including from earlier runs)."""
+        rows = self.conn.execute(
+            "SELECT result FROM tasks WHERE board = ? AND state = 'fetched' ORDER BY id", (board,)
+        ).fetchall()
+        results = []
+        for (raw,) in rows:
+            job = json.loads(raw)
+            if isinstance(job.get('posted_date'), str):
+                job['posted_date'] = datetime.fromisoformat(job['posted_date'])
+            results.append(job)
+        return results
+
+    def ack(self, board: str):
+        """Mark all fetched results for a board as ingested."""
+        self.conn.execute(
+            "UPDATE tasks SET state = 'done', updated_at = ? WHERE board = ? AND state = 'fetched'",
+            (time.time(), board)
+        )
+
+    def purge(self, older_than_days: int = 30) -> int:
+        """Delete done/failed tasks older than N days so the queue file stays small."""
+        cutoff = time.time() - older_than_days * 86400
+        cursor = self.conn.execute(
+            "DELETE FROM tasks WHERE state IN ('done', 'failed') AND updated_at < ?", (cutoff,)
+        )
+        return cursor.rowcount
+
+    def state_counts(self) -> Dict[str, int]:
+        """Count tasks in each state."""
+        rows = self.conn.execute("SELECT state, COUNT(*) FROM tasks GROUP BY state").fetchall()
+        return dict(rows)
+
+    def report(self) -> Dict:
+        """Throughput and retry metrics for this run plus persisted queue depth."""
+        elapsed = max(time.time() - self._started, 1e-9)
+        return {
+            **self.metrics,
+            'elapsed_seconds': round(elapsed, 2),
+            'completed_per_minute': round(self.metrics['completed'] / elapsed * 60, 2),
+            'retry_rate': round(self.metrics['retried'] / self.metrics['claimed'], 3)
+            if self.metrics['claimed'] else 0.0,
+            'states': self.state_counts(),
+        }
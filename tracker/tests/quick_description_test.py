@@ -30,7 +30,9 @@ try:
     test_url = "https://www.linkedin.com/jobs/view/4323948499"
     scraper = LinkedInScraper("software engineer", "Remote")
 
-    salary, description = scraper._extract_salary_and_description_from_detail_page(driver, test_url)
+    driver.get(test_url)
+    time.sleep(3)
+    salary, description = scraper.parse_detail_html(driver.page_source)
 
     driver.quit()
 
@@ -67,7 +69,7 @@ try:
         time.sleep(3)
 
         scraper = IndeedScraper("software engineer", "Remote")
-        salary, description = scraper._extract_salary_and_description_from_page(page)
+        salary, description = scraper.parse_detail_html(page.content())
 
         browser.close()
 
@@ -0,0 +1,92 @@
+"""
+Tests for browser memory measurement, recycling and cleanup.
+"""
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scrapers.browser_manager import (
+    BrowserManager, LOW_MEMORY_ARGS, find_orphaned_browsers, kill_orphaned_browsers, process_tree_rss
+)
+
+HAS_PROC = os.path.isdir('/proc') and shutil.which('sleep') is not None
+
+
+class TestBrowserManager(unittest.TestCase):
+    """Test cases for recycling decisions and launch flags."""
+
+    def test_low_memory_flags_are_opt_in(self):
+        base = ['--no-sandbox']
+        self.assertEqual(BrowserManager().chromium_args(base), base)
+        args = BrowserManager(low_memory=True).chromium_args(base)
+        self.assertEqual(args[0], '--no-sandbox')
+        self.assertTrue(set(LOW_MEMORY_ARGS) <= set(args))
+
+    def test_recycles_after_max_pages(self):
+        manager = BrowserManager(max_pages_per_browser=2)
+        manager.browser_launched()
+        manager.page_loaded()
+        self.assertFalse(manager.should_recycle())
+        manager.page_loaded()
+        self.assertTrue(manager.should_recycle())
+        manager.browser_launched()
+        self.assertFalse(manager.should_recycle())
+
+    @unittest.skipUnless(HAS_PROC, "requires /proc")
+    def test_recycles_past_memory_ceiling(self):
+        manager = BrowserManager(memory_limit_mb=1, recycle_fraction=0.5)
+        self.assertTrue(manager.should_recycle())
+        self.assertEqual(manager.stats['recycles'], 1)
+        self.assertFalse(BrowserManager(memory_limit_mb=1024 * 1024).should_recycle())
+
+
+@unittest.skipUnless(HAS_PROC, "requires /proc")
+class TestProcessTree(unittest.TestCase):
+    """Test cases that spawn real child processes."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        # A copy of sleep named like a browser process
+        self.fake_driver = os.path.join(self.tmpdir.name, 'chromedriver')
+        shutil.copy(shutil.which('sleep'), self.fake_driver)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_tree_rss_includes_children(self):
+        before = process_tree_rss()
+        child = subprocess.Popen([sys.executable, '-c',
+                                  'import time; x = bytearray(64 * 1024 * 1024); time.sleep(30)'])
+        try:
+            time.sleep(1.0)
+            self.assertGreater(process_tree_rss() - before, 48 * 1024 * 1024)
+        finally:
+            child.kill()
+            child.wait()
+
+    def test_kills_orphaned_browsers(self):
+        proc = subprocess.Popen([self.fake_driver, '30'])
+        time.sleep(0.2)
+        self.assertIn(proc.pid, {p['pid'] for p in find_orphaned_browsers()})
+        self.assertGreaterEqual(kill_orphaned_browsers(), 1)
+        self.assertEqual(proc.wait(timeout=5), -9)
+
+    def test_hard_timeout_kills_hung_browser(self):
+        manager = BrowserManager(page_timeout=0.3)
+        proc = subprocess.Popen([self.fake_driver, '30'])
+        start = time.perf_counter()
+        with manager.hard_timeout('indeed'):
+            proc.wait(timeout=10)
+        self.assertLess(time.perf_counter() - start, 5)
+        self.assertEqual(manager.stats['hard_timeouts'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
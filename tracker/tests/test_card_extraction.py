@@ -0,0 +1,127 @@
+"""
+Tests for single-round-trip card extraction and its per-element fallback.
+"""
+import os
+import sys
+import unittest
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scrapers.indeed_scraper import IndeedScraper
+from src.scrapers.linkedin_scraper import LinkedInScraper
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def launch_chromium():
+    """Start headless Chromium via Playwright, or return None if it is not installed."""
+    try:
+        from playwright.sync_api import sync_playwright
+        playwright = sync_playwright().start()
+    except Exception:
+        return None, None
+    try:
+        return playwright, playwright.chromium.launch(headless=True)
+    except Exception:
+        playwright.stop()
+        return None, None
+
+
+class FakePage:
+    """Stands in for a Playwright page / Selenium driver returning canned script results."""
+
+    def __init__(self, result=None, error=None):
+        self.result = result
+        self.error = error
+        self.calls = 0
+
+    def evaluate(self, script):
+        self.calls += 1
+        if self.error:
+            raise self.error
+        return self.result
+
+    execute_script = evaluate
+
+
+class TestCardPostProcessing(unittest.TestCase):
+    """The script output is normalized exactly like the per-element path."""
+
+    def test_indeed_js_results(self):
+        raw = [{'title': 'Backend Engineer', 'company': None, 'location': 'Remote',
+                'url': '/rc/clk?jk=abc&from=serp'},
+               {'title': None, 'company': 'Acme', 'location': None, 'url': '/rc/clk?jk=def'}]
+        raw += [{'title': f'Job {i}', 'company': 'Acme', 'location': None, 'url': f'/rc/clk?jk={i}'}
+                for i in range(30)]
+        page = FakePage(raw)
+
+        cards = IndeedScraper('python', 'Remote')._extract_cards_js(page)
+
+        self.assertEqual(page.calls, 1)
+        self.assertEqual(len(cards), 19)  # first 20 cards, one without a title
+        self.assertEqual(cards[0], {'title': 'Backend Engineer', 'company': 'Unknown', 'location': 'Remote',
+                                    'url': 'https://www.indeed.com/viewjob?jk=abc'})
+
+    def test_linkedin_js_results(self):
+        raw = [{'title': 'Data Engineer', 'company': 'Foo', 'location': '',
+                'url': 'https://www.linkedin.com/jobs/view/data-engineer-at-foo-4296417197?position=1'},
+               {'title': 'No link', 'company': 'Foo', 'location': 'NYC', 'url': ''}]
+        cards = LinkedInScraper('data', 'NYC')._extract_cards_js(FakePage(raw))
+        self.assertEqual(cards, [{'title': 'Data Engineer', 'company': 'Foo', 'location': None,
+                                  'url': 'https://www.linkedin.com/jobs/view/4296417197'}])
+
+    def test_fixture_cards_parse(self):
+        self.assertEqual(len(IndeedScraper('a', 'b').parse_cards_html(read_fixture('indeed_search.html'))), 25)
+        self.assertEqual(len(LinkedInScraper('a', 'b').parse_cards_html(read_fixture('linkedin_search.html'))), 25)
+
+
+class TestFallback(unittest.TestCase):
+    """A failing script falls back to the per-element extractor."""
+
+    def test_indeed_falls_back(self):
+        scraper = IndeedScraper('python', 'Remote')
+        page = FakePage(error=RuntimeError('Execution context was destroyed'))
+        with mock.patch.object(scraper, '_extract_cards_per_element', return_value=['card']) as fallback:
+            cards = scraper._extract_cards(page)
+        self.assertEqual(cards, ['card'])
+        fallback.assert_called_once_with(page)
+
+    def test_linkedin_uses_script_when_it_works(self):
+        scraper = LinkedInScraper('data', 'NYC')
+        page = FakePage([])
+        with mock.patch.object(scraper, '_extract_cards_per_element') as fallback:
+            self.assertEqual(scraper._extract_cards(page), [])
+        fallback.assert_not_called()
+
+
+class TestInBrowser(unittest.TestCase):
+    """Both extraction paths agree on the recorded fixture (needs a Playwright Chromium)."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.playwright, cls.browser = launch_chromium()
+        if cls.browser is None:
+            raise unittest.SkipTest("Playwright Chromium is not installed")
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.browser.close()
+        cls.playwright.stop()
+
+    def test_indeed_paths_agree(self):
+        page = self.browser.new_page()
+        page.set_content(read_fixture('indeed_search.html'))
+        scraper = IndeedScraper('python', 'Remote')
+        self.assertEqual(scraper._extract_cards_js(page), scraper._extract_cards_per_element(page))
+        page.close()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,133 @@
+"""
+Tests for the per-board circuit breaker.
+"""
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scrapers.base import BaseScraper, DetailFetchError
+from src.scrapers.keyword_filter import KeywordFilter
+from src.tracker.circuit_breaker import CircuitBreaker
+from src.tracker.search_plan import MultiSearchRunner, SearchSpec
+
+
+class BlockedScraper(BaseScraper):
+    """Scraper whose detail pages are always behind bot detection."""
+
+    SOURCE = 'indeed'
+    DETAIL_DELAY = (0, 0)
+    attempts = 0
+
+    def scrape(self):
+        return []
+
+    def collect_cards(self, search_query=None, location=None):
+        return [{'title': f'Job {i}', 'company': 'Acme', 'location': location, 'url': f'u{i}'}
+                for i in range(20)]
+
+    def fetch_details(self, job_basics):
+        return self.fetch_details_pipelined(job_basics)
+
+    def fetch_detail_html(self, basic_info):
+        BlockedScraper.attempts += 1
+        raise DetailFetchError("bot detection triggered", blocked=True)
+
+    def parse_cards_html(self, html):
+        return []
+
+    def parse_detail_html(self, html):
+        return None, None
+
+
+class TestCircuitBreaker(unittest.TestCase):
+    """Test cases for opening, half-opening and persistence."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'breaker.json')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_opens_on_block_ratio(self):
+        breaker = CircuitBreaker(block_ratio=0.3, min_requests=5)
+        for _ in range(3):
+            breaker.record_success('indeed')
+        breaker.record_failure('indeed', blocked=True)
+        self.assertTrue(breaker.allow('indeed'))
+        breaker.record_failure('indeed', blocked=True)
+        self.assertFalse(breaker.allow('indeed'))
+        self.assertTrue(breaker.allow('linkedin'))
+
+    def test_opens_on_error_ratio(self):
+        breaker = CircuitBreaker(error_ratio=0.5, min_requests=4)
+        breaker.record_success('linkedin')
+        breaker.record_success('linkedin')
+        breaker.record_failure('linkedin')
+        self.assertTrue(breaker.allow('linkedin'))
+        breaker.record_failure('linkedin')
+        self.assertFalse(breaker.allow('linkedin'))
+
+    def test_half_open_probe_closes_or_reopens(self):
+        breaker = CircuitBreaker(self.path, min_requests=1, cooldown_seconds=60)
+        breaker.record_failure('indeed', blocked=True)
+        self.assertEqual(breaker.state('indeed'), 'open')
+
+        # State survives a restart
+        breaker = CircuitBreaker(self.path, min_requests=1, cooldown_seconds=60)
+        self.assertFalse(breaker.allow('indeed'))
+
+        later = time.time() + 61
+        with mock.patch('src.tracker.circuit_breaker.time.time', return_value=later):
+            self.assertEqual(breaker.state('indeed'), 'half_open')
+            breaker.record_failure('indeed', blocked=True)
+            self.assertEqual(breaker.state('indeed'), 'open')
+        self.assertEqual(breaker._board('indeed')['cooldown'], 120)
+
+        much_later = time.time() + 200
+        with mock.patch('src.tracker.circuit_breaker.time.time', return_value=much_later):
+            self.assertTrue(breaker.allow('indeed'))
+            breaker.record_success('indeed')
+            self.assertEqual(breaker.state('indeed'), 'closed')
+
+
+class TestRunnerWithBreaker(unittest.TestCase):
+    """The runner stops fetching once the breaker opens and keeps card data."""
+
+    def test_defers_remaining_fetches(self):
+        BlockedScraper.attempts = 0
+        breaker = CircuitBreaker(block_ratio=0.5, min_requests=3)
+        runner = MultiSearchRunner([SearchSpec('python', 'Remote', 'indeed')],
+                                   {'indeed': BlockedScraper}, circuit_breaker=breaker)
+
+        jobs = runner.run_board('indeed')
+
+        self.assertEqual(BlockedScraper.attempts, 3)
+        self.assertEqual(len(jobs), 20)
+        self.assertTrue(all(job['description'] is None for job in jobs))
+        self.assertEqual(breaker.stats['deferred'], 17)
+        self.assertEqual(breaker.stats['trips'], 1)
+
+    def test_card_only_jobs_skip_keyword_filter(self):
+        BlockedScraper.attempts = 0
+        breaker = CircuitBreaker(block_ratio=0.5, min_requests=3)
+        # Matches any field, so cards pass and only a description could decide
+        keyword_filter = KeywordFilter(include=['kubernetes'])
+        runner = MultiSearchRunner([SearchSpec('python', 'Remote', 'indeed')], {'indeed': BlockedScraper},
+                                   keyword_filter=keyword_filter, circuit_breaker=breaker)
+
+        jobs = runner.run_board('indeed')
+
+        # Blocked and deferred jobs are kept with card data, as on the task-queue path
+        self.assertEqual(len(jobs), 20)
+        self.assertEqual(keyword_filter.stats['details_dropped'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+"""
+Tests for the read-through query result cache.
+"""
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.cache import CachedDatabase, ResultCache
+from src.database.db import Database
+from src.metrics import metrics
+
+
+class FakeDatabase:
+    """Counts calls to a few read and write methods."""
+
+    def __init__(self):
+        self.calls = []
+        self.jobs = 3
+
+    def count_jobs(self, status: str = 'active', since: datetime = None) -> int:
+        self.calls.append(('count_jobs', status, since))
+        return self.jobs
+
+    def get_jobs_by_status(self, status: str = 'active'):
+        self.calls.append(('get_jobs_by_status', status))
+        return [f'job {i}' for i in range(self.jobs)]
+
+    def add_job(self, title: str, **fields):
+        self.jobs += 1
+        return title
+
+    def get_data_version(self) -> str:
+        return str(self.jobs)
+
+
+class TestResultCache(unittest.TestCase):
+    """In-process caching, keys and invalidation."""
+
+    def setUp(self):
+        metrics.reset()
+        self.fake = FakeDatabase()
+        self.cache = ResultCache(ttl=60)
+        self.db = CachedDatabase(self.fake, self.cache)
+
+    def test_repeated_reads_hit(self):
+        self.assertEqual(self.db.count_jobs('active'), 3)
+        self.assertEqual(self.db.count_jobs(status='active'), 3)
+        self.assertEqual(self.db.count_jobs(), 3)
+        self.assertEqual(len(self.fake.calls), 1)
+        report = self.cache.report()
+        self.assertEqual((report['hits'], report['misses'], report['hit_rate']), (2, 1, 0.667))
+        self.assertEqual(report['methods']['count_jobs']['hits'], 2)
+        self.assertEqual(metrics.counters['db_cache_requests_total'][(('method', 'count_jobs'), ('outcome', 'hit'))], 2)
+
+    def test_different_arguments_miss(self):
+        self.db.count_jobs('active')
+        self.db.count_jobs('expired')
+        self.db.get_jobs_by_status('active')
+        self.assertEqual(len(self.fake.calls), 3)
+
+    def test_datetimes_share_a_key_within_resolution(self):
+        self.db.count_jobs(since=datetime(2024, 6, 1, 12, 0, 5))
+        self.db.count_jobs(since=datetime(2024, 6, 1, 12, 0, 40))
+        self.db.count_jobs(since=datetime(2024, 6, 1, 12, 1, 5))
+        self.assertEqual(len(self.fake.calls), 2)
+
+    def test_writes_invalidate(self):
+        self.assertEqual(self.db.count_jobs(), 3)
+        self.db.add_job('New')
+        self.assertEqual(self.db.count_jobs(), 4)
+        self.assertEqual(self.cache.report()['invalidations'], 1)
+
+    def test_result_of_read_overlapping_a_write_is_not_stored(self):
+        original = self.fake.count_jobs
+
+        def count_during_write(*args, **kwargs):
+            self.cache.invalidate()  # Another writer lands while the query runs
+            return original(*args, **kwargs)
+
+        self.fake.count_jobs = count_during_write
+        self.db.count_jobs()
+        self.fake.count_jobs = original
+        self.db.count_jobs()
+        self.assertEqual(len(self.fake.calls), 2)
+
+    def test_ttl_expiry(self):
+        self.cache.ttl = 0
+        self.db.count_jobs()
+        self.db.count_jobs()
+        self.assertEqual(len(self.fake.calls), 2)
+        self.assertEqual(self.cache.report()['expired'], 1)
+
+    def test_lru_bound(self):
+        self.cache.max_entries = 2
+        for status in ('active', 'expired', 'active', 'filled', 'expired'):
+            self.db.count_jobs(status)
+        # 'expired' was least recently used when 'filled' was added
+        self.assertEqual([call[1] for call in self.fake.calls], ['active', 'expired', 'filled', 'expired'])
+        self.assertEqual(self.cache.report()['entries'], 2)
+
+    def test_other_methods_pass_through(self):
+        self.assertEqual(self.db.get_data_version(), '3')
+        self.assertIs(self.db.database, self.fake)
+
+
+class TestSharedDiskCache(unittest.TestCase):
+    """The SQLite tier shared between processes."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        path = os.path.join(self.tmpdir.name, 'db_cache.db')
+        # Two processes: separate in-memory LRUs and databases, one cache file
+        self.caches = [ResultCache(ttl=60, cache_path=path) for _ in range(2)]
+        self.fakes = [FakeDatabase(), FakeDatabase()]
+        self.dbs = [CachedDatabase(fake, cache) for fake, cache in zip(self.fakes, self.caches)]
+
+    def tearDown(self):
+        for cache in self.caches:
+            cache.close()
+        self.tmpdir.cleanup()
+
+    def test_results_shared_between_processes(self):
+        self.assertEqual(self.dbs[0].get_jobs_by_status(), ['job 0', 'job 1', 'job 2'])
+        self.assertEqual(self.dbs[1].get_jobs_by_status(), ['job 0', 'job 1', 'job 2'])
+        self.assertEqual(self.fakes[1].calls, [])
+        self.assertEqual(self.caches[1].report()['disk_hits'], 1)
+
+    def test_write_in_one_process_invalidates_the_other(self):
+        self.dbs[0].count_jobs()
+        self.dbs[0].count_jobs()
+        self.dbs[1].add_job('New')
+        self.dbs[0].count_jobs()
+        self.assertEqual(len(self.fakes[0].calls), 2)
+
+    def test_purge_expired(self):
+        self.caches[0].ttl = 0
+        self.dbs[0].count_jobs()
+        self.assertEqual(self.caches[0].purge_expired(), 1)
+        self.assertEqual(self.caches[0].report()['size_bytes'], 0)
+
+
+class TestCachedSqlite(unittest.TestCase):
+    """CachedDatabase in front of the SQLite backend."""
+
+    def test_counts_follow_writes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            database = Database(os.path.join(tmpdir, 'jobs.db'))
+            db = CachedDatabase(database, ResultCache(ttl=60))
+            db.create_tables()
+            db.add_job(title='Engineer', company='Acme', url='u1', board_source='indeed')
+            self.assertEqual(db.count_jobs('active'), 1)
+            self.assertEqual([job.url for job in db.get_jobs_by_status('active')], ['u1'])
+            db.mark_job_expired(1)
+            self.assertEqual(db.count_jobs('active'), 0)
+            self.assertEqual(db.get_jobs_by_status('active'), [])
+            self.assertEqual(db.cache.report()['invalidations'], 2)
+            database.engine.dispose()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+"""
+Tests for near-duplicate detection.
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.db import Database
+from src.tracker.dedupe import NearDuplicateIndex
+from src.tracker.monitor import JobMonitor
+
+DESCRIPTION = (
+    "We are looking for a backend engineer to design and build scalable APIs "
+    "in Python. You will own services end to end, work closely with product, "
+    "and mentor junior engineers. Experience with PostgreSQL, AWS and Docker "
+    "is required. Competitive salary, equity and remote-friendly culture."
+)
+
+
+class TestNearDuplicateIndex(unittest.TestCase):
+    """Test cases for the MinHash LSH index."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'dedupe.db')
+        self.index = NearDuplicateIndex(self.path)
+
+    def tearDown(self):
+        self.index.close()
+        self.tmpdir.cleanup()
+
+    def test_cross_board_copy_is_flagged(self):
+        first = self.index.add('https://www.indeed.com/viewjob?jk=1',
+                               'Backend Engineer', 'Acme', DESCRIPTION)
+        second = self.index.add('https://www.linkedin.com/jobs/view/2',
+                                'Backend Engineer', 'Acme', DESCRIPTION + ' Apply today.')
+        self.assertFalse(first.is_duplicate)
+        self.assertTrue(second.is_duplicate)
+        self.assertEqual(second.cluster_id, 'https://www.indeed.com/viewjob?jk=1')
+
+    def test_distinct_jobs_get_own_cluster(self):
+        self.index.add('a', 'Backend Engineer', 'Acme', DESCRIPTION)
+        result = self.index.add('b', 'Registered Nurse', 'General Hospital',
+                                'Provide patient care on night shifts in the ICU.')
+        self.assertFalse(result.is_duplicate)
+        self.assertEqual(result.cluster_id, 'b')
+
+    def test_jobs_without_description_are_not_matched(self):
+        # Same title and company in two cities: distinct openings, not copies
+        first = self.index.add('a', 'Backend Engineer', 'Acme')
+        second = self.index.add('b', 'Backend Engineer', 'Acme', '')
+        self.assertFalse(second.is_duplicate)
+        self.assertEqual((first.cluster_id, second.cluster_id), ('a', 'b'))
+        # Nor does a full posting match a description-less one
+        self.assertFalse(self.index.add('c', 'Backend Engineer', 'Acme', DESCRIPTION).is_duplicate)
+
+    def test_short_text_is_not_matched(self):
+        self.index.add('a', 'Nurse', 'Mercy', 'Night shifts.')
+        self.assertFalse(self.index.add('b', 'Nurse', 'Mercy', 'Night shifts.').is_duplicate)
+
+    def test_index_is_persisted(self):
+        self.index.add('a', 'Backend Engineer', 'Acme', DESCRIPTION)
+        self.index.close()
+        self.index = NearDuplicateIndex(self.path)
+        self.assertEqual(len(self.index), 1)
+        self.assertTrue(self.index.add('b', 'Backend Engineer', 'Acme', DESCRIPTION).is_duplicate)
+
+
+class TestMonitorDedupe(unittest.TestCase):
+    """Test that the monitor flags near-duplicates instead of counting them as new."""
+
+    def test_process_jobs_flags_duplicates(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = Database(os.path.join(tmpdir, 'jobs.db'))
+            db.create_tables()
+            index = NearDuplicateIndex(os.path.join(tmpdir, 'dedupe.db'))
+            monitor = JobMonitor(db, dedupe_index=index)
+
+            job = {'title': 'Backend Engineer', 'company': 'Acme', 'description': DESCRIPTION}
+            indeed = monitor.process_jobs([{**job, 'url': 'https://www.indeed.com/viewjob?jk=1'}], 'indeed')
+            linkedin = monitor.process_jobs([{**job, 'url': 'https://www.linkedin.com/jobs/view/2'}], 'linkedin')
+            index.close()
+
+            self.assertEqual(indeed['new_count'], 1)
+            self.assertEqual(linkedin['new_count'], 0)
+            self.assertEqual(linkedin['duplicate_count'], 1)
+            stored = db.get_job_by_url('https://www.linkedin.com/jobs/view/2')
+            self.assertTrue(stored.is_duplicate)
+            self.assertEqual(stored.cluster_id, 'https://www.indeed.com/viewjob?jk=1')
+            db.engine.dispose()
+
+if __name__ == '__main__':
+    unittest.main()
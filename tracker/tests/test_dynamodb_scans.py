@@ -0,0 +1,228 @@
+"""
+Tests for parallel, projected and COUNT-only scans (DynamoDatabase) and the
+matching SQLite count queries.
+"""
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pynamodb.connection.base import Connection
+
+from src.database.db import Database
+from src.database.dynamodb import DynamoDatabase
+from src.metrics import metrics
+
+
+class FakeScan:
+    """
+    In-memory stand-in for the Scan API: segments, pages, Select=COUNT and
+    projections. Filters are not evaluated (every item matches).
+    """
+
+    def __init__(self, items, page_items=3, fail_segment=None):
+        self.items = items
+        self.page_items = page_items
+        self.fail_segment = fail_segment
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def __call__(self, operation_name, kwargs):
+        with self.lock:
+            self.requests.append(dict(kwargs))
+        segment, segments = kwargs['Segment'], kwargs['TotalSegments']
+        if segment == self.fail_segment:
+            raise RuntimeError(f"segment {segment} failed")
+        mine = [item for i, item in enumerate(self.items) if i % segments == segment]
+        start = 0
+        if 'ExclusiveStartKey' in kwargs:
+            urls = [item['url']['S'] for item in mine]
+            start = urls.index(kwargs['ExclusiveStartKey']['url']['S']) + 1
+        page = mine[start:start + min(self.page_items, kwargs.get('Limit', self.page_items))]
+        data = {'Count': len(page), 'ScannedCount': len(page),
+                'ConsumedCapacity': {'TableName': kwargs['TableName'], 'CapacityUnits': 0.5 * len(page)}}
+        if kwargs.get('Select') != 'COUNT':
+            names = kwargs.get('ExpressionAttributeNames', {})
+            projected = [names.get(name.strip(), name.strip())
+                         for name in kwargs['ProjectionExpression'].split(',')] if 'ProjectionExpression' in kwargs else None
+            data['Items'] = [{k: v for k, v in item.items() if projected is None or k in projected} for item in page]
+        if start + len(page) < len(mine):
+            data['LastEvaluatedKey'] = {'url': page[-1]['url']}
+        return data
+
+
+def raw_job(i):
+    return {
+        'url': {'S': f'https://example.com/{i}'}, 'id': {'N': str(i)}, 'title': {'S': f'Engineer {i}'},
+        'company': {'S': 'Acme' if i % 3 else 'Beta'}, 'board_source': {'S': 'indeed' if i % 2 else 'linkedin'},
+        'status': {'S': 'expired' if i == 0 else 'active'}, 'description': {'S': 'x' * 1000},
+        'updated_at': {'S': '2024-06-01T00:00:00.000000+0000'}, 'is_duplicate': {'BOOL': False},
+    }
+
+
+class TestDynamoScans(unittest.TestCase):
+    """Parallel segmented scans against a fake Scan API."""
+
+    def setUp(self):
+        metrics.reset()
+        self.db = DynamoDatabase(table_name='test-jobs', scan_segments=4)
+        self.fake = FakeScan([raw_job(i) for i in range(20)])
+        patcher = mock.patch.object(Connection, 'dispatch', side_effect=self.fake)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_count_by_source_uses_projection_and_all_segments(self):
+        self.assertEqual(self.db.get_job_count_by_source(),
+                         {'linkedin': {'expired': 1, 'active': 9}, 'indeed': {'active': 10}})
+        self.assertEqual({request['Segment'] for request in self.fake.requests}, {0, 1, 2, 3})
+        self.assertTrue(all(request['TotalSegments'] == 4 for request in self.fake.requests))
+        # Four segments of 5 items, 3 per page -> 2 pages each
+        self.assertEqual(len(self.fake.requests), 8)
+        for request in self.fake.requests:
+            self.assertEqual(sorted(request['ExpressionAttributeNames'].values()), ['board_source', 'status'])
+
+    def test_count_jobs_selects_count_and_records_capacity(self):
+        self.assertEqual(self.db.count_jobs('active', since=datetime(2024, 1, 1)), 20)
+        self.assertTrue(all(request['Select'] == 'COUNT' and 'FilterExpression' in request
+                            for request in self.fake.requests))
+        self.assertEqual(metrics.counters['dynamodb_consumed_capacity_total'][(('operation', 'count_jobs'),)], 10.0)
+
+    def test_company_counts(self):
+        self.assertEqual(self.db.get_job_count_by_company('active'), {'Acme': 13, 'Beta': 7})
+        self.assertTrue(all(list(request['ExpressionAttributeNames'].values()) == ['status', 'company']
+                            for request in self.fake.requests))
+
+    def test_job_by_id_stops_scanning_at_first_match(self):
+        # 4 segments x 30 items, 3 per page: a full scan takes 40 requests. The fake
+        # ignores the id filter, so the first job returned is the match.
+        self.fake.items = [raw_job(i) for i in range(120)]
+        self.assertIsNotNone(self.db.get_job_by_id(7))
+        self.assertLess(len(self.fake.requests), 20)
+
+    def test_iter_changes_resumes_per_segment(self):
+        changes = self.db.iter_changes(updated_since=datetime(2024, 1, 1), chunk_size=2, segments=2)
+        first = [next(changes) for _ in range(3)]
+        changes.close()
+        seen = [row['url'] for rows, _ in first for row in rows]
+        position = first[-1][1]
+        self.assertEqual(position['segments'], 2)
+
+        rest = list(self.db.iter_changes(updated_since=datetime(2024, 1, 1), chunk_size=2, segments=2,
+                                         position=position))
+        seen += [row['url'] for rows, _ in rest for row in rows]
+        self.assertEqual(sorted(seen), sorted(f'https://example.com/{i}' for i in range(20)))
+        self.assertEqual(rest[-1][1]['keys'], {'0': None, '1': None})
+
+    def test_segment_failure_propagates(self):
+        self.fake.fail_segment = 2
+        with self.assertRaises(RuntimeError):
+            self.db.get_jobs_by_status('active')
+
+
+class FakeItems:
+    """In-memory stand-in for single-item calls (PutItem, GetItem, UpdateItem ADD) and unfiltered Scans."""
+
+    def __init__(self):
+        self.tables = {}
+        self.operations = []
+
+    def __call__(self, operation_name, kwargs):
+        self.operations.append(operation_name)
+        table = self.tables.setdefault(kwargs['TableName'], {})
+        if operation_name == 'PutItem':
+            item = kwargs['Item']
+            table[self._key(item)] = item
+            return {}
+        if operation_name == 'GetItem':
+            item = table.get(self._key(kwargs['Key']))
+            return {'Item': item} if item else {}
+        if operation_name == 'UpdateItem':
+            item = table.setdefault(self._key(kwargs['Key']), dict(kwargs['Key']))
+            name = kwargs['ExpressionAttributeNames']['#0']
+            increment = int(kwargs['ExpressionAttributeValues'][':0']['N'])
+            item[name] = {'N': str(int(item.get(name, {'N': '0'})['N']) + increment)}
+            return {'Attributes': item}
+        if operation_name == 'Scan':
+            items = list(table.values())
+            return {'Items': items, 'Count': len(items), 'ScannedCount': len(items)}
+        raise NotImplementedError(operation_name)
+
+    @staticmethod
+    def _key(item):
+        return next(item[name]['S'] for name in ('url', 'run_id') if name in item)
+
+
+class TestDynamoDataVersion(unittest.TestCase):
+    """Job writes change the data version once per flush; the counter item is not a run."""
+
+    def setUp(self):
+        self.db = DynamoDatabase(table_name='test-jobs', runs_table_name='test-runs')
+        self.fake = FakeItems()
+        patcher = mock.patch.object(Connection, 'dispatch', side_effect=self.fake)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def updates(self):
+        return self.fake.operations.count('UpdateItem')
+
+    def test_job_writes_change_version_once_per_flush(self):
+        versions = [self.db.get_data_version()]
+        for i in range(3):
+            self.db.add_job(title='Engineer', company='Acme', url=f'https://example.com/{i}', board_source='indeed')
+        self.assertTrue(self.db.mark_job_expired('https://example.com/1'))
+        # Single-job writes don't touch the counter item
+        self.assertEqual(self.updates(), 0)
+        versions.append(self.db.get_data_version())
+        self.db.flush_data_version()
+        versions.append(self.db.get_data_version())
+        self.db.add_scrape_run(started_at=datetime(2024, 6, 1), finished_at=datetime(2024, 6, 1, 0, 5))
+        self.assertFalse(self.db.mark_job_expired('https://example.com/missing'))
+        self.db.flush_data_version()
+        versions.append(self.db.get_data_version())
+        # Runs don't change job data; a missing job isn't a write
+        self.assertEqual(versions, ['jobs:0', 'jobs:0', 'jobs:1', 'jobs:1'])
+        self.assertEqual(self.updates(), 1)
+
+    def test_update_job_saves_fields_and_changes_version(self):
+        self.db.add_job(title='Engineer', company='Acme', url='https://example.com/1', board_source='indeed')
+        self.assertTrue(self.db.update_job('https://example.com/1', salary_min=120000, title='Senior Engineer'))
+        self.assertFalse(self.db.update_job('https://example.com/missing', title='Nobody'))
+        job = self.db.get_job_by_url('https://example.com/1')
+        self.assertEqual((job.title, job.salary_min), ('Senior Engineer', 120000))
+        self.db.flush_data_version()
+        self.assertEqual(self.db.get_data_version(), 'jobs:1')
+
+    def test_counter_item_is_not_a_run(self):
+        self.db.add_job(title='Engineer', company='Acme', url='https://example.com/1', board_source='indeed')
+        self.db.add_scrape_run(started_at=datetime(2024, 6, 1), finished_at=datetime(2024, 6, 1, 0, 5))
+        self.assertEqual([run.run_id for run in self.db.get_scrape_runs()], ['2024-06-01T00:00:00'])
+
+
+class TestSqliteCounts(unittest.TestCase):
+    """SQLite count queries used by `stats`."""
+
+    def test_counts(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = Database(os.path.join(tmpdir, 'jobs.db'))
+            db.create_tables()
+            now = datetime.utcnow()
+            for i in range(6):
+                db.add_job(title=f'Job {i}', company='Acme' if i < 4 else 'Beta', url=f'u{i}',
+                           board_source='indeed' if i % 2 else 'linkedin', posted_date=now - timedelta(days=i))
+            db.mark_job_expired(1)
+            self.assertEqual(db.count_jobs('active'), 5)
+            self.assertEqual(db.count_jobs('active', since=now - timedelta(days=2, hours=1)), 2)
+            self.assertEqual(db.get_job_count_by_company('active'), {'Acme': 3, 'Beta': 2})
+            self.assertEqual(db.get_job_count_by_source(),
+                             {'indeed': {'active': 3}, 'linkedin': {'active': 2, 'expired': 1}})
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,160 @@
+"""
+Tests for the email digest notifier.
+"""
+import os
+import smtplib
+import socket
+import sys
+import unittest
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.notifications.email_notifier import EmailNotifier
+
+try:
+    from aiosmtpd.controller import Controller
+    HAS_AIOSMTPD = True
+except ImportError:
+    HAS_AIOSMTPD = False
+
+
+def jobs(n):
+    return [{'title': f'Engineer {i}', 'company': 'Acme', 'location': 'Remote', 'salary_min': 100000 + i,
+             'salary_max': 150000, 'salary_period': 'yearly', 'url': f'https://example.com/{i}',
+             'board_source': 'indeed', 'description': 'not included'} for i in range(n)]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def notifier(**kwargs):
+    return EmailNotifier('smtp.example.com', 587, 'tracker@example.com', 'secret', retry_backoff=0, **kwargs)
+
+
+class TestDigest(unittest.TestCase):
+    """Digest rendering."""
+
+    def test_render_digest(self):
+        message = notifier().render_digest(jobs(2))
+        self.assertEqual(message['Subject'], 'Job Tracker: 2 new jobs found')
+        text, html = (part.get_payload(decode=True).decode() for part in message.get_payload())
+        self.assertIn('* Engineer 1 - Acme', text)
+        self.assertIn('$100,001 - $150,000 yearly', text)
+        self.assertIn('<a href="https://example.com/0">Engineer 0</a>', html)
+        self.assertNotIn('not included', text)
+
+    def test_scored_jobs_best_match_first(self):
+        n = notifier(digest_window_seconds=3600)
+        n.add_jobs(jobs(3), scores={'https://example.com/0': 0.1, 'https://example.com/2': 0.9})
+        with mock.patch.object(n, 'enqueue') as enqueue:
+            n.flush(['a@example.com'], force=True)
+        digest = enqueue.call_args.args[1]
+        self.assertEqual([job['url'][-1] for job in digest], ['2', '0', '1'])
+        text = n.render_digest(digest).get_payload()[0].get_payload(decode=True).decode()
+        self.assertIn('90% match', text)
+
+    def test_model_objects_and_escaping(self):
+        job = mock.Mock(title='<Lead> & Co', company='A&B', location=None, salary_min=None, salary_max=None,
+                        salary_period=None, url='https://example.com/x?a=1&b=2', board_source='linkedin')
+        message = notifier().render_digest([job])
+        html = message.get_payload()[1].get_payload(decode=True).decode()
+        self.assertIn('&lt;Lead&gt; &amp; Co', html)
+        self.assertIn('href="https://example.com/x?a=1&amp;b=2"', html)
+
+
+@mock.patch('src.notifications.email_notifier.smtplib.SMTP')
+class TestDelivery(unittest.TestCase):
+    """Connection reuse and retries (SMTP mocked)."""
+
+    def test_reuses_one_connection(self, smtp):
+        n = notifier()
+        for i in range(3):
+            self.assertTrue(n.send_notification(f'user{i}@example.com', jobs(1)))
+        n.close()
+
+        smtp.assert_called_once()
+        connection = smtp.return_value
+        connection.starttls.assert_called_once()
+        connection.login.assert_called_once_with('tracker@example.com', 'secret')
+        self.assertEqual(connection.send_message.call_count, 3)
+        connection.quit.assert_called_once()
+        self.assertEqual(n.report()['connections'], 1)
+
+    def test_retries_transient_failure_on_new_connection(self, smtp):
+        connection = smtp.return_value
+        connection.send_message.side_effect = [smtplib.SMTPServerDisconnected('gone'),
+                                               smtplib.SMTPResponseException(451, b'try later'), {}]
+        n = notifier(max_attempts=3)
+        self.assertTrue(n.send_notification('user@example.com', jobs(1)))
+        self.assertEqual(smtp.call_count, 3)
+        self.assertEqual((n.stats['sent'], n.stats['retries']), (1, 2))
+
+    def test_permanent_failure_is_not_retried(self, smtp):
+        smtp.return_value.send_message.side_effect = smtplib.SMTPRecipientsRefused(
+            {'nobody@example.com': (550, b'no such user')})
+        n = notifier(max_attempts=3)
+        self.assertFalse(n.send_notification('nobody@example.com', jobs(1)))
+        self.assertEqual(smtp.return_value.send_message.call_count, 1)
+        self.assertEqual(n.stats['failed'], 1)
+
+    def test_gives_up_after_max_attempts(self, smtp):
+        smtp.return_value.send_message.side_effect = smtplib.SMTPServerDisconnected('gone')
+        n = notifier(max_attempts=2)
+        self.assertFalse(n.send_notification('user@example.com', jobs(1)))
+        self.assertEqual(smtp.return_value.send_message.call_count, 2)
+
+    def test_background_queue_and_digest_window(self, smtp):
+        n = notifier(digest_window_seconds=3600)
+        n.add_jobs(jobs(2))
+        self.assertFalse(n.flush(['a@example.com', 'b@example.com']))
+        n.add_jobs(jobs(1))
+        self.assertTrue(n.flush(['a@example.com', 'b@example.com'], force=True))
+        n.close(timeout=10)
+
+        sent = smtp.return_value.send_message.call_args_list
+        self.assertEqual([call.args[2] for call in sent], [['a@example.com'], ['b@example.com']])
+        self.assertIn('3 new jobs', sent[0].args[0]['Subject'])
+        self.assertEqual(n.report()['pending_jobs'], 0)
+
+
+@unittest.skipUnless(HAS_AIOSMTPD, "aiosmtpd not installed")
+class TestLocalSmtpServer(unittest.TestCase):
+    """End-to-end delivery to a local aiosmtpd server."""
+
+    def test_delivers_queued_digests(self):
+        class Collector:
+            def __init__(self):
+                self.messages = []
+
+            async def handle_DATA(self, server, session, envelope):
+                self.messages.append(envelope)
+                return '250 OK'
+
+        handler = Collector()
+        port = free_port()
+        controller = Controller(handler, hostname='127.0.0.1', port=port)
+        controller.start()
+        try:
+            n = EmailNotifier('127.0.0.1', port, 'tracker@example.com', '', use_tls=False)
+            for i in range(3):
+                self.assertTrue(n.send_notification(f'direct{i}@example.com', jobs(2)))
+            self.assertEqual(n.report()['connections'], 1)
+            for i in range(5):
+                n.enqueue(f'user{i}@example.com', jobs(3))
+            n.close(timeout=30)
+        finally:
+            controller.stop()
+
+        self.assertEqual(len(handler.messages), 8)
+        self.assertEqual(n.report()['sent'], 8)
+        self.assertEqual(handler.messages[-1].rcpt_tos, ['user4@example.com'])
+        self.assertIn(b'Subject: Job Tracker: 3 new jobs found', handler.messages[-1].content)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Tests for chunked job export.
+"""
+import csv
+import gzip
+import json
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.db import Database
+from src.database.models import JOB_COLUMNS
+from src.tracker.export import export_jobs, infer_format
+
+try:
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+NOW = datetime(2024, 6, 1, 12, 0, 0)
+
+
+class ExportTestCase(unittest.TestCase):
+    """Temporary SQLite database with 25 jobs across two boards."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.tmpdir.name, 'jobs.db'))
+        self.db.create_tables()
+        for i in range(25):
+            self.db.add_job(title=f'Engineer {i}', company='Acme, Inc.', url=f'https://example.com/{i}',
+                            board_source='indeed' if i % 2 else 'linkedin', posted_date=NOW - timedelta(days=i),
+                            description='Line one\nline "two"', salary_min=100000 + i if i % 3 else None)
+        self.db.mark_job_expired(1)
+
+    def tearDown(self):
+        self.db.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+
+
+class TestIterJobs(ExportTestCase):
+    """Keyset-paginated streaming from SQLite."""
+
+    def test_chunks_are_bounded_and_complete(self):
+        chunks = list(self.db.iter_jobs(chunk_size=10))
+        self.assertEqual([len(chunk) for chunk in chunks], [10, 10, 5])
+        self.assertEqual([row['id'] for chunk in chunks for row in chunk], list(range(1, 26)))
+        self.assertEqual(tuple(chunks[0][0]), JOB_COLUMNS)
+
+    def test_filters(self):
+        rows = [row for chunk in self.db.iter_jobs(status='active', source='indeed',
+                                                   since=NOW - timedelta(days=10), chunk_size=3)
+                for row in chunk]
+        # Indeed jobs (odd i) posted in the last 10 days
+        self.assertEqual([row['url'] for row in rows],
+                         [f'https://example.com/{i}' for i in (1, 3, 5, 7, 9)])
+        expired = [row for chunk in self.db.iter_jobs(status='expired') for row in chunk]
+        self.assertEqual([row['id'] for row in expired], [1])
+
+
+class TestExportFormats(ExportTestCase):
+    """CSV, JSONL and Parquet output."""
+
+    def test_infer_format(self):
+        self.assertEqual(infer_format('jobs.CSV'), 'csv')
+        self.assertEqual(infer_format('out/jobs.jsonl.gz'), 'jsonl')
+        self.assertEqual(infer_format('jobs.parquet'), 'parquet')
+        with self.assertRaises(ValueError):
+            infer_format('jobs.xlsx')
+
+    def test_csv_round_trip(self):
+        stats = export_jobs(self.db, self.path('jobs.csv'), chunk_size=7)
+        self.assertEqual((stats['rows'], stats['chunks']), (25, 4))
+        with open(self.path('jobs.csv'), newline='') as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual(len(rows), 25)
+        self.assertEqual(rows[0]['company'], 'Acme, Inc.')
+        self.assertEqual(rows[0]['description'], 'Line one\nline "two"')
+        self.assertEqual(rows[0]['posted_date'], NOW.isoformat())
+
+    def test_jsonl_gzip(self):
+        export_jobs(self.db, self.path('jobs.jsonl.gz'), source='linkedin')
+        with gzip.open(self.path('jobs.jsonl.gz'), 'rt') as f:
+            rows = [json.loads(line) for line in f]
+        self.assertEqual(len(rows), 13)
+        self.assertEqual(rows[0]['salary_min'], None)
+        self.assertEqual(rows[1]['salary_min'], 100002)
+        self.assertIs(rows[0]['is_duplicate'], False)
+
+    @unittest.skipUnless(HAS_PYARROW, "pyarrow not installed")
+    def test_parquet_schema_and_row_groups(self):
+        stats = export_jobs(self.db, self.path('jobs.parquet'), chunk_size=4, row_group_size=10)
+        self.assertEqual(stats['rows'], 25)
+        parquet = pq.ParquetFile(self.path('jobs.parquet'))
+        self.assertEqual(parquet.metadata.num_row_groups, 3)
+        self.assertEqual(parquet.metadata.row_group(0).num_rows, 10)
+        table = parquet.read()
+        self.assertEqual(str(table.schema.field('posted_date').type), 'timestamp[us]')
+        self.assertEqual(str(table.schema.field('salary_min').type), 'int64')
+        self.assertEqual(table.column('posted_date')[0].as_py(), NOW)
+        self.assertEqual(table.column('status').to_pylist().count('expired'), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
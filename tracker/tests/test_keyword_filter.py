@@ -0,0 +1,58 @@
+"""
+Tests for the compiled keyword filter.
+"""
+import os
+import sys
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scrapers.keyword_filter import AhoCorasick, KeywordFilter
+
+
+class TestAhoCorasick(unittest.TestCase):
+    """Test cases for the multi-pattern matcher."""
+
+    def test_finds_overlapping_patterns(self):
+        matcher = AhoCorasick(['he', 'she', 'hers', 'his'])
+        self.assertEqual(matcher.find('she'), {1})
+        self.assertEqual(matcher.find('hers and his'), {2, 3})
+
+    def test_whole_words_only(self):
+        matcher = AhoCorasick(['go', 'machine learning'])
+        self.assertEqual(matcher.find('Google'), set())
+        self.assertEqual(matcher.find('Go / Machine Learning engineer'), {0, 1})
+
+
+class TestKeywordFilter(unittest.TestCase):
+    """Test cases for card- and detail-level filtering."""
+
+    def test_exclude_drops_card(self):
+        kf = KeywordFilter(exclude=['company:staffing'])
+        cards = [{'title': 'Engineer', 'company': 'Acme Staffing'},
+                 {'title': 'Staffing Engineer', 'company': 'Acme'}]
+        self.assertEqual(kf.filter_cards(cards), cards[1:])
+        self.assertEqual(kf.stats['detail_fetches_saved'], 1)
+
+    def test_title_include_prunes_at_card_level(self):
+        kf = KeywordFilter(include=['title:senior', 'title:staff'])
+        cards = [{'title': 'Senior Engineer'}, {'title': 'Junior Engineer'}]
+        self.assertEqual(kf.filter_cards(cards), cards[:1])
+
+    def test_any_field_include_waits_for_description(self):
+        kf = KeywordFilter(include=['python'])
+        cards = [{'title': 'Backend Engineer', 'company': 'Acme'}]
+        self.assertEqual(kf.filter_cards(cards), cards)
+        jobs = [{**cards[0], 'description': 'We use Python and Postgres'},
+                {**cards[0], 'description': 'We use Java'}]
+        self.assertEqual(kf.filter_jobs(jobs), jobs[:1])
+        self.assertEqual(kf.stats['details_dropped'], 1)
+
+    def test_empty_filter_keeps_everything(self):
+        kf = KeywordFilter()
+        self.assertFalse(kf)
+        self.assertEqual(kf.filter_cards([{'title': 'x'}]), [{'title': 'x'}])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Tests for run instrumentation.
+"""
+import json
+import os
+import sys
+import tempfile
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.metrics import MetricsRegistry
+
+
+class TestMetricsRegistry(unittest.TestCase):
+    """Test cases for counters, timers and report output."""
+
+    def setUp(self):
+        self.registry = MetricsRegistry()
+
+    def test_counters_and_histograms_by_label(self):
+        self.registry.incr('detail_fetches_total', board='indeed', outcome='ok')
+        self.registry.incr('detail_fetches_total', board='indeed', outcome='ok')
+        self.registry.incr('detail_fetches_total', board='indeed', outcome='blocked')
+        for value in (0.1, 0.2, 0.3):
+            self.registry.observe('scraper_stage_seconds', value, board='indeed', stage='sleep')
+
+        report = self.registry.report()
+        counters = {tuple(sorted(c['labels'].items())): c['value']
+                    for c in report['counters']['detail_fetches_total']}
+        self.assertEqual(counters[(('board', 'indeed'), ('outcome', 'ok'))], 2)
+        hist = report['histograms']['scraper_stage_seconds'][0]
+        self.assertEqual(hist['count'], 3)
+        self.assertAlmostEqual(hist['sum'], 0.6)
+        self.assertEqual(hist['p50'], 0.2)
+
+    def test_timed_decorator(self):
+        @self.registry.timed('db_operation_seconds', backend='sqlite', operation='noop')
+        def noop():
+            return 42
+
+        self.assertEqual(noop(), 42)
+        self.assertEqual(self.registry.report()['histograms']['db_operation_seconds'][0]['count'], 1)
+
+    def test_prometheus_format(self):
+        self.registry.incr('cards_extracted_total', 20, board='linkedin')
+        self.registry.observe('run_stage_seconds', 1.5, stage='scrape')
+        text = self.registry.to_prometheus()
+        self.assertIn('job_tracker_cards_extracted_total{board="linkedin"} 20', text)
+        self.assertIn('job_tracker_run_stage_seconds_bucket{stage="scrape",le="2.5"} 1', text)
+        self.assertIn('job_tracker_run_stage_seconds_count{stage="scrape"} 1', text)
+
+    def test_prometheus_escapes_label_values(self):
+        self.registry.incr('db_errors_total', error='bad "quote"\\path\nnext')
+        text = self.registry.to_prometheus()
+        self.assertIn(r'job_tracker_db_errors_total{error="bad \"quote\"\\path\nnext"} 1', text)
+
+    def test_write_json(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'report.json')
+            self.registry.write_json(path, totals={'new': 3})
+            with open(path) as f:
+                self.assertEqual(json.load(f)['totals'], {'new': 3})
+
+if __name__ == '__main__':
+    unittest.main()
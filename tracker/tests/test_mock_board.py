@@ -0,0 +1,139 @@
+"""
+Tests for the local mock job board and the scrapers' site URL overrides.
+"""
+import os
+import sys
+import unittest
+import urllib.error
+import urllib.request
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.mock_board import MockJobBoard, start_server
+from src.scrapers import base
+from src.scrapers.base import BaseScraper
+from src.scrapers.indeed_scraper import IndeedScraper
+from src.scrapers.linkedin_scraper import LinkedInScraper
+
+
+def fetch(url):
+    """(status, body) of a GET, including error statuses."""
+    try:
+        with urllib.request.urlopen(url, timeout=10) as response:
+            return response.status, response.read().decode('utf-8')
+    except urllib.error.HTTPError as e:
+        return e.code, e.read().decode('utf-8')
+
+
+class MockBoardTestCase(unittest.TestCase):
+    """Serves a mock board and points both scrapers' site URLs at it."""
+
+    block_rate = 0.0
+
+    def setUp(self):
+        self.board = MockJobBoard(pages=2, jobs_per_page=5, salary_fraction=1.0, block_rate=self.block_rate)
+        self.server = start_server(self.board)
+        self.origin = f'http://127.0.0.1:{self.server.server_address[1]}'
+        for patcher in (mock.patch.dict(base.SITE_URLS, {'indeed': self.origin, 'linkedin': self.origin}),
+                        mock.patch.object(IndeedScraper, 'SITE_URL', self.origin),
+                        mock.patch.object(IndeedScraper, 'BASE_URL', f'{self.origin}/jobs'),
+                        mock.patch.object(LinkedInScraper, 'BASE_URL', f'{self.origin}/jobs/search')):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+class TestMockBoardPages(MockBoardTestCase):
+    """Search and detail pages parse with the scrapers' own selectors."""
+
+    def test_indeed_search_and_detail(self):
+        scraper = IndeedScraper('python', 'Remote')
+        status, page = fetch(f'{scraper.BASE_URL}?q=python&l=Remote&sort=date')
+        self.assertEqual(status, 200)
+        cards = scraper.parse_cards_html(page)
+        self.assertEqual(len(cards), 5)
+        # Relative /rc/clk links are made absolute against the mock origin and normalized
+        self.assertRegex(cards[0]['url'], rf'^{self.origin}/viewjob\?jk=[0-9a-f]{{16}}$')
+
+        status, detail = fetch(cards[0]['url'])
+        salary, description = scraper.parse_detail_html(detail)
+        self.assertEqual(status, 200)
+        self.assertTrue(salary.startswith('$'))
+        self.assertGreater(len(description), 200)
+        job = scraper.finish_detail(cards[0], scraper.parser.submit_detail(IndeedScraper, detail))
+        self.assertEqual((job['board_source'], job['title']), ('indeed', cards[0]['title']))
+        self.assertIsNotNone(job['salary_min'])
+
+    def test_linkedin_search_and_detail(self):
+        scraper = LinkedInScraper('python', 'Remote')
+        cards = scraper.parse_cards_html(fetch(f'{scraper.BASE_URL}?keywords=python&location=Remote')[1])
+        self.assertEqual(len(cards), 5)
+        self.assertRegex(cards[0]['url'], rf'^{self.origin}/jobs/view/\d+$')
+
+        salary, description = scraper.parse_detail_html(fetch(cards[0]['url'])[1])
+        self.assertTrue(salary.startswith('$'))
+        self.assertGreater(len(description), 200)
+
+    def test_detail_matches_card(self):
+        scraper = IndeedScraper('python', 'Remote')
+        first = scraper.parse_cards_html(fetch(f'{scraper.BASE_URL}?q=python&l=Remote')[1])
+        again = scraper.parse_cards_html(fetch(f'{scraper.BASE_URL}?q=python&l=Remote')[1])
+        self.assertEqual(first, again)
+        _, detail = fetch(first[0]['url'])
+        self.assertIn(first[0]['title'], detail)
+        self.assertIn(first[0]['company'], detail)
+
+    def test_pagination_depth(self):
+        scraper = IndeedScraper('python', 'Remote')
+        pages = [scraper.parse_cards_html(fetch(f'{scraper.BASE_URL}?q=python&l=Remote&start={start}')[1])
+                 for start in (0, 5, 10)]
+        self.assertEqual([len(cards) for cards in pages], [5, 5, 0])
+        self.assertFalse({card['url'] for card in pages[0]} & {card['url'] for card in pages[1]})
+
+    def test_request_counters(self):
+        fetch(f'{self.origin}/jobs?q=python&l=Remote')
+        fetch(f'{self.origin}/viewjob?jk=00000000000000ff')
+        fetch(f'{self.origin}/nowhere')
+        self.assertEqual(self.board.stats(), {'indeed_search': 1, 'indeed_detail': 1, 'not_found': 1})
+
+
+class TestMockBoardBlocking(MockBoardTestCase):
+    """Blocked detail pages trip the scrapers' bot-detection check."""
+
+    block_rate = 1.0
+
+    def test_detail_pages_blocked(self):
+        status, page = fetch(f'{self.origin}/viewjob?jk=00000000000000ff')
+        self.assertEqual(status, 403)
+        self.assertIn('additional verification', page.lower())
+        # Search pages are never blocked
+        self.assertEqual(fetch(f'{self.origin}/jobs?q=python&l=Remote')[0], 200)
+        self.assertEqual(self.board.stats()['indeed_blocked'], 1)
+
+
+class TestSiteUrlOverrides(unittest.TestCase):
+    """normalize_url keeps the real sites and follows an overridden origin."""
+
+    def test_real_sites_unchanged(self):
+        self.assertEqual(BaseScraper.normalize_url('https://www.indeed.com/rc/clk?jk=abc&from=serp'),
+                         'https://www.indeed.com/viewjob?jk=abc')
+        self.assertEqual(BaseScraper.normalize_url('https://www.linkedin.com/jobs/view/x-at-y-42?trk=z'),
+                         'https://www.linkedin.com/jobs/view/42')
+
+    def test_one_host_for_both_boards(self):
+        origin = 'http://localhost:9000'
+        with mock.patch.dict(base.SITE_URLS, {'indeed': origin, 'linkedin': origin}):
+            self.assertEqual(BaseScraper.normalize_url(f'{origin}/rc/clk?jk=abc&vjs=3'), f'{origin}/viewjob?jk=abc')
+            self.assertEqual(BaseScraper.normalize_url(f'{origin}/jobs/view/x-at-y-42?refId=1'),
+                             f'{origin}/jobs/view/42')
+            self.assertEqual(BaseScraper.normalize_url('http://example.com/job?jk=abc'),
+                             'http://example.com/job?jk=abc')
+
+
+if __name__ == '__main__':
+    unittest.main()
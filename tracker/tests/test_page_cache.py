@@ -0,0 +1,175 @@
+"""
+Tests for the on-disk page cache and parsing cached pages.
+"""
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scrapers.base import BaseScraper
+from src.scrapers.page_cache import PageCache
+from src.scrapers.indeed_scraper import IndeedScraper
+from src.scrapers.linkedin_scraper import LinkedInScraper
+
+INDEED_SEARCH = """
+<div class="job_seen_beacon">
+  <h2 class="jobTitle"><a href="/rc/clk?jk=abc123&from=serp">Backend Engineer</a></h2>
+  <span data-testid="company-name">Acme</span>
+  <div data-testid="text-location">Remote</div>
+</div>
+<div class="job_seen_beacon"><h2 class="jobTitle">No link</h2></div>
+"""
+
+INDEED_DETAIL = """
+<div id="salaryInfoAndJobType"><span>$120,000 - $150,000 a year</span><span>Full-time</span></div>
+<div id="jobDescriptionText"><p>Build APIs in Python.</p><p>Remote friendly.</p></div>
+"""
+
+LINKEDIN_SEARCH = """
+<div class="base-card">
+  <a class="base-card__full-link" href="https://www.linkedin.com/jobs/view/data-engineer-at-foo-4296417197?trk=x"></a>
+  <h3 class="base-search-card__title"> Data Engineer </h3>
+  <h4 class="base-search-card__subtitle"><a class="hidden-nested-link">Foo Corp</a></h4>
+  <span class="job-search-card__location">New York, NY</span>
+</div>
+"""
+
+LINKEDIN_DETAIL = """
+<div class="compensation__salary">$140,000.00/yr - $180,000.00/yr</div>
+<div class="show-more-less-html__markup">Spark and Kafka pipelines.</div>
+"""
+
+
+class TestPageCache(unittest.TestCase):
+    """Test cases for TTLs, LRU eviction and stats."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'pages.db')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_round_trip_and_stats(self):
+        cache = PageCache(self.path)
+        self.assertIsNone(cache.get('https://www.indeed.com/viewjob?jk=1', 'detail'))
+        cache.put('https://www.indeed.com/viewjob?jk=1', 'detail', '<html>job</html>')
+        self.assertEqual(cache.get('https://www.indeed.com/viewjob?jk=1', 'detail'), '<html>job</html>')
+
+        report = cache.report()
+        self.assertEqual((report['hits'], report['misses'], report['stores']), (1, 1, 1))
+        self.assertEqual(report['pages'], 1)
+        cache.close()
+
+    def test_key_normalization(self):
+        cache = PageCache(self.path)
+        cache.put('https://www.indeed.com/viewjob?jk=abc&from=serp&tk=1', 'detail', 'page')
+        self.assertEqual(cache.get('https://www.indeed.com/viewjob?jk=abc', 'detail'), 'page')
+        cache.put('https://WWW.indeed.com/jobs?q=python&l=Remote#top', 'search', 'results')
+        self.assertEqual(cache.get('https://www.indeed.com/jobs?l=Remote&q=python', 'search'), 'results')
+        cache.close()
+
+    def test_ttl_per_page_type(self):
+        cache = PageCache(self.path, ttls={'search': 60, 'detail': 3600})
+        cache.put('https://example.com/search', 'search', 'results')
+        cache.put('https://example.com/detail', 'detail', 'job')
+
+        later = time.time() + 120
+        with mock.patch('src.scrapers.page_cache.time.time', return_value=later):
+            self.assertIsNone(cache.get('https://example.com/search', 'search'))
+            self.assertEqual(cache.get('https://example.com/detail', 'detail'), 'job')
+        self.assertEqual(cache.stats['expired'], 1)
+        cache.close()
+
+    def test_lru_eviction_respects_size_bound(self):
+        page = os.urandom(3000).hex()  # incompressible, ~3 KB compressed
+        cache = PageCache(self.path, max_bytes=20000)
+        for i in range(5):
+            cache.put(f'https://example.com/{i}', 'detail', page)
+            time.sleep(0.01)
+        # Touch the oldest page so it is most recently used
+        self.assertIsNotNone(cache.get('https://example.com/0', 'detail'))
+        for i in range(5, 8):
+            cache.put(f'https://example.com/{i}', 'detail', page)
+            time.sleep(0.01)
+
+        self.assertLessEqual(cache.report()['size_bytes'], 20000)
+        self.assertGreater(cache.stats['evictions'], 0)
+        self.assertIsNotNone(cache.get('https://example.com/0', 'detail'))
+        self.assertIsNone(cache.get('https://example.com/1', 'detail'))
+        cache.close()
+
+
+class TestCachedPageParsing(unittest.TestCase):
+    """Cached pages are parsed without a browser."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = PageCache(os.path.join(self.tmpdir.name, 'pages.db'))
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmpdir.cleanup()
+
+    def test_scrapers_must_parse_saved_pages(self):
+        class BrowserOnly(IndeedScraper):
+            parse_cards_html = BaseScraper.parse_cards_html
+            parse_detail_html = BaseScraper.parse_detail_html
+
+        # Cache hits are parsed from HTML, so a scraper that can't parse it can't be created
+        with self.assertRaisesRegex(TypeError, 'parse_cards_html, parse_detail_html'):
+            BrowserOnly('python', 'Remote', page_cache=self.cache)
+
+    def test_indeed_cards_and_detail(self):
+        scraper = IndeedScraper('python', 'Remote', page_cache=self.cache)
+        cards = scraper.parse_cards_html(INDEED_SEARCH)
+        self.assertEqual(cards, [{'title': 'Backend Engineer', 'company': 'Acme', 'location': 'Remote',
+                                  'url': 'https://www.indeed.com/viewjob?jk=abc123'}])
+
+        salary, description = scraper.parse_detail_html(INDEED_DETAIL)
+        self.assertEqual(salary, '$120,000 - $150,000 a year')
+        self.assertEqual(description, 'Build APIs in Python.\nRemote friendly.')
+
+    def test_linkedin_cards_and_detail(self):
+        scraper = LinkedInScraper('data', 'New York', page_cache=self.cache)
+        cards = scraper.parse_cards_html(LINKEDIN_SEARCH)
+        self.assertEqual(cards, [{'title': 'Data Engineer', 'company': 'Foo Corp', 'location': 'New York, NY',
+                                  'url': 'https://www.linkedin.com/jobs/view/4296417197'}])
+
+        salary, description = scraper.parse_detail_html(LINKEDIN_DETAIL)
+        self.assertEqual(salary, '$140000/yr - $180000/yr')
+        self.assertEqual(description, 'Spark and Kafka pipelines.')
+
+    def test_cached_detail_skips_browser_and_pause(self):
+        url = 'https://www.indeed.com/viewjob?jk=abc123'
+        self.cache.put(url, 'detail', INDEED_DETAIL)
+        scraper = IndeedScraper('python', 'Remote', page_cache=self.cache)
+
+        with mock.patch('src.scrapers.indeed_scraper.sync_playwright') as playwright, \
+                mock.patch('src.scrapers.base.time.sleep') as sleep:
+            job = scraper.fetch_detail({'title': 'Backend Engineer', 'company': 'Acme',
+                                        'location': 'Remote', 'url': url})
+            scraper.pause_between_details()
+
+        playwright.assert_not_called()
+        sleep.assert_not_called()
+        self.assertEqual((job['salary_min'], job['salary_max']), (120000, 150000))
+
+    def test_cached_search_page_skips_browser(self):
+        scraper = IndeedScraper('python', 'Remote', page_cache=self.cache)
+        self.cache.put(f"{IndeedScraper.BASE_URL}?q=python&l=Remote&sort=date", 'search', INDEED_SEARCH)
+
+        with mock.patch('src.scrapers.indeed_scraper.sync_playwright') as playwright:
+            cards = scraper.collect_cards()
+
+        playwright.assert_not_called()
+        self.assertEqual(len(cards), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
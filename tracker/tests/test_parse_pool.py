@@ -0,0 +1,138 @@
+"""
+Tests for parsing detail pages in a process pool.
+"""
+import os
+import sys
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scrapers.base import BaseScraper, DetailFetchError
+from src.scrapers.parse_pool import ParsePool
+from src.scrapers.indeed_scraper import IndeedScraper
+
+DETAIL_HTML = """
+<div id="salaryInfoAndJobType"><span>$120,000 - $150,000 a year</span></div>
+<div id="jobDescriptionText"><p>Build APIs for {title}.</p></div>
+"""
+
+JSON_LD_HTML = """
+<script type="application/ld+json">
+{"@type": "JobPosting", "description": "Structured description.", "employmentType": "PART_TIME"}
+</script>
+"""
+
+
+class FakeScraper(IndeedScraper):
+    """Indeed parser whose detail pages come from memory instead of a browser."""
+
+    DETAIL_DELAY = (0, 0)
+    loaded = []
+
+    def fetch_detail_html(self, basic_info):
+        FakeScraper.loaded.append(basic_info['url'])
+        if basic_info['url'].endswith('blocked'):
+            raise DetailFetchError("bot detection triggered", blocked=True)
+        if basic_info['url'].endswith('json'):
+            return JSON_LD_HTML
+        return DETAIL_HTML.format(title=basic_info['title'])
+
+
+class BrokenParser(BaseScraper):
+    """Scraper whose selector parser always fails."""
+
+    SOURCE = 'broken'
+
+    def scrape(self):
+        return []
+
+    def collect_cards(self, search_query=None, location=None):
+        return []
+
+    def fetch_details(self, job_basics):
+        return self.fetch_details_pipelined(job_basics)
+
+    def fetch_detail_html(self, basic_info):
+        return '<p>no structured data</p>'
+
+    def parse_cards_html(self, html):
+        return []
+
+    def parse_detail_html(self, html):
+        raise ValueError("unparseable page")
+
+
+def cards(n):
+    return [{'title': f'Job {i}', 'company': 'Acme', 'location': 'Remote', 'url': f'https://example.com/{i}'}
+            for i in range(n)]
+
+
+class TestParsePool(unittest.TestCase):
+    """Pooled and inline parsing give the same jobs."""
+
+    def setUp(self):
+        FakeScraper.loaded = []
+
+    def test_pool_matches_inline(self):
+        jobs = {}
+        for workers in (0, 2):
+            pool = ParsePool(workers=workers)
+            try:
+                jobs[workers] = FakeScraper('python', 'Remote', parse_pool=pool).fetch_details(cards(6))
+            finally:
+                pool.close()
+            self.assertEqual(pool.stats['selectors'], 6)
+
+        self.assertEqual([job['description'] for job in jobs[0]], [job['description'] for job in jobs[2]])
+        self.assertEqual(jobs[2][3]['description'], 'Build APIs for Job 3.')
+        self.assertEqual((jobs[2][0]['salary_min'], jobs[2][0]['salary_max']), (120000, 150000))
+
+    def test_failed_pages_keep_card_data(self):
+        basics = cards(2) + [{'title': 'Blocked', 'company': 'Acme', 'location': 'Remote',
+                              'url': 'https://example.com/blocked'},
+                             {'title': 'Structured', 'company': 'Acme', 'location': 'Remote',
+                              'url': 'https://example.com/json'}]
+        pool = ParsePool(workers=1)
+        try:
+            jobs = FakeScraper('python', 'Remote', parse_pool=pool).fetch_details(basics)
+        finally:
+            pool.close()
+
+        self.assertEqual(len(FakeScraper.loaded), 4)
+        self.assertEqual([job['title'] for job in jobs], ['Job 0', 'Job 1', 'Blocked', 'Structured'])
+        self.assertIsNone(jobs[2]['description'])
+        self.assertEqual(jobs[3]['description'], 'Structured description.')
+        self.assertEqual(jobs[3]['job_type'], 'Part-time')
+        self.assertEqual(pool.report()['structured'], 1)
+
+    def test_structured_page_without_salary_keeps_selector_salary(self):
+        html = JSON_LD_HTML + DETAIL_HTML.format(title='Job 0')
+        scraper = FakeScraper('python', 'Remote')
+        job = scraper.finish_detail(cards(1)[0], scraper.parser.submit_detail(FakeScraper, html))
+
+        self.assertEqual(job['description'], 'Structured description.')
+        self.assertEqual(job['job_type'], 'Part-time')
+        self.assertEqual((job['salary_min'], job['salary_max'], job['salary_period']), (120000, 150000, 'yearly'))
+        self.assertEqual(scraper.parser.stats['structured'], 1)
+
+    def test_structured_salary_wins(self):
+        html = JSON_LD_HTML.replace('"PART_TIME"', '"PART_TIME", "baseSalary": {"currency": "USD", "value": '
+                                    '{"minValue": 90000, "maxValue": 95000, "unitText": "YEAR"}}')
+        scraper = FakeScraper('python', 'Remote')
+        job = scraper.finish_detail(cards(1)[0], scraper.parser.submit_detail(
+            FakeScraper, html + DETAIL_HTML.format(title='Job 0')))
+        self.assertEqual((job['salary_min'], job['salary_max']), (90000, 95000))
+
+    def test_parse_error_builds_card_only_job(self):
+        scraper = BrokenParser('python', 'Remote')
+        future = scraper.parser.submit_detail(BrokenParser, '<p>no structured data</p>')
+        job = scraper.finish_detail(cards(1)[0], future)
+
+        self.assertEqual(job['title'], 'Job 0')
+        self.assertIsNone(job['description'])
+        self.assertEqual(scraper.parser.stats['errors'], 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,77 @@
+"""
+Tests for the sampling profiler.
+"""
+import os
+import sys
+import tempfile
+import time
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src import profiling
+from src.profiling import SamplingProfiler
+
+
+def busy_scrape(seconds):
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += sum(range(100))
+    return total
+
+
+def busy_ingest(seconds):
+    return busy_scrape(seconds)
+
+
+class TestSamplingProfiler(unittest.TestCase):
+    """Test cases for stage-tagged sampling and output files."""
+
+    def test_samples_are_tagged_by_stage(self):
+        profiler = SamplingProfiler(interval=0.002)
+        profiler.start()
+        with profiling.stage('scrape'):
+            busy_scrape(0.15)
+        with profiling.stage('ingest'):
+            busy_ingest(0.15)
+        profiler.stop()
+
+        stages = {stage for stage, _ in profiler.samples}
+        self.assertIn('scrape', stages)
+        self.assertIn('ingest', stages)
+
+        top = profiler.top_functions(100)
+        self.assertTrue(any(label.startswith('busy_scrape') for label, _, _ in top['scrape']))
+        self.assertTrue(any(label.startswith('busy_ingest') for label, _, _ in top['ingest']))
+
+    def test_stage_is_noop_without_active_profiler(self):
+        with profiling.stage('scrape'):
+            pass
+
+    def test_write_collapsed_and_summary(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            with profiling.profiled(True, tmp, interval=0.002) as profiler:
+                with profiling.stage('stats'):
+                    busy_scrape(0.1)
+
+            collapsed = os.path.join(tmp, [f for f in os.listdir(tmp) if f.endswith('.collapsed')][0])
+            with open(collapsed) as f:
+                lines = [line for line in f.read().splitlines() if line]
+            self.assertTrue(lines)
+            for line in lines:
+                stack, count = line.rsplit(' ', 1)
+                self.assertTrue(count.isdigit())
+            self.assertTrue(any(line.startswith('stats;') for line in lines))
+
+            summary = [f for f in os.listdir(tmp) if f.endswith('-top.txt')][0]
+            with open(os.path.join(tmp, summary)) as f:
+                text = f.read()
+            self.assertIn('TOP FUNCTIONS - stats', text)
+            self.assertIsNone(profiling._active)
+            self.assertGreater(sum(profiler.samples.values()), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+"""
+Tests for relevance ranking against a candidate profile.
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.db import Database
+from src.tracker.monitor import JobMonitor
+from src.tracker.ranking import CandidateProfile, RelevanceIndex, tokenize, yearly_salary
+
+JOBS = [
+    {'url': 'py', 'title': 'Senior Python Engineer', 'salary_max': 180000, 'salary_period': 'yearly',
+     'description': 'Build APIs in Python and Django on AWS. Postgres, Docker and Kubernetes.'},
+    {'url': 'java', 'title': 'Java Developer', 'salary_max': 170000, 'salary_period': 'yearly',
+     'description': 'Spring Boot microservices in Java. Some Python scripting is a plus.'},
+    {'url': 'nurse', 'title': 'Registered Nurse', 'salary_max': 45, 'salary_period': 'hourly',
+     'description': 'Provide patient care on night shifts in the ICU.'},
+    {'url': 'cheap-py', 'title': 'Python Engineer', 'salary_max': 60000, 'salary_period': 'yearly',
+     'description': 'Build APIs in Python and Django on AWS.'},
+]
+
+
+class TestRelevanceIndex(unittest.TestCase):
+    """Scoring, incremental updates and persistence."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'ranking.db')
+        self.index = RelevanceIndex(self.path, n_features=2 ** 16)
+
+    def tearDown(self):
+        self.index.close()
+        self.tmpdir.cleanup()
+
+    def test_tokenize_and_salary(self):
+        self.assertEqual(tokenize('C++ and Node.js, C# for the win.'), ['c++', 'node.js', 'c#', 'win'])
+        self.assertEqual(yearly_salary(40, 50, 'hourly'), 104000)
+        self.assertIsNone(yearly_salary(None, None, 'yearly'))
+
+    def test_best_match_first(self):
+        self.assertEqual(self.index.add_jobs(JOBS), 4)
+        profile = CandidateProfile(skills=['python', 'django', 'aws'], titles=['Python Engineer'])
+        ranked = self.index.rank(profile)
+        self.assertEqual([url for url, _ in ranked][:2], ['cheap-py', 'py'])
+        self.assertEqual(ranked[-1], ('nurse', 0.0))
+        self.assertLessEqual(ranked[0][1], 1.0)
+
+    def test_salary_floor_penalizes_known_low_pay(self):
+        self.index.add_jobs(JOBS)
+        profile = CandidateProfile(skills=['python', 'django', 'aws'], titles=['Python Engineer'],
+                                   min_salary=100000)
+        ranked = [url for url, _ in self.index.rank(profile)]
+        self.assertEqual(ranked[0], 'py')
+        self.assertLess(ranked.index('java'), ranked.index('nurse'))
+
+    def test_incremental_adds_match_a_fresh_index(self):
+        profile = CandidateProfile(skills=['python', 'kubernetes'], titles=['engineer'])
+        self.index.add_jobs(JOBS[:2])
+        self.index._merge()
+        self.index.add_jobs(JOBS[2:])  # stays in the unsorted tail
+        self.assertTrue(self.index._tail)
+        incremental = dict(self.index.rank(profile))
+
+        fresh = RelevanceIndex(os.path.join(self.tmpdir.name, 'fresh.db'), n_features=2 ** 16)
+        fresh.add_jobs(JOBS)
+        for url, score in fresh.rank(profile):
+            self.assertAlmostEqual(incremental[url], score, places=5)
+        fresh.close()
+
+    def test_keys_and_limit(self):
+        self.index.add_jobs(JOBS)
+        profile = CandidateProfile(skills=['python'])
+        ranked = self.index.rank(profile, keys=['java', 'nurse', 'unknown'], limit=2)
+        self.assertEqual([url for url, _ in ranked], ['java', 'nurse'])
+        self.assertEqual(self.index.rank(CandidateProfile(), limit=1), [('py', 0.0)])
+
+    def test_index_is_persisted(self):
+        self.index.add_jobs(JOBS)
+        before = self.index.rank(CandidateProfile(skills=['java']))
+        self.index.close()
+        self.index = RelevanceIndex(self.path, n_features=2 ** 16)
+        self.assertEqual(len(self.index), 4)
+        self.assertEqual(self.index.add_jobs(JOBS), 0)
+        self.assertEqual(self.index.rank(CandidateProfile(skills=['java'])), before)
+
+
+class TestMonitorRanking(unittest.TestCase):
+    """New jobs are indexed as the monitor stores them."""
+
+    def test_process_jobs_indexes_new_jobs(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = Database(os.path.join(tmpdir, 'jobs.db'))
+            db.create_tables()
+            index = RelevanceIndex(os.path.join(tmpdir, 'ranking.db'), n_features=2 ** 16)
+            monitor = JobMonitor(db, ranking_index=index)
+            monitor.process_jobs([{**job, 'company': 'Acme'} for job in JOBS], 'indeed')
+            monitor.process_jobs([{**JOBS[0], 'company': 'Acme'}], 'indeed')
+
+            self.assertEqual(len(index), 4)
+            self.assertEqual(index.rank(CandidateProfile(skills=['nurse']), limit=1)[0][0], 'nurse')
+            index.close()
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    unittest.main()
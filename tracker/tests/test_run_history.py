@@ -0,0 +1,104 @@
+"""
+Tests for scrape run history.
+"""
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.cli.commands import CLI
+from src.database.db import Database
+from src.metrics import metrics
+from src.tracker.monitor import JobMonitor
+from src.tracker.run_history import build_run_record, summarize_runs
+
+
+class TestRunHistory(unittest.TestCase):
+    """Test cases for recording and aggregating runs."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.tmpdir.name, 'jobs.db'))
+        self.db.create_tables()
+        metrics.reset()
+
+    def tearDown(self):
+        self.db.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def test_build_run_record_uses_metrics(self):
+        metrics.incr('detail_fetches_total', 8, board='indeed', outcome='ok')
+        metrics.incr('detail_fetches_total', 2, board='indeed', outcome='blocked')
+        metrics.observe('run_stage_seconds', 30.0, stage='scrape', board='indeed')
+
+        record = build_run_record(datetime.utcnow(), {'indeed': {'new': 3, 'seen_again': 5}},
+                                  {'search_pages': 1, 'cards_found': 10})
+
+        self.assertEqual(record['status'], 'success')
+        self.assertEqual(record['detail_fetches'], 10)
+        self.assertEqual(record['blocks'], 2)
+        self.assertEqual(record['new_count'], 3)
+        self.assertEqual(json.loads(record['sources'])['indeed']['duration_seconds'], 30.0)
+
+    def test_runs_are_stored_and_summarized_by_day(self):
+        now = datetime.utcnow().replace(hour=12)
+        for offset, new in ((0, 4), (0, 2), (1, 6)):
+            started = now - timedelta(days=offset)
+            self.db.add_scrape_run(started_at=started, finished_at=started, duration_seconds=60,
+                                   detail_fetches=10, blocks=1, new_count=new,
+                                   sources=json.dumps({'indeed': {'detail_fetches': 10, 'blocks': 1, 'new': new}}))
+
+        runs = self.db.get_scrape_runs(since=now - timedelta(days=7))
+        summaries = summarize_runs(runs, 'day')
+
+        self.assertEqual([s['runs'] for s in summaries], [1, 2])
+        self.assertEqual(summaries[1]['new'], 6)
+        self.assertAlmostEqual(summaries[1]['block_rate'], 0.1)
+        self.assertEqual(summaries[1]['sources']['indeed']['detail_fetches'], 20)
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            CLI(self.db, None).show_runs(days=7)
+        self.assertIn('3 runs', output.getvalue())
+
+    def test_changed_listings_are_counted_as_updated(self):
+        monitor = JobMonitor(self.db)
+        jobs = [{'url': f'https://example.com/{i}', 'title': f'Engineer {i}', 'company': 'Acme',
+                 'description': 'Build things', 'salary_min': 100000} for i in range(3)]
+        self.assertEqual(monitor.process_jobs(jobs, 'indeed')['new_count'], 3)
+
+        rescraped = [dict(job) for job in jobs]
+        rescraped[0]['salary_min'] = 120000
+        rescraped[1]['description'] = None  # Not found this time: kept, not an update
+        results = monitor.process_jobs(rescraped, 'indeed')
+        self.assertEqual((results['seen_again_count'], results['updated_count']), (3, 1))
+        self.assertEqual(self.db.get_job_by_url('https://example.com/0').salary_min, 120000)
+        self.assertEqual(self.db.get_job_by_url('https://example.com/1').description, 'Build things')
+        self.assertEqual(monitor.process_jobs(rescraped, 'indeed')['updated_count'], 0)
+
+        record = build_run_record(datetime.utcnow(), {'indeed': {'seen_again': 3, 'updated': 1}}, {})
+        self.assertEqual(record['updated_count'], 1)
+        self.db.add_scrape_run(**record)
+        self.assertEqual(summarize_runs(self.db.get_scrape_runs())[0]['updated'], 1)
+
+    def test_new_queries_are_merged_into_stored_jobs(self):
+        monitor = JobMonitor(self.db)
+        job = {'url': 'https://example.com/1', 'title': 'Engineer', 'company': 'Acme',
+               'matched_queries': ['python @ Remote']}
+        monitor.process_jobs([job], 'indeed')
+
+        results = monitor.process_jobs([{**job, 'matched_queries': ['sre @ Remote', 'python @ Remote']}], 'indeed')
+        stored = self.db.get_job_by_url('https://example.com/1')
+        self.assertEqual(json.loads(stored.matched_queries), ['python @ Remote', 'sre @ Remote'])
+        # A new query alone is not a listing change
+        self.assertEqual(results['updated_count'], 0)
+
+if __name__ == '__main__':
+    unittest.main()
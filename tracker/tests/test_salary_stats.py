@@ -0,0 +1,122 @@
+"""
+Tests for salary analytics.
+"""
+import os
+import sys
+import tempfile
+import time
+import unittest
+from unittest import mock
+from datetime import datetime, timedelta
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.db import Database
+from src.tracker.salary_stats import (
+    PERCENTILES, annualize, cached_salary_report, group_percentiles, salary_report, window_labels
+)
+
+
+def columns(rows):
+    """get_salary_columns()-shaped dict from (min, max, period, currency, company, board, posted) rows."""
+    names = ('salary_min', 'salary_max', 'salary_period', 'salary_currency', 'company', 'board_source',
+             'posted_date')
+    result = {name: [row[i] for row in rows] for i, name in enumerate(names)}
+    result['location'] = ['Remote'] * len(rows)
+    return result
+
+
+class TestSalaryStats(unittest.TestCase):
+    """Annualization, grouping and report shape."""
+
+    def test_annualize(self):
+        arrays = annualize(columns([
+            (100000, 140000, 'yearly', 'USD', 'Acme', 'indeed', datetime(2024, 1, 3)),
+            (50, None, 'hourly', None, None, 'linkedin', None),
+            (None, 9000, 'monthly', 'USD', 'Beta', 'indeed', None),
+            (90000, 90000, 'yearly', 'EUR', 'Euro', 'indeed', None),
+            (10, 20, 'fortnightly', 'USD', 'Odd', 'indeed', None),
+        ]))
+        np.testing.assert_allclose(arrays['annual'], [120000, 104000, 108000])
+        self.assertEqual(arrays['company'].tolist(), ['Acme', 'N/A', 'Beta'])
+        self.assertTrue(np.isnat(arrays['posted'][1]))
+
+    def test_group_percentiles_match_numpy(self):
+        rng = np.random.default_rng(0)
+        values = rng.normal(100000, 20000, 500)
+        keys = rng.choice(['a', 'b', 'c', 'd'], 500)
+        groups, counts, result, means = group_percentiles(values, keys)
+        for i, group in enumerate(groups):
+            np.testing.assert_allclose(result[i], np.percentile(values[keys == group], PERCENTILES))
+            self.assertAlmostEqual(means[i], values[keys == group].mean())
+            self.assertEqual(counts[i], (keys == group).sum())
+
+    def test_weeks_start_on_monday(self):
+        posted = np.array(['2024-01-07T12:00', '2024-01-08T00:00', '2024-02-29'], dtype='datetime64[s]')
+        self.assertEqual(window_labels(posted, 'week').tolist(), ['2024-01-01', '2024-01-08', '2024-02-26'])
+        self.assertEqual(window_labels(posted, 'month').tolist(), ['2024-01-01', '2024-01-01', '2024-02-01'])
+
+    def test_report_groups_and_days(self):
+        now = datetime(2024, 3, 1)
+        rows = [(100000 + i * 1000, None, 'yearly', 'USD', 'Acme' if i % 3 else 'Beta',
+                 'indeed', now - timedelta(days=i)) for i in range(30)]
+        arrays = annualize(columns(rows))
+        report = salary_report(arrays, group_by='company', min_count=1, now=now)
+        self.assertEqual(report['count'], 30)
+        self.assertEqual([g['key'] for g in report['groups']], ['Acme', 'Beta'])
+        self.assertEqual(sum(report['histogram']['counts']), 30)
+
+        recent = salary_report(arrays, group_by='window', window='day', days=5, now=now)
+        self.assertEqual(recent['count'], 6)
+        self.assertEqual(recent['groups'][0]['key'], '2024-02-25')
+        self.assertEqual(salary_report(arrays, days=5, now=now + timedelta(days=365))['overall'], None)
+
+
+class TestSalaryCache(unittest.TestCase):
+    """Reports are reused until jobs change."""
+
+    def test_cache_invalidated_by_new_jobs(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = Database(os.path.join(tmpdir, 'jobs.db'))
+            db.create_tables()
+            cache_path = os.path.join(tmpdir, 'salary_cache.json')
+            db.add_job(title='A', company='Acme', url='a', board_source='indeed',
+                       salary_min=100000, salary_max=120000, salary_period='yearly')
+            db.add_job(title='B', company='Acme', url='b', board_source='indeed')
+
+            first, cached = cached_salary_report(db, cache_path, group_by='board')
+            self.assertFalse(cached)
+            self.assertEqual(first['count'], 1)
+            again, cached = cached_salary_report(db, cache_path, group_by='board')
+            self.assertTrue(cached)
+            self.assertEqual(again, first)
+
+            db.add_job(title='C', company='Beta', url='c', board_source='linkedin',
+                       salary_min=40, salary_max=60, salary_period='hourly')
+            updated, cached = cached_salary_report(db, cache_path, group_by='board')
+            self.assertFalse(cached)
+            self.assertEqual(updated['count'], 2)
+            self.assertEqual(updated['overall'][2], (110000 + 104000) / 2)
+            db.engine.dispose()
+
+    def test_cache_expires_without_data_change(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = Database(os.path.join(tmpdir, 'jobs.db'))
+            db.create_tables()
+            cache_path = os.path.join(tmpdir, 'salary_cache.json')
+            db.add_job(title='A', company='Acme', url='a', board_source='indeed',
+                       salary_min=100000, salary_max=120000, salary_period='yearly')
+
+            self.assertFalse(cached_salary_report(db, cache_path, max_age=60)[1])
+            self.assertTrue(cached_salary_report(db, cache_path, max_age=60)[1])
+            # A write the data version can't see (another writer): only the age expires the report
+            with mock.patch('src.tracker.salary_stats.time.time', return_value=time.time() + 120):
+                self.assertFalse(cached_salary_report(db, cache_path, max_age=60)[1])
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,93 @@
+"""
+Tests for multi-search runs.
+"""
+import os
+import sys
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scrapers.base import BaseScraper
+from src.tracker.search_plan import MultiSearchRunner, SearchSpec, parse_searches
+
+
+class FakeScraper(BaseScraper):
+    """Scraper that serves canned search results and records detail fetches."""
+
+    RESULTS = {
+        ('python developer', 'Remote'): ['a', 'b'],
+        ('backend engineer', 'Remote'): ['b', 'c'],
+    }
+    fetched = []
+
+    def scrape(self):
+        return self.fetch_details(self.collect_cards())
+
+    def collect_cards(self, search_query=None, location=None):
+        return [{'title': f'Job {key}', 'company': 'Acme', 'location': location, 'url': key}
+                for key in self.RESULTS.get((search_query, location), [])]
+
+    def fetch_details(self, job_basics):
+        FakeScraper.fetched.extend(card['url'] for card in job_basics)
+        return [{**card, 'board_source': 'indeed'} for card in job_basics]
+
+    def fetch_detail_html(self, basic_info):
+        FakeScraper.fetched.append(basic_info['url'])
+        return '<html></html>'
+
+    def parse_cards_html(self, html):
+        return []
+
+    def parse_detail_html(self, html):
+        return None, None
+
+
+class TestParseSearches(unittest.TestCase):
+    """Test cases for the SEARCHES setting."""
+
+    def test_defaults_to_single_search_on_all_boards(self):
+        specs = parse_searches('', 'software engineer', 'Remote')
+        self.assertEqual(specs, [SearchSpec('software engineer', 'Remote', 'indeed'),
+                                 SearchSpec('software engineer', 'Remote', 'linkedin')])
+
+    def test_parses_and_dedupes_entries(self):
+        specs = parse_searches('data engineer|NYC|linkedin; data engineer|NYC|linkedin;sre',
+                               'x', 'Remote')
+        self.assertEqual(specs, [SearchSpec('data engineer', 'NYC', 'linkedin'),
+                                 SearchSpec('sre', 'Remote', 'indeed'),
+                                 SearchSpec('sre', 'Remote', 'linkedin')])
+
+    def test_rejects_unknown_board(self):
+        with self.assertRaises(ValueError):
+            parse_searches('sre|Remote|monster', 'x', 'Remote')
+
+
+class TestMultiSearchRunner(unittest.TestCase):
+    """Test cases for cross-query deduplication."""
+
+    def test_scrapers_must_support_multi_search(self):
+        class SearchOnly(BaseScraper):
+            def scrape(self):
+                return []
+
+        # Caught when the scraper is created, not mid-run
+        with self.assertRaisesRegex(TypeError, 'collect_cards'):
+            SearchOnly('python', 'Remote')
+
+    def test_overlapping_searches_fetch_each_job_once(self):
+        FakeScraper.fetched = []
+        searches = [SearchSpec('python developer', 'Remote', 'indeed'),
+                    SearchSpec('backend engineer', 'Remote', 'indeed')]
+        runner = MultiSearchRunner(searches, {'indeed': FakeScraper})
+
+        jobs = runner.run_board('indeed')
+
+        self.assertEqual(sorted(FakeScraper.fetched), ['a', 'b', 'c'])
+        matched = {job['url']: job['matched_queries'] for job in jobs}
+        self.assertEqual(matched['b'], ['python developer @ Remote', 'backend engineer @ Remote'])
+        self.assertEqual(runner.stats['cards_found'], 4)
+        self.assertEqual(runner.stats['unique_cards'], 3)
+
+if __name__ == '__main__':
+    unittest.main()
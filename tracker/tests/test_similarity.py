@@ -0,0 +1,156 @@
+"""
+Tests for the "more like this" similarity index.
+"""
+import os
+import random
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.db import Database
+from src.tracker.monitor import JobMonitor
+from src.tracker import similarity
+from src.tracker.similarity import SimilarityIndex
+
+TOPICS = {
+    'backend': ('Backend Engineer', 'python django postgres api services aws docker kubernetes microservices'),
+    'frontend': ('Frontend Developer', 'react typescript css javascript browser design components accessibility'),
+    'nursing': ('Registered Nurse', 'patient care icu shifts hospital medication clinical charting'),
+    'sales': ('Account Executive', 'quota pipeline prospecting crm negotiation enterprise customers revenue'),
+}
+
+
+def topic_jobs(n_per_topic=30, seed=1):
+    rng = random.Random(seed)
+    jobs = []
+    for topic, (title, words) in TOPICS.items():
+        words = words.split()
+        for i in range(n_per_topic):
+            jobs.append({'url': f'{topic}-{i}', 'title': title,
+                         'description': ' '.join(rng.choice(words) for _ in range(40))})
+    return jobs
+
+
+class TestSimilarityIndex(unittest.TestCase):
+    """Fitting, incremental inserts and search."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.dir = os.path.join(self.tmpdir.name, 'similarity')
+        self.index = SimilarityIndex(self.dir, dims=16, block_rows=7)
+
+    def tearDown(self):
+        self.index.close()
+        self.tmpdir.cleanup()
+
+    def test_unfitted_index_ignores_inserts(self):
+        self.assertFalse(self.index.fitted)
+        self.assertEqual(self.index.add_jobs(topic_jobs(2)), 0)
+        self.assertEqual(len(self.index), 0)
+
+    def test_neighbours_share_a_topic(self):
+        jobs = topic_jobs()
+        self.index.fit(jobs)
+        self.assertEqual(self.index.add_jobs(jobs), len(jobs))
+        for topic in TOPICS:
+            similar = self.index.similar(f'{topic}-0', k=5)
+            self.assertEqual(len(similar), 5)
+            self.assertTrue(all(url.startswith(topic) for url, _ in similar), similar)
+            self.assertNotIn(f'{topic}-0', [url for url, _ in similar])
+            scores = [score for _, score in similar]
+            self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_batched_search_matches_brute_force(self):
+        jobs = topic_jobs()
+        self.index.fit(jobs)
+        self.index.add_jobs(jobs)
+        queries = self.index.embed(jobs[:3] + jobs[-3:])
+        results = self.index.search(queries, k=4)
+        matrix = self.index.embed(jobs)
+        for query, result in zip(queries, results):
+            expected = np.sort(matrix @ query)[::-1][:4]
+            np.testing.assert_allclose([score for _, score in result], expected, atol=1e-5)
+
+    def test_cluster_probe_narrows_scan(self):
+        jobs = topic_jobs()
+        self.index.fit(jobs)
+        self.index.add_jobs(jobs)
+        exact = self.index.similar('sales-3', k=3)
+        probed = self.index.similar('sales-3', k=3, probe=2)
+        self.assertTrue(all(url.startswith('sales') for url, _ in probed))
+        self.assertEqual(probed[0], exact[0])
+
+    def test_incremental_insert_and_reopen(self):
+        jobs = topic_jobs()
+        self.index.fit(jobs[::2])
+        self.index.add_jobs(jobs[::2])
+        self.assertEqual(self.index.add_jobs(jobs), len(jobs) // 2)
+        self.assertEqual(self.index.add_jobs(jobs), 0)
+        before = self.index.similar('nursing-1', k=3)
+        self.index.close()
+
+        self.index = SimilarityIndex(self.dir, dims=16)
+        self.assertEqual(len(self.index), len(jobs))
+        self.assertEqual(self.index.similar('nursing-1', k=3), before)
+
+    def test_refit_clears_old_embeddings(self):
+        jobs = topic_jobs(5)
+        self.index.fit(jobs)
+        self.index.add_jobs(jobs)
+        self.index.fit(jobs)
+        self.assertEqual(len(self.index), 0)
+        self.assertEqual(self.index.similar('backend-0'), [])
+
+
+class TestSparseDot(unittest.TestCase):
+    """Chunked sparse products match the dense ones."""
+
+    def test_matches_dense_product_across_chunks(self):
+        rng = np.random.default_rng(3)
+        dense = rng.random((9, 40)).astype(np.float32) * (rng.random((9, 40)) < 0.3)
+        rows, cols = np.nonzero(dense)
+        m = rng.random((40, 3)).astype(np.float32)
+        # Chunks of 2 entries split most rows' runs across chunks
+        with mock.patch.object(similarity, 'PRODUCT_CHUNK_FLOATS', 6):
+            product = similarity._sparse_dot(rows, cols, dense[rows, cols], m, 9)
+        np.testing.assert_allclose(product, dense @ m, rtol=1e-5)
+
+    def test_fit_independent_of_chunk_size(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            embeddings = []
+            for chunk in (64, similarity.PRODUCT_CHUNK_FLOATS):
+                index = SimilarityIndex(os.path.join(tmpdir, str(chunk)), dims=8)
+                with mock.patch.object(similarity, 'PRODUCT_CHUNK_FLOATS', chunk):
+                    index.fit(topic_jobs(5))
+                    embeddings.append(np.abs(index.embed(topic_jobs(2))))
+                index.close()
+            np.testing.assert_allclose(embeddings[0], embeddings[1], atol=1e-4)
+
+
+class TestMonitorSimilarity(unittest.TestCase):
+    """New jobs are embedded once a model exists."""
+
+    def test_process_jobs_embeds_new_jobs(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = Database(os.path.join(tmpdir, 'jobs.db'))
+            db.create_tables()
+            index = SimilarityIndex(os.path.join(tmpdir, 'similarity'), dims=8)
+            index.fit(topic_jobs(5))
+            monitor = JobMonitor(db, similarity_index=index)
+            monitor.process_jobs([{**job, 'company': 'Acme'} for job in topic_jobs(3)], 'indeed')
+
+            self.assertEqual(len(index), 12)
+            self.assertIn('backend-2', index)
+            self.assertEqual(db.get_job_by_id(db.get_job_by_url('backend-2').id).url, 'backend-2')
+            index.close()
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,205 @@
+"""
+Tests for precomputed dashboard snapshots.
+"""
+import gzip
+import json
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.database.db import Database
+from src.tracker.snapshots import LocalSnapshotStore, S3SnapshotStore, build_snapshots, publish_snapshots
+
+# A Wednesday, so the week (starting Sunday) began three days earlier
+NOW = datetime(2024, 6, 12, 12, 0, 0)
+
+
+class FakeS3Client:
+    """In-memory stand-in for the S3 calls the snapshot store makes (list pages of 2 keys)."""
+
+    def __init__(self):
+        self.objects = {}
+        self.puts = []
+
+    def put_object(self, Bucket, Key, Body, ContentType, **extra):
+        self.objects[Key] = {'Body': Body, 'ContentType': ContentType, **extra}
+        self.puts.append(Key)
+
+    def list_objects_v2(self, Bucket, Prefix, Delimiter=None, ContinuationToken=None):
+        keys = sorted(key for key in self.objects if key.startswith(Prefix))
+        if Delimiter:
+            keys = sorted({Prefix + key[len(Prefix):].split(Delimiter)[0] + Delimiter
+                           for key in keys if Delimiter in key[len(Prefix):]})
+        start = int(ContinuationToken or 0)
+        page = keys[start:start + 2]
+        result = {'IsTruncated': start + 2 < len(keys)}
+        if result['IsTruncated']:
+            result['NextContinuationToken'] = str(start + 2)
+        if Delimiter:
+            result['CommonPrefixes'] = [{'Prefix': prefix} for prefix in page]
+        else:
+            result['Contents'] = [{'Key': key} for key in page]
+        return result
+
+    def delete_objects(self, Bucket, Delete):
+        for item in Delete['Objects']:
+            del self.objects[item['Key']]
+
+
+def read_gzip_json(body: bytes):
+    return json.loads(gzip.decompress(body))
+
+
+class TestBuildSnapshots(unittest.TestCase):
+    """Dashboard payloads computed from a SQLite database."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        cls.db = Database(os.path.join(cls.tmpdir.name, 'jobs.db'))
+        cls.db.create_tables()
+        jobs = [
+            # (days ago, company, source, location, salary_min, salary_max)
+            (0, 'Acme', 'indeed', 'Remote', 90000, 110000),
+            (2, 'Acme', 'linkedin', 'Remote', 210000, None),
+            (5, 'Beta', 'indeed', 'NYC', None, None),
+            (20, 'Acme', 'indeed', None, 40000, 0),
+            (60, 'Gamma', 'linkedin', 'SF', 130000, 150000),
+            (200, 'Beta', 'indeed', 'NYC', None, None),
+            (400, 'Old', 'indeed', 'NYC', None, None),
+        ]
+        for i, (days, company, source, location, low, high) in enumerate(jobs):
+            cls.db.add_job(title=f'Engineer {i}', company=company, url=f'https://example.com/{i}',
+                           board_source=source, location=location, salary_min=low, salary_max=high,
+                           posted_date=NOW - timedelta(days=days), description='x' * 500)
+        cls.db.mark_job_expired(3)
+        cls.snapshots = build_snapshots(cls.db, page_size=2, now=NOW)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.db.engine.dispose()
+        cls.tmpdir.cleanup()
+
+    def test_stats_match_dashboard_route(self):
+        stats = self.snapshots['stats']
+        # The 400-day-old job is outside the 365-day window
+        self.assertEqual(stats['total_jobs'], 6)
+        self.assertEqual((stats['jobs_today'], stats['jobs_this_week'], stats['jobs_this_month']), (1, 2, 3))
+        self.assertEqual(stats['status_counts'], {'active': 5, 'expired': 1})
+        self.assertEqual(stats['source_counts'], {'indeed': 4, 'linkedin': 2})
+        self.assertEqual(stats['application_status_counts'], {'not_applied': 6})
+
+    def test_charts_cover_90_days(self):
+        self.assertEqual(self.snapshots['charts/top-companies'], {'companies': ['Acme', 'Beta', 'Gamma'],
+                                                                   'counts': [3, 1, 1]})
+        self.assertEqual(self.snapshots['charts/top-locations'], {'locations': ['Remote', 'NYC', 'SF'],
+                                                                   'counts': [2, 1, 1]})
+        self.assertEqual(self.snapshots['charts/timeline']['dates'][0], '2024-04-13')
+        self.assertEqual(sum(self.snapshots['charts/timeline']['counts']), 5)
+        self.assertEqual(self.snapshots['charts/job-types'], {'labels': ['Not specified'], 'values': [5]})
+
+    def test_salary_distribution(self):
+        salary = self.snapshots['charts/salary-distribution']
+        # 100k midpoint, 210k min only, 40k (a 0 max counts as missing), 140k midpoint
+        self.assertEqual(salary['counts'], [1, 0, 0, 1, 1, 0, 1])
+        self.assertEqual(salary['total_with_salary'], 4)
+
+    def test_job_pages(self):
+        pages = [self.snapshots[f'jobs/page-{page:04d}'] for page in (1, 2)]
+        self.assertNotIn('jobs/page-0003', self.snapshots)
+        self.assertEqual(pages[0]['pagination'], {'page': 1, 'limit': 2, 'totalJobs': 4, 'totalPages': 2,
+                                                  'hasNextPage': True, 'hasPreviousPage': False})
+        jobs = pages[0]['jobs'] + pages[1]['jobs']
+        self.assertEqual([job['title'] for job in jobs], ['Engineer 0', 'Engineer 1', 'Engineer 2', 'Engineer 3'])
+        self.assertEqual(jobs[0]['posted_date'], '2024-06-12T12:00:00Z')
+        self.assertNotIn('description', jobs[0])
+
+    def test_empty_database_has_one_empty_page(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db = Database(os.path.join(tmpdir, 'jobs.db'))
+            db.create_tables()
+            snapshots = build_snapshots(db, now=NOW)
+            self.assertEqual(snapshots['jobs/page-0001']['jobs'], [])
+            self.assertEqual(snapshots['stats']['total_jobs'], 0)
+            db.engine.dispose()
+
+
+class TestPublishSnapshots(unittest.TestCase):
+    """Versioned publishing to a local directory and an S3 stand-in."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = Database(os.path.join(self.tmpdir.name, 'jobs.db'))
+        self.db.create_tables()
+        for i in range(5):
+            self.db.add_job(title=f'Engineer {i}', company='Acme', url=f'https://example.com/{i}',
+                            board_source='indeed', posted_date=NOW - timedelta(days=i))
+
+    def tearDown(self):
+        self.db.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def test_local_store(self):
+        directory = os.path.join(self.tmpdir.name, 'snapshots')
+        store = LocalSnapshotStore(directory)
+        stats = publish_snapshots(self.db, store, page_size=2, now=NOW)
+        self.assertEqual((stats['version'], stats['jobs'], stats['files']), ('20240612T120000Z', 5, 12))
+
+        with open(os.path.join(directory, 'latest.json')) as f:
+            latest = json.load(f)
+        with open(os.path.join(directory, latest['manifest']), 'rb') as f:
+            manifest = read_gzip_json(f.read())
+        self.assertEqual(manifest['data_version'], self.db.get_data_version())
+        self.assertEqual(manifest['pages'], 3)
+        with open(os.path.join(directory, latest['version'], 'charts', 'top-companies.json.gz'), 'rb') as f:
+            self.assertEqual(read_gzip_json(f.read()), {'companies': ['Acme'], 'counts': [5]})
+        self.assertEqual(sum(f['bytes'] for f in manifest['files'].values()), stats['bytes'])
+
+    def test_old_versions_pruned(self):
+        store = LocalSnapshotStore(os.path.join(self.tmpdir.name, 'snapshots'))
+        for hours in range(4):
+            stats = publish_snapshots(self.db, store, keep=2, now=NOW + timedelta(hours=hours))
+        self.assertEqual(stats['pruned'], 1)
+        self.assertEqual(store.list_versions(), ['20240612T140000Z', '20240612T150000Z'])
+
+    def test_unrelated_directories_kept(self):
+        # Publishing into a dashboard's public/ folder must not prune its own assets
+        directory = os.path.join(self.tmpdir.name, 'public')
+        assets = ['fonts', 'icons', 'images', 'css', 'js', '20240612']
+        for name in assets:
+            os.makedirs(os.path.join(directory, name))
+        store = LocalSnapshotStore(directory)
+        for hours in range(3):
+            stats = publish_snapshots(self.db, store, keep=1, now=NOW + timedelta(hours=hours))
+        self.assertEqual(stats['pruned'], 1)
+        self.assertEqual(store.list_versions(), ['20240612T140000Z'])
+        for name in assets:
+            self.assertTrue(os.path.isdir(os.path.join(directory, name)), name)
+
+    def test_s3_store(self):
+        client = FakeS3Client()
+        store = S3SnapshotStore('bucket', prefix='dashboard/', client=client)
+        client.put_object(Bucket='bucket', Key='dashboard/assets/logo.svg', Body=b'<svg/>', ContentType='image/svg+xml')
+        for hours in range(3):
+            publish_snapshots(self.db, store, page_size=2, keep=2, now=NOW + timedelta(hours=hours))
+
+        # latest.json is the last object written, uncompressed and not cacheable
+        self.assertEqual(client.puts[-1], 'dashboard/latest.json')
+        latest = json.loads(client.objects['dashboard/latest.json']['Body'])
+        self.assertEqual(latest['version'], '20240612T140000Z')
+        self.assertEqual(client.objects['dashboard/latest.json']['CacheControl'], 'no-cache')
+        stats = client.objects['dashboard/20240612T140000Z/stats.json.gz']
+        self.assertEqual((stats['ContentEncoding'], stats['ContentType']), ('gzip', 'application/json'))
+        self.assertEqual(read_gzip_json(stats['Body'])['total_jobs'], 5)
+        self.assertEqual(store.list_versions(), ['20240612T130000Z', '20240612T140000Z'])
+        self.assertFalse(any(key.startswith('dashboard/20240612T120000Z/') for key in client.objects))
+        self.assertIn('dashboard/assets/logo.svg', client.objects)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+"""
+Tests that CLI startup stays free of scrape-only dependencies.
+"""
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestLazyImports(unittest.TestCase):
+    """Importing the entry point must not load browser stacks or unused drivers."""
+
+    def test_main_import_skips_heavy_modules(self):
+        code = (
+            "import sys; sys.path.insert(0, '.'); import src.main; "
+            "print(','.join(sorted(m for m in ('playwright', 'selenium', 'numpy', 'pynamodb') "
+            "if m in sys.modules)))"
+        )
+        env = {**os.environ, 'DATABASE_TYPE': 'sqlite'}
+        result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, env=env,
+                                capture_output=True, text=True, check=True)
+        self.assertEqual(result.stdout.strip(), '')
+
+
+if __name__ == '__main__':
+    unittest.main()
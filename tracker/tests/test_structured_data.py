@@ -0,0 +1,151 @@
+"""
+Tests for extracting job fields from embedded JSON-LD and page state.
+"""
+import os
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.scrapers.structured_data import extract_structured_job
+from src.scrapers.page_cache import PageCache
+from src.scrapers.indeed_scraper import IndeedScraper
+from src.scrapers.linkedin_scraper import LinkedInScraper
+
+JSON_LD_DETAIL = """
+<html><head>
+<script type="application/ld+json">{"@context": "https://schema.org", "@type": "BreadcrumbList"}</script>
+<script type="application/ld+json">
+{
+  "@context": "https://schema.org",
+  "@type": "JobPosting",
+  "title": "Backend Engineer",
+  "description": "&lt;p&gt;Build APIs in &lt;b&gt;Python&lt;/b&gt;.&lt;/p&gt;&lt;p&gt;Remote friendly.&lt;/p&gt;",
+  "datePosted": "2024-03-05T14:30:00.000Z",
+  "employmentType": ["CONTRACTOR"],
+  "jobLocationType": "TELECOMMUTE",
+  "baseSalary": {
+    "@type": "MonetaryAmount",
+    "currency": "USD",
+    "value": {"@type": "QuantitativeValue", "minValue": 60, "maxValue": "75.50", "unitText": "HOUR"}
+  }
+}
+</script>
+</head><body><div id="jobDescriptionText">Selector description</div></body></html>
+"""
+
+PAGE_STATE_DETAIL = """
+<html><body>
+<script>
+window._initialData = {"jobInfoWrapperModel": {"jobInfoModel": {
+    "sanitizedJobDescription": "<div><p>Own the data platform.</p></div>",
+    "jobTypes": ["Full-time"]}},
+  "salaryInfoModel": {"salaryMin": 130000, "salaryMax": 160000, "salaryType": "YEARLY"},
+  "hiringInsightsModel": {"datePosted": "2024-03-01"}};
+window._other = {};
+</script>
+</body></html>
+"""
+
+SELECTOR_ONLY_DETAIL = """
+<div id="salaryInfoAndJobType"><span>$120,000 - $150,000 a year</span><span>Full-time</span></div>
+<div id="jobDescriptionText"><p>Build APIs in Python.</p></div>
+"""
+
+LINKEDIN_GRAPH_DETAIL = """
+<script type="application/ld+json">
+{"@context": "https://schema.org", "@graph": [
+  {"@type": "Organization", "name": "Foo Corp"},
+  {"@type": "JobPosting", "description": "Spark and Kafka pipelines.", "employmentType": "FULL_TIME",
+   "datePosted": "2024-02-20", "baseSalary": {"currency": "USD", "value": {"value": 150000, "unitText": "YEAR"}}}
+]}
+</script>
+"""
+
+
+class TestExtractStructuredJob(unittest.TestCase):
+    """JSON-LD and page state are mapped onto job fields."""
+
+    def test_json_ld_job_posting(self):
+        fields = extract_structured_job(JSON_LD_DETAIL)
+        self.assertEqual(fields['description'], 'Build APIs in Python.\nRemote friendly.')
+        self.assertEqual(fields['job_type'], 'Contract')
+        self.assertEqual(fields['work_mode'], 'Remote')
+        self.assertEqual(fields['posted_date'], datetime(2024, 3, 5, 14, 30))
+        self.assertEqual((fields['salary_min'], fields['salary_max']), (60, 75))
+        self.assertEqual(fields['salary_period'], 'hourly')
+        self.assertEqual(fields['salary_currency'], 'USD')
+
+    def test_graph_and_single_salary_value(self):
+        fields = extract_structured_job(LINKEDIN_GRAPH_DETAIL)
+        self.assertEqual(fields['job_type'], 'Full-time')
+        self.assertEqual(fields['posted_date'], datetime(2024, 2, 20))
+        self.assertEqual((fields['salary_min'], fields['salary_max'], fields['salary_period']),
+                         (150000, 150000, 'yearly'))
+
+    def test_page_state(self):
+        fields = extract_structured_job(PAGE_STATE_DETAIL)
+        self.assertEqual(fields['description'], 'Own the data platform.')
+        self.assertEqual(fields['job_type'], 'Full-time')
+        self.assertEqual(fields['posted_date'], datetime(2024, 3, 1))
+        self.assertEqual((fields['salary_min'], fields['salary_max'], fields['salary_period']),
+                         (130000, 160000, 'yearly'))
+
+    def test_no_structured_data(self):
+        self.assertEqual(extract_structured_job(SELECTOR_ONLY_DETAIL), {})
+        self.assertEqual(extract_structured_job(''), {})
+
+    def test_malformed_json_is_ignored(self):
+        html = '<script type="application/ld+json">{"@type": "JobPosting", </script>'
+        self.assertEqual(extract_structured_job(html), {})
+
+
+class TestScraperStructuredFields(unittest.TestCase):
+    """Scrapers prefer structured fields and fall back to selectors."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.cache = PageCache(os.path.join(self.tmpdir.name, 'pages.db'))
+        self.card = {'title': 'Backend Engineer', 'company': 'Acme', 'location': 'Remote',
+                     'url': 'https://www.indeed.com/viewjob?jk=abc123'}
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmpdir.cleanup()
+
+    def test_structured_fields_fill_job(self):
+        self.cache.put(self.card['url'], 'detail', JSON_LD_DETAIL)
+        job = IndeedScraper('python', 'Remote', page_cache=self.cache).fetch_detail(self.card)
+
+        self.assertEqual(job['description'], 'Build APIs in Python.\nRemote friendly.')
+        self.assertEqual(job['job_type'], 'Contract')
+        self.assertEqual(job['posted_date'], datetime(2024, 3, 5, 14, 30))
+        self.assertEqual((job['salary_min'], job['salary_max'], job['salary_period']), (60, 75, 'hourly'))
+        self.assertEqual(job['work_mode'], 'Remote')
+
+    def test_selector_fallback(self):
+        self.cache.put(self.card['url'], 'detail', SELECTOR_ONLY_DETAIL)
+        before = datetime.utcnow()
+        job = IndeedScraper('python', 'Remote', page_cache=self.cache).fetch_detail(self.card)
+
+        self.assertEqual(job['description'], 'Build APIs in Python.')
+        self.assertEqual((job['salary_min'], job['salary_max'], job['salary_period']),
+                         (120000, 150000, 'yearly'))
+        self.assertIsNone(job['job_type'])
+        self.assertGreaterEqual(job['posted_date'], before)
+
+    def test_build_job_prefers_structured_over_selectors(self):
+        scraper = LinkedInScraper('data', 'New York')
+        structured = extract_structured_job(LINKEDIN_GRAPH_DETAIL)
+        job = scraper.build_job(self.card, '$100000/yr - $120000/yr', 'Selector text', structured)
+
+        self.assertEqual(job['description'], 'Spark and Kafka pipelines.')
+        self.assertEqual((job['salary_min'], job['salary_max']), (150000, 150000))
+        self.assertEqual(job['salary_currency'], 'USD')
+
+
+if __name__ == '__main__':
+    unittest.main()
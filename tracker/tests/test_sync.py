@@ -0,0 +1,346 @@
+"""
+Tests for incremental job sync.
+"""
+import os
+import sys
+import tempfile
+import threading
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pynamodb.connection.base import Connection
+
+from src.database.db import Database
+from src.database.dynamodb import DynamoDatabase
+from src.database.sync import load_checkpoints, sync_jobs
+
+
+class FailingTarget:
+    """Target that accepts a number of chunks, then fails (an interrupted sync)."""
+
+    def __init__(self, target, chunks):
+        self.target = target
+        self.chunks = chunks
+
+    def upsert_jobs(self, rows):
+        if not self.chunks:
+            raise ConnectionError("connection dropped")
+        self.chunks -= 1
+        return self.target.upsert_jobs(rows)
+
+
+class TestSync(unittest.TestCase):
+    """SQLite-to-SQLite sync (both backends share iter_changes/upsert_jobs)."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.source = Database(os.path.join(self.tmpdir.name, 'source.db'))
+        self.target = Database(os.path.join(self.tmpdir.name, 'target.db'))
+        for db in (self.source, self.target):
+            db.create_tables()
+        self.checkpoint_path = os.path.join(self.tmpdir.name, 'sync_checkpoint.json')
+        for i in range(10):
+            self.source.add_job(title=f'Engineer {i}', company='Acme', url=f'https://example.com/{i}',
+                                board_source='indeed', salary_min=100000 + i)
+
+    def tearDown(self):
+        for db in (self.source, self.target):
+            db.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def sync(self, target=None, **kwargs):
+        return sync_jobs(self.source, target or self.target, self.checkpoint_path, 'push',
+                         chunk_size=3, overlap_seconds=0, **kwargs)
+
+    def target_rows(self):
+        return {row['url']: row for chunk in self.target.iter_jobs() for row in chunk}
+
+    def test_initial_sync_copies_everything(self):
+        stats = self.sync()
+        self.assertEqual((stats['rows'], stats['chunks']), (10, 4))
+        rows = self.target_rows()
+        self.assertEqual(len(rows), 10)
+        source = self.source.get_job_by_url('https://example.com/4')
+        self.assertEqual(rows['https://example.com/4']['salary_min'], 100004)
+        self.assertEqual(rows['https://example.com/4']['updated_at'], source.updated_at)
+        self.assertEqual(load_checkpoints(self.checkpoint_path)['push']['watermark'],
+                         max(row['updated_at'] for row in rows.values()).isoformat())
+
+    def test_incremental_sync_copies_only_changes(self):
+        self.sync()
+        # Later changes: one new job and one expired job
+        self.source.add_job(title='New', company='Beta', url='https://example.com/new', board_source='linkedin')
+        self.source.mark_job_expired(self.source.get_job_by_url('https://example.com/2').id)
+        stats = self.sync()
+        # The two changes, plus the job stamped at the (inclusive) watermark
+        self.assertEqual(stats['rows'], 3)
+        rows = self.target_rows()
+        self.assertEqual(len(rows), 11)
+        self.assertEqual(rows['https://example.com/2']['status'], 'expired')
+        self.assertEqual(self.sync()['rows'], 1)
+
+    def test_existing_rows_keep_local_ids(self):
+        self.target.add_job(title='Local', company='Zed', url='https://example.com/local', board_source='indeed')
+        self.target.add_job(title='Stale', company='Acme', url='https://example.com/5', board_source='indeed')
+        self.sync()
+        rows = self.target_rows()
+        self.assertEqual(len(rows), 11)
+        self.assertEqual(rows['https://example.com/5']['id'], 2)
+        self.assertEqual(rows['https://example.com/5']['title'], 'Engineer 5')
+
+    def test_interrupted_sync_resumes_from_checkpoint(self):
+        with self.assertRaises(ConnectionError):
+            self.sync(target=FailingTarget(self.target, chunks=2))
+        self.assertEqual(len(self.target_rows()), 6)
+        pending = load_checkpoints(self.checkpoint_path)['push']['pending']
+        self.assertEqual(pending['position'], {'last_id': 6})
+
+        stats = self.sync()
+        self.assertTrue(stats['resumed'])
+        self.assertEqual(stats['rows'], 4)
+        self.assertEqual(len(self.target_rows()), 10)
+        self.assertNotIn('pending', load_checkpoints(self.checkpoint_path)['push'])
+
+    def test_interrupted_incremental_sync_resumes(self):
+        self.sync()
+        for i in range(7):
+            self.source.mark_job_expired(i + 1)
+        with self.assertRaises(ConnectionError):
+            self.sync(target=FailingTarget(self.target, chunks=1))
+        position = load_checkpoints(self.checkpoint_path)['push']['pending']['position']
+        self.assertEqual(position['last_id'], 2)  # Oldest change first: job 10 (the watermark), then 1, 2
+
+        self.assertEqual(self.sync()['rows'], 5)
+        expired = [row for chunk in self.target.iter_jobs(status='expired') for row in chunk]
+        self.assertEqual(len(expired), 7)
+
+    def test_full_sync_ignores_watermark(self):
+        self.sync()
+        self.assertEqual(self.sync(full=True)['rows'], 10)
+
+    def test_overlap_rereads_before_watermark(self):
+        self.sync()
+        stats = sync_jobs(self.source, self.target, self.checkpoint_path, 'push', overlap_seconds=3600)
+        self.assertEqual(stats['rows'], 10)
+        watermark = datetime.fromisoformat(load_checkpoints(self.checkpoint_path)['push']['watermark'])
+        self.assertEqual(stats['since'], (watermark - timedelta(hours=1)).isoformat())
+
+
+class FakeDynamo:
+    """
+    In-memory stand-in for the calls a sync makes: BatchGetItem, BatchWriteItem
+    (optionally leaving part of a request unprocessed), GetItem/UpdateItem ADD
+    (the data version counter) and segmented Scans with Limit and `#n >= :v`
+    filters.
+    """
+
+    def __init__(self):
+        self.tables = {}
+        self.requests = []
+        self.unprocessed_gets = 0  # Responses that return only half their keys
+        self.unprocessed_writes = 0  # Responses that leave their last 3 items unprocessed
+        self.lock = threading.Lock()
+
+    def sent(self, operation_name):
+        return [kwargs for name, kwargs in self.requests if name == operation_name]
+
+    def __call__(self, operation_name, kwargs):
+        with self.lock:
+            self.requests.append((operation_name, kwargs))
+            return getattr(self, operation_name)(kwargs)
+
+    @staticmethod
+    def _key(item):
+        return next(item[name]['S'] for name in ('url', 'run_id') if name in item)
+
+    def BatchGetItem(self, kwargs):
+        (name, request), = kwargs['RequestItems'].items()
+        keys, unprocessed = request['Keys'], []
+        if self.unprocessed_gets:
+            self.unprocessed_gets -= 1
+            keys, unprocessed = keys[:len(keys) // 2], keys[len(keys) // 2:]
+        table = self.tables.setdefault(name, {})
+        found = [table[self._key(key)] for key in keys if self._key(key) in table]
+        return {'Responses': {name: found},
+                'UnprocessedKeys': {name: {**request, 'Keys': unprocessed}} if unprocessed else {}}
+
+    def BatchWriteItem(self, kwargs):
+        (name, requests), = kwargs['RequestItems'].items()
+        unprocessed = []
+        if self.unprocessed_writes:
+            self.unprocessed_writes -= 1
+            requests, unprocessed = requests[:-3], requests[-3:]
+        table = self.tables.setdefault(name, {})
+        for request in requests:
+            item = request['PutRequest']['Item']
+            table[self._key(item)] = item
+        return {'UnprocessedItems': {name: unprocessed} if unprocessed else {}}
+
+    def GetItem(self, kwargs):
+        item = self.tables.get(kwargs['TableName'], {}).get(self._key(kwargs['Key']))
+        return {'Item': item} if item else {}
+
+    def UpdateItem(self, kwargs):
+        item = self.tables.setdefault(kwargs['TableName'], {}).setdefault(self._key(kwargs['Key']),
+                                                                          dict(kwargs['Key']))
+        name = kwargs['ExpressionAttributeNames']['#0']
+        increment = int(kwargs['ExpressionAttributeValues'][':0']['N'])
+        item[name] = {'N': str(int(item.get(name, {'N': '0'})['N']) + increment)}
+        return {'Attributes': item}
+
+    def Scan(self, kwargs):
+        items = list(self.tables.get(kwargs['TableName'], {}).values())
+        mine = [item for i, item in enumerate(items) if i % kwargs['TotalSegments'] == kwargs['Segment']]
+        start = 0
+        if 'ExclusiveStartKey' in kwargs:
+            start = [self._key(item) for item in mine].index(self._key(kwargs['ExclusiveStartKey'])) + 1
+        # Limit counts items read, before the filter (as DynamoDB does)
+        read = mine[start:start + kwargs.get('Limit', len(mine))]
+        page = read
+        if 'FilterExpression' in kwargs:
+            placeholder, operator, value = kwargs['FilterExpression'].split()
+            assert operator == '>=', kwargs['FilterExpression']
+            name = kwargs['ExpressionAttributeNames'][placeholder]
+            bound = kwargs['ExpressionAttributeValues'][value]['S']
+            page = [item for item in read if item[name]['S'] >= bound]
+        data = {'Items': page, 'Count': len(page), 'ScannedCount': len(read)}
+        if start + len(read) < len(mine):
+            data['LastEvaluatedKey'] = {'url': read[-1]['url']}
+        return data
+
+
+def dynamo_job(i, updated_at):
+    return {
+        'url': {'S': f'https://example.com/{i}'}, 'id': {'N': str(1000 + i)}, 'title': {'S': f'Engineer {i}'},
+        'company': {'S': 'Acme'}, 'board_source': {'S': 'indeed'}, 'status': {'S': 'active'},
+        'salary_min': {'N': str(100000 + i)}, 'is_duplicate': {'BOOL': False},
+        'created_at': {'S': '2024-06-01T00:00:00.000000+0000'},
+        'updated_at': {'S': updated_at.strftime('%Y-%m-%dT%H:%M:%S.%f+0000')},
+    }
+
+
+class TestDynamoSync(unittest.TestCase):
+    """SQLite <-> DynamoDB sync against a fake DynamoDB API."""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.sqlite = Database(os.path.join(self.tmpdir.name, 'jobs.db'))
+        self.sqlite.create_tables()
+        self.dynamo = DynamoDatabase(table_name='sync-jobs', runs_table_name='sync-runs')
+        self.fake = FakeDynamo()
+        patcher = mock.patch.object(Connection, 'dispatch', side_effect=self.fake)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.checkpoint_path = os.path.join(self.tmpdir.name, 'sync_checkpoint.json')
+
+    def tearDown(self):
+        self.sqlite.engine.dispose()
+        self.tmpdir.cleanup()
+
+    def dynamo_items(self):
+        return self.fake.tables.get('sync-jobs', {})
+
+    def add_sqlite_jobs(self, count):
+        for i in range(count):
+            self.sqlite.add_job(title=f'Engineer {i}', company='Acme', url=f'https://example.com/{i}',
+                                board_source='indeed', salary_min=100000 + i)
+
+    def push(self, **kwargs):
+        return sync_jobs(self.sqlite, self.dynamo, self.checkpoint_path, 'push', overlap_seconds=0, **kwargs)
+
+    def pull(self, target=None, **kwargs):
+        return sync_jobs(self.dynamo, target or self.sqlite, self.checkpoint_path, 'pull', chunk_size=2,
+                         segments=2, overlap_seconds=0, **kwargs)
+
+    def test_push_chunks_batch_requests(self):
+        self.add_sqlite_jobs(130)
+        stats = self.push()
+        self.assertEqual(stats['rows'], 130)
+        # Existing IDs are looked up 100 keys per BatchGetItem, items written 25 per BatchWriteItem
+        self.assertEqual([len(request['RequestItems']['sync-jobs']['Keys'])
+                          for request in self.fake.sent('BatchGetItem')], [100, 30])
+        self.assertEqual([len(request['RequestItems']['sync-jobs'])
+                          for request in self.fake.sent('BatchWriteItem')], [25] * 5 + [5])
+        items = self.dynamo_items()
+        self.assertEqual(len(items), 130)
+        source = self.sqlite.get_job_by_url('https://example.com/42')
+        self.assertEqual(items['https://example.com/42']['salary_min'], {'N': '100042'})
+        self.assertEqual(items['https://example.com/42']['updated_at']['S'],
+                         source.updated_at.strftime('%Y-%m-%dT%H:%M:%S.%f+0000'))
+        self.assertEqual(self.dynamo.get_data_version(), 'jobs:1')
+
+    def test_push_retries_unprocessed_items(self):
+        self.add_sqlite_jobs(30)
+        self.fake.tables['sync-jobs'] = {'https://example.com/7': dynamo_job(7, datetime(2024, 1, 1))}
+        self.fake.unprocessed_gets = 1
+        self.fake.unprocessed_writes = 2
+        self.assertEqual(self.push()['rows'], 30)
+        # 30 keys in one request, half left unprocessed and re-requested
+        self.assertEqual([len(request['RequestItems']['sync-jobs']['Keys'])
+                          for request in self.fake.sent('BatchGetItem')], [30, 15])
+        # 25 + 5 items; 3 of the first 25 stay unprocessed through one retry and land on the second
+        self.assertEqual([len(request['RequestItems']['sync-jobs'])
+                          for request in self.fake.sent('BatchWriteItem')], [25, 3, 3, 5])
+        items = self.dynamo_items()
+        self.assertEqual(len(items), 30)
+        # The existing item keeps its DynamoDB ID whichever half its key was in
+        self.assertEqual(items['https://example.com/7']['id'], {'N': '1007'})
+        self.assertEqual(items['https://example.com/7']['title'], {'S': 'Engineer 7'})
+
+    def test_pull_resumes_from_segment_positions(self):
+        base = datetime(2024, 6, 1)
+        self.fake.tables['sync-jobs'] = {f'https://example.com/{i}': dynamo_job(i, base + timedelta(minutes=i))
+                                         for i in range(10)}
+        with self.assertRaises(ConnectionError):
+            self.pull(target=FailingTarget(self.sqlite, chunks=2))
+        self.assertEqual(len([row for chunk in self.sqlite.iter_jobs() for row in chunk]), 4)
+        position = load_checkpoints(self.checkpoint_path)['pull']['pending']['position']
+        self.assertEqual(position['segments'], 2)
+        self.assertTrue(any(position['keys'].values()))
+
+        scans_before = len(self.fake.sent('Scan'))
+        stats = self.pull()
+        self.assertTrue(stats['resumed'])
+        self.assertEqual(stats['rows'], 6)
+        # Every segment still open restarts from its checkpointed key
+        resumed = self.fake.sent('Scan')[scans_before:]
+        for segment, key in position['keys'].items():
+            if key is not None:
+                first = next(request for request in resumed if request['Segment'] == int(segment))
+                self.assertEqual(first['ExclusiveStartKey'], key)
+        rows = {row['url']: row for chunk in self.sqlite.iter_jobs() for row in chunk}
+        self.assertEqual(len(rows), 10)
+        self.assertEqual(rows['https://example.com/3']['salary_min'], 100003)
+        self.assertEqual(rows['https://example.com/3']['updated_at'], base + timedelta(minutes=3))
+        self.assertEqual(load_checkpoints(self.checkpoint_path)['pull']['watermark'],
+                         (base + timedelta(minutes=9)).isoformat())
+
+    def test_pull_reads_only_changes_since_watermark(self):
+        base = datetime(2024, 6, 1)
+        items = {f'https://example.com/{i}': dynamo_job(i, base + timedelta(minutes=i)) for i in range(10)}
+        self.fake.tables['sync-jobs'] = items
+        self.assertEqual(self.pull()['rows'], 10)
+        self.assertTrue(all('FilterExpression' not in request for request in self.fake.sent('Scan')))
+
+        changed = dynamo_job(3, base + timedelta(hours=1))
+        changed['status'] = {'S': 'expired'}
+        items['https://example.com/3'] = changed
+        scans_before = len(self.fake.sent('Scan'))
+        stats = self.pull()
+        # The change, plus the job stamped at the (inclusive) watermark
+        self.assertEqual(stats['rows'], 2)
+        self.assertEqual(stats['since'], (base + timedelta(minutes=9)).isoformat())
+        for request in self.fake.sent('Scan')[scans_before:]:
+            self.assertEqual(list(request['ExpressionAttributeValues'].values()),
+                             [{'S': '2024-06-01T00:09:00.000000+0000'}])
+        self.assertEqual(self.sqlite.get_job_by_url('https://example.com/3').status, 'expired')
+        self.assertEqual(load_checkpoints(self.checkpoint_path)['pull']['watermark'],
+                         (base + timedelta(hours=1)).isoformat())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,194 @@
+"""
+Tests for the durable detail-fetch task queue.
+"""
+import os
+import sys
+import re
+import tempfile
+import time
+import unittest
+
+# Add parent directory to path
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from concurrent.futures import Future
+
+from src.scrapers.base import BaseScraper, DetailFetchError
+from src.scrapers.parse_pool import ParsePool, parse_detail_page
+from src.tracker.search_plan import MultiSearchRunner, SearchSpec
+from src.tracker.task_queue import DetailTaskQueue
+
+CARDS = [{'title': f'Job {key}', 'company': 'Acme', 'location': 'Remote', 'url': key}
+         for key in ('a', 'b', 'c')]
+
+
+class FlakyScraper(BaseScraper):
+    """Scraper whose detail fetch fails once for URL 'b'."""
+
+    SOURCE = 'indeed'
+    DETAIL_DELAY = (0, 0)
+    failures = {}
+
+    def scrape(self):
+        return []
+
+    def collect_cards(self, search_query=None, location=None):
+        return [dict(card) for card in CARDS]
+
+    def fetch_details(self, job_basics):
+        return self.fetch_details_pipelined(job_basics)
+
+    def fetch_detail_html(self, basic_info):
+        url = basic_info['url']
+        if url == 'b' and FlakyScraper.failures.get(url, 0) < 1:
+            FlakyScraper.failures[url] = FlakyScraper.failures.get(url, 0) + 1
+            raise DetailFetchError('timeout')
+        return f'<p class="salary">$100,000 a year</p><p class="description">Description for {url}</p>'
+
+    def parse_cards_html(self, html):
+        return []
+
+    def parse_detail_html(self, html):
+        salary, description = re.findall(r'<p class="\w+">(.*?)</p>', html)
+        return salary, description
+
+
+class DeferredParsePool(ParsePool):
+    """Parses a page only when its result is collected, logging submit/parse order."""
+
+    def __init__(self):
+        super().__init__(workers=0)
+        self.events = []
+        self.pages = {}
+
+    def submit_detail(self, scraper_cls, html):
+        future = Future()
+        self.pages[id(future)] = (scraper_cls, html)
+        self.events.append(('submit', html))
+        return future
+
+    def result(self, future, board=None):
+        scraper_cls, html = self.pages.pop(id(future))
+        future.set_result(parse_detail_page(scraper_cls, html))
+        self.events.append(('parse', html))
+        return super().result(future, board=board)
+
+
+class TestDetailTaskQueue(unittest.TestCase):
+    """Test cases for leasing, retries and resume."""
+
+    def test_scrapers_must_fetch_single_details(self):
+        class BatchOnly(FlakyScraper):
+            fetch_detail_html = BaseScraper.fetch_detail_html
+
+        # Queued fetches go through fetch_detail_html, so a scraper without it can't be created
+        with self.assertRaisesRegex(TypeError, 'fetch_detail_html'):
+            BatchOnly('python', 'Remote')
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, 'tasks.db')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_enqueue_is_idempotent(self):
+        queue = DetailTaskQueue(self.path)
+        self.assertEqual(queue.enqueue('indeed', CARDS), 3)
+        self.assertEqual(queue.enqueue('indeed', CARDS), 0)
+        queue.close()
+
+    def test_finished_tasks_are_requeued(self):
+        queue = DetailTaskQueue(self.path, max_attempts=1)
+        queue.enqueue('indeed', CARDS[:2])
+        queue.complete(queue.claim('indeed'), {'url': 'a'})
+        queue.ack('indeed')
+        self.assertFalse(queue.fail(queue.claim('indeed'), 'timeout'))
+        self.assertEqual(queue.state_counts(), {'done': 1, 'failed': 1})
+
+        # The next run sees both jobs again and fetches them from scratch
+        self.assertEqual(queue.enqueue('indeed', CARDS[:2]), 2)
+        self.assertEqual(queue.state_counts(), {'pending': 2})
+        task = queue.claim('indeed')
+        self.assertEqual((task.url, task.attempts), ('a', 0))
+        self.assertEqual(queue.metrics['resumed'], 0)
+        queue.close()
+
+    def test_runner_refetches_jobs_done_in_earlier_run(self):
+        FlakyScraper.failures = {'b': 1}
+        queue = DetailTaskQueue(self.path)
+        runner = MultiSearchRunner([SearchSpec('q', 'Remote', 'indeed')],
+                                   {'indeed': FlakyScraper}, task_queue=queue)
+        runner.run_board('indeed')
+        runner.ack('indeed')
+
+        jobs = runner.run_board('indeed')
+        runner.ack('indeed')
+        self.assertEqual(sorted(job['url'] for job in jobs), ['a', 'b', 'c'])
+        self.assertTrue(all(job['description'] for job in jobs))
+        self.assertEqual(runner.stats['detail_fetches'], 6)
+        queue.close()
+
+    def test_failure_backs_off_then_fails(self):
+        queue = DetailTaskQueue(self.path, max_attempts=2, backoff_base=60)
+        queue.enqueue('indeed', CARDS[:1])
+        task = queue.claim('indeed')
+        self.assertTrue(queue.fail(task, 'timeout'))
+        self.assertIsNone(queue.claim('indeed'))
+        self.assertGreater(queue.next_available_in('indeed'), 50)
+
+        queue.conn.execute("UPDATE tasks SET available_at = 0")
+        task = queue.claim('indeed')
+        self.assertEqual(task.attempts, 1)
+        self.assertFalse(queue.fail(task, 'timeout'))
+        self.assertEqual(queue.state_counts(), {'failed': 1})
+        queue.close()
+
+    def test_expired_lease_is_resumed_by_new_queue(self):
+        queue = DetailTaskQueue(self.path, lease_seconds=0)
+        queue.enqueue('indeed', CARDS[:1])
+        self.assertIsNotNone(queue.claim('indeed'))
+        queue.close()  # Worker died holding the lease
+
+        time.sleep(0.01)
+        queue = DetailTaskQueue(self.path)
+        task = queue.claim('indeed')
+        self.assertEqual(task.url, 'a')
+        self.assertEqual(queue.metrics['resumed'], 1)
+        queue.close()
+
+    def test_runner_retries_and_stores_results(self):
+        FlakyScraper.failures = {}
+        queue = DetailTaskQueue(self.path, backoff_base=0)
+        runner = MultiSearchRunner([SearchSpec('q', 'Remote', 'indeed')],
+                                   {'indeed': FlakyScraper}, task_queue=queue)
+
+        jobs = runner.run_board('indeed')
+        runner.ack('indeed')
+
+        self.assertEqual(sorted(job['url'] for job in jobs), ['a', 'b', 'c'])
+        self.assertTrue(all(job['description'] for job in jobs))
+        self.assertEqual(queue.metrics['retried'], 1)
+        self.assertEqual(queue.state_counts(), {'done': 3})
+        queue.close()
+
+    def test_runner_parses_while_fetching(self):
+        FlakyScraper.failures = {'b': 1}
+        queue = DetailTaskQueue(self.path)
+        pool = DeferredParsePool()
+        runner = MultiSearchRunner([SearchSpec('q', 'Remote', 'indeed')], {'indeed': FlakyScraper},
+                                   task_queue=queue, parse_pool=pool, parse_window=1)
+
+        jobs = runner.run_board('indeed')
+
+        # The next page is fetched before the previous one is parsed (and marked done)
+        order = [(kind, html.split('for ')[1][0]) for kind, html in pool.events]
+        self.assertEqual(order, [('submit', 'a'), ('submit', 'b'), ('parse', 'a'),
+                                 ('submit', 'c'), ('parse', 'b'), ('parse', 'c')])
+        self.assertEqual(sorted(job['description'] for job in jobs),
+                         ['Description for a', 'Description for b', 'Description for c'])
+        self.assertEqual(queue.state_counts(), {'fetched': 3})
+        queue.close()
+
+if __name__ == '__main__':
+    unittest.main()